@@ -1,6 +1,7 @@
 """Chemistry evaluation metrics (SMILES and Markush) for Docling metrics."""
 
 from docling_metrics_chemistry.docling_metrics_chemistry import (
+    SmilesAccumulator,
     SmilesAggregateResult,
     SmilesInputSample,
     SmilesMetric,
@@ -8,6 +9,7 @@ from docling_metrics_chemistry.docling_metrics_chemistry import (
 )
 
 __all__ = [
+    "SmilesAccumulator",
     "SmilesAggregateResult",
     "SmilesInputSample",
     "SmilesMetric",
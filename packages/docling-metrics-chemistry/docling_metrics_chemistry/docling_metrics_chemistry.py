@@ -6,11 +6,14 @@ import logging
 from typing import Annotated, Any, Iterable, Optional
 
 from docling_metrics_core.base_types import (
+    BaseAccumulator,
     BaseAggregateResult,
     BaseInputSample,
     BaseMetric,
     BaseSampleResult,
 )
+from docling_metrics_core.cache import cached_sample_evaluation
+from docling_metrics_core.profiling import stage
 from pydantic import Field
 from rdkit import Chem, RDLogger
 
@@ -160,6 +163,93 @@ class SmilesAggregateResult(BaseAggregateResult):
     ]
 
 
+class SmilesAccumulator(BaseAccumulator):
+    """Running sums and counts behind the SMILES aggregate statistics."""
+
+    tanimoto_sum: float = 0.0
+    valid_count: int = 0
+    inchi_equality_count: int = 0
+    string_equality_count: int = 0
+    # Markush sums and counts (only for samples that have them)
+    r_sum: float = 0.0
+    r_count: int = 0
+    m_sum: float = 0.0
+    m_count: int = 0
+    sg_sum: float = 0.0
+    sg_count: int = 0
+    markush_count: int = 0
+    cxsmi_equality_count: int = 0
+
+    def update(self, result: SmilesSampleResult) -> None:  # type: ignore[override]
+        """Fold a single sample result.
+
+        Args:
+            result: Sample evaluation result.
+        """
+        self.sample_count += 1
+        self.tanimoto_sum += result.tanimoto
+        self.valid_count += result.valid
+        self.inchi_equality_count += result.inchi_equality
+        self.string_equality_count += result.string_equality
+        if result.r is not None:
+            self.r_sum += result.r
+            self.r_count += 1
+        if result.m is not None:
+            self.m_sum += result.m
+            self.m_count += 1
+        if result.sg is not None:
+            self.sg_sum += result.sg
+            self.sg_count += 1
+        if result.num_fragments_gt > 0:
+            self.markush_count += 1
+            self.cxsmi_equality_count += result.cxsmi_equality
+
+    def merge(self, other: SmilesAccumulator) -> None:  # type: ignore[override]
+        """Fold the state of another accumulator.
+
+        Args:
+            other: Accumulator of another shard of the dataset.
+        """
+        for field_name in SmilesAccumulator.model_fields:
+            setattr(
+                self,
+                field_name,
+                getattr(self, field_name) + getattr(other, field_name),
+            )
+
+    def finalize(self) -> SmilesAggregateResult:
+        """Compute the summary statistics.
+
+        Returns:
+            SmilesAggregateResult with aggregated metrics.
+        """
+        sample_count = self.sample_count
+        if sample_count == 0:
+            return SmilesAggregateResult(
+                sample_count=0,
+                mean_tanimoto=0.0,
+                validity_rate=0.0,
+                inchi_equality_rate=0.0,
+                string_equality_rate=0.0,
+            )
+
+        return SmilesAggregateResult(
+            sample_count=sample_count,
+            mean_tanimoto=round(self.tanimoto_sum / sample_count, 3),
+            validity_rate=round(self.valid_count / sample_count, 3),
+            inchi_equality_rate=round(self.inchi_equality_count / sample_count, 3),
+            string_equality_rate=round(self.string_equality_count / sample_count, 3),
+            mean_r=(round(self.r_sum / self.r_count, 3) if self.r_count else None),
+            mean_m=(round(self.m_sum / self.m_count, 3) if self.m_count else None),
+            mean_sg=(round(self.sg_sum / self.sg_count, 3) if self.sg_count else None),
+            cxsmi_equality_rate=(
+                round(self.cxsmi_equality_count / self.markush_count, 3)
+                if self.markush_count
+                else None
+            ),
+        )
+
+
 def _default_result(sample_id: str) -> dict[str, Any]:
     """Return default scores for an invalid/unparseable prediction."""
     return {
@@ -186,6 +276,9 @@ class SmilesMetric(BaseMetric):
     fragment matching).
     """
 
+    sample_result_type = SmilesSampleResult
+
+    @cached_sample_evaluation
     def evaluate_sample(  # type: ignore[override]
         self,
         sample: SmilesInputSample,
@@ -198,6 +291,20 @@ class SmilesMetric(BaseMetric):
         Returns:
             SmilesSampleResult with computed metrics.
         """
+        return SmilesSampleResult(**self.evaluate_sample_values(sample))
+
+    def evaluate_sample_values(  # type: ignore[override]
+        self,
+        sample: SmilesInputSample,
+    ) -> dict[str, Any]:
+        """Evaluate a single SMILES prediction into plain values.
+
+        Args:
+            sample: Input sample with predicted and ground truth SMILES.
+
+        Returns:
+            The fields of SmilesSampleResult, without instantiating it.
+        """
         gt_smiles = sample.gt_smiles
         predicted_smiles = sample.predicted_smiles
         if predicted_smiles is None:
@@ -208,12 +315,14 @@ class SmilesMetric(BaseMetric):
         parser_params.strictCXSMILES = False
         parser_params.sanitize = False
         parser_params.removeHs = False
-        gt_molecule = Chem.MolFromSmiles(gt_smiles, parser_params)
+        with stage("chemistry.parse"):
+            gt_molecule = Chem.MolFromSmiles(gt_smiles, parser_params)
         if gt_molecule is None:
-            return SmilesSampleResult(id=sample.id, **_default_result(sample.id))
+            return {"id": sample.id, **_default_result(sample.id)}
 
         # Validate prediction
-        predicted_molecule = Chem.MolFromSmiles(predicted_smiles, parser_params)
+        with stage("chemistry.parse"):
+            predicted_molecule = Chem.MolFromSmiles(predicted_smiles, parser_params)
         if predicted_molecule is None:
             # Set default incorrect scores based on molecule information
             result = _default_result(sample.id)
@@ -231,27 +340,28 @@ class SmilesMetric(BaseMetric):
                     result["sg"] = None
                 else:
                     result["sg"] = 0.0
-            return SmilesSampleResult(id=sample.id, **result)
+            return {"id": sample.id, **result}
 
         if sample.is_markush:
             # Canonicalize for Markush comparison
             gt_smiles_canon = canonicalize_markush(gt_smiles)
             if gt_smiles_canon is None:
-                return SmilesSampleResult(id=sample.id, **_default_result(sample.id))
+                return {"id": sample.id, **_default_result(sample.id)}
             try:
                 predicted_smiles_canon = canonicalize_markush(predicted_smiles)
             except Exception:
-                return SmilesSampleResult(id=sample.id, **_default_result(sample.id))
+                return {"id": sample.id, **_default_result(sample.id)}
             if predicted_smiles_canon is None:
-                return SmilesSampleResult(id=sample.id, **_default_result(sample.id))
+                return {"id": sample.id, **_default_result(sample.id)}
 
             try:
-                scores = compute_markush_prediction_quality(
-                    predicted_smiles=predicted_smiles_canon,
-                    gt_smiles=gt_smiles_canon,
-                    remove_stereo=sample.remove_stereo,
-                    remove_double_bond_stereo=True,
-                )
+                with stage("chemistry.markush_scores"):
+                    scores = compute_markush_prediction_quality(
+                        predicted_smiles=predicted_smiles_canon,
+                        gt_smiles=gt_smiles_canon,
+                        remove_stereo=sample.remove_stereo,
+                        remove_double_bond_stereo=True,
+                    )
             except Exception as e:
                 logger.warning(
                     "Error in Markush evaluation for gt=%s, pred=%s: %s",
@@ -259,21 +369,22 @@ class SmilesMetric(BaseMetric):
                     predicted_smiles,
                     e,
                 )
-                return SmilesSampleResult(id=sample.id, **_default_result(sample.id))
+                return {"id": sample.id, **_default_result(sample.id)}
         else:
             # Simple molecule comparison
             gt_smiles_canon = Chem.MolToSmiles(gt_molecule)
             predicted_smiles_canon = Chem.MolToSmiles(predicted_molecule)
 
-            scores = compute_molecule_prediction_quality(
-                predicted_smiles=predicted_smiles_canon,
-                gt_smiles=gt_smiles_canon,
-                remove_stereo=sample.remove_stereo,
-                remove_double_bond_stereo=True,
-            )
+            with stage("chemistry.molecule_scores"):
+                scores = compute_molecule_prediction_quality(
+                    predicted_smiles=predicted_smiles_canon,
+                    gt_smiles=gt_smiles_canon,
+                    remove_stereo=sample.remove_stereo,
+                    remove_double_bond_stereo=True,
+                )
 
         # Build result
-        result_kwargs: dict[str, Any] = {
+        return {
             "id": sample.id,
             "valid": scores.get("valid", False),
             "tanimoto": scores.get("tanimoto", 0.0),
@@ -289,7 +400,13 @@ class SmilesMetric(BaseMetric):
             "cxsmi_equality": scores.get("cxsmi_equality", False),
         }
 
-        return SmilesSampleResult(**result_kwargs)
+    def create_accumulator(self) -> SmilesAccumulator:
+        """Create an empty accumulator for the summary statistics.
+
+        Returns:
+            SmilesAccumulator folding the results in constant memory.
+        """
+        return SmilesAccumulator()
 
     def aggregate(  # type: ignore[override]
         self, results: Iterable[SmilesSampleResult]
@@ -302,58 +419,6 @@ class SmilesMetric(BaseMetric):
         Returns:
             SmilesAggregateResult with aggregated metrics.
         """
-        results_list = list(results)
-        sample_count = len(results_list)
-        if sample_count == 0:
-            return SmilesAggregateResult(
-                sample_count=0,
-                mean_tanimoto=0.0,
-                validity_rate=0.0,
-                inchi_equality_rate=0.0,
-                string_equality_rate=0.0,
-            )
-
-        mean_tanimoto = sum(r.tanimoto for r in results_list) / sample_count
-        validity_rate = sum(1 for r in results_list if r.valid) / sample_count
-        inchi_rate = sum(1 for r in results_list if r.inchi_equality) / sample_count
-        string_rate = sum(1 for r in results_list if r.string_equality) / sample_count
-
-        # Markush aggregates (only for samples that have them)
-        r_values = [r.r for r in results_list if r.r is not None]
-        m_values = [r.m for r in results_list if r.m is not None]
-        sg_values = [r.sg for r in results_list if r.sg is not None]
-        markush_results = [r for r in results_list if r.num_fragments_gt > 0]
-
-        return SmilesAggregateResult(
-            sample_count=sample_count,
-            mean_tanimoto=round(mean_tanimoto, 3),
-            validity_rate=round(validity_rate, 3),
-            inchi_equality_rate=round(inchi_rate, 3),
-            string_equality_rate=round(string_rate, 3),
-            mean_r=(round(sum(r_values) / len(r_values), 3) if r_values else None),
-            mean_m=(round(sum(m_values) / len(m_values), 3) if m_values else None),
-            mean_sg=(round(sum(sg_values) / len(sg_values), 3) if sg_values else None),
-            cxsmi_equality_rate=(
-                round(
-                    sum(1 for r in markush_results if r.cxsmi_equality)
-                    / len(markush_results),
-                    3,
-                )
-                if markush_results
-                else None
-            ),
-        )
-
-    def evaluate_dataset(  # type: ignore[override]
-        self, sample_pairs: Iterable[SmilesInputSample]
-    ) -> SmilesAggregateResult:
-        """Evaluate an entire dataset of SMILES samples.
-
-        Args:
-            sample_pairs: Iterable of input samples.
-
-        Returns:
-            SmilesAggregateResult with aggregated statistics.
-        """
-        results = [self.evaluate_sample(sample) for sample in sample_pairs]
-        return self.aggregate(results)
+        accumulator = self.create_accumulator()
+        accumulator.update_all(results)
+        return accumulator.finalize()
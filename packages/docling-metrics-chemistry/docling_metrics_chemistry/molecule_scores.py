@@ -15,6 +15,7 @@ from collections import defaultdict
 from typing import Any, Optional
 
 import numpy as np
+from docling_metrics_core.profiling import stage
 from rdkit import Chem, DataStructs, RDLogger
 from rdkit.Chem import rdFMCS, rdmolfiles
 
@@ -312,7 +313,8 @@ def compute_markush_prediction_quality(
         else:
             nb_atoms_found = []
             for predicted_fragment in predicted_fragments_current:
-                mcs = rdFMCS.FindMCS([predicted_fragment, gt_fragment], timeout=5)
+                with stage("chemistry.mcs"):
+                    mcs = rdFMCS.FindMCS([predicted_fragment, gt_fragment], timeout=5)
                 nb_atoms_found.append(mcs.numAtoms)
 
             selected_indices = [
@@ -475,7 +477,8 @@ def compute_markush_prediction_quality(
         for predicted_fragment, pred_frag_indices in zip(
             fragments_mapping[i_gt], fragments_indices_mapping[i_gt]
         ):
-            mcs = rdFMCS.FindMCS([predicted_fragment, gt_fragment], timeout=5)
+            with stage("chemistry.mcs"):
+                mcs = rdFMCS.FindMCS([predicted_fragment, gt_fragment], timeout=5)
             mcs_molecule = mcs.queryMol
             if mcs_molecule is None:
                 continue
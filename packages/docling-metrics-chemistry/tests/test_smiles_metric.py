@@ -1,6 +1,7 @@
 """Tests for the SMILES chemistry metric."""
 
 from docling_metrics_chemistry import (
+    SmilesAccumulator,
     SmilesInputSample,
     SmilesMetric,
 )
@@ -127,6 +128,50 @@ def test_aggregate_mixed_results() -> None:
     assert aggregate.mean_tanimoto == 0.5
 
 
+def test_merge_accumulators() -> None:
+    """Test that merging shard accumulators matches aggregating all results."""
+    metric = SmilesMetric()
+    data = [
+        SmilesInputSample(id="1", predicted_smiles="CCO", gt_smiles="CCO"),
+        SmilesInputSample(id="2", predicted_smiles="INVALID", gt_smiles="CCO"),
+        SmilesInputSample(id="3", predicted_smiles="CCN", gt_smiles="CCO"),
+        SmilesInputSample(
+            id="4",
+            predicted_smiles="[1*]C.[2*]C",
+            gt_smiles="[1*]C.[2*]C",
+            is_markush=True,
+        ),
+    ]
+    results = [metric.evaluate_sample(sample) for sample in data]
+
+    shard_a = metric.create_accumulator().update_all(results[:2])
+    shard_b = metric.create_accumulator().update_all(results[2:])
+    shard_b = SmilesAccumulator.model_validate_json(shard_b.model_dump_json())
+    shard_a.merge(shard_b)
+
+    assert shard_a.finalize() == metric.aggregate(results)
+    assert shard_a.finalize().sample_count == 4
+
+
+def test_evaluate_dataset_columnar() -> None:
+    """Test that the columnar evaluation keeps the result schema."""
+    metric = SmilesMetric()
+    data = [
+        SmilesInputSample(id="1", predicted_smiles="CCO", gt_smiles="CCO"),
+        SmilesInputSample(id="2", predicted_smiles="INVALID", gt_smiles="CCO"),
+        SmilesInputSample(id="3", predicted_smiles=None, gt_smiles="CCO"),
+    ]
+
+    sink = metric.evaluate_dataset_columnar(data)
+    columns = sink.to_numpy()
+
+    assert columns["id"].tolist() == ["1", "2", "3"]
+    results = [metric.evaluate_sample(s) for s in data]
+    assert columns["valid"].tolist() == [r.valid for r in results]
+    assert columns["tanimoto"].tolist() == [r.tanimoto for r in results]
+    assert list(sink.iter_results()) == results
+
+
 def test_markush_identical() -> None:
     """Test Markush evaluation with identical CXSMILES."""
     metric = SmilesMetric()
@@ -1,8 +1,34 @@
+import json
 from abc import ABC, abstractmethod
-from typing import Annotated, Iterable, Optional
+from functools import partial
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
 
 from pydantic import BaseModel, Field
 
+from docling_metrics_core.cache import ResultCache
+from docling_metrics_core.checkpoint import CheckpointStore, checkpointed_map
+from docling_metrics_core.evaluation import (
+    EvaluationConfig,
+    ExecutorKind,
+    batched,
+    call_in_worker,
+    init_metric_worker,
+    parallel_map,
+)
+
+if TYPE_CHECKING:
+    from docling_metrics_core.columnar import ColumnarResultSink
+
 
 class BaseInputSample(BaseModel):
     """Base class for input samples to metrics."""
@@ -31,24 +57,230 @@ class BaseAggregateResult(BaseModel):
     ]
 
 
+class BaseAccumulator(BaseModel, ABC):
+    """Mergeable running state of an aggregation.
+
+    An accumulator folds sample results one at a time with `update`, combines with
+    the accumulator of another shard with `merge` and produces the aggregate result
+    with `finalize`. Its memory footprint does not depend on the number of samples.
+    Being a pydantic model, it can be serialized to ship partial aggregates between
+    workers or machines.
+    """
+
+    sample_count: Annotated[
+        int, Field(description="Number of samples folded into this accumulator")
+    ] = 0
+
+    @abstractmethod
+    def update(self, result: BaseSampleResult) -> None:
+        """Fold a single sample result into the accumulator."""
+        ...
+
+    @abstractmethod
+    def merge(self, other: "BaseAccumulator") -> None:
+        """Fold the state of another accumulator of the same type into this one."""
+        ...
+
+    @abstractmethod
+    def finalize(self) -> BaseAggregateResult:
+        """Compute the aggregate result from the accumulated state."""
+        ...
+
+    def update_all(self, results: Iterable[BaseSampleResult]) -> "BaseAccumulator":
+        """Fold all the given sample results and return the accumulator itself."""
+        for result in results:
+            self.update(result)
+        return self
+
+
 class BaseMetric(ABC):
     """Abstract base class defining the interface for all metrics."""
 
+    # Type of the results of `evaluate_sample`, describes the columnar schema
+    sample_result_type: ClassVar[type[BaseSampleResult]] = BaseSampleResult
+
+    # Optional cache consulted by the metrics that decorate their evaluation with
+    # `cache.cached_sample_evaluation` or `cache.cached_batch_evaluation`
+    result_cache: Optional[ResultCache] = None
+
     @abstractmethod
     def evaluate_sample(self, sample: BaseInputSample) -> BaseSampleResult:
         """Evaluate a single sample pair."""
         ...
 
-    @abstractmethod
+    def evaluate_samples(
+        self, samples: Sequence[BaseInputSample]
+    ) -> list[BaseSampleResult]:
+        """Evaluate a batch of sample pairs and return the results in input order.
+
+        The default implementation calls `evaluate_sample` for each sample. Metrics
+        with native or vectorized backends override it to amortize the per-call
+        overhead across the batch.
+        """
+        return [self.evaluate_sample(sample) for sample in samples]
+
+    def create_accumulator(self) -> BaseAccumulator:
+        """Create an empty accumulator for the results of this metric."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support incremental aggregation"
+        )
+
     def aggregate(
         self, results: Iterable[BaseSampleResult]
     ) -> Optional[BaseAggregateResult]:
-        """Aggregate multiple sample results."""
-        ...
+        """Aggregate multiple sample results.
+
+        The default implementation folds the results into a fresh accumulator.
+        """
+        return self.create_accumulator().update_all(results).finalize()
+
+    def stream_sample_results(
+        self,
+        samples: Iterable[BaseInputSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+    ) -> Iterator[BaseSampleResult]:
+        """Lazily evaluate the samples and yield their results in input order.
+
+        The samples are pulled from the iterable on demand and fanned out over the
+        executor selected by `config`, keeping a bounded number of them in flight.
+        The PROCESS executor pickles the metric once per worker process. If
+        `config.batch_size` is set, every task evaluates a batch of samples.
+
+        If a `checkpoint` store is given, the samples whose id and content are
+        unchanged since they were last scored are not evaluated again, their stored
+        results are yielded instead. New results are written to the store.
+        """
+        if checkpoint is None:
+            return self._stream("evaluate_sample", "evaluate_samples", samples, config)
+        return checkpointed_map(
+            lambda misses: self._stream(
+                "evaluate_sample", "evaluate_samples", misses, config
+            ),
+            samples,
+            checkpoint,
+            self.result_namespace(),
+            self.sample_result_type,
+        )
+
+    def metric_config(self) -> dict[str, Any]:
+        """Return the configuration parameters the sample results depend on.
+
+        Metrics with such parameters override it, so that the checkpointed and
+        cached results of different configurations are told apart.
+        """
+        return {}
+
+    def result_namespace(self) -> str:
+        """Namespace of the results of this metric in a checkpoint store or cache.
+
+        Made of the qualified class name and the `metric_config`.
+        """
+        namespace = f"{type(self).__module__}.{type(self).__qualname__}"
+        config = self.metric_config()
+        if config:
+            namespace += json.dumps(config, sort_keys=True, default=str)
+        return namespace
+
+    def stream_sample_values(
+        self,
+        samples: Iterable[BaseInputSample],
+        config: Optional[EvaluationConfig] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Like `stream_sample_results`, but yield plain result values."""
+        return self._stream(
+            "evaluate_sample_values", "evaluate_samples_values", samples, config
+        )
+
+    def evaluate_sample_values(self, sample: BaseInputSample) -> dict[str, Any]:
+        """Evaluate a single sample pair into plain values.
+
+        The values are shaped like `sample_result_type`, with nested mappings for
+        nested models. Metrics override this to skip the instantiation of the
+        result model, which the default implementation dumps.
+        """
+        return self.evaluate_sample(sample).model_dump()
+
+    def evaluate_samples_values(
+        self, samples: Sequence[BaseInputSample]
+    ) -> list[dict[str, Any]]:
+        """Evaluate a batch of sample pairs into plain values."""
+        return [self.evaluate_sample_values(sample) for sample in samples]
+
+    def evaluate_dataset_columnar(
+        self,
+        samples: Iterable[BaseInputSample],
+        config: Optional[EvaluationConfig] = None,
+        sink: Optional["ColumnarResultSink"] = None,
+    ) -> "ColumnarResultSink":
+        """Evaluate a dataset into a columnar result sink.
+
+        The per-sample values are written straight into typed column buffers
+        without instantiating the result models. Requires numpy and pyarrow.
+
+        Args:
+            samples: The samples to evaluate.
+            config: Engine configuration.
+            sink: Sink to append to. Defaults to an in-memory sink for the
+                `sample_result_type` of the metric.
+
+        Returns:
+            The sink, closed and ready to be read.
+        """
+        from docling_metrics_core.columnar import ColumnarResultSink
+
+        if sink is None:
+            sink = ColumnarResultSink(self.sample_result_type)
+        with sink:
+            sink.extend(self.stream_sample_values(samples, config))
+        return sink
+
+    def _stream(
+        self,
+        sample_method: str,
+        batch_method: str,
+        samples: Iterable[BaseInputSample],
+        config: Optional[EvaluationConfig],
+    ) -> Iterator[Any]:
+        """Fan out `sample_method`, or `batch_method` on batches, over the samples."""
+        config = config or EvaluationConfig()
+        items: Iterable[Any] = samples
+        method = sample_method
+        if config.batch_size is not None:
+            items = batched(samples, config.batch_size)
+            method = batch_method
+
+        if config.executor == ExecutorKind.PROCESS:
+            outputs = parallel_map(
+                partial(call_in_worker, method),
+                items,
+                config,
+                initializer=init_metric_worker,
+                initargs=(self,),
+            )
+        else:
+            outputs = parallel_map(getattr(self, method), items, config)
+
+        if config.batch_size is not None:
+            return chain.from_iterable(outputs)
+        return outputs
 
-    @abstractmethod
     def evaluate_dataset(
-        self, samples: Iterable[BaseInputSample]
+        self,
+        samples: Iterable[BaseInputSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
     ) -> BaseAggregateResult:
-        """Evaluate an entire dataset."""
-        ...
+        """Evaluate an entire dataset.
+
+        The sample results are streamed into `aggregate` as they are produced,
+        so they are never materialized all together by the engine. With a
+        `checkpoint` store, an interrupted evaluation resumes where it stopped and
+        a re-run only scores the new and changed samples.
+        """
+        result = self.aggregate(self.stream_sample_results(samples, config, checkpoint))
+        if result is None:
+            raise NotImplementedError(
+                f"{type(self).__name__}.aggregate() does not produce a result"
+            )
+        return result
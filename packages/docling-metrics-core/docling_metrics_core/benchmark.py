@@ -0,0 +1,358 @@
+"""Benchmark harness shared by the metric packages.
+
+`run_benchmark` times the per-sample evaluations of a metric after a warm-up and
+over several repeats, and reports latency percentiles, throughput, the peak RSS
+of the run and the statistics of the stages the metric emits (see `profiling`). Reports are
+saved as JSON and compared against a stored baseline to flag slowdowns:
+
+    python -m docling_metrics_core.benchmark current.json baseline.json -t 0.1
+"""
+
+import argparse
+import math
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Iterator, Optional, Sequence, Union
+
+from pydantic import BaseModel, Field
+
+from docling_metrics_core.base_types import BaseInputSample, BaseMetric
+from docling_metrics_core.evaluation import batched
+from docling_metrics_core.profiling import (
+    HistogramCollector,
+    StageStatistics,
+    collecting,
+)
+
+
+class BenchmarkConfig(BaseModel):
+    """Configuration of a benchmark run."""
+
+    warmup: Annotated[
+        int, Field(ge=0, description="Untimed passes over the samples")
+    ] = 1
+    repeats: Annotated[
+        int, Field(ge=1, description="Timed passes over the samples")
+    ] = 5
+    batch_size: Annotated[
+        Optional[int],
+        Field(
+            ge=1,
+            description=(
+                "If set, the samples are timed in batches with `evaluate_samples` "
+                "and every sample of a batch gets the mean latency of the batch"
+            ),
+        ),
+    ] = None
+
+
+class LatencyStatistics(BaseModel):
+    """Per-sample latency statistics, in milliseconds."""
+
+    mean_ms: float
+    min_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class BenchmarkResult(BaseModel):
+    """Timings of one benchmarked metric and dataset."""
+
+    name: str
+    sample_count: int
+    repeats: int
+    latency: LatencyStatistics
+    throughput: Annotated[
+        float, Field(description="Samples per second, median over the repeats")
+    ]
+    peak_rss_mb: Annotated[
+        Optional[float],
+        Field(
+            description=(
+                "Peak resident set size of the process during the run, None where "
+                "the peak cannot be reset before the run (only Linux supports it)"
+            )
+        ),
+    ] = None
+    stages: dict[str, StageStatistics] = {}
+
+
+class BenchmarkReport(BaseModel):
+    """A set of benchmark results with the environment they were measured in."""
+
+    created_at: datetime = Field(default_factory=datetime.now)
+    python_version: str = Field(default_factory=platform.python_version)
+    platform: str = Field(default_factory=platform.platform)
+    results: dict[str, BenchmarkResult] = {}
+
+    def add(self, result: BenchmarkResult) -> None:
+        """Add or replace the result with the same name."""
+        self.results[result.name] = result
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the report as JSON."""
+        Path(path).write_text(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BenchmarkReport":
+        """Read a report written by `save`."""
+        return cls.model_validate_json(Path(path).read_text())
+
+
+class BenchmarkRegression(BaseModel):
+    """A value that got worse than its baseline beyond the threshold."""
+
+    name: str
+    measure: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change against the baseline, positive when slower."""
+        if self.measure == "throughput":
+            return self.baseline / self.current - 1
+        return self.current / self.baseline - 1
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} {self.measure}: {self.baseline:.4g} -> "
+            f"{self.current:.4g} ({self.change:+.1%})"
+        )
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the `q` quantile of sorted values with linear interpolation."""
+    if not sorted_values:
+        raise ValueError("No values")
+    position = q * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+
+
+def latency_statistics(latencies_ms: Sequence[float]) -> LatencyStatistics:
+    """Compute the latency statistics of the given samples."""
+    values = sorted(latencies_ms)
+    return LatencyStatistics(
+        mean_ms=sum(values) / len(values),
+        min_ms=values[0],
+        max_ms=values[-1],
+        p50_ms=percentile(values, 0.50),
+        p95_ms=percentile(values, 0.95),
+        p99_ms=percentile(values, 0.99),
+    )
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the peak resident set size of this process in MiB, if available."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kibibytes elsewhere
+    if sys.platform == "darwin":
+        return max_rss / (1 << 20)
+    return max_rss / (1 << 10)
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak resident set size of this process to its current size.
+
+    Only Linux supports it, through `/proc/self/clear_refs`.
+
+    Returns:
+        Whether the peak was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def run_benchmark(
+    name: str,
+    metric: BaseMetric,
+    samples: Sequence[BaseInputSample],
+    config: Optional[BenchmarkConfig] = None,
+) -> BenchmarkResult:
+    """Time the evaluation of `samples` by `metric`.
+
+    The warm-up passes are not timed. During the timed passes, the stages emitted
+    by the metric are collected in a histogram. The result cache of the metric,
+    if any, is bypassed for the whole run.
+
+    The peak RSS is the one of the run, warm-up included: the peak of the process
+    is reset when the run starts, so the runs of one process are measured
+    separately. Where it cannot be reset, the peak RSS is not reported.
+
+    Args:
+        name: Name of the result, used to match it against a baseline.
+        metric: The metric to benchmark.
+        samples: The samples evaluated in every pass.
+        config: Warm-up, repeats and batching of the run.
+
+    Returns:
+        The timings of the run.
+    """
+    config = config or BenchmarkConfig()
+    if not samples:
+        raise ValueError("Cannot benchmark an empty dataset")
+
+    latencies_ms: list[float] = []
+    throughputs: list[float] = []
+    histogram = HistogramCollector()
+    result_cache = metric.result_cache
+    metric.result_cache = None
+    peak_reset = reset_peak_rss()
+    try:
+        for _ in range(config.warmup):
+            _timed_pass(metric, samples, config.batch_size)
+
+        with collecting(histogram):
+            for _ in range(config.repeats):
+                pass_start = time.perf_counter_ns()
+                latencies_ms.extend(_timed_pass(metric, samples, config.batch_size))
+                pass_s = (time.perf_counter_ns() - pass_start) / 1e9
+                throughputs.append(len(samples) / pass_s if pass_s > 0 else math.inf)
+    finally:
+        metric.result_cache = result_cache
+
+    return BenchmarkResult(
+        name=name,
+        sample_count=len(samples),
+        repeats=config.repeats,
+        latency=latency_statistics(latencies_ms),
+        throughput=percentile(sorted(throughputs), 0.5),
+        peak_rss_mb=peak_rss_mb() if peak_reset else None,
+        stages=histogram.statistics(),
+    )
+
+
+def _timed_pass(
+    metric: BaseMetric,
+    samples: Sequence[BaseInputSample],
+    batch_size: Optional[int],
+) -> list[float]:
+    """Evaluate all the samples once and return their latencies in milliseconds."""
+    latencies_ms: list[float] = []
+    if batch_size is None:
+        for sample in samples:
+            start = time.perf_counter_ns()
+            metric.evaluate_sample(sample)
+            latencies_ms.append((time.perf_counter_ns() - start) / 1e6)
+        return latencies_ms
+
+    for batch in batched(samples, batch_size):
+        start = time.perf_counter_ns()
+        metric.evaluate_samples(batch)
+        batch_ms = (time.perf_counter_ns() - start) / 1e6
+        latencies_ms.extend([batch_ms / len(batch)] * len(batch))
+    return latencies_ms
+
+
+def compare_reports(
+    current: BenchmarkReport,
+    baseline: BenchmarkReport,
+    threshold: float = 0.1,
+) -> list[BenchmarkRegression]:
+    """Flag the results that are slower than their baseline beyond `threshold`.
+
+    The p50 and p95 latencies and the throughput of the results present in both
+    reports are compared. A relative slowdown above `threshold` is a regression.
+    """
+    regressions: list[BenchmarkRegression] = []
+    for name, result in current.results.items():
+        baseline_result = baseline.results.get(name)
+        if baseline_result is None:
+            continue
+        measures = {
+            "p50_ms": (baseline_result.latency.p50_ms, result.latency.p50_ms),
+            "p95_ms": (baseline_result.latency.p95_ms, result.latency.p95_ms),
+            "throughput": (baseline_result.throughput, result.throughput),
+        }
+        for measure, (baseline_value, current_value) in measures.items():
+            if baseline_value <= 0 or current_value <= 0:
+                continue
+            regression = BenchmarkRegression(
+                name=name,
+                measure=measure,
+                baseline=baseline_value,
+                current=current_value,
+            )
+            if regression.change > threshold:
+                regressions.append(regression)
+    return regressions
+
+
+def synthetic_token_pairs(
+    count: int,
+    length: int,
+    error_rate: float = 0.1,
+    vocabulary_size: int = 1000,
+    seed: int = 0,
+) -> Iterator[tuple[list[str], list[str]]]:
+    """Generate reproducible pairs of token sequences of controlled size.
+
+    The first sequence of a pair has `length` tokens drawn from a vocabulary of
+    `vocabulary_size` words. The second one is a copy where every token is
+    substituted, deleted or followed by an inserted token with a total
+    probability of `error_rate`.
+    """
+    if not 0 <= error_rate <= 1:
+        raise ValueError("error_rate must be in [0, 1]")
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(vocabulary_size)]
+    for _ in range(count):
+        tokens_a = rng.choices(vocabulary, k=length)
+        tokens_b: list[str] = []
+        for token in tokens_a:
+            draw = rng.random()
+            if draw >= error_rate:
+                tokens_b.append(token)
+            elif draw < error_rate / 3:
+                tokens_b.append(rng.choice(vocabulary))
+            elif draw >= 2 * error_rate / 3:
+                tokens_b.extend([token, rng.choice(vocabulary)])
+        yield tokens_a, tokens_b
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare a benchmark report against a baseline"
+    )
+    parser.add_argument("current", type=Path, help="Benchmark report to check")
+    parser.add_argument("baseline", type=Path, help="Baseline benchmark report")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown flagged as a regression (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    regressions = compare_reports(
+        BenchmarkReport.load(args.current),
+        BenchmarkReport.load(args.baseline),
+        args.threshold,
+    )
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Content-addressed cache of per-sample results shared across metrics and runs."""
+
+import functools
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, TypeVar, Union
+
+from docling_metrics_core.hashing import cache_key
+
+if TYPE_CHECKING:
+    from docling_metrics_core.base_types import (
+        BaseInputSample,
+        BaseMetric,
+        BaseSampleResult,
+    )
+
+M = TypeVar("M", bound="BaseMetric")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+
+class ResultCache:
+    """Two-tier cache of serialized sample results.
+
+    The memory tier keeps the `memory_size` most recently used results. The
+    optional disk tier is a SQLite file that persists across runs and is shared by
+    all the metrics and processes using the same path. When its results exceed
+    `disk_max_bytes`, the least recently used ones are evicted.
+
+    The keys are content addresses built by `hashing.cache_key`, so results can be
+    shared safely between metrics, configurations and datasets. The cache is
+    thread-safe. When a metric is shipped to worker processes, every worker opens
+    the disk tier again and starts with an empty memory tier and zero counters.
+    """
+
+    # Process-local state, rebuilt by `_init_state` after unpickling
+    _lock: threading.Lock
+    _memory: OrderedDict[str, str]
+    _connection: Optional[sqlite3.Connection]
+
+    def __init__(
+        self,
+        memory_size: int = 4096,
+        disk_path: Optional[Union[str, Path]] = None,
+        disk_max_bytes: int = 1 << 30,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            memory_size: Number of results kept in memory, 0 disables the tier.
+            disk_path: Optional SQLite file of the persistent tier.
+            disk_max_bytes: Size budget of the UTF-8 encoded results stored on disk.
+        """
+        if memory_size < 0:
+            raise ValueError("memory_size must not be negative")
+        if disk_max_bytes < 1:
+            raise ValueError("disk_max_bytes must be positive")
+
+        self._memory_size = memory_size
+        self._disk_path = None if disk_path is None else Path(disk_path)
+        self._disk_max_bytes = disk_max_bytes
+        self._init_state()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "memory_size": self._memory_size,
+            "disk_path": self._disk_path,
+            "disk_max_bytes": self._disk_max_bytes,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._memory_size = state["memory_size"]
+        self._disk_path = state["disk_path"]
+        self._disk_max_bytes = state["disk_max_bytes"]
+        self._init_state()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the serialized result stored under `key`, None if missing."""
+        with self._lock:
+            value = self._memory.pop(key, None)
+            if value is not None:
+                self._memory[key] = value
+                self._memory_hits += 1
+                return value
+
+            value = self._disk_get(key)
+            if value is not None:
+                self._memory_put(key, value)
+                self._disk_hits += 1
+                return value
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a serialized result in both tiers."""
+        with self._lock:
+            self._memory_put(key, value)
+            self._disk_put(key, value)
+
+    def clear(self) -> None:
+        """Remove all the results from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM results")
+                self._disk_bytes = 0
+
+    def counters(self) -> dict[str, int]:
+        """Return the hit and miss counters and the size of the tiers."""
+        with self._lock:
+            return {
+                "hits": self._memory_hits + self._disk_hits,
+                "misses": self._misses,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "cache_size": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _init_state(self) -> None:
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+
+        # Performance counters
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._connection = None
+        self._disk_bytes = 0
+        if self._disk_path is not None:
+            self._connection = sqlite3.connect(
+                self._disk_path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            row = self._connection.execute("SELECT SUM(size) FROM results").fetchone()
+            self._disk_bytes = row[0] or 0
+
+    def _memory_put(self, key: str, value: str) -> None:
+        if self._memory_size == 0:
+            return
+        self._memory.pop(key, None)
+        self._memory[key] = value
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT result FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._connection.execute(
+            "UPDATE results SET last_access = ? WHERE key = ?", (time.time_ns(), key)
+        )
+        return row[0]
+
+    def _disk_put(self, key: str, value: str) -> None:
+        if self._connection is None:
+            return
+        # The JSON of the results may hold non-ASCII text unescaped
+        size = len(value.encode("utf-8"))
+        if size > self._disk_max_bytes:
+            return
+        row = self._connection.execute(
+            "SELECT size FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, value, size, time.time_ns()),
+        )
+        self._disk_bytes += size - (0 if row is None else row[0])
+        if self._disk_bytes > self._disk_max_bytes:
+            # Other processes may write to the same file, hence the total is re-read
+            row = self._connection.execute("SELECT SUM(size) FROM results").fetchone()
+            self._disk_bytes = row[0] or 0
+            self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        """Delete the least recently used results until they fit the budget."""
+        assert self._connection is not None
+        excess = self._disk_bytes - self._disk_max_bytes
+        evicted: list[tuple[str]] = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM results ORDER BY last_access"
+        ):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+            self._disk_bytes -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+
+def cached_sample_evaluation(
+    evaluate_sample: Callable[[M, "BaseInputSample"], "BaseSampleResult"],
+) -> Callable[[M, "BaseInputSample"], "BaseSampleResult"]:
+    """Decorate `BaseMetric.evaluate_sample` to consult the `result_cache` of the metric.
+
+    The result of a sample is looked up by the metric config and the content hash
+    of the sample, and it is only computed on a miss.
+    """
+
+    @functools.wraps(evaluate_sample)
+    def wrapper(self: M, sample: "BaseInputSample") -> "BaseSampleResult":
+        cache = self.result_cache
+        if cache is None:
+            return evaluate_sample(self, sample)
+
+        key = cache_key(self.result_namespace(), sample)
+        cached = cache.get(key)
+        if cached is not None:
+            return self.sample_result_type.model_validate_json(cached)
+
+        result = evaluate_sample(self, sample)
+        cache.set(key, result.model_dump_json())
+        return result
+
+    return wrapper
+
+
+def cached_batch_evaluation(
+    evaluate_samples: Callable[[M, Sequence["BaseInputSample"]], list[Any]],
+) -> Callable[[M, Sequence["BaseInputSample"]], list[Any]]:
+    """Decorate `BaseMetric.evaluate_samples` to consult the `result_cache` of the metric.
+
+    Only the samples missing from the cache are passed on, as one batch, to the
+    decorated method.
+    """
+
+    @functools.wraps(evaluate_samples)
+    def wrapper(self: M, samples: Sequence["BaseInputSample"]) -> list[Any]:
+        cache = self.result_cache
+        if cache is None:
+            return evaluate_samples(self, samples)
+
+        namespace = self.result_namespace()
+        keys = [cache_key(namespace, sample) for sample in samples]
+        results: list[Any] = []
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is None:
+                results.append(None)
+                missing.append(i)
+            else:
+                results.append(self.sample_result_type.model_validate_json(cached))
+
+        if missing:
+            fresh = evaluate_samples(self, [samples[i] for i in missing])
+            for i, result in zip(missing, fresh):
+                cache.set(keys[i], result.model_dump_json())
+                results[i] = result
+        return results
+
+    return wrapper
@@ -0,0 +1,203 @@
+"""On-disk store of per-sample results to resume interrupted dataset evaluations."""
+
+import sqlite3
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+from pydantic import BaseModel
+
+from docling_metrics_core.hashing import content_hash
+
+S = TypeVar("S", bound=BaseModel)
+R = TypeVar("R", bound=BaseModel)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    sample_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (namespace, sample_id)
+)
+"""
+
+
+class CheckpointStore:
+    """SQLite store of serialized sample results.
+
+    Every result is keyed by a namespace, usually the metric, and the sample id. It
+    is stored together with the content hash of the evaluated sample, so a result
+    is only reused as long as the sample did not change. Writes are committed every
+    `commit_interval` results, hence an interruption loses at most that many.
+
+    The store must be used from the thread that created it.
+    """
+
+    def __init__(self, path: Union[str, Path], commit_interval: int = 100) -> None:
+        """Open or create the store.
+
+        Args:
+            path: SQLite database file.
+            commit_interval: Number of writes grouped in one transaction.
+        """
+        if commit_interval < 1:
+            raise ValueError("commit_interval must be positive")
+
+        self._path = Path(path)
+        self._commit_interval = commit_interval
+        self._pending = 0
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    @property
+    def path(self) -> Path:
+        """The SQLite database file."""
+        return self._path
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def count(self, namespace: str) -> int:
+        """Return the number of results stored under `namespace`."""
+        row = self._connection.execute(
+            "SELECT COUNT(*) FROM results WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0]
+
+    def contains(self, namespace: str, sample_id: str, sample_hash: str) -> bool:
+        """Check whether an up-to-date result of the sample is stored."""
+        return self.get(namespace, sample_id, sample_hash) is not None
+
+    def get(self, namespace: str, sample_id: str, sample_hash: str) -> Optional[str]:
+        """Return the serialized result of the sample, None if missing or stale."""
+        row = self._connection.execute(
+            "SELECT result FROM results "
+            "WHERE namespace = ? AND sample_id = ? AND content_hash = ?",
+            (namespace, sample_id, sample_hash),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(
+        self, namespace: str, sample_id: str, sample_hash: str, result: str
+    ) -> None:
+        """Store the serialized result of the sample, replacing an older one."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (namespace, sample_id, sample_hash, result),
+        )
+        self._pending += 1
+        if self._pending >= self._commit_interval:
+            self.commit()
+
+    def clear(self, namespace: str) -> None:
+        """Remove all the results stored under `namespace`."""
+        self._connection.execute(
+            "DELETE FROM results WHERE namespace = ?", (namespace,)
+        )
+        self.commit()
+
+    def commit(self) -> None:
+        """Persist the pending writes."""
+        self._connection.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commit the pending writes and close the database."""
+        self.commit()
+        self._connection.close()
+
+
+def checkpointed_map(
+    evaluate: Callable[[Iterable[S]], Iterator[R]],
+    samples: Iterable[S],
+    store: CheckpointStore,
+    namespace: str,
+    result_type: type[R],
+    sample_id: Callable[[S], str] = lambda sample: sample.id,  # type: ignore[attr-defined]
+    max_lookahead: int = 1000,
+) -> Iterator[R]:
+    """Evaluate only the samples without an up-to-date result in `store`.
+
+    The samples whose id and content hash match a stored result are skipped, the
+    others are passed lazily to `evaluate` and their results are stored. All the
+    results are yielded in input order.
+
+    While no sample is being evaluated, the stored results are yielded as soon as
+    they are read. Behind an evaluated sample, at most `max_lookahead` stored
+    results in a row are held back; past that, the current `evaluate` stream is
+    drained and a new one is started at the next missing sample.
+
+    Args:
+        evaluate: Maps an iterable of samples to their results in the same order,
+            for example a parallel stream of the evaluation engine.
+        samples: The samples to evaluate.
+        store: The checkpoint store.
+        namespace: Namespace of the results in the store.
+        result_type: Model used to deserialize the stored results.
+        sample_id: Returns the id a sample is stored under.
+        max_lookahead: Maximum number of consecutive stored results held back
+            behind an evaluated sample.
+
+    Yields:
+        The result of every sample, in the order of `samples`.
+    """
+    if max_lookahead < 1:
+        raise ValueError("max_lookahead must be positive")
+
+    remaining = iter(samples)
+    # (sample id, content hash, stored result or None when evaluated) of the
+    # samples read behind an evaluated one, whose result was not yielded yet
+    plan: deque[tuple[str, str, Optional[str]]] = deque()
+
+    def lookup(sample: S) -> tuple[str, str, Optional[str]]:
+        key = sample_id(sample)
+        sample_hash = content_hash(sample)
+        return key, sample_hash, store.get(namespace, key, sample_hash)
+
+    def misses(first: S) -> Iterator[S]:
+        yield first
+        hits = 0
+        for sample in remaining:
+            entry = lookup(sample)
+            plan.append(entry)
+            if entry[2] is None:
+                hits = 0
+                yield sample
+            else:
+                hits += 1
+                if hits >= max_lookahead:
+                    return
+
+    def drain_hits() -> Iterator[R]:
+        while plan:
+            stored = plan[0][2]
+            if stored is None:
+                return
+            plan.popleft()
+            yield result_type.model_validate_json(stored)
+
+    try:
+        while True:
+            for sample in remaining:
+                entry = lookup(sample)
+                if entry[2] is None:
+                    plan.append(entry)
+                    break
+                yield result_type.model_validate_json(entry[2])
+            else:
+                return
+
+            for result in evaluate(misses(sample)):
+                yield from drain_hits()
+                key, sample_hash, _ = plan.popleft()
+                store.put(namespace, key, sample_hash, result.model_dump_json())
+                yield result
+            yield from drain_hits()
+    finally:
+        store.commit()
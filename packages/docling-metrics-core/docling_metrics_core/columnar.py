@@ -0,0 +1,339 @@
+"""Columnar sink that stores per-sample results in typed NumPy/Arrow buffers.
+
+Requires the optional dependencies of the `columnar` extra (numpy, pyarrow).
+"""
+
+import types
+from enum import Enum
+from pathlib import Path
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "The columnar result sink requires numpy and pyarrow. "
+        "Install them with `pip install docling-metrics-core[columnar]`"
+    ) from exc
+
+
+class ColumnKind(str, Enum):
+    """Physical type of a result column."""
+
+    FLOAT = "float"
+    INT = "int"
+    BOOL = "bool"
+    STRING = "string"
+
+
+_NUMPY_DTYPES: dict[ColumnKind, Any] = {
+    ColumnKind.FLOAT: np.float64,
+    ColumnKind.INT: np.int64,
+    ColumnKind.BOOL: np.bool_,
+    ColumnKind.STRING: object,
+}
+
+_ARROW_TYPES: dict[ColumnKind, Any] = {
+    ColumnKind.FLOAT: pa.float64(),
+    ColumnKind.INT: pa.int64(),
+    ColumnKind.BOOL: pa.bool_(),
+    ColumnKind.STRING: pa.string(),
+}
+
+_SCALAR_KINDS: dict[type, ColumnKind] = {
+    float: ColumnKind.FLOAT,
+    int: ColumnKind.INT,
+    bool: ColumnKind.BOOL,
+    str: ColumnKind.STRING,
+}
+
+
+class ColumnSpec(BaseModel):
+    """A flat column derived from a field of a result model."""
+
+    name: str
+    path: tuple[str, ...]
+    kind: ColumnKind
+    nullable: bool
+    # Presence marker of an Optional nested model, the model fields follow it
+    is_presence: bool = False
+
+
+def _unwrap_optional(annotation: Any) -> tuple[Any, bool]:
+    """Return the annotation without `None` and whether `None` was allowed."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], len(args) < len(get_args(annotation))
+    return annotation, False
+
+
+def result_columns(
+    result_type: type[BaseModel],
+    prefix: tuple[str, ...] = (),
+    nullable: bool = False,
+) -> list[ColumnSpec]:
+    """Derive the flat column schema of a result model.
+
+    Scalar fields map to one column each. Nested models are flattened into dotted
+    column names. An Optional nested model gets an additional boolean presence
+    column named after the field.
+
+    Raises:
+        TypeError: If a field has a type that cannot be stored in a column.
+    """
+    columns: list[ColumnSpec] = []
+    for field_name, field_info in result_type.model_fields.items():
+        path = prefix + (field_name,)
+        annotation, optional = _unwrap_optional(field_info.annotation)
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            if optional:
+                columns.append(
+                    ColumnSpec(
+                        name=".".join(path),
+                        path=path,
+                        kind=ColumnKind.BOOL,
+                        nullable=nullable,
+                        is_presence=True,
+                    )
+                )
+            columns.extend(
+                result_columns(annotation, path, nullable=nullable or optional)
+            )
+        elif annotation in _SCALAR_KINDS:
+            columns.append(
+                ColumnSpec(
+                    name=".".join(path),
+                    path=path,
+                    kind=_SCALAR_KINDS[annotation],
+                    nullable=nullable or optional,
+                )
+            )
+        else:
+            raise TypeError(
+                f"Field '{'.'.join(path)}' of {result_type.__name__} has the "
+                f"unsupported type {field_info.annotation} for a columnar sink"
+            )
+    return columns
+
+
+def _lookup(values: Mapping[str, Any], path: tuple[str, ...]) -> Any:
+    """Return the value at `path` of nested mappings, None if any level is missing."""
+    value: Any = values
+    for key in path:
+        if value is None:
+            return None
+        value = value.get(key)
+    return value
+
+
+class ColumnarResultSink:
+    """Collect per-sample results into typed column buffers.
+
+    The rows are plain mappings shaped like the result model (nested mappings for
+    nested models), so no pydantic model is instantiated per sample. Full buffers
+    are converted to Arrow record batches, which are kept in memory or, if
+    `spill_path` is set, appended to a Parquet file.
+    """
+
+    def __init__(
+        self,
+        result_type: type[BaseModel],
+        chunk_size: int = 65536,
+        spill_path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            result_type: Result model whose schema is stored in the columns.
+            chunk_size: Number of rows buffered before converting them to Arrow.
+            spill_path: Optional Parquet file the full chunks are written to.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self._result_type = result_type
+        self._chunk_size = chunk_size
+        self._spill_path = spill_path
+        self._columns = result_columns(result_type)
+        self._schema = pa.schema(
+            [
+                pa.field(column.name, _ARROW_TYPES[column.kind], column.nullable)
+                for column in self._columns
+            ]
+        )
+
+        self._batches: list[pa.RecordBatch] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._num_rows = 0
+        self._closed = False
+        # Per-column values and validity of the buffered rows
+        self._data: list[np.ndarray] = []
+        self._valid: list[np.ndarray] = []
+        self._buffered = 0
+        self._reset_buffers()
+
+    @property
+    def columns(self) -> list[ColumnSpec]:
+        """The flat column schema."""
+        return self._columns
+
+    @property
+    def schema(self) -> pa.Schema:
+        """The Arrow schema of the stored results."""
+        return self._schema
+
+    def __len__(self) -> int:
+        return self._num_rows + self._buffered
+
+    def __enter__(self) -> "ColumnarResultSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def append(self, values: Mapping[str, Any]) -> None:
+        """Append the values of one result, shaped like the result model."""
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed sink")
+
+        row = self._buffered
+        for column, data, valid in zip(self._columns, self._data, self._valid):
+            value = _lookup(values, column.path)
+            if column.is_presence:
+                value = value is not None
+            if value is None:
+                if not column.nullable:
+                    raise ValueError(f"Missing value for column '{column.name}'")
+                valid[row] = False
+            else:
+                data[row] = value
+                valid[row] = True
+        self._buffered += 1
+
+        if self._buffered == self._chunk_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Append the values of many results."""
+        for values in rows:
+            self.append(values)
+
+    def append_result(self, result: BaseModel) -> None:
+        """Append an already instantiated result model."""
+        self.append(result.model_dump())
+
+    def flush(self) -> None:
+        """Convert the buffered rows to an Arrow batch and spill it if configured."""
+        if self._buffered == 0:
+            return
+
+        n = self._buffered
+        arrays = [
+            pa.array(
+                data[:n],
+                type=_ARROW_TYPES[column.kind],
+                mask=~valid[:n] if column.nullable else None,
+            )
+            for column, data, valid in zip(self._columns, self._data, self._valid)
+        ]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+        if self._spill_path is not None:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._spill_path, self._schema)
+            self._writer.write_batch(batch)
+        else:
+            self._batches.append(batch)
+
+        self._num_rows += n
+        self._reset_buffers()
+
+    def close(self) -> None:
+        """Flush the remaining rows and finalize the Parquet file, if any."""
+        if self._closed:
+            return
+        self.flush()
+        if self._spill_path is not None:
+            if self._writer is None:
+                # Write an empty file that still carries the schema
+                self._writer = pq.ParquetWriter(self._spill_path, self._schema)
+            self._writer.close()
+        self._closed = True
+
+    def to_arrow(self) -> pa.Table:
+        """Return all the results as an Arrow table. Closes the sink."""
+        self.close()
+        if self._spill_path is not None:
+            return pq.read_table(self._spill_path, schema=self._schema)
+        return pa.Table.from_batches(self._batches, schema=self._schema)
+
+    def to_numpy(self) -> dict[str, np.ndarray]:
+        """Return one NumPy array per column. Closes the sink.
+
+        Nulls are NaN in the float columns and None in the others.
+        """
+        table = self.to_arrow()
+        return {
+            name: table.column(name).to_numpy(zero_copy_only=False)
+            for name in table.column_names
+        }
+
+    def iter_results(self) -> Iterator[BaseModel]:
+        """Lazily rebuild the result models from the stored columns. Closes the sink."""
+        self.close()
+        if self._spill_path is not None:
+            batches: Iterable[pa.RecordBatch] = pq.ParquetFile(
+                self._spill_path
+            ).iter_batches()
+        else:
+            batches = self._batches
+        for batch in batches:
+            for flat_row in batch.to_pylist():
+                yield self._result_type.model_validate(self._unflatten(flat_row))
+
+    def _unflatten(self, flat_row: dict[str, Any]) -> dict[str, Any]:
+        """Rebuild the nested mapping of a result from a flat row."""
+        values: dict[str, Any] = {}
+        absent: list[tuple[str, ...]] = []
+        for column in self._columns:
+            value = flat_row[column.name]
+            if column.is_presence:
+                if not value:
+                    absent.append(column.path)
+                continue
+            if any(column.path[: len(path)] == path for path in absent):
+                continue
+            parent = values
+            for key in column.path[:-1]:
+                parent = parent.setdefault(key, {})
+            parent[column.path[-1]] = value
+        for path in absent:
+            parent = values
+            for key in path[:-1]:
+                parent = parent.setdefault(key, {})
+            parent[path[-1]] = None
+        return values
+
+    def _reset_buffers(self) -> None:
+        self._data = [
+            np.empty(self._chunk_size, dtype=_NUMPY_DTYPES[column.kind])
+            for column in self._columns
+        ]
+        self._valid = [
+            np.zeros(self._chunk_size, dtype=np.bool_) for _ in self._columns
+        ]
+        self._buffered = 0
@@ -0,0 +1,160 @@
+"""Streaming, parallel execution of per-sample evaluations."""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from itertools import islice
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ExecutorKind(str, Enum):
+    """Execution backend used to evaluate the samples of a dataset."""
+
+    SERIAL = "serial"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class EvaluationConfig(BaseModel):
+    """Configuration of the dataset evaluation engine."""
+
+    executor: Annotated[
+        ExecutorKind,
+        Field(description="Backend used to fan out the per-sample evaluations"),
+    ] = ExecutorKind.SERIAL
+    max_workers: Annotated[
+        Optional[int],
+        Field(
+            ge=1,
+            description="Number of pool workers. Defaults to the number of CPUs",
+        ),
+    ] = None
+    max_in_flight: Annotated[
+        Optional[int],
+        Field(
+            ge=1,
+            description=(
+                "Upper bound of submitted but not yet collected tasks. "
+                "Defaults to twice the number of workers"
+            ),
+        ),
+    ] = None
+    batch_size: Annotated[
+        Optional[int],
+        Field(
+            ge=1,
+            description=(
+                "If set, the samples are grouped in batches of this size and every "
+                "task evaluates a whole batch with `evaluate_samples`"
+            ),
+        ),
+    ] = None
+
+    def resolved_max_workers(self) -> int:
+        """Return the number of workers, falling back to the CPU count."""
+        if self.executor == ExecutorKind.SERIAL:
+            return 1
+        return self.max_workers or os.cpu_count() or 1
+
+    def resolved_max_in_flight(self) -> int:
+        """Return the bound of pending tasks, falling back to 2 x workers."""
+        return self.max_in_flight or 2 * self.resolved_max_workers()
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """Lazily group `items` in lists of `batch_size` elements, the last may be shorter."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def parallel_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    config: Optional[EvaluationConfig] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: tuple = (),
+) -> Generator[R, None, None]:
+    """Lazily apply `fn` to `items` and yield the results in input order.
+
+    Items are pulled from `items` only when there is room in the pool, so at most
+    `config.max_in_flight` items and results are held in memory at any time.
+    Closing the generator early cancels the pending items and shuts the pool down.
+
+    Args:
+        fn: Function applied to every item. Must be picklable for PROCESS.
+        items: Iterable of inputs. It is consumed lazily.
+        config: Engine configuration. Defaults to serial execution.
+        initializer: Optional callable executed once in every worker before `fn`.
+        initargs: Arguments passed to `initializer`.
+
+    Yields:
+        The result of `fn` for each item, in the order of `items`.
+    """
+    config = config or EvaluationConfig()
+
+    if config.executor == ExecutorKind.SERIAL:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield fn(item)
+        return
+
+    max_workers = config.resolved_max_workers()
+    max_in_flight = config.resolved_max_in_flight()
+
+    executor: Executor
+    if config.executor == ExecutorKind.THREAD:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+
+    pending: deque[Future] = deque()
+    try:
+        for item in items:
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+# Metric instance of the current worker process, set by `init_metric_worker`
+_worker_metric: Any = None
+
+
+def init_metric_worker(metric: Any) -> None:
+    """Pool initializer that installs the metric once per worker process."""
+    global _worker_metric
+    _worker_metric = metric
+
+
+def call_in_worker(method: str, arg: Any) -> Any:
+    """Call `method` of the metric installed by `init_metric_worker` with `arg`.
+
+    Bind the method name with `functools.partial` to obtain a picklable task.
+    """
+    return getattr(_worker_metric, method)(arg)
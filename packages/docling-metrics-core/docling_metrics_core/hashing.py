@@ -0,0 +1,29 @@
+"""Stable content hashes of pydantic models."""
+
+import hashlib
+
+from pydantic import BaseModel
+
+
+def content_hash(model: BaseModel) -> str:
+    """Return the SHA-256 hex digest of the JSON serialization of `model`.
+
+    The serialization follows the field order of the model, so equal models of the
+    same type always produce the same digest across processes and runs.
+    """
+    return hashlib.sha256(model.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def cache_key(namespace: str, sample: BaseModel) -> str:
+    """Return the content address of the result of `sample` within `namespace`.
+
+    The namespace identifies the metric and its configuration, see
+    `BaseMetric.result_namespace`.
+    """
+    digest = hashlib.sha256()
+    digest.update(namespace.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(type(sample).__qualname__.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(sample.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,295 @@
+"""Named stage spans and pluggable collectors of their timings.
+
+The metrics wrap their expensive stages with `stage`:
+
+    with stage("text.tokenize", samples=len(samples)):
+        ...
+
+As long as no collector is registered, `stage` returns a shared no-op context
+manager, so the instrumentation costs a global lookup and a call. Register
+collectors with `collecting`, or `add_collector` and `remove_collector`, to
+receive a `StageSpan` for every completed stage.
+
+The collectors are registered per process. Spans emitted in the workers of a
+PROCESS executor are only collected by collectors registered in the workers.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO, Union
+
+from pydantic import BaseModel
+
+
+class StageSpan(BaseModel):
+    """Timing of one completed stage."""
+
+    name: str
+    parent: Optional[str] = None
+    start_ns: int  # Wall clock start, in nanoseconds since the epoch
+    duration_ns: int
+    process_id: int
+    thread_id: int
+    attributes: dict[str, Any] = {}
+
+
+class BaseSpanCollector(ABC):
+    """Receives the spans of the completed stages.
+
+    `collect` may be called concurrently from several threads.
+    """
+
+    @abstractmethod
+    def collect(self, span: StageSpan) -> None:
+        """Record a completed span."""
+        ...
+
+    def close(self) -> None:
+        """Release the resources of the collector."""
+
+
+class StageStatistics(BaseModel):
+    """Duration statistics of a stage, in milliseconds."""
+
+    count: int
+    total_ms: float
+    mean_ms: float
+    min_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class HistogramCollector(BaseSpanCollector):
+    """Aggregate the span durations of every stage in an in-memory histogram.
+
+    The durations are counted in logarithmic buckets, `buckets_per_octave` per
+    doubling, so the memory does not grow with the number of spans. The quantiles
+    are the upper bounds of their buckets, accurate to a factor of
+    2 ** (1 / buckets_per_octave).
+    """
+
+    def __init__(self, buckets_per_octave: int = 8) -> None:
+        if buckets_per_octave < 1:
+            raise ValueError("buckets_per_octave must be positive")
+        self._buckets_per_octave = buckets_per_octave
+        self._lock = threading.Lock()
+        self._buckets: dict[str, dict[int, int]] = {}
+        self._count: dict[str, int] = {}
+        self._total_ns: dict[str, int] = {}
+        self._min_ns: dict[str, int] = {}
+        self._max_ns: dict[str, int] = {}
+
+    def collect(self, span: StageSpan) -> None:
+        duration_ns = max(span.duration_ns, 1)
+        bucket = math.ceil(math.log2(duration_ns) * self._buckets_per_octave)
+        with self._lock:
+            name = span.name
+            buckets = self._buckets.setdefault(name, {})
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            self._count[name] = self._count.get(name, 0) + 1
+            self._total_ns[name] = self._total_ns.get(name, 0) + span.duration_ns
+            self._min_ns[name] = min(self._min_ns.get(name, duration_ns), duration_ns)
+            self._max_ns[name] = max(self._max_ns.get(name, duration_ns), duration_ns)
+
+    def stages(self) -> list[str]:
+        """Return the names of the collected stages."""
+        with self._lock:
+            return sorted(self._count)
+
+    def quantile(self, name: str, q: float) -> float:
+        """Return the `q` quantile of the durations of stage `name`, in milliseconds."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        with self._lock:
+            buckets = self._buckets[name]
+            rank = q * self._count[name]
+            seen = 0
+            for bucket in sorted(buckets):
+                seen += buckets[bucket]
+                if seen >= rank:
+                    break
+            upper_ns = 2 ** (bucket / self._buckets_per_octave)
+            return min(upper_ns, self._max_ns[name]) / 1e6
+
+    def statistics(self) -> dict[str, StageStatistics]:
+        """Return the statistics of every collected stage."""
+        summary: dict[str, StageStatistics] = {}
+        for name in self.stages():
+            with self._lock:
+                count = self._count[name]
+                total_ms = self._total_ns[name] / 1e6
+                min_ms = self._min_ns[name] / 1e6
+                max_ms = self._max_ns[name] / 1e6
+            summary[name] = StageStatistics(
+                count=count,
+                total_ms=total_ms,
+                mean_ms=total_ms / count,
+                min_ms=min_ms,
+                max_ms=max_ms,
+                p50_ms=self.quantile(name, 0.50),
+                p95_ms=self.quantile(name, 0.95),
+                p99_ms=self.quantile(name, 0.99),
+            )
+        return summary
+
+
+class JsonLinesCollector(BaseSpanCollector):
+    """Append every span as one JSON line to a file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._lock = threading.Lock()
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+
+    def collect(self, span: StageSpan) -> None:
+        line = span.model_dump_json() + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetryCollector(BaseSpanCollector):
+    """Forward the spans to an OpenTelemetry tracer.
+
+    Requires the `opentelemetry-api` package. The spans keep their measured start
+    and end times, and their attributes become span attributes.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """Initialize the collector.
+
+        Args:
+            tracer: OpenTelemetry tracer. Defaults to the tracer of this module
+                from the global tracer provider.
+        """
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as exc:
+                raise ImportError(
+                    "The OpenTelemetry collector requires the opentelemetry-api "
+                    "package. Install it with `pip install opentelemetry-api`"
+                ) from exc
+            tracer = trace.get_tracer(__name__)
+        self._tracer = tracer
+
+    def collect(self, span: StageSpan) -> None:
+        attributes = {
+            key: value
+            if isinstance(value, (str, bool, int, float))
+            else json.dumps(value, default=str)
+            for key, value in span.attributes.items()
+        }
+        if span.parent is not None:
+            attributes["stage.parent"] = span.parent
+        otel_span = self._tracer.start_span(
+            span.name, start_time=span.start_ns, attributes=attributes
+        )
+        otel_span.end(end_time=span.start_ns + span.duration_ns)
+
+
+# Registered collectors. A tuple, so that it can be iterated without a lock
+_collectors: tuple[BaseSpanCollector, ...] = ()
+_collectors_lock = threading.Lock()
+
+# Name of the innermost open stage of the current thread or task
+_current_stage: ContextVar[Optional[str]] = ContextVar("_current_stage", default=None)
+
+
+def add_collector(collector: BaseSpanCollector) -> None:
+    """Start sending the stage spans of this process to `collector`."""
+    global _collectors
+    with _collectors_lock:
+        _collectors = _collectors + (collector,)
+
+
+def remove_collector(collector: BaseSpanCollector) -> None:
+    """Stop sending the stage spans to `collector`."""
+    global _collectors
+    with _collectors_lock:
+        _collectors = tuple(c for c in _collectors if c is not collector)
+
+
+def profiling_enabled() -> bool:
+    """Check whether any collector is registered."""
+    return bool(_collectors)
+
+
+@contextmanager
+def collecting(*collectors: BaseSpanCollector) -> Iterator[None]:
+    """Register the collectors for the duration of the block."""
+    for collector in collectors:
+        add_collector(collector)
+    try:
+        yield
+    finally:
+        for collector in collectors:
+            remove_collector(collector)
+
+
+class _NullStage:
+    """No-op stage returned while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Stage that measures its duration and emits a span on exit."""
+
+    __slots__ = ("_attributes", "_name", "_start_counter", "_start_ns", "_token")
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> None:
+        self._token = _current_stage.set(self._name)
+        self._start_ns = time.time_ns()
+        self._start_counter = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration_ns = time.perf_counter_ns() - self._start_counter
+        _current_stage.reset(self._token)
+        span = StageSpan(
+            name=self._name,
+            parent=_current_stage.get(),
+            start_ns=self._start_ns,
+            duration_ns=duration_ns,
+            process_id=os.getpid(),
+            thread_id=threading.get_ident(),
+            attributes=self._attributes,
+        )
+        for collector in _collectors:
+            collector.collect(span)
+
+
+def stage(name: str, **attributes: Any) -> Union[_Stage, _NullStage]:
+    """Return a context manager that times the stage `name`.
+
+    Args:
+        name: Stage name, conventionally `<package>.<stage>`.
+        attributes: Extra attributes attached to the span, e.g. a batch size.
+    """
+    if not _collectors:
+        return _NULL_STAGE
+    return _Stage(name, attributes)
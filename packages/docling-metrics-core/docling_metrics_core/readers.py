@@ -0,0 +1,225 @@
+"""Lazy readers of input samples stored in JSONL or Parquet files.
+
+The readers yield typed samples one at a time, so the size of a dataset is bounded
+by the disk and not by the memory. Every sample is validated when it is read, and
+the validation errors point at the offending line or row:
+
+    samples = read_jsonl_samples("pairs.jsonl", TextPairSample)
+    aggregate = metric.evaluate_dataset(samples, config)
+
+`MappedJsonlSamples` memory-maps a JSONL file and indexes the line offsets, which
+gives random access and a length without loading the samples.
+
+The Parquet reader and writer require the optional dependencies of the `columnar`
+extra (numpy, pyarrow).
+"""
+
+import mmap
+from array import array
+from pathlib import Path
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar, Union
+
+from pydantic import ValidationError
+
+from docling_metrics_core.base_types import BaseInputSample
+from docling_metrics_core.evaluation import batched
+
+S = TypeVar("S", bound=BaseInputSample)
+
+
+def read_jsonl_samples(path: Union[str, Path], sample_type: type[S]) -> Iterator[S]:
+    """Lazily read the samples of a JSONL file, one JSON object per line.
+
+    Args:
+        path: The JSONL file. Blank lines are skipped.
+        sample_type: The type the lines are validated into.
+
+    Raises:
+        ValueError: If a line is not a valid sample.
+    """
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip():
+                yield _validate_line(sample_type, line, f"{path}:{line_number}")
+
+
+def write_jsonl_samples(path: Union[str, Path], samples: Iterable[S]) -> int:
+    """Write the samples as JSONL and return their number."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for sample in samples:
+            f.write(sample.model_dump_json() + "\n")
+            count += 1
+    return count
+
+
+class MappedJsonlSamples(Generic[S]):
+    """Random access to the samples of a memory-mapped JSONL file.
+
+    Opening the file scans it once to record the offset of every non-blank line,
+    eight bytes per sample. The samples are only parsed when accessed, and the
+    pages of the file are loaded and evicted by the operating system.
+    """
+
+    def __init__(self, path: Union[str, Path], sample_type: type[S]) -> None:
+        """Map the file and index its lines.
+
+        Args:
+            path: The JSONL file.
+            sample_type: The type the lines are validated into.
+        """
+        self._path = Path(path)
+        self._sample_type = sample_type
+        self._offsets = array("q")
+        self._file = open(self._path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        if self._path.stat().st_size == 0:
+            return
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        start = 0
+        while start < size:
+            end = self._mmap.find(b"\n", start)
+            if end == -1:
+                end = size
+            if self._mmap[start:end].strip():
+                self._offsets.append(start)
+            start = end + 1
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> S:
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("sample index out of range")
+        assert self._mmap is not None
+        start = self._offsets[index]
+        end = self._mmap.find(b"\n", start)
+        line = self._mmap[start : end if end != -1 else len(self._mmap)]
+        return _validate_line(self._sample_type, line, f"{self._path}: sample {index}")
+
+    def __iter__(self) -> Iterator[S]:
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "MappedJsonlSamples[S]":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_parquet_samples(
+    path: Union[str, Path],
+    sample_type: type[S],
+    batch_size: int = 1024,
+) -> Iterator[S]:
+    """Lazily read the samples of a Parquet file, one row per sample.
+
+    The file is memory-mapped and decoded `batch_size` rows at a time. Nested
+    fields, such as the bounding boxes of `LayoutMetricSample`, are stored as
+    Arrow lists of structs.
+
+    Args:
+        path: The Parquet file.
+        sample_type: The type the rows are validated into.
+        batch_size: Number of rows decoded at once.
+
+    Raises:
+        ValueError: If a row is not a valid sample.
+    """
+    pq = _import_parquet()
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    row_number = 0
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+        for row in record_batch.to_pylist():
+            row_number += 1
+            try:
+                yield sample_type.model_validate(row)
+            except ValidationError as exc:
+                raise ValueError(f"{path}: invalid sample at row {row_number}") from exc
+
+
+def write_parquet_samples(
+    path: Union[str, Path],
+    samples: Iterable[S],
+    row_group_size: int = 1024,
+) -> int:
+    """Write the samples as Parquet, one row group at a time, and return their number.
+
+    The schema is inferred from the first row group. Fields that are None in all
+    of its rows are inferred as nulls and cannot hold values in later groups.
+    """
+    pa = _import_arrow()
+    pq = _import_parquet()
+    count = 0
+    writer = None
+    schema = None
+    try:
+        for batch in batched(samples, row_group_size):
+            rows = [sample.model_dump(mode="json") for sample in batch]
+            table = pa.Table.from_pylist(rows, schema=schema)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table)
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def read_samples(path: Union[str, Path], sample_type: type[S]) -> Iterator[S]:
+    """Lazily read the samples of a `.jsonl` or `.parquet` file."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".jsonl":
+        return read_jsonl_samples(path, sample_type)
+    if suffix == ".parquet":
+        return read_parquet_samples(path, sample_type)
+    raise ValueError(f"Unsupported sample file format: {suffix}")
+
+
+def write_samples(path: Union[str, Path], samples: Iterable[S]) -> int:
+    """Write the samples as `.jsonl` or `.parquet` and return their number."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".jsonl":
+        return write_jsonl_samples(path, samples)
+    if suffix == ".parquet":
+        return write_parquet_samples(path, samples)
+    raise ValueError(f"Unsupported sample file format: {suffix}")
+
+
+def _validate_line(sample_type: type[S], line: bytes, location: str) -> S:
+    try:
+        return sample_type.model_validate_json(line)
+    except ValidationError as exc:
+        raise ValueError(f"{location}: invalid sample") from exc
+
+
+def _import_arrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError(
+            "Parquet samples require pyarrow. "
+            "Install it with `pip install docling-metrics-core[columnar]`"
+        ) from exc
+    return pyarrow
+
+
+def _import_parquet() -> Any:
+    _import_arrow()
+    import pyarrow.parquet
+
+    return pyarrow.parquet
@@ -0,0 +1,293 @@
+"""Deterministic sharding of datasets and a file-based coordinator of the shards.
+
+The samples are assigned to shards by a stable hash of their id, so every worker,
+process or host that reads the same dataset agrees on the assignment without
+communicating. Each shard is evaluated independently into a file of per-sample
+results and a serialized accumulator, which are merged at the end.
+
+`LocalShardCoordinator` stands in for a cluster scheduler: the workers share a
+directory, claim shards with exclusively created lock files and publish their
+outputs with atomic renames.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from docling_metrics_core.base_types import (
+    BaseAccumulator,
+    BaseAggregateResult,
+    BaseInputSample,
+    BaseMetric,
+    BaseSampleResult,
+)
+from docling_metrics_core.evaluation import EvaluationConfig
+
+
+def shard_of(sample_id: str, num_shards: int) -> int:
+    """Return the shard of a sample id, stable across processes and platforms."""
+    if num_shards < 1:
+        raise ValueError("num_shards must be positive")
+    digest = hashlib.blake2b(sample_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+def select_shard(
+    samples: Iterable[BaseInputSample], shard_index: int, num_shards: int
+) -> Iterator[BaseInputSample]:
+    """Lazily keep the samples that belong to shard `shard_index`."""
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards})")
+    for sample in samples:
+        if shard_of(sample.id, num_shards) == shard_index:
+            yield sample
+
+
+class LocalShardCoordinator:
+    """Coordinate the evaluation of the shards of a dataset through a directory.
+
+    For every shard the directory holds:
+    - `shard-<i>.lock`: created exclusively by the worker that claims the shard.
+    - `shard-<i>.results.jsonl`: the per-sample results, one JSON per line.
+    - `shard-<i>.accumulator.json`: the accumulator of the shard, written last,
+      hence it marks the shard as done.
+
+    The workers may run in separate processes or on separate hosts sharing the
+    directory. The lock of a shard is refreshed while its results are streamed. A
+    shard whose lock is older than `stale_after` seconds and which is not done is
+    considered abandoned and can be claimed again, hence `stale_after` must exceed
+    the evaluation time of a single result, or batch, of the shard.
+    """
+
+    def __init__(
+        self,
+        work_dir: Union[str, Path],
+        num_shards: int,
+        stale_after: Optional[float] = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        Args:
+            work_dir: Directory shared by the workers, created if missing.
+            num_shards: Number of shards of the dataset.
+            stale_after: Age in seconds after which a lock of an unfinished shard
+                is taken over. None never takes locks over.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be positive")
+        self._work_dir = Path(work_dir)
+        self._num_shards = num_shards
+        self._stale_after = stale_after
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+
+        # Refuse to mix the shards of different shard counts in one directory
+        manifest = self._work_dir / "shards.json"
+        if manifest.exists():
+            stored = json.loads(manifest.read_text())["num_shards"]
+            if stored != num_shards:
+                raise ValueError(
+                    f"{self._work_dir} holds {stored} shards, not {num_shards}"
+                )
+        else:
+            self._write_atomic(manifest, json.dumps({"num_shards": num_shards}))
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    def results_path(self, shard_index: int) -> Path:
+        return self._work_dir / f"shard-{shard_index:05d}.results.jsonl"
+
+    def accumulator_path(self, shard_index: int) -> Path:
+        return self._work_dir / f"shard-{shard_index:05d}.accumulator.json"
+
+    def is_done(self, shard_index: int) -> bool:
+        """Check whether the outputs of the shard are complete."""
+        return self.accumulator_path(shard_index).exists()
+
+    def pending_shards(self) -> list[int]:
+        """Return the shards that are not done yet."""
+        return [i for i in range(self._num_shards) if not self.is_done(i)]
+
+    def claim(self) -> Optional[int]:
+        """Claim an unclaimed, or abandoned, shard that is not done.
+
+        Returns:
+            The index of the claimed shard, None if there is nothing left to claim.
+        """
+        for shard_index in self.pending_shards():
+            lock_path = self._lock_path(shard_index)
+            # Unique to this claim, so concurrent claims of one process differ
+            owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+            if self._is_stale(lock_path) and not self.is_done(shard_index):
+                self._take_over(lock_path)
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, "w") as lock_file:
+                lock_file.write(owner + "\n")
+            # Make sure that no other worker took the lock over meanwhile
+            try:
+                if lock_path.read_text(encoding="utf-8").strip() != owner:
+                    continue
+            except FileNotFoundError:
+                continue
+            # The shard may have been completed between the listing and the lock
+            if self.is_done(shard_index):
+                continue
+            return shard_index
+        return None
+
+    def evaluate_shard(
+        self,
+        metric: BaseMetric,
+        samples: Iterable[BaseInputSample],
+        shard_index: int,
+        config: Optional[EvaluationConfig] = None,
+    ) -> BaseAccumulator:
+        """Evaluate the samples of one shard and publish its outputs.
+
+        Args:
+            metric: Metric that supports `create_accumulator`.
+            samples: The whole dataset, the samples of other shards are skipped.
+            shard_index: The shard to evaluate.
+            config: Engine configuration of the shard evaluation.
+
+        Returns:
+            The accumulator of the shard.
+        """
+        accumulator = metric.create_accumulator()
+        results_path = self.results_path(shard_index)
+        tmp_path = _tmp_path(results_path)
+        lock_path = self._lock_path(shard_index)
+        next_refresh = 0.0
+        with open(tmp_path, "w", encoding="utf-8") as results_file:
+            for result in metric.stream_sample_results(
+                select_shard(samples, shard_index, self._num_shards), config
+            ):
+                accumulator.update(result)
+                results_file.write(result.model_dump_json() + "\n")
+                # Keep the lock fresh, so that the shard is not taken over
+                if self._stale_after is not None and time.monotonic() >= next_refresh:
+                    self._refresh_lock(lock_path)
+                    next_refresh = time.monotonic() + self._stale_after / 4
+        os.replace(tmp_path, results_path)
+        self._write_atomic(
+            self.accumulator_path(shard_index), accumulator.model_dump_json()
+        )
+        return accumulator
+
+    def run_worker(
+        self,
+        metric: BaseMetric,
+        samples_factory: Callable[[], Iterable[BaseInputSample]],
+        config: Optional[EvaluationConfig] = None,
+    ) -> list[int]:
+        """Claim and evaluate shards until none is left.
+
+        Args:
+            metric: The metric to evaluate.
+            samples_factory: Returns a fresh iterable of the whole dataset, it is
+                called once per claimed shard.
+            config: Engine configuration of the shard evaluations.
+
+        Returns:
+            The indices of the shards evaluated by this worker.
+        """
+        evaluated: list[int] = []
+        while (shard_index := self.claim()) is not None:
+            self.evaluate_shard(metric, samples_factory(), shard_index, config)
+            evaluated.append(shard_index)
+        return evaluated
+
+    def merge_accumulators(self, metric: BaseMetric) -> BaseAccumulator:
+        """Merge the accumulators of all the shards.
+
+        Raises:
+            RuntimeError: If some shards are not done.
+        """
+        pending = self.pending_shards()
+        if pending:
+            raise RuntimeError(f"Shards {pending} are not done")
+
+        merged = metric.create_accumulator()
+        accumulator_type = type(merged)
+        for shard_index in range(self._num_shards):
+            merged.merge(
+                accumulator_type.model_validate_json(
+                    self.accumulator_path(shard_index).read_text()
+                )
+            )
+        return merged
+
+    def aggregate(self, metric: BaseMetric) -> BaseAggregateResult:
+        """Merge the accumulators of all the shards into the aggregate result."""
+        return self.merge_accumulators(metric).finalize()
+
+    def iter_results(self, metric: BaseMetric) -> Iterator[BaseSampleResult]:
+        """Lazily read the per-sample results of all the done shards, shard by shard."""
+        result_type = metric.sample_result_type
+        for shard_index in range(self._num_shards):
+            if not self.is_done(shard_index):
+                continue
+            with open(self.results_path(shard_index), encoding="utf-8") as f:
+                for line in f:
+                    yield result_type.model_validate_json(line)
+
+    def _lock_path(self, shard_index: int) -> Path:
+        return self._work_dir / f"shard-{shard_index:05d}.lock"
+
+    def _is_stale(self, lock_path: Path) -> bool:
+        """Check whether a lock exists and is older than `stale_after`."""
+        if self._stale_after is None:
+            return False
+        try:
+            mtime = lock_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return time.time() - mtime > self._stale_after
+
+    def _take_over(self, lock_path: Path) -> None:
+        """Remove a stale lock, atomically with respect to the other workers.
+
+        The lock is renamed to a name unique to this claim, so only one of the
+        workers that found it stale moves it away. If the lock was refreshed or
+        replaced in between, the moved lock is live and is put back.
+        """
+        moved_path = lock_path.with_name(f"{lock_path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(lock_path, moved_path)
+        except FileNotFoundError:
+            return
+        if not self._is_stale(moved_path):
+            try:
+                # Unlike a rename, a link never replaces a lock created meanwhile
+                os.link(moved_path, lock_path)
+            except FileExistsError:
+                pass
+        moved_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _refresh_lock(lock_path: Path) -> None:
+        try:
+            os.utime(lock_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        tmp_path = _tmp_path(path)
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def _tmp_path(path: Path) -> Path:
+    """Return a temporary path next to `path`, unique to the calling thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
@@ -0,0 +1,67 @@
+"""Length metric shared by the tests of the evaluation machinery."""
+
+from typing import Iterable
+
+from docling_metrics_core.base_types import (
+    BaseAccumulator,
+    BaseAggregateResult,
+    BaseInputSample,
+    BaseMetric,
+    BaseSampleResult,
+)
+
+
+class LengthSample(BaseInputSample):
+    """Input sample with a text payload."""
+
+    text: str
+
+
+class LengthResult(BaseSampleResult):
+    """Length of the text payload."""
+
+    length: int
+
+
+class LengthAggregate(BaseAggregateResult):
+    """Total length of all text payloads."""
+
+    total_length: int
+
+
+class LengthAccumulator(BaseAccumulator):
+    """Running total length."""
+
+    total_length: int = 0
+
+    def update(self, result: LengthResult) -> None:  # type: ignore[override]
+        self.sample_count += 1
+        self.total_length += result.length
+
+    def merge(self, other: "LengthAccumulator") -> None:  # type: ignore[override]
+        self.sample_count += other.sample_count
+        self.total_length += other.total_length
+
+    def finalize(self) -> LengthAggregate:
+        return LengthAggregate(
+            sample_count=self.sample_count, total_length=self.total_length
+        )
+
+
+class LengthMetric(BaseMetric):
+    """Metric returning the length of the text payload."""
+
+    sample_result_type = LengthResult
+
+    def evaluate_sample(self, sample: LengthSample) -> LengthResult:  # type: ignore[override]
+        return LengthResult(id=sample.id, length=len(sample.text))
+
+    def create_accumulator(self) -> LengthAccumulator:
+        return LengthAccumulator()
+
+    def aggregate(  # type: ignore[override]
+        self, results: Iterable[LengthResult]
+    ) -> LengthAggregate:
+        accumulator = self.create_accumulator()
+        accumulator.update_all(results)
+        return accumulator.finalize()
@@ -0,0 +1,160 @@
+"""Tests for the benchmark harness."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from docling_metrics_core.base_types import (
+    BaseInputSample,
+    BaseMetric,
+    BaseSampleResult,
+)
+from docling_metrics_core.benchmark import (
+    BenchmarkConfig,
+    BenchmarkReport,
+    BenchmarkResult,
+    LatencyStatistics,
+    compare_reports,
+    percentile,
+    run_benchmark,
+    synthetic_token_pairs,
+)
+from docling_metrics_core.profiling import stage
+
+
+class TokensSample(BaseInputSample):
+    """Input sample with two token sequences."""
+
+    tokens_a: list[str]
+    tokens_b: list[str]
+
+
+class OverlapResult(BaseSampleResult):
+    """Number of common tokens."""
+
+    overlap: int
+
+
+class OverlapMetric(BaseMetric):
+    """Metric counting the common tokens, with one instrumented stage."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def evaluate_sample(self, sample: TokensSample) -> OverlapResult:  # type: ignore[override]
+        self.calls += 1
+        with stage("overlap.sets"):
+            overlap = len(set(sample.tokens_a) & set(sample.tokens_b))
+        return OverlapResult(id=sample.id, overlap=overlap)
+
+
+def _samples(count: int) -> list[TokensSample]:
+    return [
+        TokensSample(id=str(i), tokens_a=tokens_a, tokens_b=tokens_b)
+        for i, (tokens_a, tokens_b) in enumerate(
+            synthetic_token_pairs(count, length=50, seed=1)
+        )
+    ]
+
+
+def _result(name: str, p50_ms: float, throughput: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        sample_count=10,
+        repeats=1,
+        latency=LatencyStatistics(
+            mean_ms=p50_ms,
+            min_ms=p50_ms,
+            max_ms=p50_ms,
+            p50_ms=p50_ms,
+            p95_ms=p50_ms,
+            p99_ms=p50_ms,
+        ),
+        throughput=throughput,
+    )
+
+
+def test_percentile() -> None:
+    """Test the interpolated quantiles."""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0.0) == 1.0
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.95) == pytest.approx(4.8)
+    assert percentile(values, 1.0) == 5.0
+    assert percentile([7.0], 0.99) == 7.0
+
+
+def test_synthetic_token_pairs() -> None:
+    """Test that the pairs are reproducible and of controlled size."""
+    pairs = list(synthetic_token_pairs(5, length=100, error_rate=0.0, seed=3))
+    assert pairs == list(synthetic_token_pairs(5, length=100, error_rate=0.0, seed=3))
+    assert all(len(a) == 100 and a == b for a, b in pairs)
+
+    noisy = list(synthetic_token_pairs(5, length=100, error_rate=0.5, seed=3))
+    assert any(a != b for a, b in noisy)
+
+
+@pytest.mark.parametrize("batch_size", [None, 4])
+def test_run_benchmark(batch_size: int) -> None:
+    """Test the warm-up, repeats and the collected statistics."""
+    metric = OverlapMetric()
+    samples = _samples(10)
+    config = BenchmarkConfig(warmup=2, repeats=3, batch_size=batch_size)
+
+    result = run_benchmark("overlap", metric, samples, config)
+
+    assert metric.calls == 50
+    assert result.sample_count == 10
+    assert result.latency.min_ms <= result.latency.p50_ms <= result.latency.p99_ms
+    assert result.throughput > 0
+    assert result.stages["overlap.sets"].count == 30
+
+
+class AllocatingMetric(OverlapMetric):
+    """Overlap metric holding a buffer of `size_mb` MiB while it evaluates."""
+
+    def __init__(self, size_mb: int) -> None:
+        super().__init__()
+        self.size_mb = size_mb
+
+    def evaluate_sample(self, sample: TokensSample) -> OverlapResult:  # type: ignore[override]
+        buffer = bytearray(self.size_mb << 20)
+        result = super().evaluate_sample(sample)
+        del buffer
+        return result
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_run_benchmark_peak_rss() -> None:
+    """Test that the peak RSS of a run does not include the earlier runs."""
+    samples = _samples(2)
+    config = BenchmarkConfig(warmup=0, repeats=1)
+
+    large = run_benchmark("large", AllocatingMetric(256), samples, config)
+    small = run_benchmark("small", AllocatingMetric(1), samples, config)
+
+    assert large.peak_rss_mb is not None and small.peak_rss_mb is not None
+    assert large.peak_rss_mb - small.peak_rss_mb > 200
+
+
+def test_report_roundtrip_and_comparison(tmp_path: Path) -> None:
+    """Test that slowdowns beyond the threshold are flagged."""
+    baseline = BenchmarkReport()
+    baseline.add(_result("a", p50_ms=10.0, throughput=100.0))
+    baseline.add(_result("b", p50_ms=10.0, throughput=100.0))
+    baseline.save(tmp_path / "baseline.json")
+
+    current = BenchmarkReport()
+    current.add(_result("a", p50_ms=10.5, throughput=95.0))
+    current.add(_result("b", p50_ms=15.0, throughput=60.0))
+    current.add(_result("c", p50_ms=1.0, throughput=1.0))
+
+    regressions = compare_reports(
+        current, BenchmarkReport.load(tmp_path / "baseline.json"), threshold=0.1
+    )
+    assert [(r.name, r.measure) for r in regressions] == [
+        ("b", "p50_ms"),
+        ("b", "p95_ms"),
+        ("b", "throughput"),
+    ]
+    assert regressions[0].change == pytest.approx(0.5)
@@ -0,0 +1,156 @@
+"""Tests for the content-addressed result cache."""
+
+import pickle
+from pathlib import Path
+from typing import Any, Sequence
+
+from docling_metrics_core.cache import (
+    ResultCache,
+    cached_batch_evaluation,
+    cached_sample_evaluation,
+)
+from docling_metrics_core.hashing import cache_key
+
+from .length_metric import LengthMetric, LengthResult, LengthSample
+
+
+class ScaledLengthMetric(LengthMetric):
+    """Metric returning the scaled length of the text and recording its calls."""
+
+    def __init__(self, scale: int = 1) -> None:
+        self.scale = scale
+        self.evaluated: list[str] = []
+        self.batches: list[list[str]] = []
+
+    @cached_sample_evaluation
+    def evaluate_sample(self, sample: LengthSample) -> LengthResult:  # type: ignore[override]
+        self.evaluated.append(sample.id)
+        return LengthResult(id=sample.id, length=self.scale * len(sample.text))
+
+    @cached_batch_evaluation
+    def evaluate_samples(  # type: ignore[override]
+        self, samples: Sequence[LengthSample]
+    ) -> list[LengthResult]:
+        self.batches.append([sample.id for sample in samples])
+        return [
+            LengthResult(id=sample.id, length=self.scale * len(sample.text))
+            for sample in samples
+        ]
+
+    def metric_config(self) -> dict[str, Any]:
+        return {"scale": self.scale}
+
+
+def test_memory_tier_evicts_least_recently_used() -> None:
+    """Test the LRU order of the memory tier."""
+    cache = ResultCache(memory_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.counters() == {
+        "hits": 3,
+        "misses": 1,
+        "memory_hits": 3,
+        "disk_hits": 0,
+        "cache_size": 2,
+        "disk_bytes": 0,
+    }
+
+
+def test_disk_tier_persists_and_evicts(tmp_path: Path) -> None:
+    """Test that the disk tier survives a new cache and respects its budget."""
+    disk_path = tmp_path / "cache.sqlite"
+    cache = ResultCache(memory_size=0, disk_path=disk_path, disk_max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # b becomes the least recently used
+    cache.set("c", "cccc")
+    cache.close()
+
+    reopened = ResultCache(memory_size=0, disk_path=disk_path, disk_max_bytes=10)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == "aaaa"
+    assert reopened.get("c") == "cccc"
+    assert reopened.counters()["disk_hits"] == 2
+    assert reopened.counters()["disk_bytes"] == 8
+
+
+def test_disk_budget_counts_utf8_bytes(tmp_path: Path) -> None:
+    """Test that the disk budget counts the bytes, not the characters, of a result."""
+    value = '{"t":"日本語テキスト"}'  # 15 characters, 29 bytes
+    cache = ResultCache(
+        memory_size=0, disk_path=tmp_path / "cache.sqlite", disk_max_bytes=40
+    )
+    cache.set("a", value)
+    assert cache.counters()["disk_bytes"] == 29
+    cache.set("b", value)
+    assert cache.get("a") is None
+    assert cache.get("b") == value
+    assert cache.counters()["disk_bytes"] == 29
+
+    cache.set("c", value * 2)
+    assert cache.get("c") is None
+    assert cache.get("b") == value
+
+
+def test_cache_survives_pickling(tmp_path: Path) -> None:
+    """Test that a pickled cache reopens its disk tier."""
+    cache = ResultCache(disk_path=tmp_path / "cache.sqlite")
+    cache.set("a", "1")
+
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.counters()["cache_size"] == 0
+    assert clone.get("a") == "1"
+
+
+def test_cache_key_depends_on_namespace_and_content() -> None:
+    """Test that the keys address the metric config and the sample payload."""
+    sample = LengthSample(id="a", text="x")
+    assert cache_key("m", sample) == cache_key("m", sample.model_copy())
+    assert cache_key("m", sample) != cache_key("n", sample)
+    assert cache_key("m", sample) != cache_key("m", LengthSample(id="a", text="y"))
+
+
+def test_cached_sample_evaluation() -> None:
+    """Test that evaluate_sample only computes the cache misses."""
+    cache = ResultCache()
+    metric = ScaledLengthMetric()
+    metric.result_cache = cache
+    sample = LengthSample(id="a", text="xyz")
+
+    assert metric.evaluate_sample(sample) == LengthResult(id="a", length=3)
+    assert metric.evaluate_sample(sample) == LengthResult(id="a", length=3)
+    assert metric.evaluated == ["a"]
+
+    other_config = ScaledLengthMetric(scale=2)
+    other_config.result_cache = cache
+    assert other_config.evaluate_sample(sample) == LengthResult(id="a", length=6)
+    assert cache.counters()["hits"] == 1
+    assert cache.counters()["misses"] == 2
+
+
+def test_cached_batch_evaluation() -> None:
+    """Test that evaluate_samples passes only the misses on as one batch."""
+    metric = ScaledLengthMetric()
+    metric.result_cache = ResultCache()
+    samples = [LengthSample(id=str(i), text="x" * i) for i in range(5)]
+
+    metric.evaluate_samples(samples[:2])
+    results = metric.evaluate_samples(samples)
+
+    assert metric.batches == [["0", "1"], ["2", "3", "4"]]
+    assert results == [LengthResult(id=str(i), length=i) for i in range(5)]
+
+
+def test_no_cache_by_default() -> None:
+    """Test that the decorated methods are plain calls without a cache."""
+    metric = ScaledLengthMetric()
+    sample = LengthSample(id="a", text="xyz")
+    metric.evaluate_sample(sample)
+    metric.evaluate_sample(sample)
+    assert metric.evaluated == ["a", "a"]
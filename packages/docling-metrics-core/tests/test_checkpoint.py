@@ -0,0 +1,129 @@
+"""Tests for the resumable checkpointed evaluation."""
+
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pytest
+from docling_metrics_core.checkpoint import CheckpointStore, checkpointed_map
+from docling_metrics_core.evaluation import EvaluationConfig, ExecutorKind
+from docling_metrics_core.hashing import content_hash
+
+from .length_metric import LengthMetric, LengthResult, LengthSample
+
+
+class CountingLengthMetric(LengthMetric):
+    """Length metric recording its calls."""
+
+    def __init__(self) -> None:
+        self.evaluated: list[str] = []
+
+    def evaluate_sample(self, sample: LengthSample) -> LengthResult:  # type: ignore[override]
+        self.evaluated.append(sample.id)
+        return super().evaluate_sample(sample)
+
+
+def _samples(n: int) -> list[LengthSample]:
+    return [LengthSample(id=str(i), text="x" * i) for i in range(n)]
+
+
+def test_content_hash_is_stable() -> None:
+    """Test that equal samples hash equally and different samples differently."""
+    assert content_hash(LengthSample(id="a", text="x")) == content_hash(
+        LengthSample(id="a", text="x")
+    )
+    assert content_hash(LengthSample(id="a", text="x")) != content_hash(
+        LengthSample(id="a", text="y")
+    )
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        EvaluationConfig(),
+        EvaluationConfig(executor=ExecutorKind.THREAD, max_workers=4),
+        EvaluationConfig(batch_size=3),
+    ],
+)
+def test_rerun_skips_scored_samples(tmp_path: Path, config: EvaluationConfig) -> None:
+    """Test that a re-run only evaluates the new and changed samples."""
+    samples = _samples(10)
+    metric = CountingLengthMetric()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        first = metric.evaluate_dataset(samples, config, checkpoint=store)
+        assert sorted(metric.evaluated, key=int) == [s.id for s in samples]
+        assert store.count(metric.result_namespace()) == 10
+
+    samples[3] = LengthSample(id="3", text="changed")
+    samples.append(LengthSample(id="10", text="new"))
+    metric.evaluated.clear()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        results = list(metric.stream_sample_results(samples, config, store))
+        assert sorted(metric.evaluated) == ["10", "3"]
+        assert results == [LengthResult(id=s.id, length=len(s.text)) for s in samples]
+
+    assert first.total_length == sum(range(10))
+
+
+def test_interrupted_evaluation_resumes(tmp_path: Path) -> None:
+    """Test that the results scored before an interruption are kept."""
+    samples = _samples(20)
+    metric = CountingLengthMetric()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite", commit_interval=1) as store:
+        stream = metric.stream_sample_results(samples, checkpoint=store)
+        list(islice(stream, 8))
+        stream.close()  # type: ignore[attr-defined]
+
+    metric.evaluated.clear()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        aggregate = metric.evaluate_dataset(samples, checkpoint=store)
+
+    assert metric.evaluated == [str(i) for i in range(8, 20)]
+    assert aggregate.sample_count == 20
+    assert aggregate.total_length == sum(range(20))
+
+
+def test_rerun_streams_stored_results(tmp_path: Path) -> None:
+    """Test that the stored results are yielded without reading the input ahead."""
+    samples = _samples(100)
+    metric = CountingLengthMetric()
+    namespace = metric.result_namespace()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        list(metric.stream_sample_results(samples, checkpoint=store))
+
+    samples[50] = LengthSample(id="50", text="changed")
+    samples[90] = LengthSample(id="90", text="changed")
+    pulled = 0
+
+    def pull(items: Iterable[LengthSample]) -> Iterator[LengthSample]:
+        nonlocal pulled
+        for item in items:
+            pulled += 1
+            yield item
+
+    def evaluate(items: Iterable[LengthSample]) -> Iterator[LengthResult]:
+        return (metric.evaluate_sample(sample) for sample in items)
+
+    metric.evaluated.clear()
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        stream = checkpointed_map(
+            evaluate, pull(samples), store, namespace, LengthResult, max_lookahead=10
+        )
+        assert next(stream) == LengthResult(id="0", length=0)
+        assert pulled == 1
+        results = [next(stream) for _ in range(50)]
+        assert results[-1] == LengthResult(id="50", length=len("changed"))
+        assert pulled == 51
+        # The stored results behind an evaluated sample are read up to the limit
+        results.append(next(stream))
+        assert pulled == 61
+        results += list(stream)
+
+    assert metric.evaluated == ["50", "90"]
+    assert [r.id for r in results] == [s.id for s in samples[1:]]
+    with pytest.raises(ValueError):
+        next(
+            checkpointed_map(
+                evaluate, samples, store, namespace, LengthResult, max_lookahead=0
+            )
+        )
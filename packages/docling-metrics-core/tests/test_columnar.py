@@ -0,0 +1,122 @@
+"""Tests for the columnar result sink."""
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pytest
+from docling_metrics_core.base_types import BaseSampleResult
+from docling_metrics_core.columnar import ColumnarResultSink, result_columns
+from docling_metrics_core.evaluation import EvaluationConfig, ExecutorKind
+from pydantic import BaseModel
+
+from .length_metric import LengthMetric, LengthResult, LengthSample
+
+
+class InnerScores(BaseModel):
+    """Nested scores."""
+
+    score: float
+    label: Optional[str] = None
+
+
+class NestedResult(BaseSampleResult):
+    """Result with scalar, optional and nested fields."""
+
+    count: int
+    valid: bool
+    ratio: Optional[float] = None
+    inner: Optional[InnerScores] = None
+
+
+class ValuesLengthMetric(LengthMetric):
+    """Length metric returning its results as plain values."""
+
+    def evaluate_sample_values(self, sample: LengthSample) -> dict:  # type: ignore[override]
+        return {"id": sample.id, "length": len(sample.text)}
+
+
+ROWS = [
+    {"id": "a", "count": 1, "valid": True, "ratio": 0.5, "inner": None},
+    {
+        "id": "b",
+        "count": 2,
+        "valid": False,
+        "ratio": None,
+        "inner": {"score": 0.25, "label": "x"},
+    },
+    {
+        "id": "c",
+        "count": 3,
+        "valid": True,
+        "ratio": 1.0,
+        "inner": {"score": 1.0, "label": None},
+    },
+]
+
+
+def test_result_columns() -> None:
+    """Test the flattening of a result model into columns."""
+    columns = result_columns(NestedResult)
+
+    assert [column.name for column in columns] == [
+        "id",
+        "count",
+        "valid",
+        "ratio",
+        "inner",
+        "inner.score",
+        "inner.label",
+    ]
+    assert [column.nullable for column in columns] == [
+        False,
+        False,
+        False,
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert columns[4].is_presence
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_sink_roundtrip(tmp_path: Path, spill: bool) -> None:
+    """Test that the stored rows rebuild the same result models."""
+    spill_path = tmp_path / "results.parquet" if spill else None
+    sink = ColumnarResultSink(NestedResult, chunk_size=2, spill_path=spill_path)
+    sink.extend(ROWS)
+    assert len(sink) == 3
+
+    results = list(sink.iter_results())
+    assert results == [NestedResult.model_validate(row) for row in ROWS]
+    if spill_path is not None:
+        assert spill_path.is_file()
+
+    columns = sink.to_numpy()
+    assert columns["count"].dtype == np.int64
+    assert columns["count"].tolist() == [1, 2, 3]
+    assert np.isnan(columns["ratio"][1])
+    assert columns["inner"].tolist() == [False, True, True]
+    assert sink.to_arrow().num_rows == 3
+
+
+def test_sink_rejects_missing_values() -> None:
+    """Test that a non-nullable column requires a value."""
+    sink = ColumnarResultSink(NestedResult)
+    with pytest.raises(ValueError):
+        sink.append({"id": "a", "valid": True})
+
+
+def test_evaluate_dataset_columnar() -> None:
+    """Test the columnar evaluation of a dataset in batches."""
+    metric = ValuesLengthMetric()
+    samples = [LengthSample(id=str(i), text="x" * i) for i in range(10)]
+    config = EvaluationConfig(executor=ExecutorKind.THREAD, max_workers=2, batch_size=3)
+
+    sink = metric.evaluate_dataset_columnar(samples, config)
+
+    assert sink.to_numpy()["length"].tolist() == list(range(10))
+    assert list(sink.iter_results()) == [
+        LengthResult(id=str(i), length=i) for i in range(10)
+    ]
@@ -0,0 +1,80 @@
+"""Tests for the streaming evaluation engine."""
+
+import threading
+from typing import Iterator
+
+import pytest
+from docling_metrics_core.evaluation import (
+    EvaluationConfig,
+    ExecutorKind,
+    batched,
+    parallel_map,
+)
+
+from .length_metric import LengthMetric, LengthSample
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+@pytest.mark.parametrize("executor", [ExecutorKind.SERIAL, ExecutorKind.THREAD])
+def test_parallel_map_preserves_order(executor: ExecutorKind) -> None:
+    """Test that the results are yielded in input order."""
+    config = EvaluationConfig(executor=executor, max_workers=4)
+    assert list(parallel_map(_square, range(100), config)) == [
+        x * x for x in range(100)
+    ]
+
+
+def test_parallel_map_bounds_in_flight_items() -> None:
+    """Test that the input iterable is consumed lazily."""
+    pulled = 0
+    lock = threading.Lock()
+
+    def items() -> Iterator[int]:
+        nonlocal pulled
+        for i in range(1000):
+            with lock:
+                pulled += 1
+            yield i
+
+    config = EvaluationConfig(
+        executor=ExecutorKind.THREAD, max_workers=2, max_in_flight=3
+    )
+    results = parallel_map(_square, items(), config)
+    assert next(results) == 0
+    # One collected item plus at most `max_in_flight` pending ones
+    assert pulled <= 4
+    results.close()
+
+
+def test_evaluate_dataset_streams_into_aggregate() -> None:
+    """Test the default evaluate_dataset on the thread executor."""
+    metric = LengthMetric()
+    samples = (LengthSample(id=str(i), text="x" * i) for i in range(10))
+    config = EvaluationConfig(executor=ExecutorKind.THREAD, max_workers=3)
+
+    aggregate = metric.evaluate_dataset(samples, config)
+
+    assert aggregate.sample_count == 10
+    assert aggregate.total_length == sum(range(10))
+
+
+def test_batched() -> None:
+    """Test that the items are grouped lazily in batches."""
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batched([], 3)) == []
+
+
+@pytest.mark.parametrize("executor", [ExecutorKind.SERIAL, ExecutorKind.THREAD])
+def test_evaluate_dataset_in_batches(executor: ExecutorKind) -> None:
+    """Test that batched evaluation matches the per-sample evaluation."""
+    metric = LengthMetric()
+    samples = [LengthSample(id=str(i), text="x" * i) for i in range(10)]
+    config = EvaluationConfig(executor=executor, max_workers=2, batch_size=4)
+
+    results = list(metric.stream_sample_results(samples, config))
+
+    assert results == metric.evaluate_samples(samples)
+    assert [result.id for result in results] == [sample.id for sample in samples]
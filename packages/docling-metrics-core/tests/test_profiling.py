@@ -0,0 +1,147 @@
+"""Tests for the stage spans and their collectors."""
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from docling_metrics_core.profiling import (
+    BaseSpanCollector,
+    HistogramCollector,
+    JsonLinesCollector,
+    OpenTelemetryCollector,
+    StageSpan,
+    collecting,
+    profiling_enabled,
+    stage,
+)
+
+
+class ListCollector(BaseSpanCollector):
+    """Keep all the spans in a list."""
+
+    def __init__(self) -> None:
+        self.spans: list[StageSpan] = []
+
+    def collect(self, span: StageSpan) -> None:
+        self.spans.append(span)
+
+
+class FakeOtelSpan:
+    def __init__(self, tracer: "FakeTracer", name: str, **kwargs: Any) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.kwargs = kwargs
+
+    def end(self, end_time: int) -> None:
+        self._tracer.ended.append((self.name, self.kwargs, end_time))
+
+
+class FakeTracer:
+    """Records the calls of the OpenTelemetry tracer API."""
+
+    def __init__(self) -> None:
+        self.ended: list[tuple[str, dict[str, Any], int]] = []
+
+    def start_span(self, name: str, **kwargs: Any) -> FakeOtelSpan:
+        return FakeOtelSpan(self, name, **kwargs)
+
+
+def test_stage_is_noop_without_collectors() -> None:
+    """Test that the disabled stages share a no-op context manager."""
+    assert not profiling_enabled()
+    assert stage("a") is stage("b", size=1)
+    with stage("a"):
+        pass
+
+
+def test_stage_spans_and_nesting() -> None:
+    """Test the names, parents and attributes of nested spans."""
+    collector = ListCollector()
+    with collecting(collector):
+        assert profiling_enabled()
+        with stage("outer", samples=2):
+            with stage("inner"):
+                time.sleep(0.001)
+    assert not profiling_enabled()
+
+    inner, outer = collector.spans
+    assert (inner.name, inner.parent) == ("inner", "outer")
+    assert (outer.name, outer.parent, outer.attributes) == (
+        "outer",
+        None,
+        {"samples": 2},
+    )
+    assert inner.duration_ns >= 1_000_000
+    assert outer.duration_ns >= inner.duration_ns
+
+
+def test_stage_records_failed_stages() -> None:
+    """Test that a span is emitted when the stage raises."""
+    collector = ListCollector()
+    with collecting(collector), pytest.raises(ValueError):
+        with stage("failing"):
+            raise ValueError()
+    assert [span.name for span in collector.spans] == ["failing"]
+
+
+def _span(name: str, duration_ms: float) -> StageSpan:
+    return StageSpan(
+        name=name,
+        start_ns=0,
+        duration_ns=int(duration_ms * 1e6),
+        process_id=0,
+        thread_id=0,
+    )
+
+
+def test_histogram_collector() -> None:
+    """Test the statistics computed from the log buckets."""
+    collector = HistogramCollector(buckets_per_octave=16)
+    for duration_ms in range(1, 101):
+        collector.collect(_span("a", duration_ms))
+    collector.collect(_span("b", 5))
+
+    statistics = collector.statistics()
+    assert collector.stages() == ["a", "b"]
+    assert statistics["a"].count == 100
+    assert statistics["a"].total_ms == pytest.approx(5050)
+    assert statistics["a"].min_ms == pytest.approx(1)
+    assert statistics["a"].max_ms == pytest.approx(100)
+    tolerance = 2 ** (1 / 16)
+    assert 50 <= statistics["a"].p50_ms <= 50 * tolerance
+    assert 95 <= statistics["a"].p95_ms <= 95 * tolerance
+    assert statistics["b"].p99_ms == pytest.approx(5)
+
+
+def test_json_lines_collector(tmp_path: Path) -> None:
+    """Test that every span is written as one JSON line."""
+    path = tmp_path / "spans.jsonl"
+    collector = JsonLinesCollector(path)
+    with collecting(collector):
+        with stage("a", size=3):
+            pass
+        with stage("b"):
+            pass
+    collector.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["a", "b"]
+    assert lines[0]["attributes"] == {"size": 3}
+    assert StageSpan.model_validate(lines[1]).name == "b"
+
+
+def test_open_telemetry_collector() -> None:
+    """Test that the spans are forwarded with their timings and attributes."""
+    tracer = FakeTracer()
+    collector = OpenTelemetryCollector(tracer)
+    with collecting(collector):
+        with stage("outer"):
+            with stage("inner", shape=[2, 3]):
+                pass
+
+    (inner_name, inner_kwargs, inner_end), (outer_name, _, _) = tracer.ended
+    assert (inner_name, outer_name) == ("inner", "outer")
+    assert inner_kwargs["attributes"] == {"shape": "[2, 3]", "stage.parent": "outer"}
+    assert inner_end >= inner_kwargs["start_time"]
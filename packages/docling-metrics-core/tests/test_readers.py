@@ -0,0 +1,108 @@
+"""Tests for the lazy sample readers."""
+
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from docling_metrics_core.base_types import BaseInputSample
+from docling_metrics_core.readers import (
+    MappedJsonlSamples,
+    read_jsonl_samples,
+    read_parquet_samples,
+    read_samples,
+    write_jsonl_samples,
+    write_parquet_samples,
+    write_samples,
+)
+from pydantic import BaseModel
+
+
+class Box(BaseModel):
+    """Nested model."""
+
+    label: str
+    score: Optional[float] = None
+
+
+class BoxesSample(BaseInputSample):
+    """Input sample with nested fields."""
+
+    width: int
+    boxes: list[Box]
+
+
+def _samples(n: int = 25) -> list[BoxesSample]:
+    return [
+        BoxesSample(
+            id=str(i),
+            width=i,
+            boxes=[Box(label=f"l{j}", score=j / 2) for j in range(i % 4)],
+        )
+        for i in range(n)
+    ]
+
+
+def test_jsonl_roundtrip(tmp_path: Path) -> None:
+    """Test that the JSONL reader is lazy and returns the written samples."""
+    path = tmp_path / "samples.jsonl"
+    assert write_jsonl_samples(path, iter(_samples())) == 25
+    with open(path, "a") as f:
+        f.write("\n")
+
+    reader = read_jsonl_samples(path, BoxesSample)
+    assert next(reader) == _samples()[0]
+    assert list(reader) == _samples()[1:]
+
+
+def test_jsonl_invalid_line(tmp_path: Path) -> None:
+    """Test that invalid lines are reported with their number."""
+    path = tmp_path / "samples.jsonl"
+    write_jsonl_samples(path, _samples(2))
+    with open(path, "a") as f:
+        f.write('{"id": "x"}\n')
+
+    with pytest.raises(ValueError, match=":3:"):
+        list(read_jsonl_samples(path, BoxesSample))
+
+
+def test_mapped_jsonl(tmp_path: Path) -> None:
+    """Test the random access to a memory-mapped JSONL file."""
+    path = tmp_path / "samples.jsonl"
+    samples = _samples()
+    path.write_text(
+        "\n".join(s.model_dump_json() for s in samples[:10])
+        + "\n\n"
+        + "\n".join(s.model_dump_json() for s in samples[10:])
+    )
+
+    with MappedJsonlSamples(path, BoxesSample) as mapped:
+        assert len(mapped) == 25
+        assert mapped[0] == samples[0]
+        assert mapped[-1] == samples[-1]
+        assert list(mapped) == samples
+        with pytest.raises(IndexError):
+            mapped[25]
+
+    (tmp_path / "empty.jsonl").write_text("")
+    with MappedJsonlSamples(tmp_path / "empty.jsonl", BoxesSample) as mapped:
+        assert len(mapped) == 0
+        assert list(mapped) == []
+
+
+def test_parquet_roundtrip(tmp_path: Path) -> None:
+    """Test the Parquet reader across several row groups and nested fields."""
+    path = tmp_path / "samples.parquet"
+    assert write_parquet_samples(path, iter(_samples()), row_group_size=10) == 25
+
+    assert list(read_parquet_samples(path, BoxesSample, batch_size=7)) == _samples()
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet"])
+def test_format_from_suffix(tmp_path: Path, suffix: str) -> None:
+    """Test that the file format is chosen from the suffix."""
+    path = tmp_path / f"samples{suffix}"
+    write_samples(path, _samples())
+    assert list(read_samples(path, BoxesSample)) == _samples()
+
+    with pytest.raises(ValueError):
+        write_samples(tmp_path / "samples.csv", _samples())
@@ -0,0 +1,144 @@
+"""Tests for the sharded evaluation and the local shard coordinator."""
+
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+from docling_metrics_core.evaluation import EvaluationConfig, ExecutorKind
+from docling_metrics_core.sharding import LocalShardCoordinator, select_shard, shard_of
+
+from .length_metric import LengthMetric, LengthSample
+
+
+def _samples(n: int = 50) -> list[LengthSample]:
+    return [LengthSample(id=f"doc_{i}", text="x" * i) for i in range(n)]
+
+
+def _worker(work_dir: str, num_shards: int) -> list[int]:
+    coordinator = LocalShardCoordinator(work_dir, num_shards)
+    return coordinator.run_worker(LengthMetric(), _samples)
+
+
+def test_shard_assignment() -> None:
+    """Test that the assignment is deterministic and partitions the samples."""
+    samples = _samples()
+    assert [shard_of(s.id, 4) for s in samples] == [shard_of(s.id, 4) for s in samples]
+    assert shard_of("doc_7", 1) == 0
+
+    shards = [list(select_shard(samples, i, 4)) for i in range(4)]
+    assert sorted(s.id for shard in shards for s in shard) == sorted(
+        s.id for s in samples
+    )
+    assert all(shards)
+
+    with pytest.raises(ValueError):
+        list(select_shard(samples, 4, 4))
+
+
+@pytest.mark.parametrize(
+    "config", [None, EvaluationConfig(executor=ExecutorKind.THREAD, max_workers=2)]
+)
+def test_sharded_evaluation_matches_single_pass(
+    tmp_path: Path, config: EvaluationConfig
+) -> None:
+    """Test that merging the shards gives the results of a single pass."""
+    metric = LengthMetric()
+    coordinator = LocalShardCoordinator(tmp_path, num_shards=3)
+
+    assert sorted(coordinator.run_worker(metric, _samples, config)) == [0, 1, 2]
+    assert coordinator.claim() is None
+    assert coordinator.aggregate(metric) == metric.aggregate(
+        metric.evaluate_samples(_samples())
+    )
+    assert sorted(r.id for r in coordinator.iter_results(metric)) == sorted(
+        s.id for s in _samples()
+    )
+
+
+def test_merge_requires_all_shards(tmp_path: Path) -> None:
+    """Test that the merge refuses missing shards and shard count mismatches."""
+    metric = LengthMetric()
+    coordinator = LocalShardCoordinator(tmp_path, num_shards=2)
+    shard_index = coordinator.claim()
+    assert shard_index is not None
+    coordinator.evaluate_shard(metric, _samples(), shard_index)
+
+    assert coordinator.pending_shards() == [1]
+    with pytest.raises(RuntimeError):
+        coordinator.aggregate(metric)
+    with pytest.raises(ValueError):
+        LocalShardCoordinator(tmp_path, num_shards=3)
+
+
+def test_stale_claims_are_taken_over(tmp_path: Path) -> None:
+    """Test that the shard of a crashed worker is claimed again once stale."""
+    LocalShardCoordinator(tmp_path, num_shards=1).claim()
+
+    assert LocalShardCoordinator(tmp_path, num_shards=1).claim() is None
+    lock_path = next(tmp_path.glob("*.lock"))
+    os.utime(lock_path, (0, 0))
+    assert LocalShardCoordinator(tmp_path, num_shards=1, stale_after=60).claim() == 0
+
+
+class _RacingCoordinator(LocalShardCoordinator):
+    """Coordinator that waits until the other racer also found the lock stale."""
+
+    def __init__(self, *args: Any, barrier: threading.Barrier, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._barrier = barrier
+
+    def _is_stale(self, lock_path: Path) -> bool:
+        stale = super()._is_stale(lock_path)
+        if lock_path.suffix == ".lock":
+            self._barrier.wait(timeout=10)
+        return stale
+
+
+def test_racing_takeover_of_a_stale_claim(tmp_path: Path) -> None:
+    """Test that a single one of two workers that found a claim stale takes it over."""
+    for attempt in range(10):
+        work_dir = tmp_path / str(attempt)
+        LocalShardCoordinator(work_dir, num_shards=1).claim()
+        os.utime(next(work_dir.glob("*.lock")), (0, 0))
+        barrier = threading.Barrier(2)
+        coordinators = [
+            _RacingCoordinator(work_dir, num_shards=1, stale_after=60, barrier=barrier)
+            for _ in range(2)
+        ]
+
+        with ThreadPoolExecutor(2) as pool:
+            claimed = list(pool.map(LocalShardCoordinator.claim, coordinators))
+
+        assert sorted(claimed, key=str) == [0, None]
+        assert [p.name for p in work_dir.glob("*.lock*")] == ["shard-00000.lock"]
+
+
+def test_claim_is_refreshed_during_evaluation(tmp_path: Path) -> None:
+    """Test that the lock of a shard being evaluated does not become stale."""
+    coordinator = LocalShardCoordinator(tmp_path, num_shards=1, stale_after=1e-6)
+    assert coordinator.claim() == 0
+    lock_path = next(tmp_path.glob("*.lock"))
+    os.utime(lock_path, (0, 0))
+
+    coordinator.evaluate_shard(LengthMetric(), _samples(), 0)
+    assert time.time() - lock_path.stat().st_mtime < 60
+
+
+def test_concurrent_workers(tmp_path: Path) -> None:
+    """Test that concurrent workers evaluate every shard exactly once."""
+    num_shards = 6
+    with ThreadPoolExecutor(3) as pool:
+        claimed = list(pool.map(_worker, [str(tmp_path)] * 3, [num_shards] * 3))
+
+    assert Counter(i for shards in claimed for i in shards) == Counter(
+        range(num_shards)
+    )
+    coordinator = LocalShardCoordinator(tmp_path, num_shards)
+    aggregate = coordinator.aggregate(LengthMetric())
+    assert aggregate.sample_count == 50
+    assert aggregate.total_length == sum(range(50))
@@ -39,6 +39,8 @@ class HelloWorldAggregateResult(BaseAggregateResult):
 class HelloWorldMetric(BaseMetric):
     """A minimal example metric that always returns 1.0, backed by C++."""
 
+    sample_result_type = HelloWorldSampleResult
+
     def evaluate_sample(  # type: ignore[override]
         self, sample: StringInputSample
     ) -> HelloWorldSampleResult:
@@ -50,18 +52,14 @@ class HelloWorldMetric(BaseMetric):
     def aggregate(  # type: ignore[override]
         self, results: Iterable[HelloWorldSampleResult]
     ) -> HelloWorldAggregateResult:
-        results_list = list(results)
-        sample_count = len(results_list)
+        sample_count = 0
+        total_score = 0.0
+        for result in results:
+            sample_count += 1
+            total_score += result.score
         if sample_count == 0:
             return HelloWorldAggregateResult(sample_count=0, mean_score=0.0)
 
-        total_score = sum(r.score for r in results_list)
         return HelloWorldAggregateResult(
             sample_count=sample_count, mean_score=total_score / sample_count
         )
-
-    def evaluate_dataset(  # type: ignore[override]
-        self, sample_pairs: Iterable[StringInputSample]
-    ) -> HelloWorldAggregateResult:
-        results = [self.evaluate_sample(sample) for sample in sample_pairs]
-        return self.aggregate(results)
@@ -1,6 +1,7 @@
 """A hello-world example metric implementation for Docling metrics."""
 
 from docling_metrics_hello_world.hello_world_metric import (
+    HelloWorldAccumulator,
     HelloWorldAggregateResult,
     HelloWorldMetric,
     HelloWorldSampleResult,
@@ -8,6 +9,7 @@ from docling_metrics_hello_world.hello_world_metric import (
 )
 
 __all__ = [
+    "HelloWorldAccumulator",
     "HelloWorldAggregateResult",
     "HelloWorldMetric",
     "HelloWorldSampleResult",
@@ -1,8 +1,9 @@
 """Hello World metric implementation demonstrating the docling-metrics-core interface."""
 
-from typing import Annotated, Iterable
+from typing import Annotated
 
 from docling_metrics_core.base_types import (
+    BaseAccumulator,
     BaseAggregateResult,
     BaseInputSample,
     BaseMetric,
@@ -34,6 +35,46 @@ class HelloWorldAggregateResult(BaseAggregateResult):
     ]
 
 
+class HelloWorldAccumulator(BaseAccumulator):
+    """Running sum of the scores of the evaluated samples."""
+
+    total_score: Annotated[
+        float, Field(description="Sum of the scores of all folded samples")
+    ] = 0.0
+
+    def update(self, result: HelloWorldSampleResult) -> None:  # type: ignore[override]
+        """Fold a single sample result.
+
+        Args:
+            result: Sample evaluation result.
+        """
+        self.sample_count += 1
+        self.total_score += result.score
+
+    def merge(self, other: "HelloWorldAccumulator") -> None:  # type: ignore[override]
+        """Fold the state of another accumulator.
+
+        Args:
+            other: Accumulator of another shard of the dataset.
+        """
+        self.sample_count += other.sample_count
+        self.total_score += other.total_score
+
+    def finalize(self) -> HelloWorldAggregateResult:
+        """Compute the aggregate result.
+
+        Returns:
+            HelloWorldAggregateResult with mean score and sample count.
+        """
+        if self.sample_count == 0:
+            return HelloWorldAggregateResult(sample_count=0, mean_score=0.0)
+
+        return HelloWorldAggregateResult(
+            sample_count=self.sample_count,
+            mean_score=self.total_score / self.sample_count,
+        )
+
+
 class HelloWorldMetric(BaseMetric):
     """A minimal example metric that always returns 1.0.
 
@@ -42,6 +83,8 @@ class HelloWorldMetric(BaseMetric):
     and always produces a score of 1.0 for each sample evaluation.
     """
 
+    sample_result_type = HelloWorldSampleResult
+
     def evaluate_sample(  # type: ignore[override]
         self,
         sample: StringInputSample,
@@ -56,37 +99,10 @@ class HelloWorldMetric(BaseMetric):
         """
         return HelloWorldSampleResult(id=sample.id, score=1.0)
 
-    def aggregate(  # type: ignore[override]
-        self, results: Iterable[HelloWorldSampleResult]
-    ) -> HelloWorldAggregateResult:
-        """Aggregate multiple sample results.
-
-        Args:
-            results: Iterable of sample evaluation results.
-
-        Returns:
-            HelloWorldAggregateResult with mean score and sample count.
-        """
-        results_list = list(results)
-        sample_count = len(results_list)
-        if sample_count == 0:
-            return HelloWorldAggregateResult(sample_count=0, mean_score=0.0)
-
-        total_score = sum(r.score for r in results_list)
-        return HelloWorldAggregateResult(
-            sample_count=sample_count, mean_score=total_score / sample_count
-        )
-
-    def evaluate_dataset(  # type: ignore[override]
-        self, sample_pairs: Iterable[StringInputSample]
-    ) -> HelloWorldAggregateResult:
-        """Evaluate an entire dataset of sample pairs.
-
-        Args:
-            sample_pairs: Iterable of (sample_a, sample_b) tuples.
+    def create_accumulator(self) -> HelloWorldAccumulator:
+        """Create an empty accumulator.
 
         Returns:
-            HelloWorldAggregateResult with aggregated statistics.
+            HelloWorldAccumulator that aggregates into mean score and sample count.
         """
-        results = [self.evaluate_sample(sample) for sample in sample_pairs]
-        return self.aggregate(results)
+        return HelloWorldAccumulator()
@@ -1,6 +1,8 @@
 """Tests for the HelloWorld metric."""
 
+from docling_metrics_core.evaluation import EvaluationConfig, ExecutorKind
 from docling_metrics_hello_world import (
+    HelloWorldAccumulator,
     HelloWorldMetric,
     StringInputSample,
 )
@@ -28,3 +30,38 @@ def test_evaluate_dataset() -> None:
 
     assert aggregate.sample_count == 2
     assert aggregate.mean_score == 1.0
+
+
+def test_merge_accumulators() -> None:
+    """Test that merging the shard accumulators matches a single pass."""
+    metric = HelloWorldMetric()
+    results = [
+        metric.evaluate_sample(
+            StringInputSample(id=str(i), payload_a="a", payload_b="b")
+        )
+        for i in range(5)
+    ]
+
+    shard_a = metric.create_accumulator().update_all(results[:2])
+    shard_b = metric.create_accumulator().update_all(results[2:])
+    shard_b = HelloWorldAccumulator.model_validate_json(shard_b.model_dump_json())
+    shard_a.merge(shard_b)
+
+    assert shard_a.finalize() == metric.aggregate(results)
+    assert shard_a.finalize().sample_count == 5
+
+
+def test_evaluate_dataset_process_pool() -> None:
+    """Test evaluating a dataset on a bounded process pool."""
+    metric = HelloWorldMetric()
+    data = (
+        StringInputSample(id=str(i), payload_a="a", payload_b="b") for i in range(20)
+    )
+    config = EvaluationConfig(
+        executor=ExecutorKind.PROCESS, max_workers=2, max_in_flight=4
+    )
+
+    aggregate = metric.evaluate_dataset(data, config)
+
+    assert aggregate.sample_count == 20
+    assert aggregate.mean_score == 1.0
@@ -45,6 +45,7 @@ def demo():
 
     # mAP metrics
     map_eval = evaluation.dataset_map_layout_evaluation
+    assert map_eval is not None
     print(f"\nmAP:         {map_eval.map:.4f}")
     print(f"mAP per class: {map_eval.map_per_class}")
 
@@ -1,4 +1,5 @@
 from docling_metrics_layout.docling_metrics_layout import (
+    LayoutMetricAccumulator,
     LayoutMetrics,
 )
 from docling_metrics_layout.layout_types import (
@@ -16,6 +17,7 @@ from docling_metrics_layout.layout_types import (
 __all__ = [
     "BboxResolution",
     "DatasetToreLayoutEvaluation",
+    "LayoutMetricAccumulator",
     "LayoutMetricDatasetEvaluation",
     "LayoutMetricSample",
     "LayoutMetricSampleEvaluation",
@@ -2,6 +2,7 @@ import json
 import logging
 from pathlib import Path
 
+from docling_metrics_core.readers import write_samples
 from docling_metrics_layout.layout_types import BboxResolution, LayoutMetricSample
 from docling_metrics_layout.utils.utils import xywh_to_xyxy
 
@@ -78,3 +79,28 @@ def load_layout_samples(
 
     _log.info("Loaded %d samples", len(samples))
     return category_id_to_name, samples
+
+
+def convert_coco_to_samples(
+    gt_coco_fn: Path,
+    preds_coco_fn: Path,
+    samples_fn: Path,
+) -> dict[int, str]:
+    r"""
+    Convert COCO GT and predictions files into a JSONL or Parquet samples file.
+
+    The converted file can be read lazily with `docling_metrics_core.readers`, which
+    avoids loading the whole COCO files for every evaluation.
+
+    Parameters:
+        gt_coco_fn: Path to COCO ground-truth annotations JSON file.
+        preds_coco_fn: Path to COCO predictions JSON file.
+        samples_fn: Path to the `.jsonl` or `.parquet` output file.
+
+    Returns:
+        The category_id_to_name mapping of the GT file.
+    """
+    category_id_to_name, samples = load_layout_samples(gt_coco_fn, preds_coco_fn)
+    write_samples(samples_fn, samples)
+    _log.info("Converted %d samples to: %s", len(samples), samples_fn)
+    return category_id_to_name
@@ -1,11 +1,17 @@
 import logging
 from enum import Enum
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional, Sequence
 
+import numpy as np
 from docling_metrics_core.base_types import (
+    BaseAccumulator,
     BaseMetric,
 )
+from docling_metrics_core.cache import cached_batch_evaluation, cached_sample_evaluation
+from docling_metrics_core.checkpoint import CheckpointStore
+from docling_metrics_core.evaluation import EvaluationConfig
+from pydantic import field_serializer, model_validator
 
 from docling_metrics_layout.layout_types import (
     DatasetToreLayoutEvaluation,
@@ -19,6 +25,9 @@ from docling_metrics_layout.layout_types import (
 from docling_metrics_layout.map.map_layout_evaluator import (
     MAPLayoutEvaluator,
 )
+from docling_metrics_layout.tore.multi_label_confusion_matrix import (
+    MultiLabelConfusionMatrix,
+)
 from docling_metrics_layout.tore.tore_layout_evaluator import (
     ToreLayoutEvaluator,
 )
@@ -34,11 +43,83 @@ class LayoutMetricsMode(str, Enum):
     CPP = "C++"
 
 
+class LayoutMetricAccumulator(BaseAccumulator):
+    r"""
+    Running sum of the TORE page confusion matrices
+
+    The dataset-level mAP cannot be derived from the page evaluations, hence the
+    finalized result contains only the TORE evaluation and no page evaluations.
+    """
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    matrix_id_to_name: dict[int, str]
+    num_pixels: int = 0
+    confusion_matrix: Optional[np.ndarray] = None
+
+    @field_serializer("confusion_matrix")
+    def serialize_confusion_matrix(
+        self, confusion_matrix: Optional[np.ndarray]
+    ) -> Optional[list]:
+        return None if confusion_matrix is None else confusion_matrix.tolist()
+
+    @model_validator(mode="before")
+    @classmethod
+    def deserialize_arrays(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("confusion_matrix") is not None:
+            data["confusion_matrix"] = np.asarray(data["confusion_matrix"])
+        return data
+
+    def update(self, result: LayoutMetricSampleEvaluation) -> None:  # type: ignore[override]
+        r"""Add the confusion matrix of one page"""
+        page_tore_evaluation = result.page_tore_evaluation
+        self.sample_count += 1
+        self.num_pixels += page_tore_evaluation.num_pixels
+        self._add_confusion_matrix(
+            page_tore_evaluation.matrix_evaluation.detailed.confusion_matrix
+        )
+
+    def merge(self, other: "LayoutMetricAccumulator") -> None:  # type: ignore[override]
+        r"""Add the confusion matrix and the counters of another accumulator"""
+        self.sample_count += other.sample_count
+        self.num_pixels += other.num_pixels
+        if other.confusion_matrix is not None:
+            self._add_confusion_matrix(other.confusion_matrix)
+
+    def finalize(self) -> LayoutMetricDatasetEvaluation:
+        r"""Compute the TORE metrics on the summed up confusion matrix"""
+        confusion_matrix = self.confusion_matrix
+        if confusion_matrix is None:
+            num_categories = len(self.matrix_id_to_name)
+            confusion_matrix = np.zeros((num_categories, num_categories))
+
+        mlcm = MultiLabelConfusionMatrix(validation_mode="disabled")
+        ds_tore_evaluation = DatasetToreLayoutEvaluation(
+            num_pages=self.sample_count,
+            num_pixels=self.num_pixels,
+            matrix_evaluation=mlcm.compute_metrics(
+                confusion_matrix, self.matrix_id_to_name
+            ),
+            page_evaluations={},
+        )
+        return LayoutMetricDatasetEvaluation(
+            sample_count=self.sample_count,
+            dataset_tore_evaluation=ds_tore_evaluation,
+        )
+
+    def _add_confusion_matrix(self, confusion_matrix: np.ndarray) -> None:
+        if self.confusion_matrix is None:
+            self.confusion_matrix = np.zeros(confusion_matrix.shape)
+        self.confusion_matrix += confusion_matrix
+
+
 class LayoutMetrics(BaseMetric):
     r"""
     Various text metrics
     """
 
+    sample_result_type = LayoutMetricSampleEvaluation
+
     def __init__(
         self,
         category_id_to_name: dict[int, str],
@@ -64,6 +145,7 @@ class LayoutMetrics(BaseMetric):
         self._tore_evaluator = ToreLayoutEvaluator(category_id_to_name, concurrency)
         self._map_evaluator = MAPLayoutEvaluator(category_id_to_name)
 
+    @cached_sample_evaluation
     def evaluate_sample(
         self, sample: LayoutMetricSample
     ) -> LayoutMetricSampleEvaluation:
@@ -81,23 +163,57 @@ class LayoutMetrics(BaseMetric):
         )
         return sample_evaluation
 
-    def aggregate(
-        self, results: Iterable[LayoutMetricSampleEvaluation]
-    ) -> Optional[LayoutMetricDatasetEvaluation]:
-        r""" """
-        return None
+    @cached_batch_evaluation
+    def evaluate_samples(  # type: ignore[override]
+        self, samples: Sequence[LayoutMetricSample]
+    ) -> list[LayoutMetricSampleEvaluation]:
+        r"""Evaluate a batch of samples, the mAP pages share one processor"""
+        page_map_layout_evaluations = self._map_evaluator.evaluate_samples(samples)
+        return [
+            LayoutMetricSampleEvaluation(
+                id=sample.id,
+                page_tore_evaluation=self._evaluate_tore_sample(sample),
+                page_map_layout_evaluation=page_map_layout_evaluation,
+            )
+            for sample, page_map_layout_evaluation in zip(
+                samples, page_map_layout_evaluations
+            )
+        ]
+
+    def create_accumulator(self) -> LayoutMetricAccumulator:
+        r"""Create an empty accumulator of the TORE confusion matrices"""
+        return LayoutMetricAccumulator(
+            matrix_id_to_name=self._tore_evaluator.matrix_id_to_name
+        )
+
+    def metric_config(self) -> dict[str, Any]:
+        r"""The category names appear in the confusion matrices of the results"""
+        return {"category_id_to_name": self._category_id_to_name}
 
-    def evaluate_dataset(
-        self, samples: Iterable[LayoutMetricSample]
+    def evaluate_dataset(  # type: ignore[override]
+        self,
+        samples: Iterable[LayoutMetricSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
     ) -> LayoutMetricDatasetEvaluation:
-        r"""Evaluate a dataset with TORE and mAP metrics"""
+        r"""
+        Evaluate a dataset with TORE and mAP metrics
+
+        The dataset-level mAP needs all pages at once, hence the samples are
+        materialized. The TORE pages are fanned out according to `config`, which
+        defaults to a process pool with `concurrency` workers. With a `checkpoint`
+        store, only the TORE pages that are new or changed since the last run are
+        evaluated.
+        """
         sample_list = list(samples)
 
         # Evaluate mAP metrics
         ds_map_layout_evaluation = self._evaluate_map_dataset(sample_list)
 
         # Evaluate TORE metrics
-        ds_tore_evaluation = self._evaluate_tore_dataset(sample_list)
+        ds_tore_evaluation = self._evaluate_tore_dataset(
+            sample_list, config, checkpoint
+        )
 
         # Save export
         reports: list[Path] = []
@@ -129,11 +245,14 @@ class LayoutMetrics(BaseMetric):
         return self._map_evaluator.evaluate_sample(sample)
 
     def _evaluate_tore_dataset(
-        self, samples: list[LayoutMetricSample]
+        self,
+        samples: list[LayoutMetricSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
     ) -> DatasetToreLayoutEvaluation:
         r"""Evaluate TORE for a dataset"""
         _log.info("Evaluate TORE metrics for a dataset")
-        return self._tore_evaluator.evaluate_dataset(samples)
+        return self._tore_evaluator.evaluate_dataset(samples, config, checkpoint)
 
     def _evaluate_map_dataset(
         self, samples: list[LayoutMetricSample]
@@ -7,7 +7,7 @@ from docling_metrics_core.base_types import (
     BaseInputSample,
     BaseSampleResult,
 )
-from pydantic import BaseModel, model_serializer, model_validator
+from pydantic import BaseModel, field_serializer, model_validator
 
 
 class DatasetStatistics(BaseModel):
@@ -58,13 +58,12 @@ class MultiLabelMatrixMetrics(BaseModel):
 
     agg_metrics: MultiLabelMatrixAggMetrics
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, serializer: Any) -> dict:
-        data = serializer(self)
-        for field_name, field_value in self.__dict__.items():
-            if isinstance(field_value, np.ndarray):
-                data[field_name] = field_value.tolist()
-        return data
+    @field_serializer(
+        "confusion_matrix", "precision_matrix", "recall_matrix", "f1_matrix"
+    )
+    def serialize_arrays(self, array: np.ndarray) -> list:
+        # Field serializers also apply to the JSON mode, which rejects numpy arrays
+        return array.tolist()
 
     @model_validator(mode="before")
     @classmethod
@@ -148,5 +147,6 @@ class LayoutMetricDatasetEvaluation(BaseAggregateResult):
     r"""Layout evaluation for the entire dataset"""
 
     dataset_tore_evaluation: DatasetToreLayoutEvaluation
-    dataset_map_layout_evaluation: MAPDatasetLayoutEvaluation
+    # None when aggregated from the page evaluations, mAP needs all the pages
+    dataset_map_layout_evaluation: Optional[MAPDatasetLayoutEvaluation] = None
     reports: Optional[list[Path]] = None
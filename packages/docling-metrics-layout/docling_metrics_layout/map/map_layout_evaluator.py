@@ -1,7 +1,8 @@
 import logging
-from typing import Iterable
+from typing import Iterable, Sequence
 
 import torch
+from docling_metrics_core.profiling import stage
 from docling_metrics_layout.layout_types import (
     LayoutMetricSample,
     MAPDatasetLayoutEvaluation,
@@ -31,63 +32,54 @@ class MAPLayoutEvaluator:
         r"""
         Evaluation of a single page
         """
-        # Extract the targets, predictions from the samples
-        targets = []
-        predictions = []
-        self._extract_from_sample(sample, targets, predictions)
+        return self.evaluate_samples([sample])[0]
 
-        # Compute mAP
-        map_processor = self._get_map_processor()
-        map_processor.update(preds=predictions, target=targets)
-        map_result = map_processor.compute()
+    def evaluate_samples(
+        self,
+        samples: Sequence[LayoutMetricSample],
+    ) -> list[MAPPageLayoutEvaluation]:
+        r"""
+        Evaluation of a batch of pages
 
-        # Prepare return object with all metrics
-        result = MAPPageLayoutEvaluation(
-            id=sample.id, **self._export_as_map_metrics(map_result).__dict__
-        )
-        return result
+        A single MeanAveragePrecision processor is reset and reused across the pages
+        instead of being constructed for each one of them.
+        """
+        targets: list = []
+        predictions: list = []
+        for sample in samples:
+            self._extract_from_sample(sample, targets, predictions)
+        return self._evaluate_pages(samples, targets, predictions)
 
     def evaluate_dataset(
         self, samples: Iterable[LayoutMetricSample]
     ) -> MAPDatasetLayoutEvaluation:
         r"""Evaluate dataset and compute mAP metrics for all pages"""
-        ds_targets = []
-        ds_predictions = []
-        page_evaluations: dict[str, MAPPageLayoutEvaluation] = {}
+        sample_list = list(samples)
+
+        # Extract the targets and predictions once for the page and dataset levels
+        ds_targets: list = []
+        ds_predictions: list = []
+        for sample in sample_list:
+            self._extract_from_sample(sample, ds_targets, ds_predictions)
 
+        # Compute page-level metrics
+        page_evaluations: dict[str, MAPPageLayoutEvaluation] = {}
         map_values: list[float] = []
         map_50_values: list[float] = []
         map_75_values: list[float] = []
-
-        for sample in samples:
-            # Extract targets and predictions for this page
-            page_targets = []
-            page_predictions = []
-            self._extract_from_sample(sample, page_targets, page_predictions)
-
-            # Accumulate for dataset-level metrics
-            ds_targets.extend(page_targets)
-            ds_predictions.extend(page_predictions)
-
-            # Compute page-level metrics
-            map_processor = self._get_map_processor()
-            map_processor.update(preds=page_predictions, target=page_targets)
-            page_map_result = map_processor.compute()
-
-            page_map_metrics = self._export_as_map_metrics(page_map_result)
-            page_evaluation = MAPPageLayoutEvaluation(
-                id=sample.id, **page_map_metrics.__dict__
-            )
-            page_evaluations[sample.id] = page_evaluation
-
-            map_values.append(page_map_metrics.map)
-            map_50_values.append(page_map_metrics.map_50)
-            map_75_values.append(page_map_metrics.map_75)
+        for page_evaluation in self._evaluate_pages(
+            sample_list, ds_targets, ds_predictions
+        ):
+            page_evaluations[page_evaluation.id] = page_evaluation
+            map_values.append(page_evaluation.map)
+            map_50_values.append(page_evaluation.map_50)
+            map_75_values.append(page_evaluation.map_75)
 
         # Compute dataset-level metrics
-        map_processor = self._get_map_processor()
-        map_processor.update(preds=ds_predictions, target=ds_targets)
-        map_result = map_processor.compute()
+        with stage("layout.map", pages=len(sample_list)):
+            map_processor = self._get_map_processor()
+            map_processor.update(preds=ds_predictions, target=ds_targets)
+            map_result = map_processor.compute()
 
         ds_evaluation = MAPDatasetLayoutEvaluation(
             page_evaluations=page_evaluations,
@@ -98,6 +90,31 @@ class MAPLayoutEvaluator:
         )
         return ds_evaluation
 
+    def _evaluate_pages(
+        self,
+        samples: Sequence[LayoutMetricSample],
+        targets: list,
+        predictions: list,
+    ) -> list[MAPPageLayoutEvaluation]:
+        r"""
+        Compute the page-level metrics with one reusable processor
+
+        targets, predictions: One entry per sample as populated by _extract_from_sample
+        """
+        page_evaluations: list[MAPPageLayoutEvaluation] = []
+        map_processor = self._get_map_processor()
+        for sample, page_target, page_prediction in zip(samples, targets, predictions):
+            with stage("layout.map", pages=1):
+                map_processor.reset()
+                map_processor.update(preds=[page_prediction], target=[page_target])
+                page_map_result = map_processor.compute()
+
+            page_map_metrics = self._export_as_map_metrics(page_map_result)
+            page_evaluations.append(
+                MAPPageLayoutEvaluation(id=sample.id, **page_map_metrics.__dict__)
+            )
+        return page_evaluations
+
     def _extract_from_sample(
         self,
         sample: LayoutMetricSample,
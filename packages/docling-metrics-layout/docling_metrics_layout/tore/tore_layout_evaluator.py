@@ -1,9 +1,16 @@
 import logging
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
 import numpy as np
+from docling_metrics_core.checkpoint import CheckpointStore, checkpointed_map
+from docling_metrics_core.evaluation import (
+    EvaluationConfig,
+    ExecutorKind,
+    parallel_map,
+)
+from docling_metrics_core.profiling import stage
 from tqdm import tqdm  # type: ignore
 
 from docling_metrics_layout.layout_types import (
@@ -42,29 +49,51 @@ def evaluate_page(
     page_metrics
     """
     # Make binary representations
-    gt_binary = mlcm.make_binary_representation(pg_width, pg_height, page_resolutions_a)
-    if page_resolutions_b is not None:
-        preds_binary = mlcm.make_binary_representation(
-            pg_width, pg_height, page_resolutions_b
+    with stage("layout.rasterize"):
+        gt_binary = mlcm.make_binary_representation(
+            pg_width, pg_height, page_resolutions_a
         )
-    else:
-        preds_binary = np.ones((pg_height, pg_width), dtype=np.uint64)
+        if page_resolutions_b is not None:
+            preds_binary = mlcm.make_binary_representation(
+                pg_width, pg_height, page_resolutions_b
+            )
+        else:
+            preds_binary = np.ones((pg_height, pg_width), dtype=np.uint64)
 
     # Compute confusion matrix
     matrix_categories_ids: list[int] = list(matrix_id_to_name.keys())
-    confusion_matrix = mlcm.generate_confusion_matrix(
-        gt_binary, preds_binary, matrix_categories_ids
-    )
+    with stage("layout.confusion_matrix"):
+        confusion_matrix = mlcm.generate_confusion_matrix(
+            gt_binary, preds_binary, matrix_categories_ids
+        )
 
     # Compute metrics
-    page_metrics: MultiLabelMatrixEvaluation = mlcm.compute_metrics(
-        confusion_matrix, matrix_id_to_name
-    )
+    with stage("layout.matrix_metrics"):
+        page_metrics: MultiLabelMatrixEvaluation = mlcm.compute_metrics(
+            confusion_matrix, matrix_id_to_name
+        )
     page_pixels = pg_width * pg_height
 
     return id, page_pixels, page_metrics
 
 
+def evaluate_sample_page(
+    mlcm: MultiLabelConfusionMatrix,
+    matrix_id_to_name: dict[int, str],
+    sample: LayoutMetricSample,
+) -> tuple[str, int, MultiLabelMatrixEvaluation]:
+    r"""Compute the confusion matrix and the metrics for the page of one sample"""
+    return evaluate_page(
+        mlcm,
+        sample.id,
+        sample.page_width,
+        sample.page_height,
+        matrix_id_to_name,
+        sample.page_resolution_a,
+        sample.page_resolution_b,
+    )
+
+
 class ToreLayoutEvaluator:
     r"""
     TORE: Taxonomy-invariant Object Recognition Evaluation
@@ -105,6 +134,11 @@ class ToreLayoutEvaluator:
             self._matrix_id_to_category_id,
         ) = self._build_matrix_categories()
 
+    @property
+    def matrix_id_to_name(self) -> dict[int, str]:
+        r"""Mapping of the confusion matrix ids to category names, Background is 0"""
+        return self._matrix_id_to_name
+
     @staticmethod
     def evaluation_filenames(save_root: Path) -> dict[str, Path]:
         r"""
@@ -167,9 +201,27 @@ class ToreLayoutEvaluator:
         )
 
     def evaluate_dataset(
-        self, samples: Iterable[LayoutMetricSample]
+        self,
+        samples: Iterable[LayoutMetricSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
     ) -> DatasetToreLayoutEvaluation:
-        r""" """
+        r"""
+        Evaluate the pages in parallel and sum up their confusion matrices.
+
+        Parameters:
+        -----------
+        samples: The pages are pulled lazily from the iterable
+        config: Evaluation engine configuration. Defaults to a process pool with
+                `concurrency` workers
+        checkpoint: Optional store of the page evaluations. The pages already
+                    evaluated with the same content are not evaluated again
+        """
+        if config is None:
+            config = EvaluationConfig(
+                executor=ExecutorKind.PROCESS, max_workers=self._concurrency
+            )
+
         matrix_categories_ids: list[int] = list(self._matrix_id_to_name.keys())
         num_categories = len(matrix_categories_ids)
         ds_confusion_matrix = np.zeros((num_categories, num_categories))
@@ -177,66 +229,30 @@ class ToreLayoutEvaluator:
             str, PageToreEvaluation
         ] = {}  # Key is doc_id-page-no
         ds_num_pixels = 0
-        pages_detailed_f1: list[
-            float
-        ] = []  # Gather f1 score/image when evaluated on all classes
-        pages_collapsed_f1: list[
-            float
-        ] = []  # Gather f1 score/image when evaluated on collapsed classes
-
-        evaluated_samples = 0
-        with ProcessPoolExecutor(max_workers=self._concurrency) as executor:
-            futures: list[Future] = []
-
-            # Submit pages for execution
-            _log.info("Submitting the documents for evaluation...")
-            for sample in samples:
-                evaluated_samples += 1
-
-                # Submit the page for computation
-                futures.append(
-                    executor.submit(
-                        evaluate_page,
-                        self._mlcm,
-                        sample.id,
-                        sample.page_width,
-                        sample.page_height,
-                        self._matrix_id_to_name,
-                        sample.page_resolution_a,
-                        sample.page_resolution_b,
-                    )
-                )
-
-            # Collect the futures
-            _log.info("Collecting the pages for evaluations...")
-            for future in tqdm(
-                as_completed(futures),
-                desc="Multi-label Matrix Layout evaluations",
-                ncols=120,
-                total=len(futures),
-            ):
-                page_metrics: MultiLabelMatrixEvaluation
-                doc_page_id, page_pixels, page_metrics = future.result()
-
-                page_confusion_matrix: np.ndarray = (
-                    page_metrics.detailed.confusion_matrix
-                )
-                ds_num_pixels += page_pixels
-                ds_confusion_matrix += page_confusion_matrix
-                page_evaluation = PageToreEvaluation(
-                    id=doc_page_id,
-                    num_pixels=page_pixels,
-                    matrix_evaluation=page_metrics,
-                )
-                all_pages_evaluations[doc_page_id] = page_evaluation
-
-                # Update f1 lists
-                pages_detailed_f1.append(
-                    page_metrics.detailed.agg_metrics.classes_f1_mean
-                )
-                pages_collapsed_f1.append(
-                    page_metrics.collapsed.agg_metrics.classes_f1_mean
-                )
+
+        page_evaluations: Iterator[PageToreEvaluation]
+        if checkpoint is None:
+            page_evaluations = self._stream_page_evaluations(samples, config)
+        else:
+            page_evaluations = checkpointed_map(
+                lambda misses: self._stream_page_evaluations(misses, config),
+                samples,
+                checkpoint,
+                self.result_namespace(),
+                PageToreEvaluation,
+            )
+
+        for page_evaluation in tqdm(
+            page_evaluations,
+            desc="Multi-label Matrix Layout evaluations",
+            ncols=120,
+        ):
+            page_confusion_matrix: np.ndarray = (
+                page_evaluation.matrix_evaluation.detailed.confusion_matrix
+            )
+            ds_num_pixels += page_evaluation.num_pixels
+            ds_confusion_matrix += page_confusion_matrix
+            all_pages_evaluations[page_evaluation.id] = page_evaluation
 
         # Compute metrics for the dataset
         ds_matrix_evaluation: MultiLabelMatrixEvaluation = self._mlcm.compute_metrics(
@@ -245,7 +261,6 @@ class ToreLayoutEvaluator:
         )
 
         ds_evaluation = DatasetToreLayoutEvaluation(
-            evaluated_samples=evaluated_samples,
             num_pages=len(all_pages_evaluations),
             num_pixels=ds_num_pixels,
             matrix_evaluation=ds_matrix_evaluation,
@@ -254,6 +269,31 @@ class ToreLayoutEvaluator:
 
         return ds_evaluation
 
+    def result_namespace(self) -> str:
+        r"""
+        Namespace of the page evaluations in a checkpoint store
+        """
+        categories = ",".join(self._matrix_id_to_name.values())
+        return f"{type(self).__module__}.{type(self).__qualname__}[{categories}]"
+
+    def _stream_page_evaluations(
+        self,
+        samples: Iterable[LayoutMetricSample],
+        config: EvaluationConfig,
+    ) -> Iterator[PageToreEvaluation]:
+        r"""
+        Evaluate the pages in parallel and yield their evaluations in input order
+        """
+        evaluate_fn = partial(evaluate_sample_page, self._mlcm, self._matrix_id_to_name)
+        for doc_page_id, page_pixels, page_metrics in parallel_map(
+            evaluate_fn, samples, config
+        ):
+            yield PageToreEvaluation(
+                id=doc_page_id,
+                num_pixels=page_pixels,
+                matrix_evaluation=page_metrics,
+            )
+
     def export_evaluations(
         self,
         ds_evaluation: DatasetToreLayoutEvaluation,
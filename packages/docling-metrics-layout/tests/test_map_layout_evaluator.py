@@ -204,5 +204,37 @@ def test_map_layout_evaluations():
     assert dataset_result.map_75_stats.std == 0.0
 
 
+def test_map_layout_evaluate_samples():
+    r"""Test that the batched evaluation matches the per-page evaluation."""
+    test_data_path = TEST_DATA_DIR / "dlnv1_t1_preds_score.json"
+    with open(test_data_path) as f:
+        test_data = json.load(f)
+
+    category_ids = set()
+    for bbox in test_data["page_resolution_a"] + test_data["page_resolution_b"]:
+        category_ids.add(bbox["category_id"])
+    category_id_to_name = {cid: f"category_{cid}" for cid in sorted(category_ids)}
+
+    # Two different pages: the original and one with swapped, truncated resolutions
+    sample = LayoutMetricSample.model_validate(test_data)
+    swapped_sample = LayoutMetricSample(
+        id=f"{sample.id}_swapped",
+        page_width=sample.page_width,
+        page_height=sample.page_height,
+        page_resolution_a=sample.page_resolution_b,
+        page_resolution_b=sample.page_resolution_a[:-3],
+    )
+    samples = [sample, swapped_sample, sample]
+
+    evaluator = MAPLayoutEvaluator(category_id_to_name=category_id_to_name)
+    batch_results = evaluator.evaluate_samples(samples)
+
+    assert len(batch_results) == len(samples)
+    for page_sample, batch_result in zip(samples, batch_results):
+        assert batch_result == evaluator.evaluate_sample(page_sample)
+    assert batch_results[0] != batch_results[1]
+
+
 if __name__ == "__main__":
     test_map_layout_evaluations()
+    test_map_layout_evaluate_samples()
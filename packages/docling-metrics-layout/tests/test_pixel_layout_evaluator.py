@@ -2,6 +2,15 @@ import json
 import tempfile
 from pathlib import Path
 
+import numpy as np
+import pytest
+from docling_metrics_core.checkpoint import CheckpointStore
+from docling_metrics_core.evaluation import EvaluationConfig
+from docling_metrics_core.readers import read_samples, write_samples
+from docling_metrics_layout.docling_metrics_layout import (
+    LayoutMetricAccumulator,
+    LayoutMetrics,
+)
 from docling_metrics_layout.layout_types import (
     BboxResolution,
     DatasetToreLayoutEvaluation,
@@ -204,3 +213,108 @@ def test_pixel_layout_evaluator():
         report_filenames = ToreLayoutEvaluator.evaluation_filenames(tmp_root)
         excel_report_fn = report_filenames["excel"]
         assert excel_report_fn.is_file(), f"Missing report at {excel_report_fn}"
+
+
+def test_layout_metric_accumulator():
+    r"""Test that merging per-page TORE accumulators matches the dataset evaluation."""
+    test_data_path = TEST_DATA_DIR / "dlnv1_t1_preds_score.json"
+    with open(test_data_path) as f:
+        test_data = json.load(f)
+
+    category_ids = set()
+    for bbox in test_data["page_resolution_a"] + test_data["page_resolution_b"]:
+        category_ids.add(bbox["category_id"])
+    category_id_to_name = {cid: f"category_{cid}" for cid in sorted(category_ids)}
+
+    # Two pages: the original and one with swapped resolutions
+    sample = LayoutMetricSample.model_validate(test_data)
+    swapped_sample = LayoutMetricSample(
+        id=f"{sample.id}_swapped",
+        page_width=sample.page_width,
+        page_height=sample.page_height,
+        page_resolution_a=sample.page_resolution_b,
+        page_resolution_b=sample.page_resolution_a,
+    )
+    samples = [sample, swapped_sample]
+
+    layout_metrics = LayoutMetrics(category_id_to_name)
+    ds_tore_evaluation = ToreLayoutEvaluator(
+        category_id_to_name, concurrency=1
+    ).evaluate_dataset(samples)
+
+    merged = layout_metrics.create_accumulator()
+    for page_sample in samples:
+        shard = layout_metrics.create_accumulator()
+        shard.update(layout_metrics.evaluate_sample(page_sample))
+        merged.merge(
+            LayoutMetricAccumulator.model_validate_json(shard.model_dump_json())
+        )
+    ds_evaluation = merged.finalize()
+
+    assert ds_evaluation.sample_count == 2
+    assert ds_evaluation.dataset_map_layout_evaluation is None
+    tore_evaluation = ds_evaluation.dataset_tore_evaluation
+    assert tore_evaluation.num_pages == ds_tore_evaluation.num_pages
+    assert tore_evaluation.num_pixels == ds_tore_evaluation.num_pixels
+    assert np.array_equal(
+        tore_evaluation.matrix_evaluation.detailed.confusion_matrix,
+        ds_tore_evaluation.matrix_evaluation.detailed.confusion_matrix,
+    )
+    assert (
+        tore_evaluation.matrix_evaluation.detailed.agg_metrics
+        == ds_tore_evaluation.matrix_evaluation.detailed.agg_metrics
+    )
+
+
+def test_tore_checkpointed_dataset_evaluation(tmp_path: Path):
+    r"""Test that a checkpointed re-run reuses the stored page evaluations."""
+    test_data_path = TEST_DATA_DIR / "dlnv1_t1_preds_score.json"
+    with open(test_data_path) as f:
+        test_data = json.load(f)
+
+    category_ids = set()
+    for bbox in test_data["page_resolution_a"] + test_data["page_resolution_b"]:
+        category_ids.add(bbox["category_id"])
+    category_id_to_name = {cid: f"category_{cid}" for cid in sorted(category_ids)}
+
+    sample = LayoutMetricSample.model_validate(test_data)
+    swapped_sample = sample.model_copy(
+        update={
+            "id": f"{sample.id}_swapped",
+            "page_resolution_a": sample.page_resolution_b,
+            "page_resolution_b": sample.page_resolution_a,
+        }
+    )
+    samples = [sample, swapped_sample]
+
+    evaluator = ToreLayoutEvaluator(category_id_to_name, concurrency=1)
+    expected = evaluator.evaluate_dataset(samples)
+
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        evaluator.evaluate_dataset(samples, checkpoint=store)
+        assert store.count(evaluator.result_namespace()) == 2
+
+    with CheckpointStore(tmp_path / "checkpoint.sqlite") as store:
+        resumed = evaluator.evaluate_dataset(
+            samples, EvaluationConfig(), checkpoint=store
+        )
+
+    assert resumed.num_pages == expected.num_pages
+    assert resumed.num_pixels == expected.num_pixels
+    assert np.array_equal(
+        resumed.matrix_evaluation.detailed.confusion_matrix,
+        expected.matrix_evaluation.detailed.confusion_matrix,
+    )
+    assert resumed.page_evaluations.keys() == expected.page_evaluations.keys()
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet"])
+def test_layout_samples_from_file(tmp_path: Path, suffix: str):
+    r"""Test that layout samples stream from JSONL and Parquet files unchanged."""
+    with open(TEST_DATA_DIR / "dlnv1_t1_preds_score.json") as f:
+        sample = LayoutMetricSample.model_validate(json.load(f))
+    samples = [sample.model_copy(update={"id": f"{sample.id}_{i}"}) for i in range(3)]
+
+    samples_fn = tmp_path / f"samples{suffix}"
+    assert write_samples(samples_fn, samples) == 3
+    assert list(read_samples(samples_fn, LayoutMetricSample)) == samples
@@ -45,6 +45,17 @@ PYBIND11_MODULE(docling_metric_table_cpp, m) {
            "    bracket_b: Input B in bracket notation\n\n"
            "Returns:\n"
            "    TEDSSampleEvaluation: Evaluation result containing TEDS score and metadata")
+      .def("evaluate_samples", &TEDSManager::evaluate_samples, py::arg("ids"),
+           py::arg("brackets_a"), py::arg("brackets_b"),
+           "Evaluate a batch of samples in one call\n\n"
+           "Args:\n"
+           "    ids: Sample identifiers\n"
+           "    brackets_a: Inputs A in bracket notation\n"
+           "    brackets_b: Inputs B in bracket notation\n\n"
+           "Returns:\n"
+           "    list[TEDSSampleEvaluation]: Evaluation results in the order of the inputs\n\n"
+           "Raises:\n"
+           "    ValueError: If the input lists have different sizes")
       .def("evaluate_html_sample", &TEDSManager::evaluate_html_sample, py::arg("id"),
            py::arg("html_a"), py::arg("html_b"), py::arg("structure_only"),
            "Evaluate a single sample from HTML format\n\n"
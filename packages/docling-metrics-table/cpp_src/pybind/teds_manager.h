@@ -2,8 +2,10 @@
 #include <algorithm>
 #include <iostream>
 #include <memory>
+#include <stdexcept>
 #include <string>
 #include <unordered_map>
+#include <vector>
 
 #include "apted_tree_index.h"
 #include "bracket_notation_parser.h"
@@ -102,6 +104,24 @@ public:
     return eval_sample;
   }
 
+  /**
+   * Evaluate a batch of samples. The i-th elements of the input vectors form one sample
+   */
+  std::vector<TEDSSampleEvaluation> evaluate_samples(const std::vector<std::string> &ids,
+                                                     const std::vector<std::string> &brackets_a,
+                                                     const std::vector<std::string> &brackets_b) {
+    if (ids.size() != brackets_a.size() || ids.size() != brackets_b.size()) {
+      throw std::invalid_argument("The ids, brackets_a and brackets_b must have the same size");
+    }
+
+    std::vector<TEDSSampleEvaluation> eval_samples;
+    eval_samples.reserve(ids.size());
+    for (std::size_t i = 0; i < ids.size(); ++i) {
+      eval_samples.push_back(evaluate_sample(ids[i], brackets_a[i], brackets_b[i]));
+    }
+    return eval_samples;
+  }
+
   void aggregate() {}
 
   TEDSDatasetEvaluation evaluate_dataset() {
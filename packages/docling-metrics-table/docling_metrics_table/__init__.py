@@ -1,6 +1,7 @@
 from docling_metrics_table.docling_metrics_table import (
     GriTSSampleEvaluation,
     TableMetric,
+    TableMetricAccumulator,
     TableMetricBracketInputSample,
     TableMetricCell,
     TableMetricCellsInputSample,
@@ -14,6 +15,7 @@ __all__ = [
     "GriTSSampleEvaluation",
     "TEDSSampleEvaluation",
     "TableMetric",
+    "TableMetricAccumulator",
     "TableMetricBracketInputSample",
     "TableMetricCell",
     "TableMetricCellsInputSample",
@@ -0,0 +1,135 @@
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from docling_metrics_core.benchmark import (
+    BenchmarkConfig,
+    BenchmarkReport,
+    compare_reports,
+    run_benchmark,
+    synthetic_token_pairs,
+)
+from docling_metrics_table.docling_metrics_table import (
+    TableMetric,
+    TableMetricHTMLInputSample,
+    TableMetricKind,
+)
+
+_log = logging.getLogger(__name__)
+
+_NUM_COLUMNS = 5
+
+
+def tokens_to_html(tokens: list[str], num_columns: int = _NUM_COLUMNS) -> str:
+    r"""
+    Lay out the tokens as the cells of a table with `num_columns` columns
+
+    The last row is padded with empty cells to keep the grid rectangular.
+    """
+    padding = [""] * (-len(tokens) % num_columns)
+    cells = tokens + padding
+    rows = [
+        "<tr>"
+        + "".join(f"<td>{cell}</td>" for cell in cells[i : i + num_columns])
+        + "</tr>"
+        for i in range(0, len(cells), num_columns)
+    ]
+    return "<table>" + "".join(rows) + "</table>"
+
+
+def make_samples(
+    count: int, num_cells: int, error_rate: float, seed: int = 0
+) -> list[TableMetricHTMLInputSample]:
+    r"""
+    Generate table pairs of `num_cells` cells, the second one with edited cells
+    """
+    return [
+        TableMetricHTMLInputSample(
+            id=f"synthetic_{num_cells}_{i}",
+            html_a=tokens_to_html(tokens_a),
+            html_b=tokens_to_html(tokens_b),
+        )
+        for i, (tokens_a, tokens_b) in enumerate(
+            synthetic_token_pairs(count, num_cells, error_rate, seed=seed)
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Table Metrics benchmark on synthetic inputs"
+    )
+    parser.add_argument(
+        "-s",
+        "--save_root",
+        type=Path,
+        required=True,
+        help="Path to the directory to save the benchmark report",
+    )
+    parser.add_argument("-n", "--count", type=int, default=50, help="Tables per size")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[25, 100, 400],
+        help="Number of cells of the generated tables",
+    )
+    parser.add_argument(
+        "-e", "--error_rate", type=float, default=0.1, help="Edit rate of the cells"
+    )
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline report to compare with. Exit with 1 on regressions",
+    )
+    parser.add_argument("-t", "--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    # Configure logger
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    logging.basicConfig(level=logging.INFO, format=log_format)
+
+    config = BenchmarkConfig(warmup=args.warmup, repeats=args.repeats)
+    report = BenchmarkReport()
+    for kind in TableMetricKind:
+        metric = TableMetric(metrics=[kind])
+        for num_cells in args.sizes:
+            samples = make_samples(args.count, num_cells, args.error_rate)
+            result = run_benchmark(
+                f"table_{kind.value}_{num_cells}", metric, samples, config
+            )
+            report.add(result)
+            _log.info(
+                "%s | p50: %.3fms | p95: %.3fms | p99: %.3fms | %.1f samples/s",
+                result.name,
+                result.latency.p50_ms,
+                result.latency.p95_ms,
+                result.latency.p99_ms,
+                result.throughput,
+            )
+
+    # Save report
+    args.save_root.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = args.save_root / f"synthetic_benchmark_report_{timestamp}.json"
+    report.save(report_path)
+    _log.info("Benchmark report saved to: %s", report_path)
+
+    if args.baseline is not None:
+        regressions = compare_reports(
+            report, BenchmarkReport.load(args.baseline), args.threshold
+        )
+        for regression in regressions:
+            _log.error("Regression: %s", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,26 @@ class TEDSManager:
             TEDSSampleEvaluation: Evaluation result containing TEDS score and metadata
         """
 
+    def evaluate_samples(
+        self,
+        ids: list[str],
+        brackets_a: list[str],
+        brackets_b: list[str],
+    ) -> list[TEDSSampleEvaluation]:
+        """Evaluate a batch of samples in one call.
+
+        Args:
+            ids: Sample identifiers
+            brackets_a: Inputs A in bracket notation
+            brackets_b: Inputs B in bracket notation
+
+        Returns:
+            list[TEDSSampleEvaluation]: Evaluation results in the order of the inputs
+
+        Raises:
+            ValueError: If the input lists have different sizes
+        """
+
     def evaluate_html_sample(
         self,
         id: str,
@@ -1,12 +1,15 @@
 from enum import Enum
-from typing import Annotated, Iterable, Optional
+from typing import Annotated, Any, Sequence
 
 from docling_metrics_core.base_types import (
+    BaseAccumulator,
     BaseAggregateResult,
     BaseInputSample,
     BaseMetric,
     BaseSampleResult,
 )
+from docling_metrics_core.cache import cached_batch_evaluation
+from docling_metrics_core.profiling import stage
 from lxml import html
 from pydantic import BaseModel, Field
 
@@ -122,7 +125,81 @@ class TableMetricSampleEvaluation(BaseSampleResult):
     grits: GriTSSampleEvaluation | None = None
 
 
-class TableMetricDatasetEvaluation(BaseAggregateResult): ...
+class TableMetricDatasetEvaluation(BaseAggregateResult):
+    # Means across the samples where the corresponding score is available
+    mean_teds: float | None = None
+    mean_grits_topology: float | None = None
+    mean_grits_content: float | None = None
+    mean_grits_location: float | None = None
+
+
+class TableMetricAccumulator(BaseAccumulator):
+    r"""
+    Running sums and counts of the TEDS and GriTS scores
+    """
+
+    teds_sum: float = 0.0
+    teds_count: int = 0
+    grits_topology_sum: float = 0.0
+    grits_topology_count: int = 0
+    grits_content_sum: float = 0.0
+    grits_content_count: int = 0
+    grits_location_sum: float = 0.0
+    grits_location_count: int = 0
+
+    def update(self, result: TableMetricSampleEvaluation) -> None:  # type: ignore[override]
+        r"""
+        Fold a single sample evaluation
+        """
+        self.sample_count += 1
+        if result.teds is not None:
+            self.teds_sum += result.teds.teds
+            self.teds_count += 1
+        if result.grits is not None:
+            if result.grits.grits_topology is not None:
+                self.grits_topology_sum += result.grits.grits_topology
+                self.grits_topology_count += 1
+            if result.grits.grits_content is not None:
+                self.grits_content_sum += result.grits.grits_content
+                self.grits_content_count += 1
+            if result.grits.grits_location is not None:
+                self.grits_location_sum += result.grits.grits_location
+                self.grits_location_count += 1
+
+    def merge(self, other: "TableMetricAccumulator") -> None:  # type: ignore[override]
+        r"""
+        Fold the sums and counts of another accumulator
+        """
+        for field_name in TableMetricAccumulator.model_fields:
+            setattr(
+                self,
+                field_name,
+                getattr(self, field_name) + getattr(other, field_name),
+            )
+
+    def finalize(self) -> TableMetricDatasetEvaluation:
+        r"""
+        Compute the mean scores
+        """
+        return TableMetricDatasetEvaluation(
+            sample_count=self.sample_count,
+            mean_teds=(self.teds_sum / self.teds_count if self.teds_count else None),
+            mean_grits_topology=(
+                self.grits_topology_sum / self.grits_topology_count
+                if self.grits_topology_count
+                else None
+            ),
+            mean_grits_content=(
+                self.grits_content_sum / self.grits_content_count
+                if self.grits_content_count
+                else None
+            ),
+            mean_grits_location=(
+                self.grits_location_sum / self.grits_location_count
+                if self.grits_location_count
+                else None
+            ),
+        )
 
 
 class TableMetric(BaseMetric):
@@ -132,6 +209,8 @@ class TableMetric(BaseMetric):
     - GriTS
     """
 
+    sample_result_type = TableMetricSampleEvaluation
+
     def __init__(
         self,
         metrics: list[TableMetricKind] = [TableMetricKind.TEDS, TableMetricKind.GRITS],
@@ -162,109 +241,76 @@ class TableMetric(BaseMetric):
         r"""
         Evaluate a single sample.
         """
-        grits_evaluation: GriTSSampleEvaluation | None = None
-        teds_evaluation: TEDSSampleEvaluation | None = None
-
-        # Decide which metrics to compute
-        compute_teds = TableMetricKind.TEDS in self._metrics
-        compute_grits = TableMetricKind.GRITS in self._metrics
-
-        if isinstance(sample, TableMetricHTMLInputSample):
-            structure_only = sample.structure_only
-            if compute_teds:
-                teds_evaluation = self._evaluate_teds_from_html(
-                    sample.id,
-                    sample.html_a,
-                    sample.html_b,
-                    structure_only=structure_only,
-                )
-            if compute_grits:
-                # The location task cannot be computed by the HTML inputs
-                grits_metrics = self._grits_metric.grits_from_html(
-                    sample.html_a,
-                    sample.html_b,
-                    enable_topology=True,
-                    enable_content=not structure_only,
-                )
-                grits_evaluation = TableMetric._build_grits_evaluation(grits_metrics)
-        elif isinstance(sample, TableMetricCellsInputSample):
-            true_cells_dict = [cell.model_dump() for cell in sample.cells_a]
-            pred_cells_dict = [cell.model_dump() for cell in sample.cells_b]
-
-            if compute_teds:
-                teds_evaluation = self._evaluate_teds_from_html(
-                    sample.id,
-                    GriTSMetric.cells_to_html(true_cells_dict),
-                    GriTSMetric.cells_to_html(pred_cells_dict),
-                )
-
-            if compute_grits:
-                grits_metrics = self._grits_metric.grits_from_cells(
-                    true_cells_dict,
-                    pred_cells_dict,
-                    enable_topology=TableMetricTaskKind.STRUCTURE in sample.tasks,
-                    enable_content=TableMetricTaskKind.CONTENT in sample.tasks,
-                    enable_location=TableMetricTaskKind.LOCATION in sample.tasks,
-                )
-                grits_evaluation = TableMetric._build_grits_evaluation(grits_metrics)
-        elif isinstance(sample, TableMetricBracketInputSample):
-            if compute_teds:
-                bracket_a = sample.bracket_a
-                bracket_b = sample.bracket_b
-                sample_evaluaton = self._teds_manager.evaluate_sample(
-                    sample.id,
-                    bracket_a,
-                    bracket_b,
-                )
-                if sample_evaluaton.error_id != 0:
-                    raise ValueError(sample_evaluaton.error_msg)
-                teds_evaluation = TEDSSampleEvaluation(
-                    tree_a_size=sample_evaluaton.tree_a_size,
-                    tree_b_size=sample_evaluaton.tree_b_size,
-                    teds=sample_evaluaton.teds,
-                )
-
-            if compute_grits:
-                html_a = self._teds_scorer.bracket_to_html(sample.bracket_a)
-                html_b = self._teds_scorer.bracket_to_html(sample.bracket_b)
-                grits_metrics = self._grits_metric.grits_from_html(
-                    html_a,
-                    html_b,
-                    enable_topology=True,
-                    enable_content=False,
-                )
-                grits_evaluation = self._build_grits_evaluation(grits_metrics)
-        else:
-            raise ValueError("Invalid sample type")  # type: ignore[unreachable]
-
-        result = TableMetricSampleEvaluation(
-            id=sample.id,
-            teds=teds_evaluation,
-            grits=grits_evaluation,
-        )
-        return result
+        return self.evaluate_samples([sample])[0]
 
-    def aggregate(  # type: ignore[override]
-        self, results: Iterable[TableMetricSampleEvaluation]
-    ) -> Optional[TableMetricDatasetEvaluation]:
+    @cached_batch_evaluation
+    def evaluate_samples(  # type: ignore[override]
+        self,
+        samples: Sequence[
+            TableMetricBracketInputSample
+            | TableMetricHTMLInputSample
+            | TableMetricCellsInputSample
+        ],
+    ) -> list[TableMetricSampleEvaluation]:
         r"""
-        Aggregate multiple sample results
+        Evaluate a batch of samples.
+
+        All samples are converted to the bracket format and their TEDS is computed by
+        a single call to the C++ TEDSManager.
         """
-        return None
+        return [
+            TableMetricSampleEvaluation.model_validate(values)
+            for values in self.evaluate_samples_values(samples)
+        ]
 
-    def evaluate_dataset(
+    def evaluate_samples_values(  # type: ignore[override]
         self,
-        sample_pairs: Iterable[
+        samples: Sequence[
             TableMetricBracketInputSample
             | TableMetricHTMLInputSample
             | TableMetricCellsInputSample
         ],
-    ) -> TableMetricDatasetEvaluation:
+    ) -> list[dict[str, Any]]:
+        r"""
+        Evaluate a batch of samples into plain values shaped like
+        TableMetricSampleEvaluation, without instantiating the pydantic models.
+        """
+        teds_values: list[dict[str, Any] | None] = [None] * len(samples)
+        if TableMetricKind.TEDS in self._metrics:
+            teds_values = list(self._evaluate_teds_batch(samples))
+
+        compute_grits = TableMetricKind.GRITS in self._metrics
+        return [
+            {
+                "id": sample.id,
+                "teds": sample_teds_values,
+                "grits": self._evaluate_grits(sample) if compute_grits else None,
+            }
+            for sample, sample_teds_values in zip(samples, teds_values)
+        ]
+
+    def evaluate_sample_values(  # type: ignore[override]
+        self,
+        sample: TableMetricBracketInputSample
+        | TableMetricHTMLInputSample
+        | TableMetricCellsInputSample,
+    ) -> dict[str, Any]:
         r"""
-        Evaluate a dataset.
+        Evaluate a single sample into plain values.
         """
-        result = TableMetricDatasetEvaluation(sample_count=0)
-        return result
+        return self.evaluate_samples_values([sample])[0]
+
+    def create_accumulator(self) -> TableMetricAccumulator:
+        r"""
+        Create an empty accumulator for the dataset evaluation
+        """
+        return TableMetricAccumulator()
+
+    def metric_config(self) -> dict[str, Any]:
+        r"""
+        The selected metrics determine which fields of the results are set
+        """
+        return {"metrics": sorted(kind.value for kind in self._metrics)}
 
     def grits_cache_counters(self) -> dict[str, int]:
         return self._grits_metric.cache_counters()
@@ -278,46 +324,146 @@ class TableMetric(BaseMetric):
         bracket: str = table_tree.bracket()
         return bracket
 
-    def _evaluate_teds_from_html(
-        self, sample_id: str, html_a: str, html_b: str, structure_only: bool = False
-    ) -> TEDSSampleEvaluation:
+    def _teds_brackets(
+        self,
+        sample: TableMetricBracketInputSample
+        | TableMetricHTMLInputSample
+        | TableMetricCellsInputSample,
+    ) -> tuple[str, str]:
+        r"""
+        Convert the input of a sample to the bracket format used by TEDS
+        """
+        if isinstance(sample, TableMetricBracketInputSample):
+            return sample.bracket_a, sample.bracket_b
+
+        structure_only = False
+        if isinstance(sample, TableMetricHTMLInputSample):
+            html_a = sample.html_a
+            html_b = sample.html_b
+            structure_only = sample.structure_only
+        elif isinstance(sample, TableMetricCellsInputSample):
+            html_a = GriTSMetric.cells_to_html(
+                [cell.model_dump() for cell in sample.cells_a]
+            )
+            html_b = GriTSMetric.cells_to_html(
+                [cell.model_dump() for cell in sample.cells_b]
+            )
+        else:
+            raise ValueError("Invalid sample type")  # type: ignore[unreachable]
+
         bracket_a = self._teds_scorer.html_to_bracket(
             html_a, structure_only=structure_only
         )
         bracket_b = self._teds_scorer.html_to_bracket(
             html_b, structure_only=structure_only
         )
-        sample_evaluaton = self._teds_manager.evaluate_sample(
-            sample_id,
-            bracket_a,
-            bracket_b,
-        )
-        if sample_evaluaton.error_id != 0:
-            raise ValueError(sample_evaluaton.error_msg)
-        return TEDSSampleEvaluation(
-            tree_a_size=sample_evaluaton.tree_a_size,
-            tree_b_size=sample_evaluaton.tree_b_size,
-            teds=sample_evaluaton.teds,
-        )
+        return bracket_a, bracket_b
+
+    def _evaluate_teds_batch(
+        self,
+        samples: Sequence[
+            TableMetricBracketInputSample
+            | TableMetricHTMLInputSample
+            | TableMetricCellsInputSample
+        ],
+    ) -> list[dict[str, Any]]:
+        r"""
+        Compute the TEDS of all samples with one call to the TEDSManager
+        """
+        with stage("table.parse", samples=len(samples)):
+            brackets = [self._teds_brackets(sample) for sample in samples]
+        with stage("table.ted", samples=len(samples)):
+            sample_evaluations = self._teds_manager.evaluate_samples(
+                [sample.id for sample in samples],
+                [bracket_a for bracket_a, _ in brackets],
+                [bracket_b for _, bracket_b in brackets],
+            )
+
+        teds_values: list[dict[str, Any]] = []
+        for sample_evaluaton in sample_evaluations:
+            if sample_evaluaton.error_id != 0:
+                raise ValueError(sample_evaluaton.error_msg)
+            teds_values.append(
+                {
+                    "tree_a_size": sample_evaluaton.tree_a_size,
+                    "tree_b_size": sample_evaluaton.tree_b_size,
+                    "teds": sample_evaluaton.teds,
+                }
+            )
+        return teds_values
+
+    def _evaluate_grits(
+        self,
+        sample: TableMetricBracketInputSample
+        | TableMetricHTMLInputSample
+        | TableMetricCellsInputSample,
+    ) -> dict[str, Any]:
+        r"""
+        Compute the GriTS values of a single sample
+        """
+        with stage("table.grits"):
+            grits_metrics = self._compute_grits(sample)
+        return TableMetric._build_grits_values(grits_metrics)
+
+    def _compute_grits(
+        self,
+        sample: TableMetricBracketInputSample
+        | TableMetricHTMLInputSample
+        | TableMetricCellsInputSample,
+    ) -> dict[str, float | int]:
+        r"""
+        Run the GriTSMetric tasks that the input of the sample supports
+        """
+        if isinstance(sample, TableMetricHTMLInputSample):
+            # The location task cannot be computed by the HTML inputs
+            grits_metrics = self._grits_metric.grits_from_html(
+                sample.html_a,
+                sample.html_b,
+                enable_topology=True,
+                enable_content=not sample.structure_only,
+            )
+        elif isinstance(sample, TableMetricCellsInputSample):
+            grits_metrics = self._grits_metric.grits_from_cells(
+                [cell.model_dump() for cell in sample.cells_a],
+                [cell.model_dump() for cell in sample.cells_b],
+                enable_topology=TableMetricTaskKind.STRUCTURE in sample.tasks,
+                enable_content=TableMetricTaskKind.CONTENT in sample.tasks,
+                enable_location=TableMetricTaskKind.LOCATION in sample.tasks,
+            )
+        elif isinstance(sample, TableMetricBracketInputSample):
+            html_a = self._teds_scorer.bracket_to_html(sample.bracket_a)
+            html_b = self._teds_scorer.bracket_to_html(sample.bracket_b)
+            grits_metrics = self._grits_metric.grits_from_html(
+                html_a,
+                html_b,
+                enable_topology=True,
+                enable_content=False,
+            )
+        else:
+            raise ValueError("Invalid sample type")  # type: ignore[unreachable]
+        return grits_metrics
 
     @staticmethod
-    def _build_grits_evaluation(
+    def _build_grits_values(
         grits_metrics: dict[str, float | int],
-    ) -> GriTSSampleEvaluation:
-        return GriTSSampleEvaluation(
-            grits_topology=grits_metrics.get("grits_top"),
-            grits_precision_topology=grits_metrics.get("grits_precision_top"),
-            grits_recall_topology=grits_metrics.get("grits_recall_top"),
-            grits_topology_upper_bound=grits_metrics.get("grits_top_upper_bound"),
-            grits_content=grits_metrics.get("grits_con"),
-            grits_precision_content=grits_metrics.get("grits_precision_con"),
-            grits_recall_content=grits_metrics.get("grits_recall_con"),
-            grits_content_upper_bound=grits_metrics.get("grits_con_upper_bound"),
-            grits_location=grits_metrics.get("grits_loc"),
-            grits_precision_location=grits_metrics.get("grits_precision_loc"),
-            grits_recall_location=grits_metrics.get("grits_recall_loc"),
-            grits_location_upper_bound=grits_metrics.get("grits_loc_upper_bound"),
-        )
+    ) -> dict[str, Any]:
+        r"""
+        Map the GriTSMetric output to the fields of GriTSSampleEvaluation
+        """
+        return {
+            "grits_topology": grits_metrics.get("grits_top"),
+            "grits_precision_topology": grits_metrics.get("grits_precision_top"),
+            "grits_recall_topology": grits_metrics.get("grits_recall_top"),
+            "grits_topology_upper_bound": grits_metrics.get("grits_top_upper_bound"),
+            "grits_content": grits_metrics.get("grits_con"),
+            "grits_precision_content": grits_metrics.get("grits_precision_con"),
+            "grits_recall_content": grits_metrics.get("grits_recall_con"),
+            "grits_content_upper_bound": grits_metrics.get("grits_con_upper_bound"),
+            "grits_location": grits_metrics.get("grits_loc"),
+            "grits_precision_location": grits_metrics.get("grits_precision_loc"),
+            "grits_recall_location": grits_metrics.get("grits_recall_loc"),
+            "grits_location_upper_bound": grits_metrics.get("grits_loc_upper_bound"),
+        }
 
     @staticmethod
     def html_to_cells_input(
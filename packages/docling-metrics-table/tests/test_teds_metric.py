@@ -2,9 +2,12 @@ import math
 from pathlib import Path
 
 import pytest
+from docling_metrics_core.cache import ResultCache
+from docling_metrics_core.profiling import HistogramCollector, collecting
 from docling_metrics_table import docling_metric_table_cpp
 from docling_metrics_table.docling_metrics_table import (
     TableMetric,
+    TableMetricAccumulator,
     TableMetricBracketInputSample,
     TableMetricCellsInputSample,
     TableMetricHTMLInputSample,
@@ -357,8 +360,178 @@ def test_cells_input():
         )
 
 
+def test_teds_evaluate_samples():
+    r"""
+    Evaluate a mixed batch with one TEDSManager call and compare with single samples.
+    """
+    all_test_data: dict[str, dict[str, str]] = load_test_data()
+    table_metric = TableMetric(metrics=[TableMetricKind.TEDS])
+
+    samples: list[TableMetricBracketInputSample | TableMetricHTMLInputSample] = []
+    for stem, test_data in all_test_data.items():
+        samples.append(
+            TableMetricBracketInputSample(
+                id=f"s6_{stem}",
+                bracket_a=test_data["gt_bracket"],
+                bracket_b=test_data["pred_bracket"],
+            )
+        )
+        samples.append(
+            TableMetricHTMLInputSample(
+                id=f"s7_{stem}",
+                html_a=test_data["gt_html"],
+                html_b=test_data["pred_html"],
+                structure_only=True,
+            )
+        )
+
+    batch_evaluations = table_metric.evaluate_samples(samples)
+    assert batch_evaluations == [
+        table_metric.evaluate_sample(sample) for sample in samples
+    ]
+
+    # A broken sample fails the batch
+    broken_sample = TableMetricBracketInputSample(
+        id="s8",
+        bracket_a=next(iter(all_test_data.values()))["broken_bracket"],
+        bracket_b=samples[0].bracket_a,  # type: ignore[union-attr]
+    )
+    with pytest.raises(ValueError):
+        table_metric.evaluate_samples([samples[0], broken_sample])
+
+    # The C++ batch call requires inputs of the same size
+    teds_manager = docling_metric_table_cpp.TEDSManager()
+    with pytest.raises(ValueError):
+        teds_manager.evaluate_samples(["s9"], [], [])
+
+
+def test_teds_columnar():
+    r"""
+    Evaluate a dataset into columns and rebuild the same sample evaluations.
+    """
+    all_test_data: dict[str, dict[str, str]] = load_test_data()
+    table_metric = TableMetric()
+
+    samples = [
+        TableMetricHTMLInputSample(
+            id=f"s10_{stem}",
+            html_a=test_data["gt_html"],
+            html_b=test_data["pred_html"],
+        )
+        for stem, test_data in all_test_data.items()
+    ]
+
+    sink = table_metric.evaluate_dataset_columnar(samples)
+    columns = sink.to_numpy()
+    assert columns["teds.teds"].tolist() == pytest.approx(
+        [TEST_DATA[stem]["html_teds"] for stem in all_test_data]
+    )
+    assert list(sink.iter_results()) == table_metric.evaluate_samples(samples)
+
+
+def test_teds_dataset_aggregation():
+    r"""
+    Aggregate the bracket evaluations in one pass and by merging per-stem shards.
+    """
+    all_test_data: dict[str, dict[str, str]] = load_test_data()
+    table_metric = TableMetric(metrics=[TableMetricKind.TEDS])
+
+    samples = [
+        TableMetricBracketInputSample(
+            id=f"s5_{stem}",
+            bracket_a=test_data["gt_bracket"],
+            bracket_b=test_data["pred_bracket"],
+        )
+        for stem, test_data in all_test_data.items()
+    ]
+    expected_mean_teds = sum(
+        config["bracket_teds"]  # type: ignore[misc]
+        for config in TEST_DATA.values()
+    ) / len(TEST_DATA)
+
+    ds_evaluation = table_metric.evaluate_dataset(samples)
+    assert ds_evaluation.sample_count == len(samples)
+    assert ds_evaluation.mean_teds is not None
+    assert math.isclose(
+        ds_evaluation.mean_teds, expected_mean_teds, rel_tol=RELATIVE_TOLERANCE
+    )
+    assert ds_evaluation.mean_grits_topology is None
+
+    # Merge one accumulator per sample, round-tripped through JSON
+    merged = table_metric.create_accumulator()
+    for sample in samples:
+        shard = table_metric.create_accumulator()
+        shard.update(table_metric.evaluate_sample(sample))
+        merged.merge(
+            TableMetricAccumulator.model_validate_json(shard.model_dump_json())
+        )
+    assert merged.finalize() == ds_evaluation
+
+
+def test_teds_result_cache(tmp_path: Path):
+    r"""
+    Re-evaluate the samples from the memory and the disk tier of a result cache.
+    """
+    all_test_data: dict[str, dict[str, str]] = load_test_data()
+    samples = [
+        TableMetricHTMLInputSample(
+            id=f"s11_{stem}",
+            html_a=test_data["gt_html"],
+            html_b=test_data["pred_html"],
+        )
+        for stem, test_data in all_test_data.items()
+    ]
+    expected = TableMetric().evaluate_samples(samples)
+
+    table_metric = TableMetric()
+    table_metric.result_cache = ResultCache(disk_path=tmp_path / "cache.sqlite")
+    assert table_metric.evaluate_samples(samples) == expected
+    assert [table_metric.evaluate_sample(sample) for sample in samples] == expected
+    counters = table_metric.result_cache.counters()
+    assert counters["misses"] == len(samples)
+    assert counters["memory_hits"] == len(samples)
+
+    # A new run only hits the disk tier
+    table_metric.result_cache = ResultCache(disk_path=tmp_path / "cache.sqlite")
+    assert table_metric.evaluate_samples(samples) == expected
+    assert table_metric.result_cache.counters()["disk_hits"] == len(samples)
+
+    # Another metric selection does not share the cached results
+    teds_metric = TableMetric(metrics=[TableMetricKind.TEDS])
+    teds_metric.result_cache = table_metric.result_cache
+    assert all(result.grits is None for result in teds_metric.evaluate_samples(samples))
+
+
+def test_table_stage_spans():
+    r"""
+    Collect the timings of the parse, TED and GriTS stages.
+    """
+    all_test_data: dict[str, dict[str, str]] = load_test_data()
+    samples = [
+        TableMetricHTMLInputSample(
+            id=f"s12_{stem}",
+            html_a=test_data["gt_html"],
+            html_b=test_data["pred_html"],
+        )
+        for stem, test_data in all_test_data.items()
+    ]
+
+    collector = HistogramCollector()
+    with collecting(collector):
+        TableMetric().evaluate_samples(samples)
+
+    statistics = collector.statistics()
+    assert collector.stages() == ["table.grits", "table.parse", "table.ted"]
+    assert statistics["table.parse"].count == 1
+    assert statistics["table.ted"].count == 1
+    assert statistics["table.grits"].count == len(samples)
+
+
 if __name__ == "__main__":
     test_cpp_bindings()
     test_teds_api()
     test_bracket_html_roundtrip()
     test_cells_input()
+    test_teds_evaluate_samples()
+    test_teds_columnar()
+    test_teds_dataset_aggregation()
@@ -0,0 +1,100 @@
+#pragma once
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace docling {
+
+/**
+ * Tokenize a line with the 13a tokenizer of sacrebleu, as the "bleu" module of HuggingFace
+ * evaluate does: the punctuation and symbols are split off, the periods and commas unless
+ * they are part of a number.
+ *
+ * @param line The input text, UTF-8 encoded.
+ * @return     List of tokens.
+ */
+std::vector<std::string> tokenize_13a(const std::string &line);
+
+/**
+ * BLEU score with its components, as returned by the "bleu" module of HuggingFace evaluate.
+ *
+ * The BLEU is NaN when it is undefined, i.e. when the hypotheses or the references are empty.
+ */
+struct BleuScore {
+  double bleu = 0.0;
+  std::vector<double> precisions;
+  double brevity_penalty = 0.0;
+  double length_ratio = 0.0;
+  int64_t translation_length = 0;
+  int64_t reference_length = 0;
+};
+
+/**
+ * Sufficient statistics of the BLEU score: the clipped n-gram matches and the number of
+ * n-grams of each order, and the lengths of the hypotheses and the closest references.
+ *
+ * Sentence pairs are added one by one, so the corpus BLEU of a dataset is computed in
+ * constant memory, and the statistics of the shards of a dataset can be merged.
+ */
+class BleuStatistics {
+public:
+  /**
+   * @param max_order Maximum n-gram order, at least 1.
+   */
+  explicit BleuStatistics(int max_order = 4);
+
+  /**
+   * Add the n-gram counts of a hypothesis.
+   *
+   * @param references The tokens of the references of the hypothesis, at least one.
+   * @param hypothesis The tokens of the hypothesis.
+   */
+  void add(const std::vector<std::vector<std::string>> &references,
+           const std::vector<std::string> &hypothesis);
+
+  /**
+   * Add the statistics of another set of sentence pairs.
+   *
+   * @param other Statistics with the same maximum order.
+   */
+  void merge(const BleuStatistics &other);
+
+  /**
+   * Add the statistics of sentence pairs that were counted elsewhere, e.g. the per-pair
+   * statistics of TextManager::bleu_batch.
+   *
+   * @param matches            Clipped n-gram matches of each order, max_order values.
+   * @param possible_matches   Number of n-grams of each order, max_order values.
+   * @param translation_length Number of tokens of the hypotheses.
+   * @param reference_length   Number of tokens of the closest references.
+   */
+  void add_counts(const std::vector<int64_t> &matches,
+                  const std::vector<int64_t> &possible_matches, int64_t translation_length,
+                  int64_t reference_length);
+
+  /**
+   * Compute the BLEU score, like compute_bleu() of the TensorFlow NMT implementation
+   * used by HuggingFace evaluate.
+   *
+   * @param smooth Apply the add-one smoothing of Lin et al. 2004 to the precisions.
+   * @return       The BLEU score and its components.
+   */
+  BleuScore score(bool smooth = false) const;
+
+  int max_order() const { return max_order_; }
+  // Clipped n-gram matches of each order
+  const std::vector<int64_t> &matches() const { return matches_; }
+  // Number of n-grams of the hypotheses of each order
+  const std::vector<int64_t> &possible_matches() const { return possible_matches_; }
+  int64_t translation_length() const { return translation_length_; }
+  int64_t reference_length() const { return reference_length_; }
+
+private:
+  int max_order_;
+  std::vector<int64_t> matches_;
+  std::vector<int64_t> possible_matches_;
+  int64_t translation_length_ = 0;
+  int64_t reference_length_ = 0;
+};
+
+} // namespace docling
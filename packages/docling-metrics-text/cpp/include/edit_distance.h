@@ -1,15 +1,111 @@
 #pragma once
 
+#include <cstddef>
 #include <cstdint>
 #include <string>
+#include <string_view>
+#include <unordered_map>
 #include <vector>
 
 namespace docling {
 
 using Word = uint64_t;
 
+/**
+ * Operations of an edit script that turns the query into the target.
+ */
+enum class EditOp : uint8_t {
+  kMatch = 0,      // The query and target tokens are equal
+  kSubstitute = 1, // The query token is replaced by the target token
+  kInsert = 2,     // The target token is missing from the query
+  kDelete = 3,     // The query token is missing from the target
+};
+
+/**
+ * Instruction sets of the batched edit distance of short sequences, in increasing order.
+ */
+enum class SimdLevel : uint8_t {
+  kPortable = 0, // One pair at a time in a 64-bit word
+  kSse4 = 1,     // Two pairs in the 64-bit lanes of an SSE4.2 register
+  kAvx2 = 2,     // Four pairs in the 64-bit lanes of an AVX2 register
+};
+
+// Best SimdLevel supported by the CPU, detected once at runtime.
+SimdLevel detect_simd_level();
+
+/**
+ * Edit script of two token sequences, as runs of the same operation.
+ *
+ * Run i applies ops[i] to lengths[i] tokens, starting at the query position query_starts[i]
+ * and at the target position target_starts[i].
+ */
+struct Alignment {
+  // Raw edit distance: number of inserted, deleted and substituted tokens
+  int distance = 0;
+  std::vector<uint8_t> ops;
+  std::vector<int32_t> lengths;
+  std::vector<int32_t> query_starts;
+  std::vector<int32_t> target_starts;
+
+  // Append count operations, extending the last run if it has the same operation.
+  void push(EditOp op, int count, int32_t query_start, int32_t target_start);
+};
+
+/**
+ * Edit distance of a hypothesis to its reference, the numerator and denominator of an error
+ * rate such as the CER or WER.
+ */
+struct ErrorCounts {
+  // Raw edit distance
+  int errors = 0;
+  // Number of characters or words of the reference
+  int reference_length = 0;
+
+  // errors / reference_length, 0 if both texts are empty and NaN if only the reference is.
+  double rate() const;
+};
+
+/**
+ * Reference token sequence preprocessed for the Myers bit-vector edit distance.
+ *
+ * The interning of the distinct reference tokens and the Peq table are built once, so scoring
+ * a hypothesis against the reference only maps its tokens to Peq rows and runs the DP. The
+ * reference is read-only once built and can be shared between threads.
+ *
+ * The keys of the interning table point into the owned tokens, hence a prepared reference can
+ * be moved but not copied.
+ */
+class PreparedReference {
+public:
+  PreparedReference() = default;
+  PreparedReference(const PreparedReference &) = delete;
+  PreparedReference &operator=(const PreparedReference &) = delete;
+  PreparedReference(PreparedReference &&) = default;
+  PreparedReference &operator=(PreparedReference &&) = default;
+
+  // Number of reference tokens
+  int size() const { return size_; }
+
+  // Number of distinct reference tokens
+  int distinct_tokens() const { return static_cast<int>(tokens_.size()); }
+
+private:
+  friend class EditDistanceCalculator;
+
+  // Distinct tokens, in the order of their Peq rows
+  std::vector<std::string> tokens_;
+  // Peq row of each distinct token, the keys point into tokens_
+  std::unordered_map<std::string_view, int> token_rows_;
+  int size_ = 0;
+  // Flat Peq table: (distinct tokens + 1) x num_blocks, the last row matches nothing
+  std::vector<Word> peq_;
+};
+
 /**
  * Computes token-level edit distance using the Myers bit-vector algorithm.
+ *
+ * The token interning table, the flat Peq table and the block state are thread-local buffers
+ * reused across calls, hence a calculator can be shared between threads.
  */
 class EditDistanceCalculator {
 public:
@@ -22,27 +118,206 @@ public:
    * Normalized edit distance: raw distance divided by max(|query|, |target|).
    * Returns 0.0 when both sequences are empty.
    *
+   * With a threshold, only the diagonal band of the DP that can stay within it is computed
+   * and the computation stops as soon as the threshold is exceeded.
+   *
+   * @param query        The query token sequence.
+   * @param target       The target token sequence.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], or infinity if it exceeds
+   *                     max_distance.
+   */
+  double edit_distance(const std::vector<std::string> &query,
+                       const std::vector<std::string> &target, double max_distance = -1.0);
+
+  /**
+   * Normalized edit distance of pre-interned token sequences, given as non-negative ids.
+   *
+   * Avoids hashing the token strings, e.g. when long documents are compared repeatedly.
+   *
+   * @param query        The query token ids.
+   * @param query_size   Number of query tokens.
+   * @param target       The target token ids.
+   * @param target_size  Number of target tokens.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], or infinity if it exceeds
+   *                     max_distance.
+   */
+  double edit_distance(const int32_t *query, std::size_t query_size, const int32_t *target,
+                       std::size_t target_size, double max_distance = -1.0);
+
+  /**
+   * Preprocess a reference token sequence, to score many targets against it.
+   *
+   * @param reference The reference token sequence, the query of the edit distances.
+   * @return          The interned reference with its Peq table.
+   */
+  PreparedReference prepare(const std::vector<std::string> &reference);
+
+  /**
+   * Normalized edit distance of a target to a prepared reference, equal to
+   * edit_distance(reference tokens, target, max_distance).
+   *
+   * Only the target tokens are interned, the Peq table of the reference is reused.
+   *
+   * @param reference    The prepared reference.
+   * @param target       The target token sequence.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], or infinity if it exceeds
+   *                     max_distance.
+   */
+  double edit_distance(const PreparedReference &reference, const std::vector<std::string> &target,
+                       double max_distance = -1.0);
+
+  /**
+   * Normalized edit distances of a batch of pairs, for many short texts such as table cells.
+   *
+   * The pairs whose shorter sequence has at most WORD_SIZE tokens need a single bit-vector
+   * block. They are sorted by length and run together in the lanes of the SIMD registers,
+   * without band bookkeeping. The other pairs fall back to edit_distance(). The results are
+   * identical to edit_distance() of every pair.
+   *
+   * @param queries      The query token sequences.
+   * @param targets      The target token sequences, same size as queries.
+   * @param num_threads  Number of worker threads, 0 for the hardware concurrency.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @param max_level    Highest instruction set to use, lowered to detect_simd_level().
+   * @return             Normalized edit distance of each pair, infinity if it exceeds
+   *                     max_distance.
+   */
+  std::vector<double> short_edit_distance_batch(
+      const std::vector<std::vector<std::string>> &queries,
+      const std::vector<std::vector<std::string>> &targets, int num_threads = 0,
+      double max_distance = -1.0, SimdLevel max_level = SimdLevel::kAvx2);
+
+  /**
+   * Character errors: the edit distance of the Unicode code points of two UTF-8 texts.
+   *
+   * @param reference  The reference text.
+   * @param hypothesis The hypothesis text, e.g. the OCR output.
+   * @return           The errors and the number of code points of the reference.
+   */
+  ErrorCounts character_errors(const std::string &reference, const std::string &hypothesis);
+
+  /**
+   * Word errors: the edit distance of the words of two UTF-8 texts, split on whitespace.
+   *
+   * @param reference  The reference text.
+   * @param hypothesis The hypothesis text, e.g. the OCR output.
+   * @return           The errors and the number of words of the reference.
+   */
+  ErrorCounts word_errors(const std::string &reference, const std::string &hypothesis);
+
+  /**
+   * Optimal alignment of two token sequences.
+   *
+   * The edit script is recovered in linear memory with Hirschberg's divide and conquer,
+   * which finds the split points of the alignment with the Myers bit-vector DP run forward
+   * and backward over the halves of the target.
+   *
    * @param query  The query token sequence.
    * @param target The target token sequence.
-   * @return       Normalized edit distance in [0, 1].
+   * @return       The run-length encoded edit script from the query to the target.
    */
-  double edit_distance(const std::vector<std::string> &query,
-                       const std::vector<std::string> &target);
+  Alignment align(const std::vector<std::string> &query, const std::vector<std::string> &target);
+
+  // Optimal alignment of two pre-interned token id sequences, see above.
+  Alignment align(const int32_t *query, std::size_t query_size, const int32_t *target,
+                  std::size_t target_size);
 
 private:
   /**
    * Myers bit-vector edit distance on token sequences (Needleman-Wunsch / global).
    * Returns the raw edit distance (number of insertions, deletions, substitutions).
    *
-   * @param query  The query token sequence.
-   * @param target The target token sequence.
-   * @return       Raw edit distance.
+   * The blocks outside of the Ukkonen band are skipped, as in edlib.
+   *
+   * @param query        The query token sequence.
+   * @param target       The target token sequence.
+   * @param max_distance Threshold of the raw distance, negative for none.
+   * @return             Raw edit distance, or -1 if it exceeds max_distance.
    */
   int edit_distance_raw(const std::vector<std::string> &query,
-                        const std::vector<std::string> &target);
+                        const std::vector<std::string> &target, int max_distance = -1);
+
+  // Raw edit distance of token id sequences, see above.
+  int edit_distance_raw(const int32_t *query, int n, const int32_t *target, int m,
+                        int max_distance);
+
+  /**
+   * Map the tokens to Peq rows: every distinct query token gets a row, the target tokens
+   * missing from the query share the last row, which matches nothing.
+   *
+   * @param query       The query token sequence.
+   * @param target      The target token sequence.
+   * @param query_rows  Set to the row of each query token.
+   * @param target_rows Set to the row of each target token.
+   * @return            Number of rows.
+   */
+  static int intern_rows(const std::vector<std::string> &query,
+                         const std::vector<std::string> &target, std::vector<int> &query_rows,
+                         std::vector<int> &target_rows);
+
+  // Map the tokens to Peq rows, see above.
+  static int intern_rows(const std::vector<std::string_view> &query,
+                         const std::vector<std::string_view> &target,
+                         std::vector<int> &query_rows, std::vector<int> &target_rows);
+
+  // Map the token ids to Peq rows, see above. Throws on negative query ids.
+  static int intern_rows(const int32_t *query, int n, const int32_t *target, int m,
+                         std::vector<int> &query_rows, std::vector<int> &target_rows);
+
+  /**
+   * Myers DP on the Peq rows of the query and target tokens set in the workspace.
+   *
+   * @param n            Number of query tokens.
+   * @param m            Number of target tokens.
+   * @param num_rows     Number of Peq rows, the last one matches no query token.
+   * @param max_distance Threshold of the raw distance, negative for none.
+   * @return             Raw edit distance, or -1 if it exceeds max_distance.
+   */
+  int myers_distance(int n, int m, int num_rows, int max_distance);
+
+  /**
+   * Banded Myers DP of the target over a built Peq table of the query.
+   *
+   * @param peq          Flat Peq table: rows x ceil(n / WORD_SIZE), with the padding bits.
+   * @param n            Number of query tokens, positive.
+   * @param target_rows  Peq row of each target token.
+   * @param m            Number of target tokens, positive.
+   * @param max_distance Threshold of the raw distance, negative for none.
+   * @return             Raw edit distance, or -1 if it exceeds max_distance.
+   */
+  int myers_scan(const Word *peq, int n, const int *target_rows, int m, int max_distance);
+
+  /**
+   * Fill a flat Peq table: peq[row][block] has bit i set iff query position
+   * (block * WORD_SIZE + i) has the token of the row.
+   *
+   * @param query_rows Peq row of each query token.
+   * @param n          Number of query tokens.
+   * @param num_rows   Number of Peq rows.
+   * @param peq        Set to the num_rows x ceil(n / WORD_SIZE) table.
+   */
+  void build_peq(const int *query_rows, int n, int num_rows, std::vector<Word> &peq);
+
+  /**
+   * Distance of the sequences that need no DP: one of them is empty, or their lengths differ
+   * by more than the threshold.
+   *
+   * @param distance Set to the raw distance, or -1 if it exceeds max_distance.
+   * @return         Whether the distance was set.
+   */
+  static bool trivial_distance(int n, int m, int max_distance, int &distance);
+
+  // Largest raw distance within a normalized threshold, -1 for none.
+  static int max_raw_distance(double max_distance, int max_len);
+
+  // Normalized distance of a raw distance, infinity if it exceeded the threshold.
+  static double normalize(int distance, int max_len);
 
-  // Processes one block of one column of the Myers bit-vector DP.
-  inline int calculate_block(Word Pv, Word Mv, Word Eq, int hin, Word &PvOut, Word &MvOut);
+  // Free the Peq table if it is too large to be kept between calls.
+  static void release_large_peq();
 
   inline int ceil_div(int x, int y) { return x % y ? x / y + 1 : x / y; }
 
@@ -0,0 +1,120 @@
+#pragma once
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include "utils.h"
+
+namespace docling {
+
+/**
+ * Lookup tables of METEOR, memory-mapped from a file written by
+ * docling_metrics_text.meteor_table: the WordNet synonyms of the words, as returned by the
+ * synsets() of NLTK's WordNet reader, and the lowercase mapping of Python's str.lower().
+ *
+ * The file is little-endian, all its arrays are uint32:
+ *
+ *   header           "DMMETEOR", version, word_count, synonym_count, lower_count,
+ *                    case_range_count, string_bytes, lower_bytes
+ *   word_offsets     word_count + 1 offsets of the words in the string bytes, the words are
+ *                    sorted bytewise
+ *   synonym_offsets  word_count + 1 offsets of the synonyms of each word
+ *   synonyms         synonym_count word ids
+ *   lower_chars      lower_count sorted code points whose lowercase differs
+ *   lower_offsets    lower_count + 1 offsets of their lowercase in the lower bytes
+ *   case_ranges      case_range_count (first, last, flags) code point ranges, where the
+ *                    flags are kCased and kCaseIgnorable
+ *   string bytes, lower bytes
+ */
+class MeteorTable {
+public:
+  static constexpr uint32_t kVersion = 1;
+  static constexpr uint32_t kCased = 1;
+  static constexpr uint32_t kCaseIgnorable = 2;
+
+  /**
+   * @param path Path of the table, a std::runtime_error is thrown if it is not valid.
+   */
+  explicit MeteorTable(const std::string &path);
+
+  /**
+   * Lowercase a word like Python's str.lower(), including the final sigma rule.
+   *
+   * @param word The word, UTF-8 encoded.
+   * @return     The lowercase word.
+   */
+  std::string lower(const std::string &word) const;
+
+  /**
+   * Append the WordNet synonyms of a word, the word itself excluded.
+   *
+   * @param word     The word.
+   * @param synonyms The synonyms are appended to it, they point into the mapped file.
+   */
+  void synonyms(std::string_view word, std::vector<std::string_view> &synonyms) const;
+
+  std::size_t word_count() const { return word_count_; }
+
+private:
+  std::string_view word(uint32_t id) const;
+  uint32_t case_flags(int32_t code_point) const;
+  bool is_final_sigma(const std::vector<int32_t> &code_points, std::size_t i) const;
+
+  MappedFile file_;
+  uint32_t word_count_ = 0;
+  uint32_t lower_count_ = 0;
+  uint32_t case_range_count_ = 0;
+  const uint32_t *word_offsets_ = nullptr;
+  const uint32_t *synonym_offsets_ = nullptr;
+  const uint32_t *synonyms_ = nullptr;
+  const uint32_t *lower_chars_ = nullptr;
+  const uint32_t *lower_offsets_ = nullptr;
+  const uint32_t *case_ranges_ = nullptr;
+  const char *string_bytes_ = nullptr;
+  const char *lower_bytes_ = nullptr;
+};
+
+/**
+ * Parameters of the METEOR score, the defaults of NLTK.
+ */
+struct MeteorParameters {
+  // Relative weight of the precision and the recall
+  double alpha = 0.9;
+  // Shape of the fragmentation penalty
+  double beta = 3.0;
+  // Weight of the fragmentation penalty
+  double gamma = 0.5;
+};
+
+/**
+ * Compute the METEOR score of a tokenized hypothesis to a reference, like NLTK's
+ * single_meteor_score(): the words are lowercased and aligned by exact match, then by
+ * Porter stem and then by WordNet synonym.
+ *
+ * @param table      The synonym and lowercase table.
+ * @param reference  The tokens of the reference.
+ * @param hypothesis The tokens of the hypothesis.
+ * @param parameters The parameters of the score.
+ * @return           The METEOR score, 0.0 if no word is aligned.
+ */
+double single_meteor_score(const MeteorTable &table, const std::vector<std::string> &reference,
+                           const std::vector<std::string> &hypothesis,
+                           const MeteorParameters &parameters = {});
+
+/**
+ * Compute the METEOR score of a tokenized hypothesis, the best score of its references, like
+ * NLTK's meteor_score().
+ *
+ * @param table      The synonym and lowercase table.
+ * @param references The tokens of the references, at least one.
+ * @param hypothesis The tokens of the hypothesis.
+ * @param parameters The parameters of the score.
+ * @return           The highest METEOR score of the references.
+ */
+double meteor_score(const MeteorTable &table,
+                    const std::vector<std::vector<std::string>> &references,
+                    const std::vector<std::string> &hypothesis,
+                    const MeteorParameters &parameters = {});
+
+} // namespace docling
@@ -0,0 +1,43 @@
+#pragma once
+
+#include <cstdint>
+
+#include "edit_distance.h"
+
+namespace docling {
+
+constexpr int WORD_SIZE = sizeof(Word) * 8;
+constexpr Word WORD_1 = static_cast<Word>(1);
+constexpr Word HIGH_BIT = WORD_1 << (WORD_SIZE - 1);
+
+// Myers "Advance_Block": processes one block of one column.
+// Pv/Mv encode the vertical deltas, Eq is the match vector for the current target token,
+// hin is the horizontal delta entering from the block above.
+// Returns hout (+1, 0, or -1) propagated to the next block.
+inline int calculate_block(Word Pv, // Element of Pv to read
+                           Word Mv, Word Eq, int hin, Word &PvOut, Word &MvOut) {
+  Word hinIsNeg = static_cast<Word>(hin >> 2) & WORD_1;
+
+  Word Xv = Eq | Mv;
+  Eq |= hinIsNeg;
+  Word Xh = (((Eq & Pv) + Pv) ^ Pv) | Eq;
+
+  Word Ph = Mv | ~(Xh | Pv);
+  Word Mh = Pv & Xh;
+
+  int hout = 0;
+  hout = (Ph & HIGH_BIT) >> (WORD_SIZE - 1);
+  hout -= (Mh & HIGH_BIT) >> (WORD_SIZE - 1);
+
+  Ph <<= 1;
+  Mh <<= 1;
+  Mh |= hinIsNeg;
+  Ph |= static_cast<Word>((hin + 1) >> 1);
+
+  PvOut = Mh | ~(Xv | Ph);
+  MvOut = Ph & Xv;
+
+  return hout;
+}
+
+} // namespace docling
@@ -0,0 +1,18 @@
+#pragma once
+#include <string>
+
+namespace docling {
+
+/**
+ * Stem a word with the Porter stemmer, a port of NLTK's PorterStemmer in its default
+ * NLTK_EXTENSIONS mode.
+ *
+ * NLTK lowercases the word first, the word is expected to be lowercase already, as after
+ * the preprocessing of METEOR.
+ *
+ * @param word The lowercase word, UTF-8 encoded.
+ * @return     The stem of the word.
+ */
+std::string porter_stem(const std::string &word);
+
+} // namespace docling
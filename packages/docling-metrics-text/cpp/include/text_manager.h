@@ -1,12 +1,86 @@
 #pragma once
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <optional>
 #include <string>
 #include <vector>
 
+#include "bleu.h"
 #include "edit_distance.h"
+#include "meteor.h"
+#include "token_list.h"
+#include "token_overlap.h"
 #include "treebank.h"
 
 namespace docling {
 
+/**
+ * Per-pair text metrics computed natively by TextManager::evaluate_pair.
+ */
+struct PairEvaluation {
+  std::vector<std::string> tokens_a;
+  std::vector<std::string> tokens_b;
+  // Token set scores with tokens_a as reference, empty when undefined
+  std::optional<double> precision;
+  std::optional<double> recall;
+  std::optional<double> f1;
+  // Sizes of the token sets and of their intersection
+  std::size_t token_set_a = 0;
+  std::size_t token_set_b = 0;
+  std::size_t common_tokens = 0;
+  // Normalized edit distance in [0, 1], infinity if it exceeds the threshold
+  double edit_distance = 0.0;
+};
+
+/**
+ * Per-pair text metrics of a batch, one column per metric.
+ *
+ * The undefined scores are NaN. The edit distance is NaN for the pairs whose edit
+ * distance could not be computed, e.g. because the Peq table would not fit in memory, and
+ * infinity for the pairs whose edit distance exceeds the threshold.
+ */
+struct BatchEvaluation {
+  std::vector<double> precision;
+  std::vector<double> recall;
+  std::vector<double> f1;
+  std::vector<double> edit_distance;
+  // Sizes of the token sets and of their intersection, 0 if the overlap is not computed
+  std::vector<int64_t> token_set_a;
+  std::vector<int64_t> token_set_b;
+  std::vector<int64_t> common_tokens;
+  // Empty unless the tokens are requested
+  std::vector<std::vector<std::string>> tokens_a;
+  std::vector<std::vector<std::string>> tokens_b;
+};
+
+/**
+ * Character and word error rates of a batch, with the first text of each pair as the
+ * reference. The rates are NaN when the reference is empty but the hypothesis is not.
+ */
+struct BatchErrorRates {
+  std::vector<double> cer;
+  std::vector<double> wer;
+  std::vector<int32_t> char_errors;
+  std::vector<int32_t> char_lengths;
+  std::vector<int32_t> word_errors;
+  std::vector<int32_t> word_lengths;
+};
+
+/**
+ * Sentence BLEU of a batch with its sufficient statistics, which can be summed over the
+ * pairs for the corpus BLEU. The BLEU is NaN when it is undefined.
+ */
+struct BatchBleu {
+  int max_order = 4;
+  std::vector<double> bleu;
+  // Row-major (pairs x max_order) clipped n-gram matches and n-gram counts
+  std::vector<int64_t> matches;
+  std::vector<int64_t> possible_matches;
+  std::vector<int64_t> translation_length;
+  std::vector<int64_t> reference_length;
+};
+
 /**
  * Manager for computing text metrics such as tokenization and edit distance.
  */
@@ -29,16 +103,311 @@ public:
   /**
    * Calculate the normalized edit distance between two token lists.
    *
+   * @param tokens_a     The first list of tokens.
+   * @param tokens_b     The second list of tokens.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], infinity if it exceeds the
+   *                     threshold.
+   */
+  double edit_distance(const std::vector<std::string> &tokens_a,
+                       const std::vector<std::string> &tokens_b, double max_distance = -1.0);
+
+  /**
+   * Map tokens to ids of a vocabulary kept by the manager, for edit_distance_ids.
+   *
+   * @param tokens The list of tokens.
+   * @return       The id of each token, new tokens are added to the vocabulary.
+   */
+  std::vector<int32_t> intern_tokens(const std::vector<std::string> &tokens);
+
+  /**
+   * Calculate the normalized edit distance between two pre-interned token id lists.
+   *
+   * @param ids_a        The ids of the first list of tokens, non-negative.
+   * @param size_a       Number of tokens of the first list.
+   * @param ids_b        The ids of the second list of tokens.
+   * @param size_b       Number of tokens of the second list.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], infinity if it exceeds the
+   *                     threshold.
+   */
+  double edit_distance_ids(const int32_t *ids_a, std::size_t size_a, const int32_t *ids_b,
+                           std::size_t size_b, double max_distance = -1.0);
+
+  /**
+   * Tokenize the sentences of a text like evaluate_pair() into a token list, whose tokens are
+   * interned in the vocabulary of the manager.
+   *
+   * @param sentences           The sentences of the text.
+   * @param convert_parentheses Convert all parentheses.
+   * @return                    The tokens of all the sentences.
+   */
+  TokenList tokenize_list(const std::vector<std::string> &sentences,
+                          bool convert_parentheses = false);
+
+  /**
+   * Calculate the normalized edit distance between two token lists of the manager, through
+   * their ids.
+   *
+   * @param tokens_a     The first list of tokens.
+   * @param tokens_b     The second list of tokens.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], infinity if it exceeds the
+   *                     threshold.
+   * @throws std::invalid_argument If a list was tokenized by another manager.
+   */
+  double edit_distance(const TokenList &tokens_a, const TokenList &tokens_b,
+                       double max_distance = -1.0);
+
+  /**
+   * Compare the token sets of two token lists of the manager, through their ids.
+   *
+   * @param reference The reference tokens.
+   * @param test      The test tokens.
+   * @return          The overlap scores, see compute_overlap().
+   * @throws std::invalid_argument If a list was tokenized by another manager.
+   */
+  OverlapScores overlap(const TokenList &reference, const TokenList &test) const;
+
+  /**
+   * Align two token lists, for instance to inspect the differences of an OCR output.
+   *
+   * The edit script is computed in linear memory, so long documents can be aligned.
+   *
    * @param tokens_a The first list of tokens.
    * @param tokens_b The second list of tokens.
-   * @return         Normalized edit distance in [0, 1].
+   * @return         Run-length encoded edit script from tokens_a to tokens_b.
    */
-  double edit_distance(const std::vector<std::string> &tokens_a,
-                       const std::vector<std::string> &tokens_b);
+  Alignment align(const std::vector<std::string> &tokens_a,
+                  const std::vector<std::string> &tokens_b);
+
+  // Align two pre-interned token id lists, see align() and edit_distance_ids().
+  Alignment align_ids(const int32_t *ids_a, std::size_t size_a, const int32_t *ids_b,
+                      std::size_t size_b);
+
+  /**
+   * Calculate the normalized edit distances of a batch of token list pairs.
+   *
+   * @param batch_a      The first token lists.
+   * @param batch_b      The second token lists. Must have the same size as batch_a.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1] for each pair, infinity if it
+   *                     exceeds the threshold.
+   */
+  std::vector<double> edit_distance_batch(const std::vector<std::vector<std::string>> &batch_a,
+                                          const std::vector<std::vector<std::string>> &batch_b,
+                                          double max_distance = -1.0);
+
+  /**
+   * Calculate the normalized edit distances of a batch of short token list pairs with worker
+   * threads, e.g. the table cells or captions of a document.
+   *
+   * The pairs whose shorter list has at most 64 tokens run together in the SIMD lanes, the
+   * instruction set is selected at runtime. The other pairs are computed one by one.
+   *
+   * @param batch_a      The first token lists.
+   * @param batch_b      The second token lists. Must have the same size as batch_a.
+   * @param num_threads  Number of worker threads, 0 for the hardware concurrency.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @param max_level    Highest instruction set to use, e.g. to compare the kernels.
+   * @return             Normalized edit distance in [0, 1] for each pair, infinity if it
+   *                     exceeds the threshold.
+   */
+  std::vector<double>
+  short_edit_distance_batch(const std::vector<std::vector<std::string>> &batch_a,
+                            const std::vector<std::vector<std::string>> &batch_b,
+                            int num_threads = 0, double max_distance = -1.0,
+                            SimdLevel max_level = SimdLevel::kAvx2);
+
+  /**
+   * Preprocess a reference token list once, to compute its edit distance to many hypotheses,
+   * e.g. the outputs of several models for the same ground truth.
+   *
+   * @param tokens The reference tokens.
+   * @return       The interned reference with its Peq table.
+   */
+  PreparedReference prepare_reference(const std::vector<std::string> &tokens);
+
+  /**
+   * Calculate the normalized edit distance of a token list to a prepared reference, equal to
+   * edit_distance(reference tokens, tokens, max_distance).
+   *
+   * @param reference    The prepared reference.
+   * @param tokens       The hypothesis tokens.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance in [0, 1], infinity if it exceeds the
+   *                     threshold.
+   */
+  double edit_distance(const PreparedReference &reference, const std::vector<std::string> &tokens,
+                       double max_distance = -1.0);
+
+  /**
+   * Calculate the normalized edit distances of many token lists to a prepared reference with
+   * worker threads.
+   *
+   * @param reference    The prepared reference.
+   * @param hypotheses   The hypothesis token lists.
+   * @param num_threads  Number of worker threads, 0 for the hardware concurrency.
+   * @param max_distance Threshold of the normalized distance, negative for none.
+   * @return             Normalized edit distance of each hypothesis, in the order of the input.
+   */
+  std::vector<double> edit_distance_batch(const PreparedReference &reference,
+                                          const std::vector<std::vector<std::string>> &hypotheses,
+                                          int num_threads = 0, double max_distance = -1.0);
+
+  /**
+   * Run the per-pair pipeline: tokenize both texts, compare the token sets and compute
+   * the normalized edit distance of the token lists.
+   *
+   * The texts are given as their sentences, each sentence is tokenized with the Tree Bank
+   * tokenizer, as NLTK's word_tokenize() does after the sentence splitting.
+   *
+   * @param sentences_a  The sentences of the first (reference) text.
+   * @param sentences_b  The sentences of the second text.
+   * @param max_distance Threshold of the normalized edit distance, negative for none.
+   * @return             The tokens and the scores of the pair.
+   */
+  PairEvaluation evaluate_pair(const std::vector<std::string> &sentences_a,
+                               const std::vector<std::string> &sentences_b,
+                               double max_distance = -1.0);
+
+  /**
+   * Run the per-pair pipeline of evaluate_pair on a batch of pairs with worker threads.
+   *
+   * @param batch_sentences_a The sentences of the first (reference) text of each pair.
+   * @param batch_sentences_b The sentences of the second text of each pair, same size.
+   * @param num_threads       Number of worker threads, 0 for the hardware concurrency.
+   * @param return_tokens     Also return the tokens of the texts.
+   * @param max_distance      Threshold of the normalized edit distance, negative for none.
+   * @param overlap           Compute the token set scores, NaN otherwise.
+   * @param edit_distance     Compute the edit distance, NaN otherwise.
+   * @return                  The scores of the pairs, in the order of the input.
+   */
+  BatchEvaluation evaluate_batch(const std::vector<std::vector<std::string>> &batch_sentences_a,
+                                 const std::vector<std::vector<std::string>> &batch_sentences_b,
+                                 int num_threads = 0, bool return_tokens = false,
+                                 double max_distance = -1.0, bool overlap = true,
+                                 bool edit_distance = true);
+
+  /**
+   * Compute the character error counts (CER) of a text to its reference.
+   *
+   * @param reference  The reference text, UTF-8 encoded.
+   * @param hypothesis The hypothesis text, UTF-8 encoded.
+   * @return           The edit distance of the code points and the reference length.
+   */
+  ErrorCounts character_errors(const std::string &reference, const std::string &hypothesis);
+
+  /**
+   * Compute the word error counts (WER) of a text to its reference, the words are split on
+   * whitespace like Python's str.split().
+   *
+   * @param reference  The reference text, UTF-8 encoded.
+   * @param hypothesis The hypothesis text, UTF-8 encoded.
+   * @return           The edit distance of the words and the reference length.
+   */
+  ErrorCounts word_errors(const std::string &reference, const std::string &hypothesis);
+
+  /**
+   * Compute the character and word error rates of a batch of text pairs with worker threads.
+   *
+   * @param references  The reference texts.
+   * @param hypotheses  The hypothesis texts, same size as references.
+   * @param num_threads Number of worker threads, 0 for the hardware concurrency.
+   * @return            The error rates and counts of the pairs, in the order of the input.
+   */
+  BatchErrorRates error_rates_batch(const std::vector<std::string> &references,
+                                    const std::vector<std::string> &hypotheses,
+                                    int num_threads = 0);
+
+  /**
+   * Tokenize text with the 13a tokenizer used by BLEU.
+   *
+   * @param text The input text to tokenize.
+   * @return     List of tokens.
+   */
+  std::vector<std::string> tokenize_13a(const std::string &text);
+
+  /**
+   * Compute the BLEU score of a tokenized hypothesis.
+   *
+   * @param references The tokens of the references, at least one.
+   * @param hypothesis The tokens of the hypothesis.
+   * @param max_order  Maximum n-gram order.
+   * @param smooth     Apply add-one smoothing to the n-gram precisions.
+   * @return           The BLEU score and its components.
+   */
+  BleuScore sentence_bleu(const std::vector<std::vector<std::string>> &references,
+                          const std::vector<std::string> &hypothesis, int max_order = 4,
+                          bool smooth = false);
+
+  /**
+   * Compute the sentence BLEU of a batch of text pairs with worker threads, with the 13a
+   * tokenization like the "bleu" module of HuggingFace evaluate.
+   *
+   * @param hypotheses  The hypothesis texts.
+   * @param references  The reference text of each hypothesis, same size as hypotheses.
+   * @param num_threads Number of worker threads, 0 for the hardware concurrency.
+   * @param max_order   Maximum n-gram order.
+   * @param smooth      Apply add-one smoothing to the n-gram precisions.
+   * @return            The BLEU scores and statistics, in the order of the input.
+   */
+  BatchBleu bleu_batch(const std::vector<std::string> &hypotheses,
+                       const std::vector<std::string> &references, int num_threads = 0,
+                       int max_order = 4, bool smooth = false);
+
+  /**
+   * Load the synonym and lowercase table of METEOR, written by
+   * docling_metrics_text.meteor_table. The table is memory-mapped and shared by the copies of
+   * the manager.
+   *
+   * @param path Path of the table, a std::runtime_error is thrown if it is not valid.
+   */
+  void load_meteor_table(const std::string &path);
+
+  // Whether a METEOR table is loaded
+  bool has_meteor_table() const { return meteor_table_ != nullptr; }
+
+  /**
+   * Compute the METEOR score of a tokenized hypothesis like NLTK's meteor_score(), a table
+   * must be loaded.
+   *
+   * @param references The tokens of the references, at least one.
+   * @param hypothesis The tokens of the hypothesis.
+   * @param alpha      Relative weight of the precision and the recall.
+   * @param beta       Shape of the fragmentation penalty.
+   * @param gamma      Weight of the fragmentation penalty.
+   * @return           The highest METEOR score of the references.
+   */
+  double meteor(const std::vector<std::vector<std::string>> &references,
+                const std::vector<std::string> &hypothesis, double alpha = 0.9,
+                double beta = 3.0, double gamma = 0.5);
+
+  /**
+   * Compute the METEOR scores of a batch of tokenized pairs with worker threads, a table must
+   * be loaded.
+   *
+   * @param references  The tokens of the reference of each pair.
+   * @param hypotheses  The tokens of the hypothesis of each pair, same size as references.
+   * @param num_threads Number of worker threads, 0 for the hardware concurrency.
+   * @param alpha       Relative weight of the precision and the recall.
+   * @param beta        Shape of the fragmentation penalty.
+   * @param gamma       Weight of the fragmentation penalty.
+   * @return            The METEOR score of each pair, in the order of the input.
+   */
+  std::vector<double> meteor_batch(const std::vector<std::vector<std::string>> &references,
+                                   const std::vector<std::vector<std::string>> &hypotheses,
+                                   int num_threads = 0, double alpha = 0.9, double beta = 3.0,
+                                   double gamma = 0.5);
 
 private:
+  // Throw if the ids of the token list are not from the vocabulary of the manager
+  void check_vocabulary(const TokenList &tokens) const;
+
   TreeBankTokenizer treebank_tokenizer_;
   EditDistanceCalculator ed_calculator_;
+  Vocabulary vocabulary_;
+  std::shared_ptr<const MeteorTable> meteor_table_;
 };
 
 } // namespace docling
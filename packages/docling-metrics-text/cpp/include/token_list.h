@@ -0,0 +1,104 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <vector>
+
+namespace docling {
+
+/**
+ * Ids of the tokens interned by a TextManager.
+ *
+ * The ids of two vocabularies are unrelated, hence every vocabulary has an identity, and a
+ * copy gets a new one since the ids of the copies diverge.
+ */
+class Vocabulary {
+public:
+  Vocabulary();
+  Vocabulary(const Vocabulary &other);
+  Vocabulary &operator=(const Vocabulary &other);
+
+  /**
+   * The id of a token, a new token gets the next id.
+   *
+   * @param token The token.
+   * @return      Its non-negative id.
+   */
+  int32_t intern(std::string_view token);
+
+  // Number of tokens
+  std::size_t size() const { return ids_.size(); }
+
+  // Identity of the vocabulary, unique in the process
+  uint64_t identity() const { return identity_; }
+
+private:
+  struct Hash {
+    using is_transparent = void;
+    std::size_t operator()(std::string_view token) const {
+      return std::hash<std::string_view>{}(token);
+    }
+  };
+
+  std::unordered_map<std::string, int32_t, Hash, std::equal_to<>> ids_;
+  uint64_t identity_;
+};
+
+/**
+ * Tokens of a text in a single arena: the bytes of the tokens back to back, the offset of
+ * each token in the arena and its id in the vocabulary of the TextManager that tokenized it.
+ *
+ * The token lists of the same vocabulary are compared through their ids, without copying
+ * nor hashing the token strings.
+ */
+class TokenList {
+public:
+  /**
+   * @param vocabulary Identity of the vocabulary interning the tokens.
+   */
+  explicit TokenList(uint64_t vocabulary = 0) : vocabulary_(vocabulary) {}
+
+  // Number of tokens
+  std::size_t size() const { return ids_.size(); }
+
+  // The i-th token, a view of the arena
+  std::string_view operator[](std::size_t i) const {
+    return std::string_view(arena_).substr(offsets_[i], offsets_[i + 1] - offsets_[i]);
+  }
+
+  // Copies of the tokens
+  std::vector<std::string> tokens() const;
+
+  // The bytes of the tokens, UTF-8 encoded
+  const std::string &arena() const { return arena_; }
+
+  // Offsets of the tokens in the arena, followed by the size of the arena
+  const std::vector<uint32_t> &offsets() const { return offsets_; }
+
+  // Ids of the tokens
+  const std::vector<int32_t> &ids() const { return ids_; }
+
+  // Identity of the vocabulary of the ids
+  uint64_t vocabulary() const { return vocabulary_; }
+
+  /**
+   * Append a token.
+   *
+   * @param token      The token.
+   * @param vocabulary The vocabulary of the list, interning the token.
+   * @throws std::invalid_argument If the vocabulary is not the one of the list.
+   * @throws std::length_error     If the arena exceeds 32-bit offsets.
+   */
+  void append(std::string_view token, Vocabulary &vocabulary);
+
+private:
+  std::string arena_;
+  std::vector<uint32_t> offsets_ = {0};
+  std::vector<int32_t> ids_;
+  uint64_t vocabulary_;
+};
+
+} // namespace docling
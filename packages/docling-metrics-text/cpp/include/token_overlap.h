@@ -0,0 +1,51 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <vector>
+
+namespace docling {
+
+/**
+ * Overlap scores of the token sets of two token lists.
+ *
+ * A score is empty when it is undefined, as None in nltk.metrics.
+ */
+struct OverlapScores {
+  std::optional<double> precision;
+  std::optional<double> recall;
+  std::optional<double> f1;
+  // Sizes of the token sets and of their intersection, the corpus statistics are their sums
+  std::size_t reference_size = 0;
+  std::size_t test_size = 0;
+  std::size_t common = 0;
+};
+
+/**
+ * Compute precision, recall and F1 of the token sets of two token lists.
+ *
+ * Bit-compatible with nltk.metrics precision(), recall() and f_measure() on sets.
+ *
+ * @param reference The reference tokens.
+ * @param test      The test tokens.
+ * @return          The overlap scores. The precision is undefined for empty test tokens,
+ *                  the recall for empty reference tokens and the F1 for either.
+ */
+OverlapScores compute_overlap(const std::vector<std::string> &reference,
+                              const std::vector<std::string> &test);
+
+/**
+ * Compute precision, recall and F1 of the token sets of two token id lists, equal to
+ * compute_overlap() of the tokens of the ids.
+ *
+ * @param reference      The ids of the reference tokens.
+ * @param reference_size Number of reference tokens.
+ * @param test           The ids of the test tokens.
+ * @param test_size      Number of test tokens.
+ * @return               The overlap scores.
+ */
+OverlapScores compute_overlap(const int32_t *reference, std::size_t reference_size,
+                              const int32_t *test, std::size_t test_size);
+
+} // namespace docling
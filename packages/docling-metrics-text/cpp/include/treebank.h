@@ -1,15 +1,59 @@
 #pragma once
+#include <cstdint>
 #include <memory>
 #include <string>
-#include <utility>
+#include <string_view>
 #include <vector>
 
 #include "re2/re2.h"
 
 namespace docling {
 
+/**
+ * Text of a token that replaces the bytes of its span.
+ */
+enum class TokenReplacement : uint8_t {
+  kNone,               // The token is the span
+  kOpeningQuote,       // ``
+  kClosingQuote,       // ''
+  kLeftParenthesis,    // -LRB-
+  kRightParenthesis,   // -RRB-
+  kLeftSquareBracket,  // -LSB-
+  kRightSquareBracket, // -RSB-
+  kLeftCurlyBracket,   // -LCB-
+  kRightCurlyBracket,  // -RCB-
+};
+
+/**
+ * Token of a text as a span of its bytes. The PTB quotes and brackets replace the bytes
+ * of their span.
+ */
+struct TokenSpan {
+  uint32_t start = 0;
+  uint32_t size = 0;
+  TokenReplacement replacement = TokenReplacement::kNone;
+
+  /**
+   * The text of the token.
+   *
+   * @param text The tokenized text.
+   * @return     A view of the text, or of the replacement.
+   */
+  std::string_view view(std::string_view text) const;
+};
+
 /**
  * Tokenizer based on the Tree Bank tokenization rules.
+ *
+ * Port of the NLTKWordTokenizer, the improved TreeBank tokenizer used by NLTK's
+ * word_tokenize() on each sentence, with Python's Unicode semantics of \s, \d and \b.
+ *
+ * Instead of rewriting the text with one regex pass per rule, a single scan records the
+ * spaces each rule inserts between the bytes of the text, together with the phase of the
+ * rule. A rule only sees the spaces of the earlier phases, as it would see in the
+ * rewritten text, so the tokens are the same as with the sequential passes.
+ *
+ * The tokenizer is immutable once constructed and can be shared between threads.
  */
 class TreeBankTokenizer {
 public:
@@ -18,25 +62,38 @@ public:
   /**
    * Tokenize the input text.
    *
-   * @param text                The input text to tokenize.
+   * @param text                The input text to tokenize, UTF-8 encoded.
    * @param convert_parentheses When true, convert parentheses to PTB bracket tokens.
    * @return                    List of tokens.
    */
-  std::vector<std::string> tokenize(const std::string &text, bool convert_parentheses = false);
+  std::vector<std::string> tokenize(const std::string &text,
+                                    bool convert_parentheses = false) const;
+
+  /**
+   * Tokenize the input text and append the tokens to the given list.
+   *
+   * @param text                The input text to tokenize, UTF-8 encoded.
+   * @param convert_parentheses When true, convert parentheses to PTB bracket tokens.
+   * @param tokens              List the tokens are appended to.
+   */
+  void tokenize_into(const std::string &text, bool convert_parentheses,
+                     std::vector<std::string> &tokens) const;
+
+  /**
+   * Tokenize the input text into spans of its bytes, without copying the tokens.
+   *
+   * @param text                The input text to tokenize, UTF-8 encoded.
+   * @param convert_parentheses When true, convert parentheses to PTB bracket tokens.
+   * @param spans               List the token spans are appended to.
+   * @throws std::length_error  If the text does not fit 32-bit offsets.
+   */
+  void tokenize_spans(std::string_view text, bool convert_parentheses,
+                      std::vector<TokenSpan> &spans) const;
 
 private:
-  // Pattern pairs: (compiled_regex, replacement)
-  std::vector<std::pair<std::unique_ptr<re2::RE2>, std::string>> starting_quotes_;
-  std::vector<std::pair<std::unique_ptr<re2::RE2>, std::string>> punctuation_;
-  std::vector<std::pair<std::unique_ptr<re2::RE2>, std::string>> ending_quotes_;
-  std::vector<std::pair<std::unique_ptr<re2::RE2>, std::string>> convert_parentheses_;
-
-  std::pair<std::unique_ptr<re2::RE2>, std::string> parens_brackets_;
-  std::pair<std::unique_ptr<re2::RE2>, std::string> double_dashes_;
-
-  // Contraction patterns (compiled regex, replacement is fixed)
-  std::vector<std::unique_ptr<re2::RE2>> contractions2_;
-  std::vector<std::unique_ptr<re2::RE2>> contractions3_;
+  // Python's \w and \p{Nd} for the non-ASCII code points
+  std::unique_ptr<re2::RE2> word_char_;
+  std::unique_ptr<re2::RE2> decimal_digit_;
 };
 
 } // namespace docling
@@ -1,6 +1,10 @@
 #pragma once
+#include <cstddef>
 #include <cstdint>
+#include <functional>
 #include <string>
+#include <string_view>
+#include <vector>
 
 namespace docling {
 
@@ -16,4 +20,85 @@ uint64_t GetTotalSystemGB();
  */
 void set_loglevel(std::string level);
 
-} // namespace docling
\ No newline at end of file
+/**
+ * Number of worker threads to use for a number of tasks
+ *
+ * @param num_threads Requested number of threads, 0 for the hardware concurrency.
+ * @param count       Number of tasks, there are never more workers than tasks.
+ */
+int resolve_num_threads(int num_threads, std::size_t count);
+
+/**
+ * Call fn(index, worker) for every index in [0, count) on a pool of worker threads
+ *
+ * The indices are handed out dynamically, so uneven tasks are balanced. The calling
+ * thread is the worker 0. The first exception thrown by fn stops the remaining tasks
+ * and is rethrown once all the workers are done.
+ *
+ * @param count       Number of tasks.
+ * @param num_threads Number of threads, 0 for the hardware concurrency.
+ * @param fn          Task function, called with the task index and the worker index.
+ */
+void parallel_for(std::size_t count, int num_threads,
+                  const std::function<void(std::size_t, int)> &fn);
+
+/**
+ * Decode a UTF-8 string into its code points
+ *
+ * The bytes of invalid sequences are decoded one by one as U+DC80 to U+DCFF, like Python's
+ * surrogateescape error handler.
+ *
+ * @param text        UTF-8 encoded text.
+ * @param code_points Set to the code points of the text.
+ */
+void decode_utf8(std::string_view text, std::vector<int32_t> &code_points);
+
+/**
+ * Append the UTF-8 encoding of code points to a string, the inverse of decode_utf8()
+ *
+ * @param code_points The code points, U+DC80 to U+DCFF are written as the escaped bytes.
+ * @param count       Number of code points.
+ * @param text        String the encoded code points are appended to.
+ */
+void encode_utf8(const char32_t *code_points, std::size_t count, std::string &text);
+
+/**
+ * Whether a code point is whitespace for Python's str.isspace()
+ */
+bool is_python_space(int32_t code_point);
+
+/**
+ * Split a UTF-8 string on runs of whitespace, like Python's str.split() without arguments
+ *
+ * @param text  UTF-8 encoded text.
+ * @param words Set to the words, pointing into the text.
+ */
+void split_whitespace(std::string_view text, std::vector<std::string_view> &words);
+
+/**
+ * Read-only memory mapping of a whole file, unmapped on destruction
+ */
+class MappedFile {
+public:
+  /**
+   * @param path Path of the file, a std::runtime_error is thrown if it cannot be mapped.
+   */
+  explicit MappedFile(const std::string &path);
+  ~MappedFile();
+
+  MappedFile(const MappedFile &) = delete;
+  MappedFile &operator=(const MappedFile &) = delete;
+
+  const char *data() const { return data_; }
+  std::size_t size() const { return size_; }
+
+private:
+  const char *data_ = nullptr;
+  std::size_t size_ = 0;
+#if defined(_WIN32)
+  void *file_ = nullptr;
+  void *mapping_ = nullptr;
+#endif
+};
+
+} // namespace docling
@@ -0,0 +1,271 @@
+#include <algorithm>
+#include <climits>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "edit_distance.h"
+#include "myers_block.h"
+
+namespace docling {
+
+namespace {
+
+// Largest DP matrix (cells) aligned directly with a traceback
+constexpr std::size_t kMaxTracebackCells = 1 << 14;
+
+/**
+ * Hirschberg's divide and conquer over the Myers bit-vector DP.
+ *
+ * The target range is split in half and the query split point is found from the last DP
+ * columns of the forward pass over the first half and of the backward pass over the second
+ * half. Only O(|query| + |target|) memory is used besides the small traceback matrices.
+ */
+class HirschbergAligner {
+public:
+  HirschbergAligner(const std::vector<int> &query_rows, const std::vector<int> &target_rows,
+                    int num_rows, Alignment &alignment)
+      : query_rows_(query_rows), target_rows_(target_rows), heads_(num_rows, -1),
+        counts_(num_rows, 0), dense_rows_(num_rows, -1), next_(query_rows.size()),
+        alignment_(alignment) {}
+
+  // Align the query range [q_lo, q_hi) with the target range [t_lo, t_hi).
+  void align(int q_lo, int q_hi, int t_lo, int t_hi) {
+    const int n = q_hi - q_lo;
+    const int m = t_hi - t_lo;
+    if (n == 0) {
+      alignment_.push(EditOp::kInsert, m, q_lo, t_lo);
+      return;
+    }
+    if (m == 0) {
+      alignment_.push(EditOp::kDelete, n, q_lo, t_lo);
+      return;
+    }
+    if (m == 1 || static_cast<std::size_t>(n + 1) * (m + 1) <= kMaxTracebackCells) {
+      align_traceback(q_lo, q_hi, t_lo, t_hi);
+      return;
+    }
+
+    const int t_mid = t_lo + m / 2;
+    int split = 0;
+    {
+      std::vector<int> forward;
+      std::vector<int> backward;
+      last_column(q_lo, q_hi, t_lo, t_mid, false, forward);
+      last_column(q_lo, q_hi, t_mid, t_hi, true, backward);
+
+      int best = INT_MAX;
+      for (int i = 0; i <= n; i++) {
+        int cost = forward[i] + backward[n - i];
+        if (cost < best) {
+          best = cost;
+          split = i;
+        }
+      }
+    }
+
+    align(q_lo, q_lo + split, t_lo, t_mid);
+    align(q_lo + split, q_hi, t_mid, t_hi);
+  }
+
+private:
+  /**
+   * Distances of the query prefixes to the whole target range with the Myers DP.
+   *
+   * In reverse, the query and the target ranges are read backwards, i.e. column[i] is the
+   * distance of the last i query tokens to the target range.
+   *
+   * The Eq vector of a target token is built from the positions of its token in the query
+   * range. The tokens occurring more often than the number of blocks get a Peq row, there
+   * are at most WORD_SIZE of them, which keeps the memory linear.
+   */
+  void last_column(int q_lo, int q_hi, int t_lo, int t_hi, bool reverse,
+                   std::vector<int> &column) {
+    const int n = q_hi - q_lo;
+    const int m = t_hi - t_lo;
+    const int num_blocks = (n + WORD_SIZE - 1) / WORD_SIZE;
+    auto query_row = [&](int k) { return query_rows_[reverse ? q_hi - 1 - k : q_lo + k]; };
+
+    // Positions of the rows in the query range, as linked lists
+    for (int k = 0; k < n; k++) {
+      int row = query_row(k);
+      next_[k] = heads_[row];
+      heads_[row] = k;
+      counts_[row]++;
+    }
+
+    int num_dense = 0;
+    for (int k = 0; k < n; k++) {
+      int row = query_row(k);
+      if (counts_[row] > num_blocks && dense_rows_[row] < 0) {
+        dense_rows_[row] = num_dense++;
+      }
+    }
+    dense_peq_.assign(static_cast<std::size_t>(num_dense) * num_blocks, 0);
+    for (int k = 0; k < n; k++) {
+      int dense = dense_rows_[query_row(k)];
+      if (dense >= 0) {
+        dense_peq_[static_cast<std::size_t>(dense) * num_blocks + k / WORD_SIZE] |=
+            WORD_1 << (k % WORD_SIZE);
+      }
+    }
+
+    eq_.assign(num_blocks, 0);
+    pv_.assign(num_blocks, ~Word(0));
+    mv_.assign(num_blocks, 0);
+    for (int c = 0; c < m; c++) {
+      const int row = target_rows_[reverse ? t_hi - 1 - c : t_lo + c];
+      const int dense = dense_rows_[row];
+      const Word *eq = eq_.data();
+      if (dense >= 0) {
+        eq = dense_peq_.data() + static_cast<std::size_t>(dense) * num_blocks;
+      } else {
+        for (int k = heads_[row]; k >= 0; k = next_[k]) {
+          eq_[k / WORD_SIZE] |= WORD_1 << (k % WORD_SIZE);
+        }
+      }
+
+      int hout = 1; // NW: gap before query is penalised
+      for (int b = 0; b < num_blocks; b++) {
+        hout = calculate_block(pv_[b], mv_[b], eq[b], hout, pv_[b], mv_[b]);
+      }
+
+      if (dense < 0) {
+        for (int k = heads_[row]; k >= 0; k = next_[k]) {
+          eq_[k / WORD_SIZE] = 0;
+        }
+      }
+    }
+
+    // Accumulate the vertical deltas from the top cell, which is the target length
+    column.resize(n + 1);
+    column[0] = m;
+    for (int i = 1; i <= n; i++) {
+      const int block = (i - 1) / WORD_SIZE;
+      const int bit = (i - 1) % WORD_SIZE;
+      column[i] = column[i - 1] + static_cast<int>((pv_[block] >> bit) & WORD_1) -
+                  static_cast<int>((mv_[block] >> bit) & WORD_1);
+    }
+
+    // Reset the tables for the next call
+    for (int k = 0; k < n; k++) {
+      int row = query_row(k);
+      heads_[row] = -1;
+      counts_[row] = 0;
+      dense_rows_[row] = -1;
+    }
+  }
+
+  // Align small ranges with the full DP matrix and its traceback.
+  void align_traceback(int q_lo, int q_hi, int t_lo, int t_hi) {
+    const int n = q_hi - q_lo;
+    const int m = t_hi - t_lo;
+    const int width = m + 1;
+    std::vector<int> dp(static_cast<std::size_t>(n + 1) * width);
+    for (int j = 0; j <= m; j++) {
+      dp[j] = j;
+    }
+    for (int i = 1; i <= n; i++) {
+      dp[i * width] = i;
+      for (int j = 1; j <= m; j++) {
+        int diagonal = dp[(i - 1) * width + j - 1] +
+                       (query_rows_[q_lo + i - 1] == target_rows_[t_lo + j - 1] ? 0 : 1);
+        dp[i * width + j] =
+            std::min({diagonal, dp[(i - 1) * width + j] + 1, dp[i * width + j - 1] + 1});
+      }
+    }
+
+    // Walk back from the end, preferring the diagonal
+    std::vector<EditOp> ops;
+    ops.reserve(n + m);
+    int i = n;
+    int j = m;
+    while (i > 0 || j > 0) {
+      if (i > 0 && j > 0) {
+        bool same = query_rows_[q_lo + i - 1] == target_rows_[t_lo + j - 1];
+        if (dp[i * width + j] == dp[(i - 1) * width + j - 1] + (same ? 0 : 1)) {
+          ops.push_back(same ? EditOp::kMatch : EditOp::kSubstitute);
+          i--;
+          j--;
+          continue;
+        }
+      }
+      if (i > 0 && dp[i * width + j] == dp[(i - 1) * width + j] + 1) {
+        ops.push_back(EditOp::kDelete);
+        i--;
+      } else {
+        ops.push_back(EditOp::kInsert);
+        j--;
+      }
+    }
+
+    int q_pos = q_lo;
+    int t_pos = t_lo;
+    for (auto it = ops.rbegin(); it != ops.rend(); ++it) {
+      alignment_.push(*it, 1, q_pos, t_pos);
+      q_pos += *it == EditOp::kInsert ? 0 : 1;
+      t_pos += *it == EditOp::kDelete ? 0 : 1;
+    }
+  }
+
+  const std::vector<int> &query_rows_;
+  const std::vector<int> &target_rows_;
+  // Linked lists of the query positions of each row, and their lengths
+  std::vector<int> heads_;
+  std::vector<int> counts_;
+  // Index of the rows in dense_peq_, -1 for the rows without a Peq row
+  std::vector<int> dense_rows_;
+  std::vector<int> next_;
+  std::vector<Word> dense_peq_;
+  // Eq vector of the current target token, and the block state
+  std::vector<Word> eq_;
+  std::vector<Word> pv_;
+  std::vector<Word> mv_;
+  Alignment &alignment_;
+};
+
+Alignment align_rows(const std::vector<int> &query_rows, const std::vector<int> &target_rows,
+                     int num_rows) {
+  Alignment alignment;
+  HirschbergAligner aligner(query_rows, target_rows, num_rows, alignment);
+  aligner.align(0, static_cast<int>(query_rows.size()), 0, static_cast<int>(target_rows.size()));
+  return alignment;
+}
+
+} // namespace
+
+void Alignment::push(EditOp op, int count, int32_t query_start, int32_t target_start) {
+  if (count <= 0) {
+    return;
+  }
+  if (op != EditOp::kMatch) {
+    distance += count;
+  }
+  if (!ops.empty() && ops.back() == static_cast<uint8_t>(op)) {
+    lengths.back() += count;
+    return;
+  }
+  ops.push_back(static_cast<uint8_t>(op));
+  lengths.push_back(count);
+  query_starts.push_back(query_start);
+  target_starts.push_back(target_start);
+}
+
+Alignment EditDistanceCalculator::align(const std::vector<std::string> &query,
+                                        const std::vector<std::string> &target) {
+  std::vector<int> query_rows;
+  std::vector<int> target_rows;
+  int num_rows = intern_rows(query, target, query_rows, target_rows);
+  return align_rows(query_rows, target_rows, num_rows);
+}
+
+Alignment EditDistanceCalculator::align(const int32_t *query, std::size_t query_size,
+                                        const int32_t *target, std::size_t target_size) {
+  std::vector<int> query_rows;
+  std::vector<int> target_rows;
+  int num_rows = intern_rows(query, static_cast<int>(query_size), target,
+                             static_cast<int>(target_size), query_rows, target_rows);
+  return align_rows(query_rows, target_rows, num_rows);
+}
+
+} // namespace docling
@@ -0,0 +1,278 @@
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <string_view>
+#include <unordered_map>
+
+#include "bleu.h"
+#include "utils.h"
+
+namespace docling {
+
+namespace {
+
+void replace_all(std::string &text, std::string_view from, std::string_view to) {
+  std::size_t pos = text.find(from);
+  if (pos == std::string::npos) {
+    return;
+  }
+  std::string result;
+  result.reserve(text.size());
+  std::size_t start = 0;
+  for (; pos != std::string::npos; pos = text.find(from, start)) {
+    result.append(text, start, pos - start);
+    result.append(to);
+    start = pos + from.size();
+  }
+  result.append(text, start);
+  text = std::move(result);
+}
+
+bool is_digit(char c) { return c >= '0' && c <= '9'; }
+
+bool is_period_or_comma(char c) { return c == '.' || c == ','; }
+
+// Python: [\{-\~\[-\` -\&\(-\+\:-\@\/]
+bool is_symbol(char c) {
+  return (c >= '{' && c <= '~') || (c >= '[' && c <= '`') || (c >= ' ' && c <= '&') ||
+         (c >= '(' && c <= '+') || (c >= ':' && c <= '@') || c == '/';
+}
+
+/**
+ * Ids of the n-grams of token sequences, an n-gram of order k is keyed by the id of its
+ * prefix of order k - 1 and the id of its last token.
+ */
+class NgramIndex {
+public:
+  // Set ids[k][i] to the id of the n-gram of order k + 1 starting at the token i
+  void index(const std::vector<std::string> &tokens, int max_order,
+             std::vector<std::vector<int32_t>> &ids) {
+    ids.assign(max_order, {});
+    std::vector<int32_t> token_ids;
+    token_ids.reserve(tokens.size());
+    for (const auto &token : tokens) {
+      auto [it, inserted] =
+          token_ids_.try_emplace(token, static_cast<int32_t>(token_ids_.size()));
+      token_ids.push_back(it->second);
+    }
+
+    for (int order = 1; order <= max_order && order <= static_cast<int>(tokens.size());
+         ++order) {
+      std::vector<int32_t> &current = ids[order - 1];
+      current.resize(tokens.size() - order + 1);
+      for (std::size_t i = 0; i < current.size(); ++i) {
+        uint64_t prefix = order == 1 ? 0 : static_cast<uint64_t>(ids[order - 2][i]) + 1;
+        uint64_t key = (prefix << 32) | static_cast<uint32_t>(token_ids[i + order - 1]);
+        auto [it, inserted] = ngram_ids_.try_emplace(key, static_cast<int32_t>(size()));
+        current[i] = it->second;
+      }
+    }
+  }
+
+  std::size_t size() const { return ngram_ids_.size(); }
+
+private:
+  std::unordered_map<std::string_view, int32_t> token_ids_;
+  std::unordered_map<uint64_t, int32_t> ngram_ids_;
+};
+
+} // namespace
+
+std::vector<std::string> tokenize_13a(const std::string &line) {
+  // Language-independent part
+  std::string text = line;
+  replace_all(text, "<skipped>", "");
+  replace_all(text, "-\n", "");
+  replace_all(text, "\n", " ");
+  if (text.find('&') != std::string::npos) {
+    replace_all(text, "&quot;", "\"");
+    replace_all(text, "&amp;", "&");
+    replace_all(text, "&lt;", "<");
+    replace_all(text, "&gt;", ">");
+  }
+  text = " " + text + " ";
+
+  // The regular expressions of the language-dependent part, applied one after the other.
+  // Only ASCII characters are matched, the other code points are copied byte by byte.
+  std::string result;
+  result.reserve(text.size() * 2);
+  // ([\{-\~\[-\` -\&\(-\+\:-\@\/]) -> " \1 "
+  for (char c : text) {
+    if (is_symbol(c)) {
+      result.push_back(' ');
+      result.push_back(c);
+      result.push_back(' ');
+    } else {
+      result.push_back(c);
+    }
+  }
+
+  // ([^0-9])([\.,]) -> "\1 \2 "
+  text.swap(result);
+  result.clear();
+  for (std::size_t i = 0; i < text.size(); ++i) {
+    if (i + 1 < text.size() && !is_digit(text[i]) && is_period_or_comma(text[i + 1])) {
+      result.push_back(text[i]);
+      result.push_back(' ');
+      result.push_back(text[i + 1]);
+      result.push_back(' ');
+      ++i;
+    } else {
+      result.push_back(text[i]);
+    }
+  }
+
+  // ([\.,])([^0-9]) -> " \1 \2"
+  text.swap(result);
+  result.clear();
+  for (std::size_t i = 0; i < text.size(); ++i) {
+    if (i + 1 < text.size() && is_period_or_comma(text[i]) && !is_digit(text[i + 1])) {
+      result.push_back(' ');
+      result.push_back(text[i]);
+      result.push_back(' ');
+      result.push_back(text[i + 1]);
+      ++i;
+    } else {
+      result.push_back(text[i]);
+    }
+  }
+
+  // ([0-9])(-) -> "\1 \2 "
+  text.swap(result);
+  result.clear();
+  for (std::size_t i = 0; i < text.size(); ++i) {
+    if (i + 1 < text.size() && is_digit(text[i]) && text[i + 1] == '-') {
+      result.push_back(text[i]);
+      result.append(" - ");
+      ++i;
+    } else {
+      result.push_back(text[i]);
+    }
+  }
+
+  std::vector<std::string_view> words;
+  split_whitespace(result, words);
+  return std::vector<std::string>(words.begin(), words.end());
+}
+
+BleuStatistics::BleuStatistics(int max_order)
+    : max_order_(max_order), matches_(std::max(max_order, 0), 0),
+      possible_matches_(std::max(max_order, 0), 0) {
+  if (max_order < 1) {
+    throw std::invalid_argument("The maximum n-gram order must be at least 1");
+  }
+}
+
+void BleuStatistics::add(const std::vector<std::vector<std::string>> &references,
+                         const std::vector<std::string> &hypothesis) {
+  if (references.empty()) {
+    throw std::invalid_argument("A hypothesis needs at least one reference");
+  }
+
+  NgramIndex index;
+  std::vector<std::vector<int32_t>> hypothesis_ids;
+  std::vector<std::vector<std::vector<int32_t>>> reference_ids(references.size());
+  index.index(hypothesis, max_order_, hypothesis_ids);
+  std::size_t reference_length = references[0].size();
+  for (std::size_t r = 0; r < references.size(); ++r) {
+    index.index(references[r], max_order_, reference_ids[r]);
+    reference_length = std::min(reference_length, references[r].size());
+  }
+
+  // The n-gram counts of the hypothesis are clipped to their maximum count in a reference
+  std::vector<int32_t> max_reference_counts(index.size(), 0);
+  std::vector<int32_t> counts(index.size(), 0);
+  for (const auto &ids_by_order : reference_ids) {
+    std::fill(counts.begin(), counts.end(), 0);
+    for (const auto &ids : ids_by_order) {
+      for (int32_t id : ids) {
+        counts[id] += 1;
+        max_reference_counts[id] = std::max(max_reference_counts[id], counts[id]);
+      }
+    }
+  }
+  for (int order = 1; order <= max_order_; ++order) {
+    for (int32_t id : hypothesis_ids[order - 1]) {
+      if (max_reference_counts[id] > 0) {
+        max_reference_counts[id] -= 1;
+        matches_[order - 1] += 1;
+      }
+    }
+    int64_t possible = static_cast<int64_t>(hypothesis.size()) - order + 1;
+    if (possible > 0) {
+      possible_matches_[order - 1] += possible;
+    }
+  }
+  translation_length_ += static_cast<int64_t>(hypothesis.size());
+  reference_length_ += static_cast<int64_t>(reference_length);
+}
+
+void BleuStatistics::merge(const BleuStatistics &other) {
+  if (other.max_order_ != max_order_) {
+    throw std::invalid_argument("Cannot merge BLEU statistics of different orders");
+  }
+  for (int i = 0; i < max_order_; ++i) {
+    matches_[i] += other.matches_[i];
+    possible_matches_[i] += other.possible_matches_[i];
+  }
+  translation_length_ += other.translation_length_;
+  reference_length_ += other.reference_length_;
+}
+
+void BleuStatistics::add_counts(const std::vector<int64_t> &matches,
+                                const std::vector<int64_t> &possible_matches,
+                                int64_t translation_length, int64_t reference_length) {
+  if (matches.size() != static_cast<std::size_t>(max_order_) ||
+      possible_matches.size() != static_cast<std::size_t>(max_order_)) {
+    throw std::invalid_argument("The n-gram counts must have max_order values");
+  }
+  for (int i = 0; i < max_order_; ++i) {
+    matches_[i] += matches[i];
+    possible_matches_[i] += possible_matches[i];
+  }
+  translation_length_ += translation_length;
+  reference_length_ += reference_length;
+}
+
+BleuScore BleuStatistics::score(bool smooth) const {
+  const double nan = std::numeric_limits<double>::quiet_NaN();
+  BleuScore score;
+  score.translation_length = translation_length_;
+  score.reference_length = reference_length_;
+  score.precisions.assign(max_order_, 0.0);
+  for (int i = 0; i < max_order_; ++i) {
+    if (smooth) {
+      score.precisions[i] = (static_cast<double>(matches_[i]) + 1.0) /
+                            (static_cast<double>(possible_matches_[i]) + 1.0);
+    } else if (possible_matches_[i] > 0) {
+      score.precisions[i] =
+          static_cast<double>(matches_[i]) / static_cast<double>(possible_matches_[i]);
+    }
+  }
+
+  double geo_mean = 0.0;
+  if (*std::min_element(score.precisions.begin(), score.precisions.end()) > 0.0) {
+    double log_sum = 0.0;
+    for (double precision : score.precisions) {
+      log_sum += (1.0 / max_order_) * std::log(precision);
+    }
+    geo_mean = std::exp(log_sum);
+  }
+
+  // The reference implementation divides by zero for empty hypotheses or references
+  if (reference_length_ == 0 || translation_length_ == 0) {
+    score.bleu = nan;
+    score.brevity_penalty = nan;
+    score.length_ratio = reference_length_ == 0 ? nan : 0.0;
+    return score;
+  }
+  score.length_ratio =
+      static_cast<double>(translation_length_) / static_cast<double>(reference_length_);
+  score.brevity_penalty =
+      score.length_ratio > 1.0 ? 1.0 : std::exp(1.0 - 1.0 / score.length_ratio);
+  score.bleu = geo_mean * score.brevity_penalty;
+  return score;
+}
+
+} // namespace docling
@@ -1,130 +1,299 @@
 #include <algorithm>
+#include <cmath>
+#include <cstdlib>
 #include <cstdint>
 #include <iostream>
+#include <limits>
 #include <stdexcept>
+#include <string_view>
 #include <unordered_map>
 #include <vector>
 
 #include "edit_distance.h"
 #include "loguru.hpp"
+#include "myers_block.h"
 #include "utils.h"
 
 namespace docling {
 
-constexpr int WORD_SIZE = sizeof(Word) * 8;
-constexpr Word WORD_1 = static_cast<Word>(1);
-constexpr Word HIGH_BIT = WORD_1 << (WORD_SIZE - 1);
+// Largest Peq table kept allocated between calls (bytes)
+constexpr std::size_t kMaxRetainedPeqBytes = 64 * 1024 * 1024;
 
-EditDistanceCalculator::EditDistanceCalculator(bool memory_safe) : memory_safe_(memory_safe) {
-  system_gb_ = GetTotalSystemGB();
-}
+// Largest token id mapped through a dense table, larger ids are hashed
+constexpr int32_t kMaxDenseTokenId = 1 << 24;
 
-// Myers "Advance_Block": processes one block of one column.
-// Pv/Mv encode the vertical deltas, Eq is the match vector for the current target token,
-// hin is the horizontal delta entering from the block above.
-// Returns hout (+1, 0, or -1) propagated to the next block.
-int EditDistanceCalculator::calculate_block(Word Pv, // Element of Pv to read
-                                            Word Mv, Word Eq, int hin, Word &PvOut, Word &MvOut) {
-  Word hinIsNeg = static_cast<Word>(hin >> 2) & WORD_1;
+namespace {
 
-  Word Xv = Eq | Mv;
-  Eq |= hinIsNeg;
-  Word Xh = (((Eq & Pv) + Pv) ^ Pv) | Eq;
+// Buffers reused across the calls of a thread. They are thread-local so that a calculator
+// can be shared between threads.
+struct MyersWorkspace {
+  // Interning of the string tokens, the keys point into the tokens of the current call
+  std::unordered_map<std::string_view, int> token_rows;
+  // Rows of the token ids: dense for small ids, hashed otherwise
+  std::vector<int> dense_id_rows;
+  std::unordered_map<int32_t, int> sparse_id_rows;
+  // Peq rows of the query and target positions
+  std::vector<int> query_rows;
+  std::vector<int> target_rows;
+  // Flat Peq table: num_rows x num_blocks
+  std::vector<Word> peq;
+  // Block state
+  std::vector<Word> pv;
+  std::vector<Word> mv;
+  std::vector<int> scores;
+};
 
-  Word Ph = Mv | ~(Xh | Pv);
-  Word Mh = Pv & Xh;
+thread_local MyersWorkspace workspace;
 
-  int hout = 0;
-  hout = (Ph & HIGH_BIT) >> (WORD_SIZE - 1);
-  hout -= (Mh & HIGH_BIT) >> (WORD_SIZE - 1);
+// Map the string tokens to Peq rows, see EditDistanceCalculator::intern_rows()
+template <typename Token>
+int intern_token_rows(const std::vector<Token> &query, const std::vector<Token> &target,
+                      std::vector<int> &query_rows, std::vector<int> &target_rows) {
+  const int n = static_cast<int>(query.size());
+  const int m = static_cast<int>(target.size());
 
-  Ph <<= 1;
-  Mh <<= 1;
-  Mh |= hinIsNeg;
-  Ph |= static_cast<Word>((hin + 1) >> 1);
+  // --- Map tokens to Peq rows ---
+  // Every distinct query token gets a row, the target tokens missing from the query share
+  // the last row that matches nothing.
+  auto &token_rows = workspace.token_rows;
+  token_rows.clear();
+  query_rows.resize(n);
+  for (int i = 0; i < n; i++) {
+    auto [it, inserted] = token_rows.try_emplace(query[i], static_cast<int>(token_rows.size()));
+    query_rows[i] = it->second;
+  }
 
-  PvOut = Mh | ~(Xv | Ph);
-  MvOut = Ph & Xv;
+  const int no_match_row = static_cast<int>(token_rows.size());
+  target_rows.resize(m);
+  for (int j = 0; j < m; j++) {
+    auto it = token_rows.find(target[j]);
+    target_rows[j] = it == token_rows.end() ? no_match_row : it->second;
+  }
+  token_rows.clear();
 
-  return hout;
+  return no_match_row + 1;
 }
 
-int EditDistanceCalculator::edit_distance_raw(const std::vector<std::string> &query,
-                                              const std::vector<std::string> &target) {
-  const int n = static_cast<int>(query.size());
-  const int m = static_cast<int>(target.size());
+} // namespace
 
-  if (n == 0) {
-    return m;
-  }
-  if (m == 0) {
-    return n;
-  }
+EditDistanceCalculator::EditDistanceCalculator(bool memory_safe) : memory_safe_(memory_safe) {
+  system_gb_ = GetTotalSystemGB();
+}
+
+int EditDistanceCalculator::intern_rows(const std::vector<std::string> &query,
+                                        const std::vector<std::string> &target,
+                                        std::vector<int> &query_rows,
+                                        std::vector<int> &target_rows) {
+  return intern_token_rows(query, target, query_rows, target_rows);
+}
 
-  // --- Map tokens to contiguous integer indices ---
-  std::unordered_map<std::string, int> token_map;
-  int next_id = 0;
+int EditDistanceCalculator::intern_rows(const std::vector<std::string_view> &query,
+                                        const std::vector<std::string_view> &target,
+                                        std::vector<int> &query_rows,
+                                        std::vector<int> &target_rows) {
+  return intern_token_rows(query, target, query_rows, target_rows);
+}
 
-  std::vector<int> q_idx(n); // vector with indices in the token_map
+int EditDistanceCalculator::intern_rows(const int32_t *query, int n, const int32_t *target, int m,
+                                        std::vector<int> &query_rows,
+                                        std::vector<int> &target_rows) {
+  int32_t max_id = -1;
   for (int i = 0; i < n; i++) {
-    auto [it, inserted] = token_map.try_emplace(query[i], next_id);
-    if (inserted) {
-      next_id++;
+    if (query[i] < 0) {
+      throw std::invalid_argument("Token ids must be non-negative");
     }
-    q_idx[i] = it->second;
+    max_id = std::max(max_id, query[i]);
   }
 
-  std::vector<int> t_idx(m); // vector with indices in the token_map
-  for (int i = 0; i < m; i++) {
-    auto [it, inserted] = token_map.try_emplace(target[i], next_id);
-    if (inserted) {
-      next_id++;
+  // --- Map token ids to Peq rows, as for the string tokens ---
+  int num_query_rows = 0;
+  query_rows.resize(n);
+  target_rows.resize(m);
+  if (max_id < kMaxDenseTokenId) {
+    auto &id_rows = workspace.dense_id_rows;
+    if (static_cast<int32_t>(id_rows.size()) <= max_id) {
+      id_rows.resize(max_id + 1, -1);
+    }
+    for (int i = 0; i < n; i++) {
+      int &row = id_rows[query[i]];
+      if (row < 0) {
+        row = num_query_rows++;
+      }
+      query_rows[i] = row;
+    }
+    for (int j = 0; j < m; j++) {
+      int32_t id = target[j];
+      int row = id >= 0 && id <= max_id ? id_rows[id] : -1;
+      target_rows[j] = row < 0 ? num_query_rows : row;
+    }
+    // Reset the table for the next call
+    for (int i = 0; i < n; i++) {
+      id_rows[query[i]] = -1;
+    }
+  } else {
+    auto &id_rows = workspace.sparse_id_rows;
+    id_rows.clear();
+    for (int i = 0; i < n; i++) {
+      auto [it, inserted] = id_rows.try_emplace(query[i], num_query_rows);
+      if (inserted) {
+        num_query_rows++;
+      }
+      query_rows[i] = it->second;
+    }
+    for (int j = 0; j < m; j++) {
+      auto it = id_rows.find(target[j]);
+      target_rows[j] = it == id_rows.end() ? num_query_rows : it->second;
     }
-    t_idx[i] = it->second;
   }
 
-  // --- Build Peq table ---
-  // Peq[token_id][block] has bit i set iff query position (block*64 + i) matches token_id.
-  // Tokens that only appear in the target get all-zero rows (no matches), which is the default.
+  return num_query_rows + 1;
+}
+
+int EditDistanceCalculator::edit_distance_raw(const std::vector<std::string> &query,
+                                              const std::vector<std::string> &target,
+                                              int max_distance) {
+  int num_rows = intern_rows(query, target, workspace.query_rows, workspace.target_rows);
+  return myers_distance(static_cast<int>(query.size()), static_cast<int>(target.size()),
+                        num_rows, max_distance);
+}
+
+int EditDistanceCalculator::edit_distance_raw(const int32_t *query, int n, const int32_t *target,
+                                              int m, int max_distance) {
+  int num_rows = intern_rows(query, n, target, m, workspace.query_rows, workspace.target_rows);
+  return myers_distance(n, m, num_rows, max_distance);
+}
+
+bool EditDistanceCalculator::trivial_distance(int n, int m, int max_distance, int &distance) {
+  // The distance is at least the difference of the lengths
+  if (max_distance >= 0 && std::abs(n - m) > max_distance) {
+    distance = -1;
+    return true;
+  }
+  if (n == 0 || m == 0) {
+    distance = std::max(n, m);
+    return true;
+  }
+  return false;
+}
+
+void EditDistanceCalculator::build_peq(const int *query_rows, int n, int num_rows,
+                                       std::vector<Word> &peq) {
+  // Peq[row][block] has bit i set iff query position (block*64 + i) has the token of the row.
+  // The W padding cells at the end of the last block match every token, as in edlib, which
+  // keeps the score of the last block an upper bound for the band checks of the DP.
   const int num_blocks = ceil_div(n, WORD_SIZE);
   const int W = num_blocks * WORD_SIZE - n; // padding bits in the last block
-  // std::cout << "n=" << n << ", m=" << m << "\n";
-  // std::cout << "num_blocks=" << num_blocks << "\n";
-  // std::cout << "WORD_SIZE=" << WORD_SIZE << "\n";
-  // std::cout << "W=" << W << "\n";
-  // std::cout << "token_map.size()=" << token_map.size() << ", next_id=" << next_id << "\n";
 
   // Initialize the dynamic matrix
-  // Dimension: size-of-token_map x num-of-blocks
-  bool mem_ok = sanity_checks(next_id, num_blocks);
+  // Dimension: num-of-rows x num-of-blocks
+  bool mem_ok = sanity_checks(num_rows, num_blocks);
   if (!mem_ok) {
     if (memory_safe_) {
       throw std::runtime_error("Insufficient system memory for Peq table; Aborting.");
     }
   }
 
-  std::vector<std::vector<Word>> Peq(next_id, std::vector<Word>(num_blocks, 0));
+  const Word padding = W > 0 ? ~Word(0) << (WORD_SIZE - W) : 0;
+  peq.assign(static_cast<std::size_t>(num_rows) * num_blocks, 0);
+  for (int row = 0; row < num_rows; row++) {
+    peq[static_cast<std::size_t>(row) * num_blocks + num_blocks - 1] = padding;
+  }
   for (int i = 0; i < n; i++) {
-    Peq[q_idx[i]][i / WORD_SIZE] |= WORD_1 << (i % WORD_SIZE);
+    peq[static_cast<std::size_t>(query_rows[i]) * num_blocks + i / WORD_SIZE] |=
+        WORD_1 << (i % WORD_SIZE);
   }
+}
+
+int EditDistanceCalculator::myers_distance(int n, int m, int num_rows, int max_distance) {
+  int distance;
+  if (trivial_distance(n, m, max_distance, distance)) {
+    return distance;
+  }
+
+  build_peq(workspace.query_rows.data(), n, num_rows, workspace.peq);
+  distance = myers_scan(workspace.peq.data(), n, workspace.target_rows.data(), m, max_distance);
+  release_large_peq();
+  return distance;
+}
+
+int EditDistanceCalculator::myers_scan(const Word *peq, int n, const int *target_rows, int m,
+                                       int max_distance) {
+  const int num_blocks = ceil_div(n, WORD_SIZE);
+  const int W = num_blocks * WORD_SIZE - n; // padding bits in the last block
+
+  // --- Ukkonen band ---
+  // k is an upper bound of the distance: the threshold, tightened after every column. Only
+  // the blocks [first_block, last_block] that can hold cells with a score <= k are computed.
+  int k = std::max(n, m);
+  if (max_distance >= 0) {
+    k = std::min(k, max_distance);
+  }
+  int first_block = 0;
+  int last_block =
+      std::min(ceil_div(std::min(k, (k + n - m) / 2) + 1, WORD_SIZE), num_blocks) - 1;
 
   // --- Initialise block state ---
-  std::vector<Word> Pv(num_blocks, ~Word(0)); // all 1s
-  std::vector<Word> Mv(num_blocks, 0);
-  std::vector<int> scores(num_blocks);
+  std::vector<Word> &Pv = workspace.pv;
+  std::vector<Word> &Mv = workspace.mv;
+  std::vector<int> &scores = workspace.scores;
+  Pv.assign(num_blocks, ~Word(0)); // all 1s
+  Mv.assign(num_blocks, 0);
+  scores.resize(num_blocks);
   for (int b = 0; b < num_blocks; b++) {
     scores[b] = (b + 1) * WORD_SIZE;
   }
 
   // --- Process each target token ---
   for (int j = 0; j < m; j++) {
-    const std::vector<Word> &eq = Peq[t_idx[j]]; // The Peq vector corresponding to the target token
-    int hin = 1;                                 // NW: gap before query is penalised
+    // The Peq vector corresponding to the target token
+    const Word *eq = peq + static_cast<std::size_t>(target_rows[j]) * num_blocks;
+    int hout = 1; // NW: gap before query is penalised
+
+    for (int b = first_block; b <= last_block; b++) {
+      hout = calculate_block(Pv[b], Mv[b], eq[b], hout, Pv[b], Mv[b]);
+      scores[b] += hout;
+    }
+
+    // The distance is at most the score of the last block plus the remaining steps
+    k = std::min(k, scores[last_block] +
+                        std::max(m - j - 1, n - ((1 + last_block) * WORD_SIZE - 1) - 1) +
+                        (last_block == num_blocks - 1 ? W : 0));
 
-    for (int b = 0; b < num_blocks; b++) {
-      hin = calculate_block(Pv[b], Mv[b], eq[b], hin, Pv[b], Mv[b]);
-      scores[b] += hin;
+    // Extend the band by the next block if it is not beneath the band
+    if (last_block + 1 < num_blocks &&
+        (last_block + 1) * WORD_SIZE - 1 <=
+            k - scores[last_block] + 2 * WORD_SIZE - 2 - m + j + n) {
+      last_block++;
+      Pv[last_block] = ~Word(0);
+      Mv[last_block] = 0;
+      int new_hout =
+          calculate_block(Pv[last_block], Mv[last_block], eq[last_block], hout, Pv[last_block],
+                          Mv[last_block]);
+      scores[last_block] = scores[last_block - 1] - hout + WORD_SIZE + new_hout;
+      hout = new_hout;
     }
+
+    // Drop the blocks beneath and above the band
+    while (last_block >= first_block &&
+           (scores[last_block] >= k + WORD_SIZE ||
+            (last_block + 1) * WORD_SIZE - 1 >
+                k - scores[last_block] + 2 * WORD_SIZE - 2 - m + j + n + 1)) {
+      last_block--;
+    }
+    while (first_block <= last_block &&
+           (scores[first_block] >= k + WORD_SIZE ||
+            (first_block + 1) * WORD_SIZE - 1 < scores[first_block] - k - m + n + j)) {
+      first_block++;
+    }
+
+    // No cell can stay within the threshold anymore
+    if (last_block < first_block) {
+      return -1;
+    }
+  }
+
+  if (last_block != num_blocks - 1) {
+    return -1;
   }
 
   // --- Extract score at the real last query position ---
@@ -142,16 +311,155 @@ int EditDistanceCalculator::edit_distance_raw(const std::vector<std::string> &qu
     mask >>= 1;
   }
 
-  return score;
+  return score <= k ? score : -1;
+}
+
+void EditDistanceCalculator::release_large_peq() {
+  if (workspace.peq.capacity() * sizeof(Word) > kMaxRetainedPeqBytes) {
+    std::vector<Word>().swap(workspace.peq);
+  }
 }
 
 double EditDistanceCalculator::edit_distance(const std::vector<std::string> &query,
-                                             const std::vector<std::string> &target) {
+                                             const std::vector<std::string> &target,
+                                             double max_distance) {
   const int max_len = std::max(static_cast<int>(query.size()), static_cast<int>(target.size()));
   if (max_len == 0) {
     return 0.0;
   }
-  return static_cast<double>(edit_distance_raw(query, target)) / max_len;
+
+  return normalize(edit_distance_raw(query, target, max_raw_distance(max_distance, max_len)),
+                   max_len);
+}
+
+PreparedReference EditDistanceCalculator::prepare(const std::vector<std::string> &reference) {
+  PreparedReference prepared;
+  prepared.size_ = static_cast<int>(reference.size());
+  if (reference.empty()) {
+    return prepared;
+  }
+
+  // --- Intern the reference tokens, as intern_rows() does for a query ---
+  auto &token_rows = workspace.token_rows;
+  token_rows.clear();
+  std::vector<int> query_rows(reference.size());
+  for (std::size_t i = 0; i < reference.size(); i++) {
+    auto [it, inserted] =
+        token_rows.try_emplace(reference[i], static_cast<int>(token_rows.size()));
+    query_rows[i] = it->second;
+  }
+
+  // The keys of the prepared table must point into its own tokens
+  prepared.tokens_.resize(token_rows.size());
+  for (const auto &[token, row] : token_rows) {
+    prepared.tokens_[row] = std::string(token);
+  }
+  token_rows.clear();
+  prepared.token_rows_.reserve(prepared.tokens_.size());
+  for (std::size_t row = 0; row < prepared.tokens_.size(); row++) {
+    prepared.token_rows_.emplace(prepared.tokens_[row], static_cast<int>(row));
+  }
+
+  build_peq(query_rows.data(), prepared.size_, static_cast<int>(prepared.tokens_.size()) + 1,
+            prepared.peq_);
+  return prepared;
+}
+
+double EditDistanceCalculator::edit_distance(const PreparedReference &reference,
+                                             const std::vector<std::string> &target,
+                                             double max_distance) {
+  const int n = reference.size_;
+  const int m = static_cast<int>(target.size());
+  const int max_len = std::max(n, m);
+  if (max_len == 0) {
+    return 0.0;
+  }
+
+  const int max_raw = max_raw_distance(max_distance, max_len);
+  int distance;
+  if (!trivial_distance(n, m, max_raw, distance)) {
+    // Only the target tokens are mapped to the rows of the reference
+    const int no_match_row = reference.distinct_tokens();
+    std::vector<int> &target_rows = workspace.target_rows;
+    target_rows.resize(m);
+    for (int j = 0; j < m; j++) {
+      auto it = reference.token_rows_.find(target[j]);
+      target_rows[j] = it == reference.token_rows_.end() ? no_match_row : it->second;
+    }
+    distance = myers_scan(reference.peq_.data(), n, target_rows.data(), m, max_raw);
+  }
+  return normalize(distance, max_len);
+}
+
+ErrorCounts EditDistanceCalculator::character_errors(const std::string &reference,
+                                                     const std::string &hypothesis) {
+  std::vector<int32_t> reference_chars;
+  std::vector<int32_t> hypothesis_chars;
+  decode_utf8(reference, reference_chars);
+  decode_utf8(hypothesis, hypothesis_chars);
+
+  ErrorCounts counts;
+  counts.reference_length = static_cast<int>(reference_chars.size());
+  counts.errors = edit_distance_raw(reference_chars.data(), counts.reference_length,
+                                    hypothesis_chars.data(),
+                                    static_cast<int>(hypothesis_chars.size()), -1);
+  return counts;
+}
+
+ErrorCounts EditDistanceCalculator::word_errors(const std::string &reference,
+                                                const std::string &hypothesis) {
+  std::vector<std::string_view> reference_words;
+  std::vector<std::string_view> hypothesis_words;
+  split_whitespace(reference, reference_words);
+  split_whitespace(hypothesis, hypothesis_words);
+
+  ErrorCounts counts;
+  counts.reference_length = static_cast<int>(reference_words.size());
+  int num_rows = intern_rows(reference_words, hypothesis_words, workspace.query_rows,
+                             workspace.target_rows);
+  counts.errors = myers_distance(counts.reference_length,
+                                 static_cast<int>(hypothesis_words.size()), num_rows, -1);
+  return counts;
+}
+
+double ErrorCounts::rate() const {
+  if (reference_length == 0) {
+    return errors == 0 ? 0.0 : std::numeric_limits<double>::quiet_NaN();
+  }
+  return static_cast<double>(errors) / reference_length;
+}
+
+double EditDistanceCalculator::edit_distance(const int32_t *query, std::size_t query_size,
+                                             const int32_t *target, std::size_t target_size,
+                                             double max_distance) {
+  const int n = static_cast<int>(query_size);
+  const int m = static_cast<int>(target_size);
+  const int max_len = std::max(n, m);
+  if (max_len == 0) {
+    return 0.0;
+  }
+  return normalize(edit_distance_raw(query, n, target, m, max_raw_distance(max_distance, max_len)),
+                   max_len);
+}
+
+int EditDistanceCalculator::max_raw_distance(double max_distance, int max_len) {
+  if (max_distance < 0.0) {
+    return -1;
+  }
+  // Largest raw distance whose normalized distance is within max_distance
+  int max_raw = static_cast<int>(
+      std::min(std::floor(max_distance * max_len), static_cast<double>(max_len)));
+  if (max_raw < max_len && static_cast<double>(max_raw + 1) / max_len <= max_distance) {
+    max_raw++;
+  }
+  return max_raw;
+}
+
+double EditDistanceCalculator::normalize(int distance, int max_len) {
+  if (distance < 0) {
+    return std::numeric_limits<double>::infinity();
+  }
+  return static_cast<double>(distance) / max_len;
 }
 
 bool EditDistanceCalculator::sanity_checks(size_t token_map_size, size_t num_of_blocks) {
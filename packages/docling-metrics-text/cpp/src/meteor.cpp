@@ -0,0 +1,354 @@
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <stdexcept>
+#include <unordered_map>
+#include <utility>
+
+#include "meteor.h"
+#include "porter.h"
+
+namespace docling {
+
+namespace {
+
+constexpr char kMagic[8] = {'D', 'M', 'M', 'E', 'T', 'E', 'O', 'R'};
+constexpr int32_t kCapitalSigma = 0x3A3;
+constexpr char32_t kSmallSigma = 0x3C3;
+constexpr char32_t kFinalSigma = 0x3C2;
+
+// Reads the uint32 arrays of the table one after the other
+class TableReader {
+public:
+  TableReader(const MappedFile &file, const std::string &path)
+      : data_(file.data()), size_(file.size()), path_(path) {}
+
+  const uint32_t *array(std::size_t count) {
+    if (count > (size_ - offset_) / sizeof(uint32_t)) {
+      fail("is truncated");
+    }
+    const auto *values = reinterpret_cast<const uint32_t *>(data_ + offset_);
+    offset_ += count * sizeof(uint32_t);
+    return values;
+  }
+
+  const char *bytes(std::size_t count) {
+    if (count > size_ - offset_) {
+      fail("is truncated");
+    }
+    const char *values = data_ + offset_;
+    offset_ += count;
+    return values;
+  }
+
+  // Check that offsets into an array of the given size are sorted and in bounds
+  void check_offsets(const uint32_t *offsets, std::size_t count, std::size_t size) const {
+    if (offsets[0] != 0 || offsets[count] != size) {
+      fail("has invalid offsets");
+    }
+    for (std::size_t i = 0; i < count; ++i) {
+      if (offsets[i] > offsets[i + 1]) {
+        fail("has invalid offsets");
+      }
+    }
+  }
+
+  [[noreturn]] void fail(const std::string &reason) const {
+    throw std::runtime_error("The METEOR table " + path_ + " " + reason);
+  }
+
+private:
+  const char *data_;
+  std::size_t size_;
+  std::size_t offset_ = sizeof(kMagic);
+  const std::string &path_;
+};
+
+/**
+ * The words of a sentence which are not aligned yet, with their position in the sentence.
+ */
+struct UnalignedWords {
+  std::vector<int32_t> positions;
+  std::vector<std::string> words;
+
+  void assign(const std::vector<std::string> &tokens, const MeteorTable &table) {
+    positions.resize(tokens.size());
+    words.resize(tokens.size());
+    for (std::size_t i = 0; i < tokens.size(); ++i) {
+      positions[i] = static_cast<int32_t>(i);
+      words[i] = table.lower(tokens[i]);
+    }
+  }
+
+  // Drop the aligned words, keeping the order of the others
+  void remove(const std::vector<bool> &aligned) {
+    std::size_t kept = 0;
+    for (std::size_t i = 0; i < words.size(); ++i) {
+      if (aligned[i]) {
+        continue;
+      }
+      if (kept != i) {
+        positions[kept] = positions[i];
+        words[kept] = std::move(words[i]);
+      }
+      ++kept;
+    }
+    positions.resize(kept);
+    words.resize(kept);
+  }
+
+  void stem() {
+    for (std::string &word : words) {
+      word = porter_stem(word);
+    }
+  }
+};
+
+using Match = std::pair<int32_t, int32_t>;
+
+/**
+ * Align the words of the hypothesis, from the last one, to the last unaligned occurrence of a
+ * candidate word in the reference: the word itself, or also its synonyms if a table is given.
+ * Among the synonyms, the one whose occurrence is the last in the reference is taken.
+ */
+void align_words(UnalignedWords &hypothesis, UnalignedWords &reference,
+                 const MeteorTable *synonym_table, std::vector<Match> &matches) {
+  std::unordered_map<std::string_view, std::vector<int32_t>> reference_positions;
+  for (std::size_t j = 0; j < reference.words.size(); ++j) {
+    reference_positions[reference.words[j]].push_back(static_cast<int32_t>(j));
+  }
+
+  std::vector<bool> hypothesis_aligned(hypothesis.words.size(), false);
+  std::vector<bool> reference_aligned(reference.words.size(), false);
+  std::vector<std::string_view> candidates;
+  for (std::size_t i = hypothesis.words.size(); i-- > 0;) {
+    candidates.assign(1, hypothesis.words[i]);
+    if (synonym_table != nullptr) {
+      synonym_table->synonyms(hypothesis.words[i], candidates);
+    }
+
+    std::vector<int32_t> *best = nullptr;
+    for (std::string_view candidate : candidates) {
+      auto it = reference_positions.find(candidate);
+      if (it != reference_positions.end() && !it->second.empty() &&
+          (best == nullptr || it->second.back() > best->back())) {
+        best = &it->second;
+      }
+    }
+    if (best != nullptr) {
+      int32_t j = best->back();
+      best->pop_back();
+      hypothesis_aligned[i] = true;
+      reference_aligned[j] = true;
+      matches.emplace_back(hypothesis.positions[i], reference.positions[j]);
+    }
+  }
+  hypothesis.remove(hypothesis_aligned);
+  reference.remove(reference_aligned);
+}
+
+// Fewest chunks of adjacent matches, the matches are sorted by hypothesis position
+int count_chunks(const std::vector<Match> &matches) {
+  int chunks = 1;
+  for (std::size_t i = 0; i + 1 < matches.size(); ++i) {
+    if (matches[i + 1].first != matches[i].first + 1 ||
+        matches[i + 1].second != matches[i].second + 1) {
+      ++chunks;
+    }
+  }
+  return chunks;
+}
+
+} // namespace
+
+MeteorTable::MeteorTable(const std::string &path) : file_(path) {
+  if (file_.size() < sizeof(kMagic) || std::memcmp(file_.data(), kMagic, sizeof(kMagic)) != 0) {
+    throw std::runtime_error("The METEOR table " + path + " has an invalid header");
+  }
+  TableReader reader(file_, path);
+  const uint32_t *header = reader.array(7);
+  if (header[0] != kVersion) {
+    reader.fail("has the unsupported version " + std::to_string(header[0]));
+  }
+  word_count_ = header[1];
+  const uint32_t synonym_count = header[2];
+  lower_count_ = header[3];
+  case_range_count_ = header[4];
+  const uint32_t string_size = header[5];
+  const uint32_t lower_size = header[6];
+
+  word_offsets_ = reader.array(static_cast<std::size_t>(word_count_) + 1);
+  synonym_offsets_ = reader.array(static_cast<std::size_t>(word_count_) + 1);
+  synonyms_ = reader.array(synonym_count);
+  lower_chars_ = reader.array(lower_count_);
+  lower_offsets_ = reader.array(static_cast<std::size_t>(lower_count_) + 1);
+  case_ranges_ = reader.array(static_cast<std::size_t>(case_range_count_) * 3);
+  string_bytes_ = reader.bytes(string_size);
+  lower_bytes_ = reader.bytes(lower_size);
+
+  reader.check_offsets(word_offsets_, word_count_, string_size);
+  reader.check_offsets(synonym_offsets_, word_count_, synonym_count);
+  reader.check_offsets(lower_offsets_, lower_count_, lower_size);
+  for (uint32_t i = 0; i < synonym_count; ++i) {
+    if (synonyms_[i] >= word_count_) {
+      reader.fail("has invalid synonyms");
+    }
+  }
+}
+
+std::string_view MeteorTable::word(uint32_t id) const {
+  return std::string_view(string_bytes_ + word_offsets_[id],
+                          word_offsets_[id + 1] - word_offsets_[id]);
+}
+
+void MeteorTable::synonyms(std::string_view word,
+                           std::vector<std::string_view> &synonyms) const {
+  // Binary search of the word in the sorted words
+  uint32_t low = 0;
+  uint32_t high = word_count_;
+  while (low < high) {
+    uint32_t middle = low + (high - low) / 2;
+    if (this->word(middle) < word) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  if (low == word_count_ || this->word(low) != word) {
+    return;
+  }
+  for (uint32_t i = synonym_offsets_[low]; i < synonym_offsets_[low + 1]; ++i) {
+    synonyms.push_back(this->word(synonyms_[i]));
+  }
+}
+
+uint32_t MeteorTable::case_flags(int32_t code_point) const {
+  const auto c = static_cast<uint32_t>(code_point);
+  uint32_t low = 0;
+  uint32_t high = case_range_count_;
+  while (low < high) {
+    uint32_t middle = low + (high - low) / 2;
+    if (case_ranges_[middle * 3 + 1] < c) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  if (low < case_range_count_ && case_ranges_[low * 3] <= c) {
+    return case_ranges_[low * 3 + 2];
+  }
+  return 0;
+}
+
+// Python lowercases a capital sigma preceded by a cased letter and not followed by one,
+// skipping the case-ignorable characters, to a final sigma
+bool MeteorTable::is_final_sigma(const std::vector<int32_t> &code_points, std::size_t i) const {
+  std::size_t j = i;
+  uint32_t flags = 0;
+  while (j > 0) {
+    flags = case_flags(code_points[--j]);
+    if (!(flags & kCaseIgnorable)) {
+      break;
+    }
+  }
+  if (j == i || (flags & kCaseIgnorable) || !(flags & kCased)) {
+    return false;
+  }
+  for (j = i + 1; j < code_points.size(); ++j) {
+    flags = case_flags(code_points[j]);
+    if (!(flags & kCaseIgnorable)) {
+      return !(flags & kCased);
+    }
+  }
+  return true;
+}
+
+std::string MeteorTable::lower(const std::string &word) const {
+  bool ascii_lowercase = true;
+  for (char c : word) {
+    if ((c & 0x80) || (c >= 'A' && c <= 'Z')) {
+      ascii_lowercase = false;
+      break;
+    }
+  }
+  if (ascii_lowercase) {
+    return word;
+  }
+
+  std::vector<int32_t> code_points;
+  decode_utf8(word, code_points);
+  std::string result;
+  result.reserve(word.size());
+  for (std::size_t i = 0; i < code_points.size(); ++i) {
+    const int32_t c = code_points[i];
+    if (c < 0x80) {
+      result.push_back(static_cast<char>(c >= 'A' && c <= 'Z' ? c + ('a' - 'A') : c));
+      continue;
+    }
+    if (c == kCapitalSigma) {
+      const char32_t sigma = is_final_sigma(code_points, i) ? kFinalSigma : kSmallSigma;
+      encode_utf8(&sigma, 1, result);
+      continue;
+    }
+    const uint32_t *it = std::lower_bound(lower_chars_, lower_chars_ + lower_count_,
+                                          static_cast<uint32_t>(c));
+    if (it != lower_chars_ + lower_count_ && *it == static_cast<uint32_t>(c)) {
+      std::size_t k = it - lower_chars_;
+      result.append(lower_bytes_ + lower_offsets_[k], lower_offsets_[k + 1] - lower_offsets_[k]);
+    } else {
+      const auto code_point = static_cast<char32_t>(c);
+      encode_utf8(&code_point, 1, result);
+    }
+  }
+  return result;
+}
+
+double single_meteor_score(const MeteorTable &table, const std::vector<std::string> &reference,
+                           const std::vector<std::string> &hypothesis,
+                           const MeteorParameters &parameters) {
+  UnalignedWords hypothesis_words;
+  UnalignedWords reference_words;
+  hypothesis_words.assign(hypothesis, table);
+  reference_words.assign(reference, table);
+
+  // Exact matches, then matches of the Porter stems, then of the WordNet synonyms of the
+  // stems, each stage aligns the words left by the previous one
+  std::vector<Match> matches;
+  align_words(hypothesis_words, reference_words, nullptr, matches);
+  hypothesis_words.stem();
+  reference_words.stem();
+  align_words(hypothesis_words, reference_words, nullptr, matches);
+  align_words(hypothesis_words, reference_words, &table, matches);
+  std::sort(matches.begin(), matches.end());
+
+  if (matches.empty() || hypothesis.empty() || reference.empty()) {
+    return 0.0;
+  }
+  const auto match_count = static_cast<double>(matches.size());
+  const double precision = match_count / static_cast<double>(hypothesis.size());
+  const double recall = match_count / static_cast<double>(reference.size());
+  const double denominator = parameters.alpha * precision + (1 - parameters.alpha) * recall;
+  if (denominator == 0.0) {
+    return 0.0;
+  }
+  const double fmean = (precision * recall) / denominator;
+  const double fragmentation = static_cast<double>(count_chunks(matches)) / match_count;
+  const double penalty = parameters.gamma * std::pow(fragmentation, parameters.beta);
+  return (1 - penalty) * fmean;
+}
+
+double meteor_score(const MeteorTable &table,
+                    const std::vector<std::vector<std::string>> &references,
+                    const std::vector<std::string> &hypothesis,
+                    const MeteorParameters &parameters) {
+  if (references.empty()) {
+    throw std::invalid_argument("A hypothesis needs at least one reference");
+  }
+  double best = single_meteor_score(table, references[0], hypothesis, parameters);
+  for (std::size_t r = 1; r < references.size(); ++r) {
+    best = std::max(best, single_meteor_score(table, references[r], hypothesis, parameters));
+  }
+  return best;
+}
+
+} // namespace docling
@@ -0,0 +1,306 @@
+#include <cstdint>
+#include <string_view>
+#include <vector>
+
+#include "porter.h"
+#include "utils.h"
+
+namespace docling {
+
+namespace {
+
+using Word = std::u32string;
+// A rule condition is called with the stem left by the suffix and the whole word
+using Condition = bool (*)(const Word &stem, const Word &word);
+
+struct Rule {
+  std::u32string_view suffix;
+  std::u32string_view replacement;
+  Condition condition;
+};
+
+// Suffix of the rule replacing a double consonant by a single letter
+constexpr std::u32string_view kDoubleConsonant = U"*d";
+
+bool is_vowel(char32_t c) { return c == U'a' || c == U'e' || c == U'i' || c == U'o' || c == U'u'; }
+
+bool is_consonant(const Word &word, std::size_t i) {
+  if (is_vowel(word[i])) {
+    return false;
+  }
+  if (word[i] == U'y') {
+    bool negate = false;
+    while (i > 0 && word[i] == U'y') {
+      negate = !negate;
+      --i;
+    }
+    return !is_vowel(word[i]) != negate;
+  }
+  return true;
+}
+
+// Whether a letter is a consonant, a "y" is one after a vowel or at the start of the word
+bool is_consonant_after(char32_t c, bool after_vowel_or_start) {
+  if (is_vowel(c)) {
+    return false;
+  }
+  return c != U'y' || after_vowel_or_start;
+}
+
+// Number of vowel-consonant sequences, the m of [C](VC){m}[V]
+int measure(std::u32string_view stem) {
+  int count = 0;
+  bool previous_consonant = true;
+  for (std::size_t i = 0; i < stem.size(); ++i) {
+    bool consonant = is_consonant_after(stem[i], i == 0 || !previous_consonant);
+    count += i > 0 && !previous_consonant && consonant;
+    previous_consonant = consonant;
+  }
+  return count;
+}
+
+bool contains_vowel(std::u32string_view stem) {
+  bool previous_consonant = true;
+  for (std::size_t i = 0; i < stem.size(); ++i) {
+    bool consonant = is_consonant_after(stem[i], i == 0 || !previous_consonant);
+    if (!consonant) {
+      return true;
+    }
+    previous_consonant = consonant;
+  }
+  return false;
+}
+
+bool ends_double_consonant(const Word &word) {
+  std::size_t n = word.size();
+  return n >= 2 && word[n - 1] == word[n - 2] && is_consonant(word, n - 1);
+}
+
+bool ends_cvc(const Word &word) {
+  std::size_t n = word.size();
+  return (n >= 3 && is_consonant(word, n - 3) && !is_consonant(word, n - 2) &&
+          is_consonant(word, n - 1) && word[n - 1] != U'w' && word[n - 1] != U'x' &&
+          word[n - 1] != U'y') ||
+         (n == 2 && !is_consonant(word, 0) && is_consonant(word, 1));
+}
+
+bool ends_with(const Word &word, std::u32string_view suffix) {
+  return word.size() >= suffix.size() &&
+         std::u32string_view(word).substr(word.size() - suffix.size()) == suffix;
+}
+
+Word remove_suffix(const Word &word, std::size_t length) {
+  return word.substr(0, word.size() - length);
+}
+
+bool positive_measure(const Word &stem, const Word &) { return measure(stem) > 0; }
+
+bool measure_gt_1(const Word &stem, const Word &) { return measure(stem) > 1; }
+
+// The first rule whose suffix ends the word is applied if its condition holds
+template <std::size_t N> Word apply_rule_list(const Word &word, const Rule (&rules)[N]) {
+  for (const Rule &rule : rules) {
+    std::size_t length = 0;
+    if (rule.suffix == kDoubleConsonant && ends_double_consonant(word)) {
+      length = 2;
+    } else if (ends_with(word, rule.suffix)) {
+      length = rule.suffix.size();
+    } else {
+      continue;
+    }
+    Word stem = remove_suffix(word, length);
+    if (rule.condition != nullptr && !rule.condition(stem, word)) {
+      return word;
+    }
+    if (rule.suffix == kDoubleConsonant) {
+      return stem + word.back();
+    }
+    return stem.append(rule.replacement);
+  }
+  return word;
+}
+
+Word step1a(const Word &word) {
+  static const Rule kRules[] = {
+      {U"sses", U"ss", nullptr}, {U"ies", U"i", nullptr}, {U"ss", U"ss", nullptr},
+      {U"s", U"", nullptr}};
+  if (ends_with(word, U"ies") && word.size() == 4) {
+    return remove_suffix(word, 3) + U"ie";
+  }
+  return apply_rule_list(word, kRules);
+}
+
+Word step1b(const Word &word) {
+  static const Rule kRules[] = {
+      {U"at", U"ate", nullptr},
+      {U"bl", U"ble", nullptr},
+      {U"iz", U"ize", nullptr},
+      {kDoubleConsonant, U"",
+       [](const Word &, const Word &word) {
+         return word.back() != U'l' && word.back() != U's' && word.back() != U'z';
+       }},
+      {U"", U"e",
+       [](const Word &stem, const Word &) { return measure(stem) == 1 && ends_cvc(stem); }}};
+
+  if (ends_with(word, U"ied")) {
+    return remove_suffix(word, 3) + (word.size() == 4 ? U"ie" : U"i");
+  }
+  if (ends_with(word, U"eed")) {
+    Word stem = remove_suffix(word, 3);
+    return measure(stem) > 0 ? stem + U"ee" : word;
+  }
+
+  for (std::u32string_view suffix : {std::u32string_view(U"ed"), std::u32string_view(U"ing")}) {
+    if (ends_with(word, suffix)) {
+      Word intermediate_stem = remove_suffix(word, suffix.size());
+      if (contains_vowel(intermediate_stem)) {
+        return apply_rule_list(intermediate_stem, kRules);
+      }
+    }
+  }
+  return word;
+}
+
+Word step1c(const Word &word) {
+  static const Rule kRules[] = {{U"y", U"i", [](const Word &stem, const Word &) {
+                                   return stem.size() > 1 && is_consonant(stem, stem.size() - 1);
+                                 }}};
+  return apply_rule_list(word, kRules);
+}
+
+Word step2(const Word &word) {
+  static const Rule kRules[] = {
+      {U"ational", U"ate", positive_measure},
+      {U"tional", U"tion", positive_measure},
+      {U"enci", U"ence", positive_measure},
+      {U"anci", U"ance", positive_measure},
+      {U"izer", U"ize", positive_measure},
+      {U"bli", U"ble", positive_measure},
+      {U"alli", U"al", positive_measure},
+      {U"entli", U"ent", positive_measure},
+      {U"eli", U"e", positive_measure},
+      {U"ousli", U"ous", positive_measure},
+      {U"ization", U"ize", positive_measure},
+      {U"ation", U"ate", positive_measure},
+      {U"ator", U"ate", positive_measure},
+      {U"alism", U"al", positive_measure},
+      {U"iveness", U"ive", positive_measure},
+      {U"fulness", U"ful", positive_measure},
+      {U"ousness", U"ous", positive_measure},
+      {U"aliti", U"al", positive_measure},
+      {U"iviti", U"ive", positive_measure},
+      {U"biliti", U"ble", positive_measure},
+      {U"fulli", U"ful", positive_measure},
+      // The measure of the word without "ogi", not of the stem
+      {U"logi", U"log", [](const Word &, const Word &word) {
+         return measure(std::u32string_view(word).substr(0, word.size() - 3)) > 0;
+       }}};
+
+  if (ends_with(word, U"alli") &&
+      measure(std::u32string_view(word).substr(0, word.size() - 4)) > 0) {
+    return step2(remove_suffix(word, 4) + U"al");
+  }
+  return apply_rule_list(word, kRules);
+}
+
+Word step3(const Word &word) {
+  static const Rule kRules[] = {
+      {U"icate", U"ic", positive_measure}, {U"ative", U"", positive_measure},
+      {U"alize", U"al", positive_measure}, {U"iciti", U"ic", positive_measure},
+      {U"ical", U"ic", positive_measure},  {U"ful", U"", positive_measure},
+      {U"ness", U"", positive_measure}};
+  return apply_rule_list(word, kRules);
+}
+
+Word step4(const Word &word) {
+  static const Rule kRules[] = {
+      {U"al", U"", measure_gt_1},
+      {U"ance", U"", measure_gt_1},
+      {U"ence", U"", measure_gt_1},
+      {U"er", U"", measure_gt_1},
+      {U"ic", U"", measure_gt_1},
+      {U"able", U"", measure_gt_1},
+      {U"ible", U"", measure_gt_1},
+      {U"ant", U"", measure_gt_1},
+      {U"ement", U"", measure_gt_1},
+      {U"ment", U"", measure_gt_1},
+      {U"ent", U"", measure_gt_1},
+      {U"ion", U"",
+       [](const Word &stem, const Word &) {
+         return measure(stem) > 1 && (stem.back() == U's' || stem.back() == U't');
+       }},
+      {U"ou", U"", measure_gt_1},
+      {U"ism", U"", measure_gt_1},
+      {U"ate", U"", measure_gt_1},
+      {U"iti", U"", measure_gt_1},
+      {U"ous", U"", measure_gt_1},
+      {U"ive", U"", measure_gt_1},
+      {U"ize", U"", measure_gt_1}};
+  return apply_rule_list(word, kRules);
+}
+
+Word step5a(const Word &word) {
+  if (ends_with(word, U"e")) {
+    Word stem = remove_suffix(word, 1);
+    int m = measure(stem);
+    if (m > 1 || (m == 1 && !ends_cvc(stem))) {
+      return stem;
+    }
+  }
+  return word;
+}
+
+Word step5b(const Word &word) {
+  // The measure of the word without the last "l", not of the stem
+  static const Rule kRules[] = {{U"ll", U"l", [](const Word &, const Word &word) {
+                                   return measure(std::u32string_view(word).substr(
+                                              0, word.size() - 1)) > 1;
+                                 }}};
+  return apply_rule_list(word, kRules);
+}
+
+// Irregular forms of the NLTK extensions
+const char *irregular_stem(std::string_view word) {
+  static const std::pair<std::string_view, const char *> kPool[] = {
+      {"sky", "sky"}, {"skies", "sky"}, {"dying", "die"}, {"lying", "lie"}, {"tying", "tie"},
+      {"news", "news"}, {"innings", "inning"}, {"inning", "inning"}, {"outings", "outing"},
+      {"outing", "outing"}, {"cannings", "canning"}, {"canning", "canning"}, {"howe", "howe"},
+      {"proceed", "proceed"}, {"exceed", "exceed"}, {"succeed", "succeed"}};
+  for (const auto &[form, stem] : kPool) {
+    if (form == word) {
+      return stem;
+    }
+  }
+  return nullptr;
+}
+
+} // namespace
+
+std::string porter_stem(const std::string &word) {
+  if (const char *stem = irregular_stem(word)) {
+    return stem;
+  }
+
+  std::vector<int32_t> code_points;
+  decode_utf8(word, code_points);
+  if (code_points.size() <= 2) {
+    return word;
+  }
+
+  Word stem(code_points.begin(), code_points.end());
+  stem = step1a(stem);
+  stem = step1b(stem);
+  stem = step1c(stem);
+  stem = step2(stem);
+  stem = step3(stem);
+  stem = step4(stem);
+  stem = step5a(stem);
+  stem = step5b(stem);
+
+  std::string result;
+  result.reserve(stem.size());
+  encode_utf8(stem.data(), stem.size(), result);
+  return result;
+}
+
+} // namespace docling
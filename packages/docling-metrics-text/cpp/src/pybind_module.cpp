@@ -1,15 +1,362 @@
 #include "pybind11/pybind11.h"
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
 
+#include "porter.h"
 #include "text_manager.h"
 
 namespace py = pybind11;
 
 namespace docling {
 
+// Hand the buffer of a vector over to a NumPy array without copying it
+template <typename T> py::array_t<T> as_numpy(std::vector<T> &&values) {
+  auto *owner = new std::vector<T>(std::move(values));
+  py::capsule free_owner(owner, [](void *p) { delete static_cast<std::vector<T> *>(p); });
+  return py::array_t<T>(owner->size(), owner->data(), free_owner);
+}
+
+// Same for a row-major matrix
+template <typename T>
+py::array_t<T> as_numpy(std::vector<T> &&values, py::ssize_t rows, py::ssize_t cols) {
+  auto *owner = new std::vector<T>(std::move(values));
+  py::capsule free_owner(owner, [](void *p) { delete static_cast<std::vector<T> *>(p); });
+  return py::array_t<T>({rows, cols}, owner->data(), free_owner);
+}
+
+py::dict evaluate_batch(TextManager &manager,
+                        const std::vector<std::vector<std::string>> &batch_sentences_a,
+                        const std::vector<std::vector<std::string>> &batch_sentences_b,
+                        int num_threads, bool return_tokens, double max_distance,
+                        bool overlap, bool edit_distance) {
+  BatchEvaluation batch;
+  {
+    py::gil_scoped_release release;
+    batch = manager.evaluate_batch(batch_sentences_a, batch_sentences_b, num_threads,
+                                   return_tokens, max_distance, overlap, edit_distance);
+  }
+
+  py::dict result;
+  result["precision"] = as_numpy(std::move(batch.precision));
+  result["recall"] = as_numpy(std::move(batch.recall));
+  result["f1"] = as_numpy(std::move(batch.f1));
+  result["edit_distance"] = as_numpy(std::move(batch.edit_distance));
+  result["token_set_a"] = as_numpy(std::move(batch.token_set_a));
+  result["token_set_b"] = as_numpy(std::move(batch.token_set_b));
+  result["common_tokens"] = as_numpy(std::move(batch.common_tokens));
+  if (return_tokens) {
+    result["tokens_a"] = py::cast(std::move(batch.tokens_a));
+    result["tokens_b"] = py::cast(std::move(batch.tokens_b));
+  }
+  return result;
+}
+
+py::dict error_rates_batch(TextManager &manager, const std::vector<std::string> &references,
+                           const std::vector<std::string> &hypotheses, int num_threads) {
+  BatchErrorRates batch;
+  {
+    py::gil_scoped_release release;
+    batch = manager.error_rates_batch(references, hypotheses, num_threads);
+  }
+
+  py::dict result;
+  result["cer"] = as_numpy(std::move(batch.cer));
+  result["wer"] = as_numpy(std::move(batch.wer));
+  result["char_errors"] = as_numpy(std::move(batch.char_errors));
+  result["char_lengths"] = as_numpy(std::move(batch.char_lengths));
+  result["word_errors"] = as_numpy(std::move(batch.word_errors));
+  result["word_lengths"] = as_numpy(std::move(batch.word_lengths));
+  return result;
+}
+
+py::dict bleu_batch(TextManager &manager, const std::vector<std::string> &hypotheses,
+                    const std::vector<std::string> &references, int num_threads, int max_order,
+                    bool smooth) {
+  BatchBleu batch;
+  {
+    py::gil_scoped_release release;
+    batch = manager.bleu_batch(hypotheses, references, num_threads, max_order, smooth);
+  }
+
+  auto count = static_cast<py::ssize_t>(batch.bleu.size());
+  py::dict result;
+  result["bleu"] = as_numpy(std::move(batch.bleu));
+  result["matches"] = as_numpy(std::move(batch.matches), count, batch.max_order);
+  result["possible_matches"] =
+      as_numpy(std::move(batch.possible_matches), count, batch.max_order);
+  result["translation_length"] = as_numpy(std::move(batch.translation_length));
+  result["reference_length"] = as_numpy(std::move(batch.reference_length));
+  return result;
+}
+
+py::array_t<double> meteor_batch(TextManager &manager,
+                                 const std::vector<std::vector<std::string>> &references,
+                                 const std::vector<std::vector<std::string>> &hypotheses,
+                                 int num_threads, double alpha, double beta, double gamma) {
+  std::vector<double> scores;
+  {
+    py::gil_scoped_release release;
+    scores = manager.meteor_batch(references, hypotheses, num_threads, alpha, beta, gamma);
+  }
+  return as_numpy(std::move(scores));
+}
+
+py::array_t<double> short_edit_distance_batch(
+    TextManager &manager, const std::vector<std::vector<std::string>> &batch_a,
+    const std::vector<std::vector<std::string>> &batch_b, int num_threads, double max_distance,
+    SimdLevel max_level) {
+  std::vector<double> distances;
+  {
+    py::gil_scoped_release release;
+    distances =
+        manager.short_edit_distance_batch(batch_a, batch_b, num_threads, max_distance, max_level);
+  }
+  return as_numpy(std::move(distances));
+}
+
+py::array_t<double> edit_distance_prepared_batch(
+    TextManager &manager, const PreparedReference &reference,
+    const std::vector<std::vector<std::string>> &hypotheses, int num_threads,
+    double max_distance) {
+  std::vector<double> distances;
+  {
+    py::gil_scoped_release release;
+    distances = manager.edit_distance_batch(reference, hypotheses, num_threads, max_distance);
+  }
+  return as_numpy(std::move(distances));
+}
+
+using IdArray = py::array_t<int32_t, py::array::c_style | py::array::forcecast>;
+
+double edit_distance_ids(TextManager &manager, const IdArray &ids_a, const IdArray &ids_b,
+                         double max_distance) {
+  if (ids_a.ndim() != 1 || ids_b.ndim() != 1) {
+    throw py::value_error("The token ids must be 1-dimensional arrays");
+  }
+  py::gil_scoped_release release;
+  return manager.edit_distance_ids(ids_a.data(), ids_a.size(), ids_b.data(), ids_b.size(),
+                                   max_distance);
+}
+
+py::dict alignment_to_dict(Alignment &&alignment) {
+  py::dict result;
+  result["distance"] = alignment.distance;
+  result["ops"] = as_numpy(std::move(alignment.ops));
+  result["lengths"] = as_numpy(std::move(alignment.lengths));
+  result["starts_a"] = as_numpy(std::move(alignment.query_starts));
+  result["starts_b"] = as_numpy(std::move(alignment.target_starts));
+  return result;
+}
+
+py::dict align(TextManager &manager, const std::vector<std::string> &tokens_a,
+               const std::vector<std::string> &tokens_b) {
+  Alignment alignment;
+  {
+    py::gil_scoped_release release;
+    alignment = manager.align(tokens_a, tokens_b);
+  }
+  return alignment_to_dict(std::move(alignment));
+}
+
+py::dict align_ids(TextManager &manager, const IdArray &ids_a, const IdArray &ids_b) {
+  if (ids_a.ndim() != 1 || ids_b.ndim() != 1) {
+    throw py::value_error("The token ids must be 1-dimensional arrays");
+  }
+  Alignment alignment;
+  {
+    py::gil_scoped_release release;
+    alignment = manager.align_ids(ids_a.data(), ids_a.size(), ids_b.data(), ids_b.size());
+  }
+  return alignment_to_dict(std::move(alignment));
+}
+
+// Read-only NumPy view of a buffer of a TokenList, which the view keeps alive
+template <typename T>
+py::array_t<T> token_list_view(const std::vector<T> &values, std::size_t size, py::handle owner) {
+  py::array_t<T> view(static_cast<py::ssize_t>(size), values.data(), owner);
+  view.attr("flags").attr("writeable") = false;
+  return view;
+}
+
 PYBIND11_MODULE(docling_metrics_text_cpp, m) {
   m.doc() = "Text metrics module";
 
+  m.def("porter_stem", &porter_stem, py::arg("word"),
+        "Stem a lowercase word like NLTK's PorterStemmer in the NLTK_EXTENSIONS mode\n\n"
+        "Args:\n"
+        "    word: The lowercase word\n\n"
+        "Returns:\n"
+        "    The stem of the word");
+
+  py::enum_<EditOp>(m, "EditOp", py::arithmetic(), "Operations of an edit script")
+      .value("MATCH", EditOp::kMatch, "The tokens are equal")
+      .value("SUBSTITUTE", EditOp::kSubstitute, "The token of a is replaced by the token of b")
+      .value("INSERT", EditOp::kInsert, "The token of b is missing from a")
+      .value("DELETE", EditOp::kDelete, "The token of a is missing from b");
+
+  py::enum_<SimdLevel>(m, "SimdLevel", py::arithmetic(),
+                       "Instruction sets of the batched edit distance of short token lists")
+      .value("PORTABLE", SimdLevel::kPortable, "One pair at a time in a 64-bit word")
+      .value("SSE4", SimdLevel::kSse4, "Two pairs in an SSE4.2 register")
+      .value("AVX2", SimdLevel::kAvx2, "Four pairs in an AVX2 register");
+
+  m.def("simd_level", &detect_simd_level,
+        "The best SimdLevel supported by the CPU, used by short_edit_distance_batch()");
+
+  pybind11::class_<PairEvaluation>(m, "PairEvaluation", "Per-pair text metrics")
+      .def_readonly("tokens_a", &PairEvaluation::tokens_a, "Tokens of the first text")
+      .def_readonly("tokens_b", &PairEvaluation::tokens_b, "Tokens of the second text")
+      .def_readonly("precision", &PairEvaluation::precision,
+                    "Precision of the token sets, None if undefined")
+      .def_readonly("recall", &PairEvaluation::recall,
+                    "Recall of the token sets, None if undefined")
+      .def_readonly("f1", &PairEvaluation::f1, "F1 of the token sets, None if undefined")
+      .def_readonly("token_set_a", &PairEvaluation::token_set_a,
+                    "Number of distinct tokens of the first text")
+      .def_readonly("token_set_b", &PairEvaluation::token_set_b,
+                    "Number of distinct tokens of the second text")
+      .def_readonly("common_tokens", &PairEvaluation::common_tokens,
+                    "Number of distinct tokens of both texts")
+      .def_readonly("edit_distance", &PairEvaluation::edit_distance,
+                    "Normalized edit distance of the token lists, infinity if it exceeds "
+                    "the threshold");
+
+  pybind11::class_<ErrorCounts>(m, "ErrorCounts", "Errors of a text to its reference")
+      .def_readonly("errors", &ErrorCounts::errors, "Edit distance to the reference")
+      .def_readonly("reference_length", &ErrorCounts::reference_length,
+                    "Number of characters or words of the reference")
+      .def_property_readonly("rate", &ErrorCounts::rate,
+                             "errors / reference_length, 0.0 if both texts are empty and "
+                             "NaN if only the reference is empty");
+
+  pybind11::class_<BleuScore>(m, "BleuScore", "BLEU score with its components")
+      .def_readonly("bleu", &BleuScore::bleu, "BLEU score, NaN if undefined")
+      .def_readonly("precisions", &BleuScore::precisions, "Precision of each n-gram order")
+      .def_readonly("brevity_penalty", &BleuScore::brevity_penalty, "Brevity penalty")
+      .def_readonly("length_ratio", &BleuScore::length_ratio,
+                    "Length of the hypotheses divided by the length of the references")
+      .def_readonly("translation_length", &BleuScore::translation_length,
+                    "Number of tokens of the hypotheses")
+      .def_readonly("reference_length", &BleuScore::reference_length,
+                    "Number of tokens of the closest references")
+      .def("as_dict", [](const BleuScore &score) {
+        py::dict result;
+        result["bleu"] = score.bleu;
+        result["precisions"] = score.precisions;
+        result["brevity_penalty"] = score.brevity_penalty;
+        result["length_ratio"] = score.length_ratio;
+        result["translation_length"] = score.translation_length;
+        result["reference_length"] = score.reference_length;
+        return result;
+      }, "The score as the dict returned by the 'bleu' module of HuggingFace evaluate");
+
+  pybind11::class_<BleuStatistics>(m, "BleuStatistics",
+                                   "Mergeable n-gram statistics of the corpus BLEU")
+      .def(py::init<int>(), py::arg("max_order") = 4,
+           "Initialize empty statistics\n\n"
+           "Args:\n"
+           "    max_order: Maximum n-gram order")
+      .def("add", &BleuStatistics::add, py::arg("references"), py::arg("hypothesis"),
+           py::call_guard<py::gil_scoped_release>(),
+           "Add the n-gram counts of a tokenized hypothesis\n\n"
+           "Args:\n"
+           "    references: The token lists of the references of the hypothesis\n"
+           "    hypothesis: The tokens of the hypothesis")
+      .def("merge", &BleuStatistics::merge, py::arg("other"),
+           "Add the statistics of another set of sentence pairs with the same max_order")
+      .def("add_counts", &BleuStatistics::add_counts, py::arg("matches"),
+           py::arg("possible_matches"), py::arg("translation_length"),
+           py::arg("reference_length"),
+           "Add the statistics of sentence pairs that were counted elsewhere, e.g. the\n"
+           "per-pair statistics of TextManager.bleu_batch\n\n"
+           "Args:\n"
+           "    matches: Clipped n-gram matches of each order\n"
+           "    possible_matches: Number of n-grams of the hypotheses of each order\n"
+           "    translation_length: Number of tokens of the hypotheses\n"
+           "    reference_length: Number of tokens of the closest references\n\n"
+           "Raises:\n"
+           "    ValueError: If the counts do not have max_order values")
+      .def("score", &BleuStatistics::score, py::arg("smooth") = false,
+           "Compute the corpus BLEU of the added sentence pairs\n\n"
+           "Args:\n"
+           "    smooth: Apply add-one smoothing to the n-gram precisions\n\n"
+           "Returns:\n"
+           "    BleuScore")
+      .def_property_readonly("max_order", &BleuStatistics::max_order)
+      .def_property_readonly("matches", &BleuStatistics::matches,
+                             "Clipped n-gram matches of each order")
+      .def_property_readonly("possible_matches", &BleuStatistics::possible_matches,
+                             "Number of n-grams of the hypotheses of each order")
+      .def_property_readonly("translation_length", &BleuStatistics::translation_length)
+      .def_property_readonly("reference_length", &BleuStatistics::reference_length);
+
+  pybind11::class_<PreparedReference>(m, "PreparedReference",
+                                      "Reference token list preprocessed for the edit distance")
+      .def_property_readonly("size", &PreparedReference::size, "Number of reference tokens")
+      .def_property_readonly("distinct_tokens", &PreparedReference::distinct_tokens,
+                             "Number of distinct reference tokens")
+      .def("__len__", &PreparedReference::size);
+
+  pybind11::class_<OverlapScores>(m, "OverlapScores", "Overlap scores of two token sets")
+      .def_readonly("precision", &OverlapScores::precision, "Precision, None if undefined")
+      .def_readonly("recall", &OverlapScores::recall, "Recall, None if undefined")
+      .def_readonly("f1", &OverlapScores::f1, "F1, None if undefined")
+      .def_readonly("reference_size", &OverlapScores::reference_size,
+                    "Number of distinct reference tokens")
+      .def_readonly("test_size", &OverlapScores::test_size, "Number of distinct test tokens")
+      .def_readonly("common", &OverlapScores::common, "Number of distinct tokens of both");
+
+  pybind11::class_<TokenList>(m, "TokenList", py::buffer_protocol(),
+                              "Tokens kept in a native arena by the TextManager that tokenized "
+                              "them, see TextManager.tokenize_list()\n\n"
+                              "The buffer protocol exposes the read-only int32 token ids")
+      .def_buffer([](const TokenList &tokens) {
+        return py::buffer_info(const_cast<int32_t *>(tokens.ids().data()), sizeof(int32_t),
+                               py::format_descriptor<int32_t>::format(), 1,
+                               {static_cast<py::ssize_t>(tokens.size())},
+                               {static_cast<py::ssize_t>(sizeof(int32_t))}, true);
+      })
+      .def("__len__", &TokenList::size)
+      .def("__getitem__",
+           [](const TokenList &tokens, py::ssize_t i) {
+             const auto size = static_cast<py::ssize_t>(tokens.size());
+             if (i < 0) {
+               i += size;
+             }
+             if (i < 0 || i >= size) {
+               throw py::index_error("TokenList index out of range");
+             }
+             return std::string(tokens[static_cast<std::size_t>(i)]);
+           })
+      .def("tolist", &TokenList::tokens, "Copy the tokens into a list of str")
+      .def_property_readonly(
+          "ids",
+          [](py::object self) {
+            const auto &tokens = self.cast<const TokenList &>();
+            return token_list_view(tokens.ids(), tokens.size(), self);
+          },
+          "Read-only int32 NumPy array with the id of each token in the vocabulary of the\n"
+          "TextManager, as returned by intern_tokens()")
+      .def_property_readonly(
+          "offsets",
+          [](py::object self) {
+            const auto &tokens = self.cast<const TokenList &>();
+            return token_list_view(tokens.offsets(), tokens.offsets().size(), self);
+          },
+          "Read-only uint32 NumPy array with the offset of each token in the arena,\n"
+          "followed by the size of the arena")
+      .def_property_readonly(
+          "arena",
+          [](py::object self) {
+            const auto &tokens = self.cast<const TokenList &>();
+            const auto &arena = tokens.arena();
+            py::array_t<uint8_t> view(static_cast<py::ssize_t>(arena.size()),
+                                      reinterpret_cast<const uint8_t *>(arena.data()), self);
+            view.attr("flags").attr("writeable") = false;
+            return view;
+          },
+          "Read-only uint8 NumPy array with the UTF-8 bytes of the tokens, back to back");
+
   pybind11::class_<TextManager>(m, "TextManager", "Manager for computing text metrics")
       .def(py::init<std::string>(), py::arg("level") = "info",
            "Initialize a new TextManager instance\n\n"
@@ -17,19 +364,326 @@ PYBIND11_MODULE(docling_metrics_text_cpp, m) {
            "    level: Log level for the text manager. One of 'info', 'warning', 'error', "
            "'fatal'. Defaults to 'info'")
       .def("tokenize", &TextManager::tokenize, py::arg("text"), py::arg("convert_parentheses"),
+           py::call_guard<py::gil_scoped_release>(),
            "Tokenize text according to the Tree Bank Tokenizer\n\n"
            "Args:\n"
            "    text: The input text to tokenize\n"
            "    convert_parentheses: Convert all parentheses\n\n"
            "Returns:\n"
            "    List of the tokens")
-      .def("edit_distance", &TextManager::edit_distance, py::arg("tokens_a"), py::arg("tokens_b"),
+      .def(
+          "tokenize_list",
+          [](TextManager &manager, const std::string &text, bool convert_parentheses) {
+            return manager.tokenize_list({text}, convert_parentheses);
+          },
+          py::arg("text"), py::arg("convert_parentheses") = false,
+          "Tokenize text like tokenize() into a TokenList, whose tokens stay in a native\n"
+          "arena with their ids in the vocabulary of the TextManager\n\n"
+          "The TokenList is passed to edit_distance() and overlap() without converting the\n"
+          "tokens to Python strings\n\n"
+          "Args:\n"
+          "    text: The input text to tokenize\n"
+          "    convert_parentheses: Convert all parentheses\n\n"
+          "Returns:\n"
+          "    The TokenList")
+      .def("tokenize_list", &TextManager::tokenize_list, py::arg("sentences"),
+           py::arg("convert_parentheses") = false,
+           "Tokenize the sentences of a text like evaluate_pair() into a single TokenList\n\n"
+           "Args:\n"
+           "    sentences: The sentences of the text\n"
+           "    convert_parentheses: Convert all parentheses\n\n"
+           "Returns:\n"
+           "    The TokenList")
+      // Before the overload of the token lists, which would convert a TokenList as a sequence
+      .def("edit_distance",
+           py::overload_cast<const TokenList &, const TokenList &, double>(
+               &TextManager::edit_distance),
+           py::arg("tokens_a"), py::arg("tokens_b"), py::arg("max_distance") = -1.0,
+           py::call_guard<py::gil_scoped_release>(),
+           "Calculate the normalized edit distance between two TokenLists through their ids\n\n"
+           "Args:\n"
+           "    tokens_a: The first TokenList\n"
+           "    tokens_b: The second TokenList\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    The normalized edit distance as a float\n\n"
+           "Raises:\n"
+           "    ValueError: If a TokenList was tokenized by another TextManager")
+      .def("overlap", &TextManager::overlap, py::arg("reference"), py::arg("test"),
+           py::call_guard<py::gil_scoped_release>(),
+           "Compute precision, recall and F1 of the token sets of two TokenLists through\n"
+           "their ids, as in evaluate_pair()\n\n"
+           "Args:\n"
+           "    reference: The reference TokenList\n"
+           "    test: The test TokenList\n\n"
+           "Returns:\n"
+           "    OverlapScores\n\n"
+           "Raises:\n"
+           "    ValueError: If a TokenList was tokenized by another TextManager")
+      .def("edit_distance",
+           py::overload_cast<const std::vector<std::string> &, const std::vector<std::string> &,
+                             double>(&TextManager::edit_distance),
+           py::arg("tokens_a"), py::arg("tokens_b"), py::arg("max_distance") = -1.0,
+           py::call_guard<py::gil_scoped_release>(),
            "Calculate the normalized edit distance between two token lists\n\n"
+           "Only the band of the DP that can stay within max_distance is computed, and the\n"
+           "computation stops early once the threshold is exceeded\n\n"
+           "Args:\n"
+           "    tokens_a: The first list of tokens\n"
+           "    tokens_b: The second list of tokens\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    The normalized edit distance as a float")
+      .def(
+          "intern_tokens",
+          [](TextManager &manager, const std::vector<std::string> &tokens) {
+            return as_numpy(manager.intern_tokens(tokens));
+          },
+          py::arg("tokens"),
+          "Map tokens to the ids of a vocabulary kept by the TextManager\n\n"
+          "Args:\n"
+          "    tokens: The list of tokens\n\n"
+          "Returns:\n"
+          "    int32 NumPy array with the id of each token")
+      .def("edit_distance_ids", &edit_distance_ids, py::arg("ids_a"), py::arg("ids_b"),
+           py::arg("max_distance") = -1.0,
+           "Calculate the normalized edit distance between two token id arrays\n\n"
+           "The ids are compared without hashing the token strings, e.g. to compare long\n"
+           "documents repeatedly after interning them once with intern_tokens\n\n"
+           "Args:\n"
+           "    ids_a: The non-negative int32 token ids of the first text\n"
+           "    ids_b: The int32 token ids of the second text\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    The normalized edit distance as a float\n\n"
+           "Raises:\n"
+           "    ValueError: If the arrays are not 1-dimensional or ids_a has negative ids")
+      .def("align", &align, py::arg("tokens_a"), py::arg("tokens_b"),
+           "Align two token lists in linear memory, e.g. to inspect OCR differences\n\n"
            "Args:\n"
            "    tokens_a: The first list of tokens\n"
            "    tokens_b: The second list of tokens\n\n"
            "Returns:\n"
-           "    The normalized edit distance as a float");
+           "    Dict with the raw edit 'distance' and the edit script from tokens_a to\n"
+           "    tokens_b as runs of the same operation: the NumPy arrays 'ops' (EditOp\n"
+           "    values), 'lengths', 'starts_a' and 'starts_b' (the first position of each\n"
+           "    run in tokens_a and tokens_b)")
+      .def("align_ids", &align_ids, py::arg("ids_a"), py::arg("ids_b"),
+           "Align two int32 token id arrays, see align() and edit_distance_ids()\n\n"
+           "Raises:\n"
+           "    ValueError: If the arrays are not 1-dimensional or ids_a has negative ids")
+      .def("edit_distance_batch",
+           py::overload_cast<const std::vector<std::vector<std::string>> &,
+                             const std::vector<std::vector<std::string>> &, double>(
+               &TextManager::edit_distance_batch),
+           py::arg("batch_a"), py::arg("batch_b"), py::arg("max_distance") = -1.0,
+           py::call_guard<py::gil_scoped_release>(),
+           "Calculate the normalized edit distances of a batch of token list pairs\n\n"
+           "Args:\n"
+           "    batch_a: The first token lists\n"
+           "    batch_b: The second token lists, same size as batch_a\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    List with the normalized edit distance of each pair\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes")
+      .def("short_edit_distance_batch", &short_edit_distance_batch, py::arg("batch_a"),
+           py::arg("batch_b"), py::arg("num_threads") = 0, py::arg("max_distance") = -1.0,
+           py::arg("max_level") = SimdLevel::kAvx2,
+           "Calculate the normalized edit distances of a batch of short token list pairs,\n"
+           "e.g. table cells or captions, on a thread pool with the GIL released\n\n"
+           "The pairs whose shorter list has at most 64 tokens run together in the SIMD\n"
+           "lanes of the best instruction set of the CPU, see simd_level(). The results\n"
+           "are identical to edit_distance()\n\n"
+           "Args:\n"
+           "    batch_a: The first token lists\n"
+           "    batch_b: The second token lists, same size as batch_a\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n"
+           "    max_level: Highest SimdLevel to use\n\n"
+           "Returns:\n"
+           "    float64 NumPy array with the normalized edit distance of each pair\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes")
+      .def("prepare_reference", &TextManager::prepare_reference, py::arg("tokens"),
+           py::call_guard<py::gil_scoped_release>(),
+           "Preprocess a reference token list to compute its edit distance to many\n"
+           "hypotheses, e.g. the outputs of several models for the same ground truth\n\n"
+           "The reference tokens are interned and their Peq table is built once, so the\n"
+           "edit distance of a hypothesis only maps its tokens and runs the DP\n\n"
+           "Args:\n"
+           "    tokens: The reference tokens\n\n"
+           "Returns:\n"
+           "    The PreparedReference, for edit_distance() and edit_distance_batch()")
+      .def("edit_distance",
+           py::overload_cast<const PreparedReference &, const std::vector<std::string> &,
+                             double>(&TextManager::edit_distance),
+           py::arg("reference"), py::arg("tokens"), py::arg("max_distance") = -1.0,
+           py::call_guard<py::gil_scoped_release>(),
+           "Calculate the normalized edit distance of a token list to a prepared reference\n\n"
+           "Args:\n"
+           "    reference: The PreparedReference of prepare_reference()\n"
+           "    tokens: The hypothesis tokens\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    The normalized edit distance as a float")
+      .def("edit_distance_batch", &edit_distance_prepared_batch, py::arg("reference"),
+           py::arg("hypotheses"), py::arg("num_threads") = 0, py::arg("max_distance") = -1.0,
+           "Calculate the normalized edit distances of many token lists to a prepared\n"
+           "reference on a thread pool, with the GIL released\n\n"
+           "Args:\n"
+           "    reference: The PreparedReference of prepare_reference()\n"
+           "    hypotheses: The hypothesis token lists\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    float64 NumPy array with the normalized edit distance of each hypothesis")
+      .def("character_errors", &TextManager::character_errors, py::arg("reference"),
+           py::arg("hypothesis"), py::call_guard<py::gil_scoped_release>(),
+           "Compute the character errors of a text, the edit distance of the code points\n\n"
+           "Args:\n"
+           "    reference: The reference text\n"
+           "    hypothesis: The hypothesis text, e.g. the OCR output\n\n"
+           "Returns:\n"
+           "    ErrorCounts whose rate is the character error rate (CER)")
+      .def("word_errors", &TextManager::word_errors, py::arg("reference"),
+           py::arg("hypothesis"), py::call_guard<py::gil_scoped_release>(),
+           "Compute the word errors of a text, the words are split like str.split()\n\n"
+           "Args:\n"
+           "    reference: The reference text\n"
+           "    hypothesis: The hypothesis text, e.g. the OCR output\n\n"
+           "Returns:\n"
+           "    ErrorCounts whose rate is the word error rate (WER)")
+      .def("error_rates_batch", &error_rates_batch, py::arg("references"),
+           py::arg("hypotheses"), py::arg("num_threads") = 0,
+           "Compute the character and word error rates of a batch of text pairs on worker\n"
+           "threads, without the GIL\n\n"
+           "Args:\n"
+           "    references: The reference texts\n"
+           "    hypotheses: The hypothesis texts, same size as references\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n\n"
+           "Returns:\n"
+           "    Dict with the float64 NumPy arrays 'cer' and 'wer', NaN where the reference\n"
+           "    is empty but the hypothesis is not, and the int32 NumPy arrays\n"
+           "    'char_errors', 'char_lengths', 'word_errors' and 'word_lengths'\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes")
+      .def("tokenize_13a", &TextManager::tokenize_13a, py::arg("text"),
+           py::call_guard<py::gil_scoped_release>(),
+           "Tokenize text with the 13a tokenizer of sacrebleu, used by BLEU\n\n"
+           "Args:\n"
+           "    text: The input text to tokenize\n\n"
+           "Returns:\n"
+           "    List of the tokens")
+      .def("sentence_bleu", &TextManager::sentence_bleu, py::arg("references"),
+           py::arg("hypothesis"), py::arg("max_order") = 4, py::arg("smooth") = false,
+           py::call_guard<py::gil_scoped_release>(),
+           "Compute the BLEU score of a tokenized hypothesis\n\n"
+           "Args:\n"
+           "    references: The token lists of the references\n"
+           "    hypothesis: The tokens of the hypothesis\n"
+           "    max_order: Maximum n-gram order\n"
+           "    smooth: Apply add-one smoothing to the n-gram precisions\n\n"
+           "Returns:\n"
+           "    BleuScore, whose bleu is NaN if the hypothesis or the references are empty")
+      .def("bleu_batch", &bleu_batch, py::arg("hypotheses"), py::arg("references"),
+           py::arg("num_threads") = 0, py::arg("max_order") = 4, py::arg("smooth") = false,
+           "Compute the sentence BLEU of a batch of text pairs on worker threads, without\n"
+           "the GIL. The texts are tokenized with the 13a tokenizer, as in the 'bleu'\n"
+           "module of HuggingFace evaluate\n\n"
+           "Args:\n"
+           "    hypotheses: The hypothesis texts\n"
+           "    references: The reference text of each hypothesis\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n"
+           "    max_order: Maximum n-gram order\n"
+           "    smooth: Apply add-one smoothing to the n-gram precisions\n\n"
+           "Returns:\n"
+           "    Dict with the float64 NumPy array 'bleu', NaN where it is undefined, the\n"
+           "    int64 (pairs, max_order) arrays 'matches' and 'possible_matches' and the\n"
+           "    int64 arrays 'translation_length' and 'reference_length', whose sums give\n"
+           "    the corpus BLEU\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes")
+      .def("load_meteor_table", &TextManager::load_meteor_table, py::arg("path"),
+           "Memory-map the synonym and lowercase table of METEOR\n\n"
+           "Args:\n"
+           "    path: Path of a table written by docling_metrics_text.meteor_table\n\n"
+           "Raises:\n"
+           "    RuntimeError: If the table cannot be mapped or is not valid")
+      .def_property_readonly("has_meteor_table", &TextManager::has_meteor_table,
+                             "Whether a METEOR table is loaded")
+      .def("meteor", &TextManager::meteor, py::arg("references"), py::arg("hypothesis"),
+           py::arg("alpha") = 0.9, py::arg("beta") = 3.0, py::arg("gamma") = 0.5,
+           py::call_guard<py::gil_scoped_release>(),
+           "Compute the METEOR score of a tokenized hypothesis like NLTK's meteor_score(),\n"
+           "with exact, Porter stem and WordNet synonym matches\n\n"
+           "Args:\n"
+           "    references: The token lists of the references\n"
+           "    hypothesis: The tokens of the hypothesis\n"
+           "    alpha: Relative weight of the precision and the recall\n"
+           "    beta: Shape of the fragmentation penalty\n"
+           "    gamma: Weight of the fragmentation penalty\n\n"
+           "Returns:\n"
+           "    The highest METEOR score of the references\n\n"
+           "Raises:\n"
+           "    RuntimeError: If no METEOR table is loaded")
+      .def("meteor_batch", &meteor_batch, py::arg("references"), py::arg("hypotheses"),
+           py::arg("num_threads") = 0, py::arg("alpha") = 0.9, py::arg("beta") = 3.0,
+           py::arg("gamma") = 0.5,
+           "Compute the METEOR scores of a batch of tokenized pairs on worker threads,\n"
+           "without the GIL\n\n"
+           "Args:\n"
+           "    references: The tokens of the reference of each pair\n"
+           "    hypotheses: The tokens of the hypothesis of each pair\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n"
+           "    alpha: Relative weight of the precision and the recall\n"
+           "    beta: Shape of the fragmentation penalty\n"
+           "    gamma: Weight of the fragmentation penalty\n\n"
+           "Returns:\n"
+           "    float64 NumPy array with the METEOR score of each pair\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes\n"
+           "    RuntimeError: If no METEOR table is loaded")
+      .def("evaluate_pair", &TextManager::evaluate_pair, py::arg("sentences_a"),
+           py::arg("sentences_b"), py::arg("max_distance") = -1.0,
+           py::call_guard<py::gil_scoped_release>(),
+           "Tokenize a pair of texts and compute their token set and edit distance scores\n\n"
+           "Args:\n"
+           "    sentences_a: The sentences of the first (reference) text\n"
+           "    sentences_b: The sentences of the second text\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n\n"
+           "Returns:\n"
+           "    PairEvaluation with the tokens and the scores of the pair")
+      .def("evaluate_batch", &evaluate_batch, py::arg("batch_sentences_a"),
+           py::arg("batch_sentences_b"), py::arg("num_threads") = 0,
+           py::arg("return_tokens") = false, py::arg("max_distance") = -1.0,
+           py::arg("overlap") = true, py::arg("edit_distance") = true,
+           "Tokenize and score a batch of text pairs on worker threads, without the GIL\n\n"
+           "Args:\n"
+           "    batch_sentences_a: The sentences of the first (reference) text of each pair\n"
+           "    batch_sentences_b: The sentences of the second text of each pair\n"
+           "    num_threads: Number of worker threads, 0 for the hardware concurrency\n"
+           "    return_tokens: Also return the tokens of the texts\n"
+           "    max_distance: Threshold of the normalized edit distance, negative for none.\n"
+           "        The edit distances above it are returned as infinity\n"
+           "    overlap: Compute the token set scores\n"
+           "    edit_distance: Compute the edit distance\n\n"
+           "Returns:\n"
+           "    Dict with the float64 NumPy arrays 'precision', 'recall', 'f1' and\n"
+           "    'edit_distance', NaN where a score is undefined, failed or not computed,\n"
+           "    the int64 arrays 'token_set_a', 'token_set_b' and 'common_tokens' of the\n"
+           "    sizes of the token sets and of their intersection, and the lists\n"
+           "    'tokens_a' and 'tokens_b' if requested\n\n"
+           "Raises:\n"
+           "    ValueError: If the batches have different sizes");
 }
 
 } // namespace docling
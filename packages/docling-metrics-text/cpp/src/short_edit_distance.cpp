@@ -0,0 +1,340 @@
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <functional>
+#include <stdexcept>
+#include <string_view>
+#include <vector>
+
+#include "edit_distance.h"
+#include "myers_block.h"
+#include "utils.h"
+
+// The SIMD kernels use the vector extensions of GCC and Clang, compiled for AVX2 and SSE4.2
+// with target attributes and selected at runtime. Other compilers use the portable kernel.
+#if (defined(__GNUC__) || defined(__clang__)) && (defined(__x86_64__) || defined(__i386__))
+#define DOCLING_X86_SIMD 1
+#endif
+
+namespace docling {
+
+namespace {
+
+// Most pairs run together, the lanes of an AVX2 register
+constexpr int kMaxLanes = 4;
+
+// A pair whose query fits in a single word
+struct ShortPair {
+  std::size_t index;
+  const std::vector<std::string> *query;
+  const std::vector<std::string> *target;
+};
+
+/**
+ * Bit masks of the positions of the tokens of a query of at most WORD_SIZE tokens, in an
+ * open-addressing hash table that is never reallocated, unlike an unordered_map whose nodes
+ * would cost more than the DP of a short pair.
+ */
+class TokenMasks {
+public:
+  // Set the masks of the query tokens
+  void assign(const std::vector<std::string> &query) {
+    for (int slot : used_) {
+      slots_[slot].mask = 0;
+    }
+    used_.clear();
+    for (std::size_t i = 0; i < query.size(); i++) {
+      Slot &slot = find(query[i]);
+      if (slot.mask == 0) {
+        slot.token = query[i];
+        used_.push_back(static_cast<int>(&slot - slots_));
+      }
+      slot.mask |= WORD_1 << i;
+    }
+  }
+
+  // Mask of the query positions of a token, 0 if it is not in the query
+  Word mask(std::string_view token) const { return find(token).mask; }
+
+private:
+  // Twice the largest number of distinct tokens, so the probe sequences stay short
+  static constexpr int kSlots = 2 * WORD_SIZE;
+
+  struct Slot {
+    std::string_view token;
+    Word mask = 0;
+  };
+
+  // The slot of a token, or the empty slot where it would be inserted
+  Slot &find(std::string_view token) const {
+    std::size_t slot = std::hash<std::string_view>()(token) & (kSlots - 1);
+    while (slots_[slot].mask != 0 && slots_[slot].token != token) {
+      slot = (slot + 1) & (kSlots - 1);
+    }
+    return slots_[slot];
+  }
+
+  mutable Slot slots_[kSlots];
+  std::vector<int> used_;
+};
+
+// Buffers reused across the groups of a thread
+struct ShortWorkspace {
+  TokenMasks token_masks;
+  // Peq words of the target tokens: columns x lanes, interleaved
+  std::vector<Word> eqs;
+};
+
+thread_local ShortWorkspace short_workspace;
+
+int num_lanes(SimdLevel level) {
+  switch (level) {
+  case SimdLevel::kAvx2:
+    return 4;
+  case SimdLevel::kSse4:
+    return 2;
+  default:
+    return 1;
+  }
+}
+
+/**
+ * Myers recurrence of a query of at most WORD_SIZE tokens, as calculate_block() with the
+ * horizontal delta +1 of the global alignment entering every column.
+ *
+ * @param eqs      Peq word of each target token, every stride words.
+ * @param stride   Distance of the Peq words of consecutive target tokens.
+ * @param m        Number of target tokens.
+ * @param last_row Bit of the last query token.
+ * @param n        Number of query tokens.
+ * @return         Raw edit distance.
+ */
+int myers_word(const Word *eqs, std::size_t stride, int m, Word last_row, int n) {
+  Word pv = ~Word(0);
+  Word mv = 0;
+  int score = n;
+  for (int j = 0; j < m; j++) {
+    const Word eq = eqs[j * stride];
+    const Word xv = eq | mv;
+    const Word xh = (((eq & pv) + pv) ^ pv) | eq;
+    Word ph = mv | ~(xh | pv);
+    Word mh = pv & xh;
+    score += (ph & last_row) != 0;
+    score -= (mh & last_row) != 0;
+    ph = (ph << 1) | WORD_1;
+    mh <<= 1;
+    pv = mh | ~(xv | ph);
+    mv = ph & xv;
+  }
+  return score;
+}
+
+#if defined(DOCLING_X86_SIMD)
+
+typedef uint64_t U64x2 __attribute__((vector_size(16)));
+typedef int64_t I64x2 __attribute__((vector_size(16)));
+typedef uint64_t U64x4 __attribute__((vector_size(32)));
+typedef int64_t I64x4 __attribute__((vector_size(32)));
+
+/**
+ * myers_word() of the pairs in the lanes of a vector. The lanes run for the longest target,
+ * the scores of the shorter ones stop changing after their last column.
+ *
+ * Always inlined into the kernels below, which compile it for their instruction set.
+ *
+ * @param eqs          Peq words: columns x lanes, interleaved.
+ * @param columns      Number of columns, the longest target.
+ * @param last_rows    Bit of the last query token of each lane.
+ * @param target_sizes Number of target tokens of each lane.
+ * @param scores       The query sizes, set to the raw edit distances.
+ */
+template <typename UVec, typename IVec>
+__attribute__((always_inline)) inline void myers_lanes(const Word *eqs, int columns,
+                                                      const Word *last_rows,
+                                                      const int64_t *target_sizes,
+                                                      int64_t *scores) {
+  constexpr int kLanes = sizeof(UVec) / sizeof(Word);
+  UVec last, score;
+  IVec sizes;
+  std::memcpy(&last, last_rows, sizeof(UVec));
+  std::memcpy(&score, scores, sizeof(UVec));
+  std::memcpy(&sizes, target_sizes, sizeof(IVec));
+
+  UVec pv = ~UVec{};
+  UVec mv = UVec{};
+  IVec column = IVec{};
+  for (int j = 0; j < columns; j++) {
+    UVec eq;
+    std::memcpy(&eq, eqs + static_cast<std::size_t>(j) * kLanes, sizeof(UVec));
+    const UVec xv = eq | mv;
+    const UVec xh = (((eq & pv) + pv) ^ pv) | eq;
+    UVec ph = mv | ~(xh | pv);
+    UVec mh = pv & xh;
+    // The comparisons are all ones, i.e. -1, in the lanes where they hold
+    const UVec active = (UVec)(column < sizes);
+    score -= (UVec)((ph & last) != 0) & active;
+    score += (UVec)((mh & last) != 0) & active;
+    ph = (ph << 1) | WORD_1;
+    mh <<= 1;
+    pv = mh | ~(xv | ph);
+    mv = ph & xv;
+    column += 1;
+  }
+  std::memcpy(scores, &score, sizeof(UVec));
+}
+
+__attribute__((target("avx2"))) void myers_lanes_avx2(const Word *eqs, int columns,
+                                                      const Word *last_rows,
+                                                      const int64_t *target_sizes,
+                                                      int64_t *scores) {
+  myers_lanes<U64x4, I64x4>(eqs, columns, last_rows, target_sizes, scores);
+}
+
+__attribute__((target("sse4.2"))) void myers_lanes_sse4(const Word *eqs, int columns,
+                                                        const Word *last_rows,
+                                                        const int64_t *target_sizes,
+                                                        int64_t *scores) {
+  myers_lanes<U64x2, I64x2>(eqs, columns, last_rows, target_sizes, scores);
+}
+
+#endif
+
+/**
+ * Raw edit distances of a group of short pairs, one per lane.
+ *
+ * @param pairs     The pairs, sorted by decreasing target size.
+ * @param count     Number of pairs, at most the number of lanes of the level.
+ * @param level     Instruction set of the kernel.
+ * @param distances Set to the raw edit distance of each pair.
+ */
+void short_distances(const ShortPair *pairs, int count, SimdLevel level, int *distances) {
+  const int lanes = num_lanes(level);
+  const int columns = static_cast<int>(pairs[0].target->size());
+  Word last_rows[kMaxLanes];
+  int64_t target_sizes[kMaxLanes];
+  int64_t scores[kMaxLanes];
+
+  // --- Peq words of the target tokens of each lane ---
+  auto &token_masks = short_workspace.token_masks;
+  std::vector<Word> &eqs = short_workspace.eqs;
+  eqs.assign(static_cast<std::size_t>(columns) * lanes, 0);
+  for (int lane = 0; lane < lanes; lane++) {
+    if (lane >= count) {
+      // Idle lane: a single query token without target tokens
+      last_rows[lane] = WORD_1;
+      target_sizes[lane] = 0;
+      scores[lane] = 1;
+      continue;
+    }
+    const std::vector<std::string> &query = *pairs[lane].query;
+    const std::vector<std::string> &target = *pairs[lane].target;
+    token_masks.assign(query);
+    for (std::size_t j = 0; j < target.size(); j++) {
+      eqs[j * lanes + lane] = token_masks.mask(target[j]);
+    }
+    last_rows[lane] = WORD_1 << (query.size() - 1);
+    target_sizes[lane] = static_cast<int64_t>(target.size());
+    scores[lane] = static_cast<int64_t>(query.size());
+  }
+
+  // --- Myers recurrence of all the lanes ---
+  switch (level) {
+#if defined(DOCLING_X86_SIMD)
+  case SimdLevel::kAvx2:
+    myers_lanes_avx2(eqs.data(), columns, last_rows, target_sizes, scores);
+    break;
+  case SimdLevel::kSse4:
+    myers_lanes_sse4(eqs.data(), columns, last_rows, target_sizes, scores);
+    break;
+#endif
+  default:
+    scores[0] = myers_word(eqs.data(), 1, columns, last_rows[0],
+                           static_cast<int>(pairs[0].query->size()));
+    break;
+  }
+
+  for (int lane = 0; lane < count; lane++) {
+    distances[lane] = static_cast<int>(scores[lane]);
+  }
+}
+
+} // namespace
+
+SimdLevel detect_simd_level() {
+#if defined(DOCLING_X86_SIMD)
+  static const SimdLevel level = [] {
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) {
+      return SimdLevel::kAvx2;
+    }
+    if (__builtin_cpu_supports("sse4.2")) {
+      return SimdLevel::kSse4;
+    }
+    return SimdLevel::kPortable;
+  }();
+  return level;
+#else
+  return SimdLevel::kPortable;
+#endif
+}
+
+std::vector<double> EditDistanceCalculator::short_edit_distance_batch(
+    const std::vector<std::vector<std::string>> &queries,
+    const std::vector<std::vector<std::string>> &targets, int num_threads, double max_distance,
+    SimdLevel max_level) {
+  if (queries.size() != targets.size()) {
+    throw std::invalid_argument("The batches of token lists must have the same size");
+  }
+
+  const SimdLevel level = std::min(max_level, detect_simd_level());
+  const int lanes = num_lanes(level);
+  std::vector<double> distances(queries.size());
+
+  // --- Split the short pairs from the long ones ---
+  // The edit distance is symmetric, the shorter sequence of a pair is its query
+  std::vector<ShortPair> short_pairs;
+  std::vector<std::size_t> long_pairs;
+  for (std::size_t i = 0; i < queries.size(); i++) {
+    const std::vector<std::string> &a = queries[i];
+    const std::vector<std::string> &b = targets[i];
+    if (a.empty() || b.empty()) {
+      distances[i] = edit_distance(a, b, max_distance);
+    } else if (std::min(a.size(), b.size()) <= static_cast<std::size_t>(WORD_SIZE)) {
+      short_pairs.push_back(a.size() <= b.size() ? ShortPair{i, &a, &b} : ShortPair{i, &b, &a});
+    } else {
+      long_pairs.push_back(i);
+    }
+  }
+
+  // Pairs of similar sizes share the lanes, so few columns are computed for nothing
+  std::sort(short_pairs.begin(), short_pairs.end(),
+            [](const ShortPair &x, const ShortPair &y) {
+              return x.target->size() > y.target->size();
+            });
+  const std::size_t num_groups = (short_pairs.size() + lanes - 1) / lanes;
+
+  // The long pairs come first, so that they do not delay the end of the batch
+  parallel_for(long_pairs.size() + num_groups, num_threads, [&](std::size_t task, int) {
+    if (task < long_pairs.size()) {
+      const std::size_t i = long_pairs[task];
+      distances[i] = edit_distance(queries[i], targets[i], max_distance);
+      return;
+    }
+
+    const std::size_t first = (task - long_pairs.size()) * lanes;
+    const int count = static_cast<int>(std::min<std::size_t>(lanes, short_pairs.size() - first));
+    int raw_distances[kMaxLanes];
+    short_distances(short_pairs.data() + first, count, level, raw_distances);
+    for (int lane = 0; lane < count; lane++) {
+      const ShortPair &pair = short_pairs[first + lane];
+      const int max_len = static_cast<int>(pair.target->size());
+      const int max_raw = max_raw_distance(max_distance, max_len);
+      const int distance = raw_distances[lane];
+      distances[pair.index] = normalize(max_raw >= 0 && distance > max_raw ? -1 : distance,
+                                        max_len);
+    }
+  });
+  return distances;
+}
+
+} // namespace docling
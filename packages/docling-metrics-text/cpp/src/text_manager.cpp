@@ -1,4 +1,8 @@
+#include <limits>
+#include <stdexcept>
+
 #include "text_manager.h"
+#include "loguru.hpp"
 #include "utils.h"
 
 namespace docling {
@@ -20,8 +24,312 @@ std::vector<std::string> TextManager::tokenize(const std::string &text, bool con
 }
 
 double TextManager::edit_distance(const std::vector<std::string> &tokens_a,
-                                  const std::vector<std::string> &tokens_b) {
-  return ed_calculator_.edit_distance(tokens_a, tokens_b);
+                                  const std::vector<std::string> &tokens_b, double max_distance) {
+  return ed_calculator_.edit_distance(tokens_a, tokens_b, max_distance);
+}
+
+std::vector<int32_t> TextManager::intern_tokens(const std::vector<std::string> &tokens) {
+  std::vector<int32_t> ids;
+  ids.reserve(tokens.size());
+  for (const auto &token : tokens) {
+    ids.push_back(vocabulary_.intern(token));
+  }
+  return ids;
+}
+
+TokenList TextManager::tokenize_list(const std::vector<std::string> &sentences,
+                                     bool convert_parentheses) {
+  TokenList tokens(vocabulary_.identity());
+  std::vector<TokenSpan> spans;
+  for (const auto &sentence : sentences) {
+    spans.clear();
+    treebank_tokenizer_.tokenize_spans(sentence, convert_parentheses, spans);
+    for (const TokenSpan &span : spans) {
+      tokens.append(span.view(sentence), vocabulary_);
+    }
+  }
+  return tokens;
+}
+
+void TextManager::check_vocabulary(const TokenList &tokens) const {
+  if (tokens.vocabulary() != vocabulary_.identity()) {
+    throw std::invalid_argument("The token list was tokenized by another TextManager");
+  }
+}
+
+double TextManager::edit_distance(const TokenList &tokens_a, const TokenList &tokens_b,
+                                  double max_distance) {
+  check_vocabulary(tokens_a);
+  check_vocabulary(tokens_b);
+  return ed_calculator_.edit_distance(tokens_a.ids().data(), tokens_a.size(), tokens_b.ids().data(),
+                                      tokens_b.size(), max_distance);
+}
+
+OverlapScores TextManager::overlap(const TokenList &reference, const TokenList &test) const {
+  check_vocabulary(reference);
+  check_vocabulary(test);
+  return compute_overlap(reference.ids().data(), reference.size(), test.ids().data(), test.size());
+}
+
+double TextManager::edit_distance_ids(const int32_t *ids_a, std::size_t size_a,
+                                      const int32_t *ids_b, std::size_t size_b,
+                                      double max_distance) {
+  return ed_calculator_.edit_distance(ids_a, size_a, ids_b, size_b, max_distance);
+}
+
+Alignment TextManager::align(const std::vector<std::string> &tokens_a,
+                             const std::vector<std::string> &tokens_b) {
+  return ed_calculator_.align(tokens_a, tokens_b);
+}
+
+Alignment TextManager::align_ids(const int32_t *ids_a, std::size_t size_a, const int32_t *ids_b,
+                                 std::size_t size_b) {
+  return ed_calculator_.align(ids_a, size_a, ids_b, size_b);
+}
+
+std::vector<double>
+TextManager::edit_distance_batch(const std::vector<std::vector<std::string>> &batch_a,
+                                 const std::vector<std::vector<std::string>> &batch_b,
+                                 double max_distance) {
+  if (batch_a.size() != batch_b.size()) {
+    throw std::invalid_argument("The batches of token lists must have the same size");
+  }
+
+  std::vector<double> distances;
+  distances.reserve(batch_a.size());
+  for (std::size_t i = 0; i < batch_a.size(); ++i) {
+    distances.push_back(ed_calculator_.edit_distance(batch_a[i], batch_b[i], max_distance));
+  }
+  return distances;
+}
+
+std::vector<double>
+TextManager::short_edit_distance_batch(const std::vector<std::vector<std::string>> &batch_a,
+                                       const std::vector<std::vector<std::string>> &batch_b,
+                                       int num_threads, double max_distance,
+                                       SimdLevel max_level) {
+  return ed_calculator_.short_edit_distance_batch(batch_a, batch_b, num_threads, max_distance,
+                                                  max_level);
+}
+
+PreparedReference TextManager::prepare_reference(const std::vector<std::string> &tokens) {
+  return ed_calculator_.prepare(tokens);
+}
+
+double TextManager::edit_distance(const PreparedReference &reference,
+                                  const std::vector<std::string> &tokens, double max_distance) {
+  return ed_calculator_.edit_distance(reference, tokens, max_distance);
+}
+
+std::vector<double>
+TextManager::edit_distance_batch(const PreparedReference &reference,
+                                 const std::vector<std::vector<std::string>> &hypotheses,
+                                 int num_threads, double max_distance) {
+  std::vector<double> distances(hypotheses.size());
+  parallel_for(hypotheses.size(), num_threads, [&](std::size_t i, int) {
+    distances[i] = ed_calculator_.edit_distance(reference, hypotheses[i], max_distance);
+  });
+  return distances;
+}
+
+PairEvaluation TextManager::evaluate_pair(const std::vector<std::string> &sentences_a,
+                                          const std::vector<std::string> &sentences_b,
+                                          double max_distance) {
+  PairEvaluation evaluation;
+  for (const auto &sentence : sentences_a) {
+    treebank_tokenizer_.tokenize_into(sentence, false, evaluation.tokens_a);
+  }
+  for (const auto &sentence : sentences_b) {
+    treebank_tokenizer_.tokenize_into(sentence, false, evaluation.tokens_b);
+  }
+
+  OverlapScores overlap = compute_overlap(evaluation.tokens_a, evaluation.tokens_b);
+  evaluation.precision = overlap.precision;
+  evaluation.recall = overlap.recall;
+  evaluation.f1 = overlap.f1;
+  evaluation.token_set_a = overlap.reference_size;
+  evaluation.token_set_b = overlap.test_size;
+  evaluation.common_tokens = overlap.common;
+  evaluation.edit_distance =
+      ed_calculator_.edit_distance(evaluation.tokens_a, evaluation.tokens_b, max_distance);
+  return evaluation;
+}
+
+BatchEvaluation
+TextManager::evaluate_batch(const std::vector<std::vector<std::string>> &batch_sentences_a,
+                            const std::vector<std::vector<std::string>> &batch_sentences_b,
+                            int num_threads, bool return_tokens, double max_distance,
+                            bool overlap, bool edit_distance) {
+  if (batch_sentences_a.size() != batch_sentences_b.size()) {
+    throw std::invalid_argument("The batches of texts must have the same size");
+  }
+
+  const std::size_t count = batch_sentences_a.size();
+  const double nan = std::numeric_limits<double>::quiet_NaN();
+  BatchEvaluation batch;
+  batch.precision.assign(count, nan);
+  batch.recall.assign(count, nan);
+  batch.f1.assign(count, nan);
+  batch.edit_distance.assign(count, nan);
+  batch.token_set_a.assign(count, 0);
+  batch.token_set_b.assign(count, 0);
+  batch.common_tokens.assign(count, 0);
+  if (return_tokens) {
+    batch.tokens_a.resize(count);
+    batch.tokens_b.resize(count);
+  }
+
+  // The tokenizer and the edit distance calculator are shared, the latter keeps its buffers
+  // per thread
+  parallel_for(count, num_threads, [&](std::size_t i, int) {
+    std::vector<std::string> tokens_a;
+    std::vector<std::string> tokens_b;
+    for (const auto &sentence : batch_sentences_a[i]) {
+      treebank_tokenizer_.tokenize_into(sentence, false, tokens_a);
+    }
+    for (const auto &sentence : batch_sentences_b[i]) {
+      treebank_tokenizer_.tokenize_into(sentence, false, tokens_b);
+    }
+
+    if (overlap) {
+      OverlapScores scores = compute_overlap(tokens_a, tokens_b);
+      batch.precision[i] = scores.precision.value_or(nan);
+      batch.recall[i] = scores.recall.value_or(nan);
+      batch.f1[i] = scores.f1.value_or(nan);
+      batch.token_set_a[i] = static_cast<int64_t>(scores.reference_size);
+      batch.token_set_b[i] = static_cast<int64_t>(scores.test_size);
+      batch.common_tokens[i] = static_cast<int64_t>(scores.common);
+    }
+    if (edit_distance) {
+      try {
+        batch.edit_distance[i] = ed_calculator_.edit_distance(tokens_a, tokens_b, max_distance);
+      } catch (const std::exception &e) {
+        LOG_F(WARNING, "Edit distance of pair %zu failed: %s", i, e.what());
+      }
+    }
+
+    if (return_tokens) {
+      batch.tokens_a[i] = std::move(tokens_a);
+      batch.tokens_b[i] = std::move(tokens_b);
+    }
+  });
+  return batch;
+}
+
+ErrorCounts TextManager::character_errors(const std::string &reference,
+                                          const std::string &hypothesis) {
+  return ed_calculator_.character_errors(reference, hypothesis);
+}
+
+ErrorCounts TextManager::word_errors(const std::string &reference,
+                                     const std::string &hypothesis) {
+  return ed_calculator_.word_errors(reference, hypothesis);
+}
+
+BatchErrorRates TextManager::error_rates_batch(const std::vector<std::string> &references,
+                                               const std::vector<std::string> &hypotheses,
+                                               int num_threads) {
+  if (references.size() != hypotheses.size()) {
+    throw std::invalid_argument("The batches of texts must have the same size");
+  }
+
+  const std::size_t count = references.size();
+  BatchErrorRates batch;
+  batch.cer.resize(count);
+  batch.wer.resize(count);
+  batch.char_errors.resize(count);
+  batch.char_lengths.resize(count);
+  batch.word_errors.resize(count);
+  batch.word_lengths.resize(count);
+
+  parallel_for(count, num_threads, [&](std::size_t i, int) {
+    ErrorCounts chars = ed_calculator_.character_errors(references[i], hypotheses[i]);
+    ErrorCounts words = ed_calculator_.word_errors(references[i], hypotheses[i]);
+    batch.cer[i] = chars.rate();
+    batch.wer[i] = words.rate();
+    batch.char_errors[i] = chars.errors;
+    batch.char_lengths[i] = chars.reference_length;
+    batch.word_errors[i] = words.errors;
+    batch.word_lengths[i] = words.reference_length;
+  });
+  return batch;
+}
+
+std::vector<std::string> TextManager::tokenize_13a(const std::string &text) {
+  return docling::tokenize_13a(text);
+}
+
+BleuScore TextManager::sentence_bleu(const std::vector<std::vector<std::string>> &references,
+                                     const std::vector<std::string> &hypothesis, int max_order,
+                                     bool smooth) {
+  BleuStatistics statistics(max_order);
+  statistics.add(references, hypothesis);
+  return statistics.score(smooth);
+}
+
+BatchBleu TextManager::bleu_batch(const std::vector<std::string> &hypotheses,
+                                  const std::vector<std::string> &references, int num_threads,
+                                  int max_order, bool smooth) {
+  if (hypotheses.size() != references.size()) {
+    throw std::invalid_argument("The batches of texts must have the same size");
+  }
+  if (max_order < 1) {
+    throw std::invalid_argument("The maximum n-gram order must be at least 1");
+  }
+
+  const std::size_t count = hypotheses.size();
+  BatchBleu batch;
+  batch.max_order = max_order;
+  batch.bleu.resize(count);
+  batch.matches.resize(count * max_order);
+  batch.possible_matches.resize(count * max_order);
+  batch.translation_length.resize(count);
+  batch.reference_length.resize(count);
+
+  parallel_for(count, num_threads, [&](std::size_t i, int) {
+    BleuStatistics statistics(max_order);
+    statistics.add({docling::tokenize_13a(references[i])}, docling::tokenize_13a(hypotheses[i]));
+    batch.bleu[i] = statistics.score(smooth).bleu;
+    std::copy(statistics.matches().begin(), statistics.matches().end(),
+              batch.matches.begin() + i * max_order);
+    std::copy(statistics.possible_matches().begin(), statistics.possible_matches().end(),
+              batch.possible_matches.begin() + i * max_order);
+    batch.translation_length[i] = statistics.translation_length();
+    batch.reference_length[i] = statistics.reference_length();
+  });
+  return batch;
+}
+
+void TextManager::load_meteor_table(const std::string &path) {
+  meteor_table_ = std::make_shared<const MeteorTable>(path);
+}
+
+double TextManager::meteor(const std::vector<std::vector<std::string>> &references,
+                           const std::vector<std::string> &hypothesis, double alpha, double beta,
+                           double gamma) {
+  if (meteor_table_ == nullptr) {
+    throw std::runtime_error("No METEOR table is loaded");
+  }
+  return meteor_score(*meteor_table_, references, hypothesis, {alpha, beta, gamma});
+}
+
+std::vector<double>
+TextManager::meteor_batch(const std::vector<std::vector<std::string>> &references,
+                          const std::vector<std::vector<std::string>> &hypotheses,
+                          int num_threads, double alpha, double beta, double gamma) {
+  if (references.size() != hypotheses.size()) {
+    throw std::invalid_argument("The batches of token lists must have the same size");
+  }
+  if (meteor_table_ == nullptr) {
+    throw std::runtime_error("No METEOR table is loaded");
+  }
+
+  const MeteorParameters parameters{alpha, beta, gamma};
+  std::vector<double> scores(references.size());
+  parallel_for(references.size(), num_threads, [&](std::size_t i, int) {
+    scores[i] = single_meteor_score(*meteor_table_, references[i], hypotheses[i], parameters);
+  });
+  return scores;
 }
 
 } // namespace docling
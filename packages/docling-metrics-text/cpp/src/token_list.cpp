@@ -0,0 +1,59 @@
+#include <atomic>
+#include <limits>
+#include <stdexcept>
+
+#include "token_list.h"
+
+namespace docling {
+
+namespace {
+
+uint64_t next_identity() {
+  static std::atomic<uint64_t> counter{0};
+  return ++counter;
+}
+
+} // namespace
+
+Vocabulary::Vocabulary() : identity_(next_identity()) {}
+
+Vocabulary::Vocabulary(const Vocabulary &other) : ids_(other.ids_), identity_(next_identity()) {}
+
+Vocabulary &Vocabulary::operator=(const Vocabulary &other) {
+  if (this != &other) {
+    ids_ = other.ids_;
+    identity_ = next_identity();
+  }
+  return *this;
+}
+
+int32_t Vocabulary::intern(std::string_view token) {
+  auto it = ids_.find(token);
+  if (it == ids_.end()) {
+    it = ids_.emplace(std::string(token), static_cast<int32_t>(ids_.size())).first;
+  }
+  return it->second;
+}
+
+std::vector<std::string> TokenList::tokens() const {
+  std::vector<std::string> tokens;
+  tokens.reserve(size());
+  for (std::size_t i = 0; i < size(); ++i) {
+    tokens.emplace_back((*this)[i]);
+  }
+  return tokens;
+}
+
+void TokenList::append(std::string_view token, Vocabulary &vocabulary) {
+  if (vocabulary.identity() != vocabulary_) {
+    throw std::invalid_argument("The token list belongs to another vocabulary");
+  }
+  if (arena_.size() + token.size() > std::numeric_limits<uint32_t>::max()) {
+    throw std::length_error("The tokens are too long for 32-bit offsets");
+  }
+  arena_.append(token);
+  offsets_.push_back(static_cast<uint32_t>(arena_.size()));
+  ids_.push_back(vocabulary.intern(token));
+}
+
+} // namespace docling
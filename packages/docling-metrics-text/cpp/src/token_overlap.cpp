@@ -0,0 +1,75 @@
+#include <algorithm>
+#include <string_view>
+#include <unordered_set>
+
+#include "token_overlap.h"
+
+namespace docling {
+
+namespace {
+
+OverlapScores overlap_scores(std::size_t reference_size, std::size_t test_size,
+                             std::size_t common) {
+  OverlapScores scores;
+  scores.reference_size = reference_size;
+  scores.test_size = test_size;
+  scores.common = common;
+  if (test_size > 0) {
+    scores.precision = static_cast<double>(common) / static_cast<double>(test_size);
+  }
+  if (reference_size > 0) {
+    scores.recall = static_cast<double>(common) / static_cast<double>(reference_size);
+  }
+  if (scores.precision && scores.recall) {
+    // f_measure() with alpha = 0.5
+    double p = *scores.precision;
+    double r = *scores.recall;
+    scores.f1 = (p == 0.0 || r == 0.0) ? 0.0 : 1.0 / (0.5 / p + 0.5 / r);
+  }
+  return scores;
+}
+
+// The sorted distinct ids
+std::vector<int32_t> id_set(const int32_t *ids, std::size_t size) {
+  std::vector<int32_t> set(ids, ids + size);
+  std::sort(set.begin(), set.end());
+  set.erase(std::unique(set.begin(), set.end()), set.end());
+  return set;
+}
+
+} // namespace
+
+OverlapScores compute_overlap(const std::vector<std::string> &reference,
+                              const std::vector<std::string> &test) {
+  std::unordered_set<std::string_view> reference_set(reference.begin(), reference.end());
+  std::unordered_set<std::string_view> test_set(test.begin(), test.end());
+
+  // Probe the larger set with the elements of the smaller one
+  const auto &smaller = reference_set.size() < test_set.size() ? reference_set : test_set;
+  const auto &larger = reference_set.size() < test_set.size() ? test_set : reference_set;
+  std::size_t common = 0;
+  for (const auto &token : smaller) {
+    common += larger.count(token);
+  }
+
+  return overlap_scores(reference_set.size(), test_set.size(), common);
+}
+
+OverlapScores compute_overlap(const int32_t *reference, std::size_t reference_size,
+                              const int32_t *test, std::size_t test_size) {
+  std::vector<int32_t> reference_set = id_set(reference, reference_size);
+  std::vector<int32_t> test_set = id_set(test, test_size);
+
+  std::size_t common = 0;
+  auto it = reference_set.begin();
+  for (int32_t id : test_set) {
+    it = std::lower_bound(it, reference_set.end(), id);
+    if (it == reference_set.end()) {
+      break;
+    }
+    common += *it == id;
+  }
+  return overlap_scores(reference_set.size(), test_set.size(), common);
+}
+
+} // namespace docling
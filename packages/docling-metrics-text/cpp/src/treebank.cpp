@@ -1,6 +1,11 @@
+#include <algorithm>
+#include <cctype>
+#include <cstdint>
+#include <limits>
 #include <memory>
-#include <sstream>
+#include <stdexcept>
 #include <string>
+#include <string_view>
 #include <vector>
 
 #include "treebank.h"
@@ -8,123 +13,635 @@
 
 namespace docling {
 
-TreeBankTokenizer::TreeBankTokenizer() {
-  // Starting quotes - compile regex patterns
-  starting_quotes_.emplace_back(std::make_unique<re2::RE2>(R"(^")", re2::RE2::Quiet), "``");
-  starting_quotes_.emplace_back(std::make_unique<re2::RE2>(R"((``))", re2::RE2::Quiet), R"( \1 )");
-  starting_quotes_.emplace_back(
-      std::make_unique<re2::RE2>(R"(([ \(\[{<])("|\'{2}))", re2::RE2::Quiet), R"(\1 `` )");
-
-  // Punctuation
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"(([:,])([^\d]))", re2::RE2::Quiet),
-                            R"( \1 \2)");
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"(([:,])$)", re2::RE2::Quiet), R"( \1 )");
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"(\.\.\.)", re2::RE2::Quiet), R"( ... )");
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"([;@#$%&])", re2::RE2::Quiet), R"( \0 )");
-  punctuation_.emplace_back(
-      std::make_unique<re2::RE2>(R"(([^\.])(\.)([\]\)}>"\']*)\s*$)", re2::RE2::Quiet),
-      R"(\1 \2\3 )");
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"([?!])", re2::RE2::Quiet), R"( \0 )");
-  punctuation_.emplace_back(std::make_unique<re2::RE2>(R"(([^'])' )", re2::RE2::Quiet), R"(\1 ' )");
-
-  // Parentheses and brackets
-  parens_brackets_ = {std::make_unique<re2::RE2>(R"([\]\[\(\)\{\}\<\>])", re2::RE2::Quiet),
-                      R"( \0 )"};
-
-  // Convert parentheses (optional)
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\()", re2::RE2::Quiet), "-LRB-");
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\))", re2::RE2::Quiet), "-RRB-");
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\[)", re2::RE2::Quiet), "-LSB-");
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\])", re2::RE2::Quiet), "-RSB-");
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\{)", re2::RE2::Quiet), "-LCB-");
-  convert_parentheses_.emplace_back(std::make_unique<re2::RE2>(R"(\})", re2::RE2::Quiet), "-RCB-");
-
-  // Double dashes
-  double_dashes_ = {std::make_unique<re2::RE2>(R"(--)", re2::RE2::Quiet), R"( -- )"};
-
-  // Ending quotes
-  ending_quotes_.emplace_back(std::make_unique<re2::RE2>(R"('')", re2::RE2::Quiet), " '' ");
-  ending_quotes_.emplace_back(std::make_unique<re2::RE2>(R"(")", re2::RE2::Quiet), " '' ");
-  ending_quotes_.emplace_back(
-      std::make_unique<re2::RE2>(R"(([^' ])('[sS]|'[mM]|'[dD]|') )", re2::RE2::Quiet), R"(\1 \2 )");
-  ending_quotes_.emplace_back(
-      std::make_unique<re2::RE2>(R"(([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) )", re2::RE2::Quiet),
-      R"(\1 \2 )");
-
-  // Contractions (case-insensitive)
-  // Note: RE2 doesn't support lookaheads, so we adjust patterns
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(can)(not)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(d)('ye)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(gim)(me)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(gon)(na)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(got)(ta)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(lem)(me)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(more)('n)\b)", re2::RE2::Quiet));
-  contractions2_.emplace_back(std::make_unique<re2::RE2>(R"((?i)\b(wan)(na)\s)", re2::RE2::Quiet));
-
-  contractions3_.emplace_back(std::make_unique<re2::RE2>(R"((?i) ('t)(is)\b)", re2::RE2::Quiet));
-  contractions3_.emplace_back(std::make_unique<re2::RE2>(R"((?i) ('t)(was)\b)", re2::RE2::Quiet));
+namespace {
+
+/**
+ * The rules of the NLTKWordTokenizer, in the order of their regex passes. A rule sees the
+ * spaces inserted by the rules of the earlier phases only.
+ */
+enum Phase : uint8_t {
+  kUncut = 0,
+  // «“‘„ and the runs of backticks are isolated, the `` pairs of a run are split, and a "
+  // starting the text becomes ``
+  kStartingQuotes,
+  // " and '' after a space, an opening bracket or a starting quote become ``
+  kOpeningQuotes,
+  // A ' before a word that is not a clitic
+  kStartingSingleQuote,
+  // ([^\.])(\.)([\]\)}>"\'»”’ ]*)\s*$
+  kFinalPeriod,
+  // , and : before a non-digit or at the end, ellipses, ;@#$%&, the dashes U+2012-U+2015
+  // and ?!
+  kPunctuation,
+  // ([^'])' followed by a space
+  kQuoteBeforeSpace,
+  // *, the brackets, the pairs of hyphens, »”’, the '' pairs and the other "
+  kClosingPunctuation,
+  // ([^' ])('[sSmMdD]?) followed by a space
+  kClitics,
+  // ([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) followed by a space
+  kNegations,
+};
+
+// Buffers reused across the calls of a thread, so that a tokenizer can be shared
+struct TreeBankWorkspace {
+  // Earliest phase inserting a space before each byte, and after the last one
+  std::vector<uint8_t> cuts;
+  // Replacement of the token starting at each byte
+  std::vector<TokenReplacement> replacements;
+  // Offsets of the ' that are not part of an opening quote
+  std::vector<uint32_t> quotes;
+  // Offsets of the spaces inserted by the contractions in a token
+  std::vector<std::size_t> splits;
+};
+
+thread_local TreeBankWorkspace workspace;
+
+// Length of the UTF-8 sequence starting with the given byte
+std::size_t utf8_length(unsigned char lead) {
+  if (lead < 0x80) {
+    return 1;
+  }
+  if ((lead >> 5) == 0x6) {
+    return 2;
+  }
+  if ((lead >> 4) == 0xE) {
+    return 3;
+  }
+  return 4;
+}
+
+// Python's str.isspace()
+bool is_whitespace(uint32_t cp) {
+  return (cp >= 0x09 && cp <= 0x0D) || (cp >= 0x1C && cp <= 0x20) || cp == 0x85 || cp == 0xA0 ||
+         cp == 0x1680 || (cp >= 0x2000 && cp <= 0x200A) || cp == 0x2028 || cp == 0x2029 ||
+         cp == 0x202F || cp == 0x205F || cp == 0x3000;
+}
+
+bool is_ascii_letter(char c) { return (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z'); }
+
+// Case-insensitive comparison of a span with a lowercase ASCII word
+bool equals_word(std::string_view span, std::string_view word) {
+  if (span.size() != word.size()) {
+    return false;
+  }
+  for (std::size_t k = 0; k < word.size(); ++k) {
+    if (std::tolower(static_cast<unsigned char>(span[k])) != word[k]) {
+      return false;
+    }
+  }
+  return true;
 }
 
 /**
- * Implementation of the TreeBankTokenizer using regular expressions
- * The logic is ported from the NLTK tokenizer
- * The implementation is based on the RE2 regex library
+ * One tokenization: the scan of the text, then the rules around the single quotes, then
+ * the tokens between the spaces.
  */
-std::vector<std::string> TreeBankTokenizer::tokenize(const std::string &text,
-                                                     bool convert_parentheses) {
-  std::string result = text;
+class SpanScanner {
+public:
+  SpanScanner(std::string_view text, bool convert_parentheses, const re2::RE2 &word_char,
+              const re2::RE2 &decimal_digit)
+      : text_(text), n_(text.size()), convert_parentheses_(convert_parentheses),
+        word_char_(word_char), decimal_digit_(decimal_digit), cuts_(workspace.cuts),
+        replacements_(workspace.replacements), quotes_(workspace.quotes),
+        splits_(workspace.splits) {
+    cuts_.assign(n_ + 1, kUncut);
+    replacements_.assign(n_, TokenReplacement::kNone);
+    quotes_.clear();
+  }
 
-  // Apply starting quotes
-  for (const auto &pair : starting_quotes_) {
-    re2::RE2::GlobalReplace(&result, *pair.first, pair.second);
+  void run(std::vector<TokenSpan> &spans) {
+    scan();
+    final_period();
+    quotes_before_space();
+    clitics();
+    negations();
+    emit(spans);
   }
 
-  // Apply punctuation rules
-  for (const auto &pair : punctuation_) {
-    re2::RE2::GlobalReplace(&result, *pair.first, pair.second);
+private:
+  std::size_t codepoint_length(std::size_t pos) const {
+    return std::min(utf8_length(static_cast<unsigned char>(text_[pos])), n_ - pos);
   }
 
-  // Handle parentheses and brackets
-  re2::RE2::GlobalReplace(&result, *parens_brackets_.first, parens_brackets_.second);
+  std::size_t previous_codepoint(std::size_t pos) const {
+    std::size_t start = pos - 1;
+    while (start > 0 && (static_cast<unsigned char>(text_[start]) & 0xC0) == 0x80) {
+      --start;
+    }
+    return start;
+  }
 
-  // Optionally convert parentheses
-  if (convert_parentheses) {
-    for (const auto &pair : convert_parentheses_) {
-      re2::RE2::GlobalReplace(&result, *pair.first, pair.second);
+  uint32_t decode(std::size_t pos) const {
+    const auto *bytes = reinterpret_cast<const unsigned char *>(text_.data() + pos);
+    switch (codepoint_length(pos)) {
+    case 1:
+      return bytes[0];
+    case 2:
+      return ((bytes[0] & 0x1Fu) << 6) | (bytes[1] & 0x3Fu);
+    case 3:
+      return ((bytes[0] & 0x0Fu) << 12) | ((bytes[1] & 0x3Fu) << 6) | (bytes[2] & 0x3Fu);
+    default:
+      return ((bytes[0] & 0x07u) << 18) | ((bytes[1] & 0x3Fu) << 12) | ((bytes[2] & 0x3Fu) << 6) |
+             (bytes[3] & 0x3Fu);
     }
   }
 
-  // Handle double dashes
-  re2::RE2::GlobalReplace(&result, *double_dashes_.first, double_dashes_.second);
+  bool is_word_char(std::size_t pos) const {
+    unsigned char c = static_cast<unsigned char>(text_[pos]);
+    if (c < 0x80) {
+      return std::isalnum(c) != 0 || c == '_';
+    }
+    return re2::RE2::FullMatch(text_.substr(pos, codepoint_length(pos)), word_char_);
+  }
 
-  // Add extra space to make things easier
-  result = " " + result + " ";
+  bool previous_is_word_char(std::size_t pos) const {
+    return pos > 0 && is_word_char(previous_codepoint(pos));
+  }
 
-  // Apply ending quotes
-  for (const auto &pair : ending_quotes_) {
-    re2::RE2::GlobalReplace(&result, *pair.first, pair.second);
+  bool is_decimal_digit(std::size_t pos) const {
+    unsigned char c = static_cast<unsigned char>(text_[pos]);
+    if (c < 0x80) {
+      return c >= '0' && c <= '9';
+    }
+    return re2::RE2::FullMatch(text_.substr(pos, codepoint_length(pos)), decimal_digit_);
+  }
+
+  bool whitespace_at(std::size_t pos) const { return pos < n_ && is_whitespace(decode(pos)); }
+
+  // Insert a space before pos, the earliest phase is kept
+  void cut(std::size_t pos, Phase phase) {
+    if (cuts_[pos] == kUncut || phase < cuts_[pos]) {
+      cuts_[pos] = phase;
+    }
   }
 
-  // Apply contractions2
-  for (const auto &regex : contractions2_) {
-    re2::RE2::GlobalReplace(&result, *regex, R"( \1 \2 )");
+  void isolate(std::size_t start, std::size_t end, Phase phase) {
+    cut(start, phase);
+    cut(end, phase);
   }
 
-  // Apply contractions3
-  for (const auto &regex : contractions3_) {
-    re2::RE2::GlobalReplace(&result, *regex, R"( \1 \2 )");
+  // Whether a rule of the given phase sees an inserted space before pos
+  bool spaced(std::size_t pos, Phase phase) const {
+    return cuts_[pos] != kUncut && cuts_[pos] < phase;
   }
 
-  // Split by whitespace
-  std::vector<std::string> tokens;
-  std::istringstream iss(result);
-  std::string token;
-  while (iss >> token) {
-    tokens.push_back(token);
+  // Whether a rule of the ending quotes, after the text is padded and its whitespace
+  // collapsed, sees a space before the byte at pos
+  bool space_at(std::size_t pos, Phase phase) const {
+    return pos == 0 || pos >= n_ || spaced(pos, phase) || whitespace_at(pos);
+  }
+
+  bool space_before(std::size_t pos, Phase phase) const {
+    return pos == 0 || spaced(pos, phase) || is_whitespace(decode(previous_codepoint(pos)));
+  }
+
+  // Number of bytes of the " or '' at pos that become ``
+  std::size_t opening_quote_length(std::size_t pos) const {
+    std::size_t length = 0;
+    if (text_[pos] == '"') {
+      length = 1;
+    } else if (text_[pos] == '\'' && pos + 1 < n_ && text_[pos + 1] == '\'') {
+      length = 2;
+    }
+    if (length == 0 || (pos == 0 && length == 2)) {
+      return 0;
+    }
+    // ^" and ([ \(\[{<])("|\'{2}), where the isolated starting quotes are followed by a space
+    if (pos == 0 || (pos == 1 && text_[0] == '"') ||
+        std::string_view(" ([{<`").find(text_[pos - 1]) != std::string_view::npos) {
+      return length;
+    }
+    uint32_t previous = decode(previous_codepoint(pos));
+    bool starting_quote =
+        previous == 0xAB || previous == 0x201C || previous == 0x2018 || previous == 0x201E;
+    return starting_quote ? length : 0;
+  }
+
+  /**
+   * Python: (?i)(?<!\w)(\')(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w) -> "\1 "
+   * Case-insensitive like Python, where "s" also matches the long s (U+017F).
+   */
+  bool starts_clitic(std::size_t pos) const {
+    for (std::string_view clitic : {"re", "ve", "ll", "m", "t", "s", "d", "n"}) {
+      std::size_t end = pos;
+      bool matches = true;
+      for (std::size_t k = 0; k < clitic.size() && matches; ++k) {
+        if (end < n_ && std::tolower(static_cast<unsigned char>(text_[end])) == clitic[k]) {
+          end += 1;
+        } else if (clitic[k] == 's' && text_.substr(end, 2) == "\xC5\xBF") {
+          end += 2;
+        } else {
+          matches = false;
+        }
+      }
+      if (matches && (end == n_ || !is_word_char(end))) {
+        return true;
+      }
+    }
+    return false;
+  }
+
+  std::size_t run_end(std::size_t pos, char c) const {
+    while (pos < n_ && text_[pos] == c) {
+      ++pos;
+    }
+    return pos;
+  }
+
+  // The rules that only depend on the neighbouring characters, in a single pass
+  void scan() {
+    // The code points before skip_until were consumed by a match of ([:,])([^\p{Nd}])
+    std::size_t skip_until = 0;
+    // The previous ' starts a '' pair
+    bool pair_open = false;
+
+    for (std::size_t pos = 0; pos < n_;) {
+      const char c = text_[pos];
+      std::size_t next = pos + codepoint_length(pos);
+      switch (c) {
+      case '"':
+        if (opening_quote_length(pos) > 0) {
+          replacements_[pos] = TokenReplacement::kOpeningQuote;
+          isolate(pos, next, pos == 0 ? kStartingQuotes : kOpeningQuotes);
+        } else {
+          replacements_[pos] = TokenReplacement::kClosingQuote;
+          isolate(pos, next, kClosingPunctuation);
+        }
+        break;
+      case '\'':
+        if (opening_quote_length(pos) == 2) {
+          replacements_[pos] = TokenReplacement::kOpeningQuote;
+          replacements_[pos + 1] = TokenReplacement::kOpeningQuote;
+          isolate(pos, pos + 2, kOpeningQuotes);
+          next = pos + 2;
+          break;
+        }
+        quotes_.push_back(static_cast<uint32_t>(pos));
+        if (!previous_is_word_char(pos) && next < n_ && is_word_char(next) &&
+            !starts_clitic(next)) {
+          cut(next, kStartingSingleQuote);
+        }
+        if (pair_open) {
+          cut(next, kClosingPunctuation);
+          pair_open = false;
+        } else if (next < n_ && text_[next] == '\'') {
+          cut(pos, kClosingPunctuation);
+          pair_open = true;
+        }
+        break;
+      case '`': {
+        next = run_end(pos, '`');
+        isolate(pos, next, kStartingQuotes);
+        for (std::size_t pair = pos; pair + 2 <= next; pair += 2) {
+          isolate(pair, pair + 2, kStartingQuotes);
+        }
+        break;
+      }
+      case ',':
+      case ':':
+        if (pos >= skip_until && next < n_ && !is_decimal_digit(next)) {
+          isolate(pos, next, kPunctuation);
+          skip_until = next + codepoint_length(next);
+        }
+        if (next == n_) {
+          cut(pos, kPunctuation);
+        }
+        break;
+      case '.':
+        next = run_end(pos, '.');
+        if (next - pos >= 2) {
+          isolate(pos, next, kPunctuation);
+        }
+        break;
+      case ';':
+      case '@':
+      case '#':
+      case '$':
+      case '%':
+      case '&':
+      case '?':
+      case '!':
+        isolate(pos, next, kPunctuation);
+        break;
+      case '*':
+      case '<':
+      case '>':
+        isolate(pos, next, kClosingPunctuation);
+        break;
+      case '(':
+      case ')':
+      case '[':
+      case ']':
+      case '{':
+      case '}':
+        isolate(pos, next, kClosingPunctuation);
+        if (convert_parentheses_) {
+          replacements_[pos] = bracket_replacement(c);
+        }
+        break;
+      case '-':
+        next = run_end(pos, '-');
+        for (std::size_t pair = pos; pair + 2 <= next; pair += 2) {
+          isolate(pair, pair + 2, kClosingPunctuation);
+        }
+        break;
+      default:
+        if (static_cast<unsigned char>(c) >= 0x80) {
+          uint32_t cp = decode(pos);
+          if (cp == 0xAB || cp == 0x201C || cp == 0x2018 || cp == 0x201E) {
+            isolate(pos, next, kStartingQuotes);
+          } else if (cp >= 0x2012 && cp <= 0x2015) {
+            isolate(pos, next, kPunctuation);
+          } else if (cp == 0xBB || cp == 0x201D || cp == 0x2019) {
+            isolate(pos, next, kClosingPunctuation);
+          }
+        }
+        break;
+      }
+      pos = next;
+    }
   }
 
+  static TokenReplacement bracket_replacement(char c) {
+    switch (c) {
+    case '(':
+      return TokenReplacement::kLeftParenthesis;
+    case ')':
+      return TokenReplacement::kRightParenthesis;
+    case '[':
+      return TokenReplacement::kLeftSquareBracket;
+    case ']':
+      return TokenReplacement::kRightSquareBracket;
+    case '{':
+      return TokenReplacement::kLeftCurlyBracket;
+    default:
+      return TokenReplacement::kRightCurlyBracket;
+    }
+  }
+
+  /**
+   * ([^\.])(\.)([\]\)}>"\'»”’ ]*)\s*$ -> "\1 \2 \3 ", the closing characters exclude the
+   * quotes that became ``. The second final period rule without the » ” ’ and spaces
+   * never inserts a space that this one did not.
+   */
+  void final_period() {
+    std::size_t end = n_;
+    while (end > 0 && is_whitespace(decode(previous_codepoint(end)))) {
+      end = previous_codepoint(end);
+    }
+    std::size_t start = end;
+    while (start > 0) {
+      std::size_t previous = previous_codepoint(start);
+      uint32_t cp = decode(previous);
+      bool closing =
+          cp == 0xBB || cp == 0x201D || cp == 0x2019 ||
+          (cp < 0x80 &&
+           std::string_view("])}>\"' ").find(static_cast<char>(cp)) != std::string_view::npos &&
+           replacements_[previous] != TokenReplacement::kOpeningQuote);
+      if (!closing) {
+        break;
+      }
+      start = previous;
+    }
+    if (start >= 2 && text_[start - 1] == '.' && text_[start - 2] != '.') {
+      isolate(start - 1, start, kFinalPeriod);
+      cut(end, kFinalPeriod);
+    }
+  }
+
+  // ([^'])' followed by a space -> "\1 ' "
+  void quotes_before_space() {
+    for (std::size_t pos : quotes_) {
+      if (pos == 0) {
+        continue;
+      }
+      bool after_quote = text_[pos - 1] == '\'' &&
+                         replacements_[pos - 1] == TokenReplacement::kNone &&
+                         !spaced(pos, kQuoteBeforeSpace);
+      bool before_space =
+          spaced(pos + 1, kQuoteBeforeSpace) || (pos + 1 < n_ && text_[pos + 1] == ' ');
+      if (!after_quote && before_space) {
+        cut(pos, kQuoteBeforeSpace);
+      }
+    }
+  }
+
+  // Whether the previous character is neither a space nor a ', as the ([^' ]) of a rule
+  bool follows_character(std::size_t pos, Phase phase) const {
+    return !space_before(pos, phase) && text_[pos - 1] != '\'';
+  }
+
+  // ([^' ])('[sSmMdD]?) followed by a space -> "\1 \2 "
+  void clitics() {
+    for (std::size_t pos : quotes_) {
+      if (!follows_character(pos, kClitics)) {
+        continue;
+      }
+      if (space_at(pos + 1, kClitics) ||
+          (std::string_view("sSmMdD").find(text_[pos + 1]) != std::string_view::npos &&
+           space_at(pos + 2, kClitics))) {
+        cut(pos, kClitics);
+      }
+    }
+  }
+
+  // ([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) followed by a space -> "\1 \2 "
+  void negations() {
+    for (std::size_t pos : quotes_) {
+      std::size_t start = 0;
+      std::string_view after = text_.substr(pos + 1, 2);
+      if (after == "ll" || after == "LL" || after == "re" || after == "RE" || after == "ve" ||
+          after == "VE") {
+        start = pos;
+      } else if (pos > 0 &&
+                 (text_.substr(pos - 1, 3) == "n't" || text_.substr(pos - 1, 3) == "N'T")) {
+        start = pos - 1;
+      } else {
+        continue;
+      }
+      std::size_t end = start + 3;
+      if (!spaced(start + 1, kNegations) && !spaced(start + 2, kNegations) &&
+          space_at(end, kNegations) && follows_character(start, kNegations)) {
+        cut(start, kNegations);
+      }
+    }
+  }
+
+  void push(std::vector<TokenSpan> &spans, std::size_t start, std::size_t end,
+            TokenReplacement replacement = TokenReplacement::kNone) const {
+    spans.push_back(
+        {static_cast<uint32_t>(start), static_cast<uint32_t>(end - start), replacement});
+  }
+
+  // The tokens between the spaces of all the rules
+  void emit(std::vector<TokenSpan> &spans) {
+    std::size_t pos = 0;
+    while (pos < n_) {
+      if (whitespace_at(pos)) {
+        pos += codepoint_length(pos);
+        continue;
+      }
+      std::size_t start = pos;
+      pos += codepoint_length(pos);
+      while (pos < n_ && cuts_[pos] == kUncut && !whitespace_at(pos)) {
+        pos += codepoint_length(pos);
+      }
+      if (replacements_[start] != TokenReplacement::kNone) {
+        push(spans, start, pos, replacements_[start]);
+      } else {
+        split_contractions(start, pos, spans);
+      }
+    }
+  }
+
+  // Whether the word at [start, end) of the token [token_start, token_end) is not
+  // preceded nor followed by a word character, like \b
+  bool bounded(std::size_t start, std::size_t end, std::size_t token_start,
+               std::size_t token_end) const {
+    return (start == token_start || !previous_is_word_char(start)) &&
+           (end == token_end || !is_word_char(end));
+  }
+
+  /**
+   * The contractions of NLTK, case-insensitive: "cannot", "gimme", "gonna", "gotta",
+   * "lemme" and "wanna" before a space are split after their third letter, "d'ye" and
+   * "more'n" before their '. The words are tokens or surrounded by non-word characters.
+   *
+   * Then " ('t)(is)\b" and " ('t)(was)\b": a ' after a space is split from the following
+   * word by the starting quotes, unless the space is inserted after a contraction.
+   */
+  void split_contractions(std::size_t token_start, std::size_t token_end,
+                          std::vector<TokenSpan> &spans) {
+    splits_.clear();
+    for (std::size_t pos = token_start; pos < token_end;) {
+      if (!is_ascii_letter(text_[pos])) {
+        ++pos;
+        continue;
+      }
+      std::size_t end = pos;
+      while (end < token_end && is_ascii_letter(text_[end])) {
+        ++end;
+      }
+      std::string_view word = text_.substr(pos, end - pos);
+      if (equals_word(word, "cannot") || equals_word(word, "gimme") || equals_word(word, "gonna") ||
+          equals_word(word, "gotta") || equals_word(word, "lemme") ||
+          (equals_word(word, "wanna") && end == token_end)) {
+        if (bounded(pos, end, token_start, token_end)) {
+          splits_.insert(splits_.end(), {pos, pos + 3, end});
+        }
+      } else if ((equals_word(word, "d") || equals_word(word, "more")) && end < token_end &&
+                 text_[end] == '\'') {
+        std::string_view clitic = equals_word(word, "d") ? "ye" : "n";
+        std::size_t clitic_end = end + 1 + clitic.size();
+        if (clitic_end <= token_end && equals_word(text_.substr(end + 1, clitic.size()), clitic) &&
+            bounded(pos, clitic_end, token_start, token_end)) {
+          splits_.insert(splits_.end(), {pos, end, clitic_end});
+          end = clitic_end;
+        }
+      }
+      pos = end;
+    }
+
+    for (std::string_view rest : {"is", "was"}) {
+      for (std::size_t pos = token_start; pos + 2 < token_end; ++pos) {
+        if (text_[pos] != '\'' || std::tolower(static_cast<unsigned char>(text_[pos + 1])) != 't' ||
+            (pos != token_start &&
+             std::find(splits_.begin(), splits_.end(), pos) == splits_.end())) {
+          continue;
+        }
+        std::size_t end = pos + 2;
+        bool matches = true;
+        for (std::size_t k = 0; k < rest.size() && matches; ++k) {
+          if (end < token_end && std::tolower(static_cast<unsigned char>(text_[end])) == rest[k]) {
+            end += 1;
+          } else if (rest[k] == 's' && text_.substr(end, 2) == "\xC5\xBF") {
+            end += 2;
+          } else {
+            matches = false;
+          }
+        }
+        if (matches && (end == token_end || !is_word_char(end))) {
+          splits_.insert(splits_.end(), {pos + 2, end});
+        }
+      }
+    }
+
+    std::sort(splits_.begin(), splits_.end());
+    std::size_t piece = token_start;
+    for (std::size_t pos : splits_) {
+      if (pos > piece && pos < token_end) {
+        push(spans, piece, pos);
+        piece = pos;
+      }
+    }
+    push(spans, piece, token_end);
+  }
+
+  std::string_view text_;
+  std::size_t n_;
+  bool convert_parentheses_;
+  const re2::RE2 &word_char_;
+  const re2::RE2 &decimal_digit_;
+  std::vector<uint8_t> &cuts_;
+  std::vector<TokenReplacement> &replacements_;
+  std::vector<uint32_t> &quotes_;
+  std::vector<std::size_t> &splits_;
+};
+
+} // namespace
+
+std::string_view TokenSpan::view(std::string_view text) const {
+  switch (replacement) {
+  case TokenReplacement::kNone:
+    return text.substr(start, size);
+  case TokenReplacement::kOpeningQuote:
+    return "``";
+  case TokenReplacement::kClosingQuote:
+    return "''";
+  case TokenReplacement::kLeftParenthesis:
+    return "-LRB-";
+  case TokenReplacement::kRightParenthesis:
+    return "-RRB-";
+  case TokenReplacement::kLeftSquareBracket:
+    return "-LSB-";
+  case TokenReplacement::kRightSquareBracket:
+    return "-RSB-";
+  case TokenReplacement::kLeftCurlyBracket:
+    return "-LCB-";
+  case TokenReplacement::kRightCurlyBracket:
+    return "-RCB-";
+  }
+  return {};
+}
+
+TreeBankTokenizer::TreeBankTokenizer()
+    : word_char_(std::make_unique<re2::RE2>(R"([\p{L}\p{N}_])", re2::RE2::Quiet)),
+      decimal_digit_(std::make_unique<re2::RE2>(R"(\p{Nd})", re2::RE2::Quiet)) {}
+
+std::vector<std::string> TreeBankTokenizer::tokenize(const std::string &text,
+                                                     bool convert_parentheses) const {
+  std::vector<std::string> tokens;
+  tokenize_into(text, convert_parentheses, tokens);
   return tokens;
 }
 
+void TreeBankTokenizer::tokenize_into(const std::string &text, bool convert_parentheses,
+                                      std::vector<std::string> &tokens) const {
+  thread_local std::vector<TokenSpan> spans;
+  spans.clear();
+  tokenize_spans(text, convert_parentheses, spans);
+  for (const TokenSpan &span : spans) {
+    tokens.emplace_back(span.view(text));
+  }
+}
+
+void TreeBankTokenizer::tokenize_spans(std::string_view text, bool convert_parentheses,
+                                       std::vector<TokenSpan> &spans) const {
+  if (text.size() >= std::numeric_limits<uint32_t>::max()) {
+    throw std::length_error("The text is too long for 32-bit token offsets");
+  }
+  SpanScanner(text, convert_parentheses, *word_char_, *decimal_digit_).run(spans);
+}
+
 } // namespace docling
@@ -1,11 +1,20 @@
 #include "utils.h"
 #include "loguru.hpp"
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <mutex>
 #include <stdexcept>
 #include <string>
+#include <thread>
+#include <vector>
 
 #if defined(_WIN32)
 #include <windows.h>
 #else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
 #include <unistd.h>
 #endif
 
@@ -42,4 +51,226 @@ void set_loglevel(std::string level) {
   }
 }
 
-} // namespace docling
\ No newline at end of file
+int resolve_num_threads(int num_threads, std::size_t count) {
+  if (num_threads < 0) {
+    throw std::invalid_argument("The number of threads must be non-negative");
+  }
+  if (num_threads == 0) {
+    num_threads = std::max(1u, std::thread::hardware_concurrency());
+  }
+  return static_cast<int>(std::min<std::size_t>(num_threads, std::max<std::size_t>(count, 1)));
+}
+
+void parallel_for(std::size_t count, int num_threads,
+                  const std::function<void(std::size_t, int)> &fn) {
+  const int workers = resolve_num_threads(num_threads, count);
+  if (workers == 1) {
+    for (std::size_t i = 0; i < count; ++i) {
+      fn(i, 0);
+    }
+    return;
+  }
+
+  std::atomic<std::size_t> next{0};
+  std::exception_ptr error;
+  std::mutex error_mutex;
+  auto work = [&](int worker) {
+    try {
+      for (std::size_t i = next.fetch_add(1); i < count; i = next.fetch_add(1)) {
+        fn(i, worker);
+      }
+    } catch (...) {
+      std::lock_guard<std::mutex> lock(error_mutex);
+      if (!error) {
+        error = std::current_exception();
+      }
+      next.store(count);
+    }
+  };
+
+  std::vector<std::thread> threads;
+  threads.reserve(workers - 1);
+  for (int worker = 1; worker < workers; ++worker) {
+    threads.emplace_back(work, worker);
+  }
+  work(0);
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  if (error) {
+    std::rethrow_exception(error);
+  }
+}
+
+namespace {
+
+// Decode the code point starting at pos and advance pos past it
+int32_t next_code_point(std::string_view text, std::size_t &pos) {
+  const auto byte = [&](std::size_t i) { return static_cast<unsigned char>(text[i]); };
+  const unsigned char lead = byte(pos);
+  int length = 0;
+  int32_t code_point = 0;
+  int32_t min_code_point = 0;
+  if (lead < 0x80) {
+    pos += 1;
+    return lead;
+  } else if ((lead & 0xE0) == 0xC0) {
+    length = 2;
+    code_point = lead & 0x1F;
+    min_code_point = 0x80;
+  } else if ((lead & 0xF0) == 0xE0) {
+    length = 3;
+    code_point = lead & 0x0F;
+    min_code_point = 0x800;
+  } else if ((lead & 0xF8) == 0xF0) {
+    length = 4;
+    code_point = lead & 0x07;
+    min_code_point = 0x10000;
+  }
+
+  bool valid = length > 0 && pos + length <= text.size();
+  for (int k = 1; valid && k < length; k++) {
+    valid = (byte(pos + k) & 0xC0) == 0x80;
+    code_point = (code_point << 6) | (byte(pos + k) & 0x3F);
+  }
+  valid = valid && code_point >= min_code_point && code_point <= 0x10FFFF &&
+          (code_point < 0xD800 || code_point > 0xDFFF);
+  if (!valid) {
+    pos += 1;
+    return 0xDC00 + lead;
+  }
+  pos += length;
+  return code_point;
+}
+
+} // namespace
+
+void decode_utf8(std::string_view text, std::vector<int32_t> &code_points) {
+  code_points.clear();
+  code_points.reserve(text.size());
+  for (std::size_t pos = 0; pos < text.size();) {
+    code_points.push_back(next_code_point(text, pos));
+  }
+}
+
+void encode_utf8(const char32_t *code_points, std::size_t count, std::string &text) {
+  for (std::size_t i = 0; i < count; ++i) {
+    const char32_t c = code_points[i];
+    if (c < 0x80) {
+      text.push_back(static_cast<char>(c));
+    } else if (c >= 0xDC80 && c <= 0xDCFF) {
+      text.push_back(static_cast<char>(c - 0xDC00));
+    } else if (c < 0x800) {
+      text.push_back(static_cast<char>(0xC0 | (c >> 6)));
+      text.push_back(static_cast<char>(0x80 | (c & 0x3F)));
+    } else if (c < 0x10000) {
+      text.push_back(static_cast<char>(0xE0 | (c >> 12)));
+      text.push_back(static_cast<char>(0x80 | ((c >> 6) & 0x3F)));
+      text.push_back(static_cast<char>(0x80 | (c & 0x3F)));
+    } else {
+      text.push_back(static_cast<char>(0xF0 | (c >> 18)));
+      text.push_back(static_cast<char>(0x80 | ((c >> 12) & 0x3F)));
+      text.push_back(static_cast<char>(0x80 | ((c >> 6) & 0x3F)));
+      text.push_back(static_cast<char>(0x80 | (c & 0x3F)));
+    }
+  }
+}
+
+bool is_python_space(int32_t code_point) {
+  if (code_point < 0x80) {
+    return (code_point >= 0x09 && code_point <= 0x0D) || (code_point >= 0x1C && code_point <= 0x20);
+  }
+  return code_point == 0x85 || code_point == 0xA0 || code_point == 0x1680 ||
+         (code_point >= 0x2000 && code_point <= 0x200A) || code_point == 0x2028 ||
+         code_point == 0x2029 || code_point == 0x202F || code_point == 0x205F ||
+         code_point == 0x3000;
+}
+
+void split_whitespace(std::string_view text, std::vector<std::string_view> &words) {
+  words.clear();
+  std::size_t start = std::string_view::npos;
+  for (std::size_t pos = 0; pos < text.size();) {
+    const std::size_t begin = pos;
+    if (is_python_space(next_code_point(text, pos))) {
+      if (start != std::string_view::npos) {
+        words.push_back(text.substr(start, begin - start));
+        start = std::string_view::npos;
+      }
+    } else if (start == std::string_view::npos) {
+      start = begin;
+    }
+  }
+  if (start != std::string_view::npos) {
+    words.push_back(text.substr(start));
+  }
+}
+
+#if defined(_WIN32)
+MappedFile::MappedFile(const std::string &path) {
+  HANDLE file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr, OPEN_EXISTING,
+                            FILE_ATTRIBUTE_NORMAL, nullptr);
+  if (file == INVALID_HANDLE_VALUE) {
+    throw std::runtime_error("Cannot open " + path);
+  }
+  file_ = file;
+  LARGE_INTEGER size;
+  if (!GetFileSizeEx(file, &size)) {
+    CloseHandle(file);
+    throw std::runtime_error("Cannot get the size of " + path);
+  }
+  size_ = static_cast<std::size_t>(size.QuadPart);
+  if (size_ == 0) {
+    return;
+  }
+  HANDLE mapping = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+  void *data = mapping == nullptr ? nullptr : MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+  if (data == nullptr) {
+    if (mapping != nullptr) {
+      CloseHandle(mapping);
+    }
+    CloseHandle(file);
+    throw std::runtime_error("Cannot map " + path);
+  }
+  mapping_ = mapping;
+  data_ = static_cast<const char *>(data);
+}
+
+MappedFile::~MappedFile() {
+  if (data_ != nullptr) {
+    UnmapViewOfFile(data_);
+    CloseHandle(mapping_);
+  }
+  CloseHandle(file_);
+}
+#else
+MappedFile::MappedFile(const std::string &path) {
+  int fd = open(path.c_str(), O_RDONLY);
+  if (fd < 0) {
+    throw std::runtime_error("Cannot open " + path);
+  }
+  struct stat info;
+  if (fstat(fd, &info) != 0) {
+    close(fd);
+    throw std::runtime_error("Cannot get the size of " + path);
+  }
+  size_ = static_cast<std::size_t>(info.st_size);
+  if (size_ > 0) {
+    void *data = mmap(nullptr, size_, PROT_READ, MAP_SHARED, fd, 0);
+    if (data == MAP_FAILED) {
+      close(fd);
+      throw std::runtime_error("Cannot map " + path);
+    }
+    data_ = static_cast<const char *>(data);
+  }
+  // The mapping stays valid after the file is closed
+  close(fd);
+}
+
+MappedFile::~MappedFile() {
+  if (data_ != nullptr) {
+    munmap(const_cast<char *>(data_), size_);
+  }
+}
+#endif
+
+} // namespace docling
@@ -0,0 +1,106 @@
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <iostream>
+#include <random>
+#include <string>
+#include <vector>
+
+#include "text_manager.h"
+
+using docling::Alignment;
+using docling::EditOp;
+
+// Check that the runs cover both sequences and that their operations hold
+static void check_alignment(const Alignment &alignment, const std::vector<std::string> &a,
+                            const std::vector<std::string> &b) {
+  int i = 0;
+  int j = 0;
+  int cost = 0;
+  for (std::size_t run = 0; run < alignment.ops.size(); ++run) {
+    assert(alignment.query_starts[run] == i && alignment.target_starts[run] == j);
+    assert(run == 0 || alignment.ops[run] != alignment.ops[run - 1]);
+    for (int k = 0; k < alignment.lengths[run]; ++k) {
+      switch (static_cast<EditOp>(alignment.ops[run])) {
+      case EditOp::kMatch:
+        assert(a[i++] == b[j++]);
+        break;
+      case EditOp::kSubstitute:
+        assert(a[i++] != b[j++]);
+        cost++;
+        break;
+      case EditOp::kInsert:
+        j++;
+        cost++;
+        break;
+      case EditOp::kDelete:
+        i++;
+        cost++;
+        break;
+      }
+    }
+  }
+  assert(i == static_cast<int>(a.size()) && j == static_cast<int>(b.size()));
+  assert(cost == alignment.distance);
+}
+
+void test_align_small() {
+  docling::TextManager tm("error");
+  std::vector<std::string> a = {"the", "quick", "brown", "fox"};
+  std::vector<std::string> b = {"the", "quikc", "brown", "fox", "jumps"};
+  Alignment alignment = tm.align(a, b);
+  check_alignment(alignment, a, b);
+  assert(alignment.distance == 2);
+  std::vector<uint8_t> expected_ops = {0, 1, 0, 2};
+  std::vector<int32_t> expected_lengths = {1, 1, 2, 1};
+  assert(alignment.ops == expected_ops && alignment.lengths == expected_lengths);
+
+  Alignment to_empty = tm.align(a, {});
+  assert(to_empty.ops.size() == 1 && to_empty.lengths[0] == 4);
+  assert(to_empty.ops[0] == static_cast<uint8_t>(EditOp::kDelete));
+  assert(tm.align({}, {}).ops.empty());
+  std::cout << "test_align_small: OK!\n";
+}
+
+void test_align_random() {
+  docling::TextManager tm("error");
+  std::mt19937 rng(3);
+  // Long enough for the divide and conquer, with frequent and rare tokens
+  for (int round = 0; round < 100; ++round) {
+    const int alphabet = round % 2 == 0 ? 3 : 50;
+    std::vector<std::string> a(rng() % 1000);
+    for (auto &token : a) {
+      token = std::to_string(rng() % alphabet);
+    }
+    std::vector<std::string> b = a;
+    for (int edit = 0; edit < static_cast<int>(rng() % 100); ++edit) {
+      std::size_t pos = b.empty() ? 0 : rng() % b.size();
+      if (edit % 3 == 0 && !b.empty()) {
+        b.erase(b.begin() + pos);
+      } else if (edit % 3 == 1) {
+        b.insert(b.begin() + pos, std::to_string(rng() % alphabet));
+      } else if (!b.empty()) {
+        b[pos] = "x";
+      }
+    }
+
+    Alignment alignment = tm.align(a, b);
+    check_alignment(alignment, a, b);
+    const int max_len = static_cast<int>(std::max(a.size(), b.size()));
+    assert(max_len == 0 || alignment.distance == std::lround(tm.edit_distance(a, b) * max_len));
+
+    std::vector<int32_t> ids_a = tm.intern_tokens(a);
+    std::vector<int32_t> ids_b = tm.intern_tokens(b);
+    Alignment id_alignment = tm.align_ids(ids_a.data(), ids_a.size(), ids_b.data(), ids_b.size());
+    assert(id_alignment.distance == alignment.distance);
+  }
+  std::cout << "test_align_random: OK!\n";
+}
+
+int main(int argc, char *argv[]) {
+  test_align_small();
+  test_align_random();
+
+  std::cout << "\nAll alignment tests passed!\n";
+  return 0;
+}
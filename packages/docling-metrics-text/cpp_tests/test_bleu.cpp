@@ -0,0 +1,124 @@
+#include <cassert>
+#include <cmath>
+#include <iostream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "text_manager.h"
+
+static void assert_near(double actual, double expected, double tol, const char *label) {
+  if (std::fabs(actual - expected) > tol) {
+    std::cerr << "FAIL [" << label << "]: expected " << expected << ", got " << actual << "\n";
+    assert(false);
+  }
+}
+
+void test_tokenize_13a() {
+  docling::TextManager tm;
+  std::vector<std::string> expected = {"Hello", ",",     "world", "!", "It", "costs", "$", "3.50",
+                                       ",",     "1,000", "&",     "5", "-",  "6",     "."};
+  std::vector<std::string> tokens =
+      tm.tokenize_13a("Hello, world! It costs $3.50, 1,000 &amp; 5-6.");
+  assert(tokens == expected);
+
+  // Hyphenated line breaks are joined and the other line breaks are spaces
+  assert(tm.tokenize_13a("docu-\nment\n(draft)<skipped>") ==
+         (std::vector<std::string>{"document", "(", "draft", ")"}));
+  assert(tm.tokenize_13a(" \t ").empty());
+  std::cout << "test_tokenize_13a: OK!\n";
+}
+
+void test_sentence_bleu() {
+  docling::TextManager tm;
+  std::vector<std::string> reference = {"the", "cat", "is", "on", "the", "mat"};
+
+  docling::BleuScore identical = tm.sentence_bleu({reference}, reference);
+  assert_near(identical.bleu, 1.0, 1e-12, "identical");
+
+  // 5/6 unigrams, 3/5 bigrams, 1/4 trigrams, 0/3 4-grams
+  std::vector<std::string> hypothesis = {"the", "cat", "sat", "on", "the", "mat"};
+  docling::BleuScore score = tm.sentence_bleu({reference}, hypothesis);
+  assert_near(score.precisions[0], 5.0 / 6.0, 1e-12, "unigrams");
+  assert_near(score.precisions[1], 3.0 / 5.0, 1e-12, "bigrams");
+  assert_near(score.precisions[2], 1.0 / 4.0, 1e-12, "trigrams");
+  assert(score.precisions[3] == 0.0 && score.bleu == 0.0);
+
+  docling::BleuScore smoothed = tm.sentence_bleu({reference}, hypothesis, 4, true);
+  double expected = std::exp(0.25 * (std::log(6.0 / 7.0) + std::log(4.0 / 6.0) +
+                                     std::log(2.0 / 5.0) + std::log(1.0 / 4.0)));
+  assert_near(smoothed.bleu, expected, 1e-12, "smoothed");
+
+  // The n-gram counts are clipped to the maximum count in any reference
+  docling::BleuScore clipped =
+      tm.sentence_bleu({{"the", "cat"}, {"the", "the"}}, {"the", "the", "the"}, 1);
+  assert_near(clipped.precisions[0], 2.0 / 3.0, 1e-12, "clipped");
+  assert(clipped.reference_length == 2 && clipped.brevity_penalty == 1.0);
+
+  // A short hypothesis is penalized
+  docling::BleuScore brevity = tm.sentence_bleu({reference}, {"the", "cat"}, 1);
+  assert_near(brevity.brevity_penalty, std::exp(1.0 - 3.0), 1e-12, "brevity penalty");
+
+  assert(std::isnan(tm.sentence_bleu({{}}, hypothesis).bleu));
+  assert(std::isnan(tm.sentence_bleu({reference}, {}).bleu));
+  std::cout << "test_sentence_bleu: OK!\n";
+}
+
+void test_corpus_bleu() {
+  docling::TextManager tm;
+  std::vector<std::string> hypotheses = {"The cat sat on the mat.", "A dog barks loudly!",
+                                         "Nothing matches here",
+                                         "This text is completely identical"};
+  std::vector<std::string> references = {"The cat is on the mat.", "The dog barks loudly!", "",
+                                         "This text is completely identical"};
+  docling::BatchBleu batch = tm.bleu_batch(hypotheses, references, 2);
+  assert(batch.bleu.size() == 4 && batch.matches.size() == 16);
+  assert(std::isnan(batch.bleu[2]));
+  assert_near(batch.bleu[3], 1.0, 1e-12, "identical pair");
+
+  // The statistics of the pairs sum up to the corpus statistics
+  docling::BleuStatistics even;
+  docling::BleuStatistics odd;
+  for (std::size_t i = 0; i < hypotheses.size(); ++i) {
+    (i % 2 == 0 ? even : odd)
+        .add({tm.tokenize_13a(references[i])}, tm.tokenize_13a(hypotheses[i]));
+  }
+  even.merge(odd);
+  for (int order = 0; order < 4; ++order) {
+    int64_t matches = 0;
+    for (std::size_t i = 0; i < hypotheses.size(); ++i) {
+      matches += batch.matches[i * 4 + order];
+    }
+    assert(even.matches()[order] == matches);
+  }
+  double corpus_bleu = even.score().bleu;
+  assert(corpus_bleu > 0.0 && corpus_bleu < 1.0);
+
+  // The corpus BLEU from the summed per-pair statistics
+  docling::BleuStatistics summed;
+  for (std::size_t i = 0; i < hypotheses.size(); ++i) {
+    summed.add_counts({batch.matches.begin() + i * 4, batch.matches.begin() + i * 4 + 4},
+                      {batch.possible_matches.begin() + i * 4,
+                       batch.possible_matches.begin() + i * 4 + 4},
+                      batch.translation_length[i], batch.reference_length[i]);
+  }
+  assert(summed.score().bleu == corpus_bleu);
+
+  bool thrown = false;
+  try {
+    even.merge(docling::BleuStatistics(2));
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected statistics of different orders to be rejected");
+  std::cout << "test_corpus_bleu: OK!\n";
+}
+
+int main(int argc, char *argv[]) {
+  test_tokenize_13a();
+  test_sentence_bleu();
+  test_corpus_bleu();
+
+  std::cout << "\nAll BLEU tests passed!\n";
+  return 0;
+}
@@ -1,7 +1,9 @@
+#include <algorithm>
 #include <cassert>
 #include <cmath>
 #include <iostream>
 #include <random>
+#include <stdexcept>
 #include <string>
 #include <vector>
 
@@ -109,6 +111,209 @@ void test_single_token_mismatch() {
   std::cout << "  OK!\n";
 }
 
+void test_edit_distance_batch() {
+  docling::TextManager tm;
+  std::vector<std::vector<std::string>> batch_a = {{"the", "cat"}, {}, {"a", "b", "c"}};
+  std::vector<std::vector<std::string>> batch_b = {{"the", "big", "cat"}, {}, {"d", "e", "f"}};
+  std::vector<double> dists = tm.edit_distance_batch(batch_a, batch_b);
+  std::cout << "test_edit_distance_batch: size=" << dists.size() << "\n";
+  assert(dists.size() == batch_a.size());
+  for (std::size_t i = 0; i < batch_a.size(); ++i) {
+    assert_near(dists[i], tm.edit_distance(batch_a[i], batch_b[i]), 1e-9, "batch pair");
+  }
+
+  bool thrown = false;
+  try {
+    tm.edit_distance_batch(batch_a, {});
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown);
+  std::cout << "  OK!\n";
+}
+
+// Reference Levenshtein distance with the full DP matrix
+static int reference_distance(const std::vector<std::string> &a,
+                              const std::vector<std::string> &b) {
+  std::vector<int> previous(b.size() + 1), current(b.size() + 1);
+  for (std::size_t j = 0; j <= b.size(); ++j) {
+    previous[j] = static_cast<int>(j);
+  }
+  for (std::size_t i = 1; i <= a.size(); ++i) {
+    current[0] = static_cast<int>(i);
+    for (std::size_t j = 1; j <= b.size(); ++j) {
+      current[j] = std::min({previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (a[i - 1] == b[j - 1] ? 0 : 1)});
+    }
+    std::swap(previous, current);
+  }
+  return previous[b.size()];
+}
+
+void test_max_distance() {
+  docling::TextManager tm("error");
+  std::mt19937 rng(7);
+  std::uniform_int_distribution<int> token_dist(0, 3);
+  auto random_tokens = [&](int size) {
+    std::vector<std::string> tokens(size);
+    for (auto &token : tokens) {
+      token = std::string(1, static_cast<char>('a' + token_dist(rng)));
+    }
+    return tokens;
+  };
+
+  // Sizes across several blocks, similar and unrelated sequences
+  for (int round = 0; round < 300; ++round) {
+    std::vector<std::string> a = random_tokens(rng() % 300);
+    std::vector<std::string> b = a;
+    if (round % 3 == 0) {
+      b = random_tokens(rng() % 300);
+    } else {
+      for (int edit = 0; edit < static_cast<int>(rng() % 20); ++edit) {
+        std::size_t pos = b.empty() ? 0 : rng() % b.size();
+        if (edit % 2 == 0 && !b.empty()) {
+          b.erase(b.begin() + pos);
+        } else {
+          b.insert(b.begin() + pos, "x");
+        }
+      }
+    }
+
+    const int max_len = static_cast<int>(std::max(a.size(), b.size()));
+    const double exact = max_len == 0 ? 0.0 : reference_distance(a, b) / double(max_len);
+    assert(tm.edit_distance(a, b) == exact);
+    for (double max_distance : {0.0, 0.02, 0.1, 0.3, 1.0, exact}) {
+      double bounded = tm.edit_distance(a, b, max_distance);
+      assert(exact <= max_distance ? bounded == exact : std::isinf(bounded));
+    }
+  }
+  std::cout << "test_max_distance: OK!\n";
+}
+
+void test_token_ids() {
+  docling::TextManager tm("error");
+  std::mt19937 rng(11);
+  for (int round = 0; round < 200; ++round) {
+    std::vector<std::string> a(rng() % 200), b(rng() % 200);
+    for (auto &token : a) {
+      token = std::to_string(rng() % 8);
+    }
+    for (auto &token : b) {
+      token = std::to_string(rng() % 12);
+    }
+    std::vector<int32_t> ids_a = tm.intern_tokens(a);
+    std::vector<int32_t> ids_b = tm.intern_tokens(b);
+    double expected = tm.edit_distance(a, b);
+    assert(tm.edit_distance_ids(ids_a.data(), ids_a.size(), ids_b.data(), ids_b.size()) ==
+           expected);
+
+    // Ids beyond the dense table are hashed
+    for (auto &id : ids_a) {
+      id += 1 << 30;
+    }
+    for (auto &id : ids_b) {
+      id += 1 << 30;
+    }
+    assert(tm.edit_distance_ids(ids_a.data(), ids_a.size(), ids_b.data(), ids_b.size()) ==
+           expected);
+  }
+
+  std::vector<int32_t> negative = {1, -2};
+  bool thrown = false;
+  try {
+    tm.edit_distance_ids(negative.data(), negative.size(), negative.data(), 1);
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected negative token ids to be rejected");
+  std::cout << "test_token_ids: OK!\n";
+}
+
+void test_prepared_reference() {
+  docling::TextManager tm("error");
+  std::mt19937 rng(13);
+  auto random_tokens = [&](int size, int vocabulary) {
+    std::vector<std::string> tokens(size);
+    for (auto &token : tokens) {
+      token = "token" + std::to_string(rng() % vocabulary);
+    }
+    return tokens;
+  };
+
+  for (int round = 0; round < 40; ++round) {
+    // Sizes across several blocks, including an empty reference
+    std::vector<std::string> reference = random_tokens(round == 0 ? 0 : rng() % 300, 10);
+    std::vector<std::vector<std::string>> hypotheses = {{}, reference};
+    for (int i = 0; i < 10; ++i) {
+      hypotheses.push_back(random_tokens(rng() % 300, 14));
+    }
+
+    docling::PreparedReference prepared = tm.prepare_reference(reference);
+    assert(prepared.size() == static_cast<int>(reference.size()));
+    for (double max_distance : {-1.0, 0.0, 0.1, 0.5, 1.0}) {
+      std::vector<double> batch = tm.edit_distance_batch(prepared, hypotheses, 3, max_distance);
+      assert(batch.size() == hypotheses.size());
+      for (std::size_t i = 0; i < hypotheses.size(); ++i) {
+        double expected = tm.edit_distance(reference, hypotheses[i], max_distance);
+        assert(tm.edit_distance(prepared, hypotheses[i], max_distance) == expected);
+        assert(batch[i] == expected);
+      }
+    }
+  }
+
+  // A moved reference keeps its interning table
+  docling::PreparedReference prepared = tm.prepare_reference({"a", "b", "a", "c"});
+  docling::PreparedReference moved = std::move(prepared);
+  assert(moved.distinct_tokens() == 3);
+  assert_near(tm.edit_distance(moved, {"a", "b", "c"}), 0.25, 1e-12, "moved reference");
+  std::cout << "test_prepared_reference: OK!\n";
+}
+
+void test_short_edit_distance_batch() {
+  docling::TextManager tm("error");
+  std::mt19937 rng(17);
+  auto random_tokens = [&](int size, int vocabulary) {
+    std::vector<std::string> tokens(size);
+    for (auto &token : tokens) {
+      token = "t" + std::to_string(rng() % vocabulary);
+    }
+    return tokens;
+  };
+
+  // Short pairs of all sizes up to a full word, empty and long sequences, swapped pairs
+  std::vector<std::vector<std::string>> batch_a, batch_b;
+  for (int i = 0; i < 500; ++i) {
+    int vocabulary = i % 2 == 0 ? 6 : 100;
+    batch_a.push_back(random_tokens(i % 25 == 0 ? 100 + rng() % 100 : rng() % 66, vocabulary));
+    batch_b.push_back(random_tokens(i % 40 == 0 ? 100 + rng() % 100 : rng() % 66, vocabulary));
+  }
+  batch_a.push_back(random_tokens(64, 100));
+  batch_b.push_back(batch_a.back());
+
+  for (docling::SimdLevel level : {docling::SimdLevel::kPortable, docling::SimdLevel::kSse4,
+                                   docling::SimdLevel::kAvx2}) {
+    for (double max_distance : {-1.0, 0.0, 0.3, 0.7}) {
+      std::vector<double> distances =
+          tm.short_edit_distance_batch(batch_a, batch_b, 3, max_distance, level);
+      assert(distances.size() == batch_a.size());
+      for (std::size_t i = 0; i < batch_a.size(); ++i) {
+        assert(distances[i] == tm.edit_distance(batch_a[i], batch_b[i], max_distance));
+      }
+    }
+  }
+  assert(tm.short_edit_distance_batch(batch_a, batch_b).back() == 0.0);
+
+  bool thrown = false;
+  try {
+    tm.short_edit_distance_batch(batch_a, {});
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected batches of different sizes to be rejected");
+  std::cout << "test_short_edit_distance_batch: simd_level="
+            << static_cast<int>(docling::detect_simd_level()) << "\n  OK!\n";
+}
+
 void test_long_sequence() {
   std::cout << "test_long_sequence\n";
   int num_tokens = 100000; // 100k tokens
@@ -155,6 +360,34 @@ void test_long_sequence() {
   std::cout << "test_long_sequence (different): dist=" << dist_diff << "\n";
   assert_near(dist_diff, 1.0, 1e-9, "long sequence all different");
   std::cout << "  OK!\n";
+
+  // The band vanishes after the first columns
+  double dist_bounded = tm.edit_distance(input_a, input_b, 0.01);
+  std::cout << "test_long_sequence (max_distance=0.01): dist=" << dist_bounded << "\n";
+  assert(std::isinf(dist_bounded));
+  std::cout << "  OK!\n";
+}
+
+void test_error_rates() {
+  docling::TextManager tm;
+  // One substituted and one deleted code point of 6
+  docling::ErrorCounts chars = tm.character_errors("na\xC3\xAFve!", "naive");
+  assert(chars.errors == 2 && chars.reference_length == 6);
+  assert_near(chars.rate(), 2.0 / 6.0, 1e-12, "cer");
+
+  docling::ErrorCounts words = tm.word_errors("the quick  brown fox", "the\tquikc brown");
+  assert(words.errors == 2 && words.reference_length == 4);
+  assert_near(words.rate(), 0.5, 1e-12, "wer");
+
+  assert(tm.word_errors("", "").rate() == 0.0);
+  assert(std::isnan(tm.character_errors("", "x").rate()));
+
+  docling::BatchErrorRates batch =
+      tm.error_rates_batch({"abc", "a b", ""}, {"abd", "a b c", "x y"}, 2);
+  assert_near(batch.cer[0], 1.0 / 3.0, 1e-12, "batch cer");
+  assert(batch.word_errors[1] == 1 && batch.word_lengths[1] == 2);
+  assert(std::isnan(batch.wer[2]) && batch.char_lengths[2] == 0);
+  std::cout << "test_error_rates: OK!\n";
 }
 
 int main(int argc, char *argv[]) {
@@ -167,7 +400,13 @@ int main(int argc, char *argv[]) {
   test_empty_one();
   test_single_token_match();
   test_single_token_mismatch();
+  test_edit_distance_batch();
+  test_max_distance();
+  test_token_ids();
+  test_prepared_reference();
+  test_short_edit_distance_batch();
   test_long_sequence();
+  test_error_rates();
 
   std::cout << "\nAll edit_distance tests passed!\n";
   return 0;
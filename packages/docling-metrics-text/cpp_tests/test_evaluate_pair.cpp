@@ -0,0 +1,169 @@
+#include <cassert>
+#include <cmath>
+#include <iostream>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "text_manager.h"
+#include "token_overlap.h"
+
+static void assert_near(double actual, double expected, double tol, const char *label) {
+  if (std::fabs(actual - expected) > tol) {
+    std::cerr << label << ": expected " << expected << ", got " << actual << "\n";
+    assert(false);
+  }
+}
+
+void test_overlap_scores() {
+  // Sets: {a, b, c} and {b, c, d, e}, 2 common tokens
+  docling::OverlapScores scores =
+      docling::compute_overlap({"a", "b", "c", "a"}, {"b", "c", "d", "e", "e"});
+  std::cout << "test_overlap_scores: p=" << *scores.precision << " r=" << *scores.recall
+            << " f1=" << *scores.f1 << "\n";
+  assert_near(*scores.precision, 2.0 / 4.0, 1e-12, "precision");
+  assert_near(*scores.recall, 2.0 / 3.0, 1e-12, "recall");
+  assert(*scores.f1 == 1.0 / (0.5 / (2.0 / 4.0) + 0.5 / (2.0 / 3.0)));
+  assert(scores.reference_size == 3 && scores.test_size == 4 && scores.common == 2);
+  std::cout << "  OK!\n";
+}
+
+void test_overlap_undefined() {
+  docling::OverlapScores empty_test = docling::compute_overlap({"a"}, {});
+  assert(!empty_test.precision && empty_test.recall && !empty_test.f1);
+  assert(*empty_test.recall == 0.0);
+
+  docling::OverlapScores empty_reference = docling::compute_overlap({}, {"a"});
+  assert(empty_reference.precision && !empty_reference.recall && !empty_reference.f1);
+
+  docling::OverlapScores disjoint = docling::compute_overlap({"a"}, {"b"});
+  assert(*disjoint.f1 == 0.0);
+  std::cout << "test_overlap_undefined: OK!\n";
+}
+
+void test_evaluate_pair() {
+  docling::TextManager tm("error");
+  docling::PairEvaluation evaluation =
+      tm.evaluate_pair({"Good muffins cost $3.88 in New York.", "Please buy two."},
+                       {"Good muffins cost $4 in York.", "Buy two."});
+  std::vector<std::string> expected_a{"Good", "muffins", "cost", "$", "3.88", "in", "New",
+                                      "York", ".", "Please", "buy", "two", "."};
+  assert(evaluation.tokens_a == expected_a);
+  assert(evaluation.tokens_b.size() == 11);
+
+  docling::OverlapScores overlap = docling::compute_overlap(evaluation.tokens_a,
+                                                            evaluation.tokens_b);
+  assert(evaluation.precision == overlap.precision);
+  assert(evaluation.recall == overlap.recall);
+  assert(evaluation.f1 == overlap.f1);
+  assert(evaluation.edit_distance ==
+         tm.edit_distance(evaluation.tokens_a, evaluation.tokens_b));
+  std::cout << "test_evaluate_pair: f1=" << *evaluation.f1
+            << " edit_distance=" << evaluation.edit_distance << "\n  OK!\n";
+}
+
+void test_evaluate_empty_pair() {
+  docling::TextManager tm("error");
+  docling::PairEvaluation evaluation = tm.evaluate_pair({"some text"}, {});
+  assert(evaluation.tokens_b.empty());
+  assert(!evaluation.precision && !evaluation.f1);
+  assert_near(evaluation.edit_distance, 1.0, 1e-12, "edit distance to empty text");
+  std::cout << "test_evaluate_empty_pair: OK!\n";
+}
+
+void test_evaluate_batch() {
+  docling::TextManager tm("error");
+  std::vector<std::vector<std::string>> batch_a, batch_b;
+  for (int i = 0; i < 50; ++i) {
+    batch_a.push_back({"Sentence number " + std::to_string(i) + " of the batch.", "Done."});
+    batch_b.push_back({"Sentence " + std::to_string(i * 7 % 13) + " of a batch!"});
+  }
+  batch_a.push_back({"some text"});
+  batch_b.push_back({});
+
+  for (int num_threads : {1, 4}) {
+    docling::BatchEvaluation batch = tm.evaluate_batch(batch_a, batch_b, num_threads, true);
+    assert(batch.f1.size() == batch_a.size() && batch.tokens_a.size() == batch_a.size());
+    for (std::size_t i = 0; i < batch_a.size(); ++i) {
+      docling::PairEvaluation pair = tm.evaluate_pair(batch_a[i], batch_b[i]);
+      assert(batch.tokens_a[i] == pair.tokens_a && batch.tokens_b[i] == pair.tokens_b);
+      assert(pair.precision ? batch.precision[i] == *pair.precision
+                            : std::isnan(batch.precision[i]));
+      assert(pair.recall ? batch.recall[i] == *pair.recall : std::isnan(batch.recall[i]));
+      assert(pair.f1 ? batch.f1[i] == *pair.f1 : std::isnan(batch.f1[i]));
+      assert(batch.edit_distance[i] == pair.edit_distance);
+      assert(batch.token_set_a[i] == static_cast<int64_t>(pair.token_set_a));
+      assert(batch.common_tokens[i] == static_cast<int64_t>(pair.common_tokens));
+    }
+  }
+
+  docling::BatchEvaluation scores_only = tm.evaluate_batch(batch_a, batch_b, 2, false);
+  assert(scores_only.tokens_a.empty() && scores_only.f1.size() == batch_a.size());
+
+  // The scores that are not selected are NaN
+  docling::BatchEvaluation edit_distance_only =
+      tm.evaluate_batch(batch_a, batch_b, 2, false, -1.0, false, true);
+  docling::BatchEvaluation overlap_only =
+      tm.evaluate_batch(batch_a, batch_b, 2, false, -1.0, true, false);
+  for (std::size_t i = 0; i < batch_a.size(); ++i) {
+    assert(std::isnan(edit_distance_only.f1[i]) && std::isnan(edit_distance_only.recall[i]));
+    assert(edit_distance_only.edit_distance[i] == scores_only.edit_distance[i]);
+    assert(std::isnan(overlap_only.edit_distance[i]));
+    assert(std::isnan(overlap_only.recall[i]) == std::isnan(scores_only.recall[i]));
+  }
+
+  bool thrown = false;
+  try {
+    tm.evaluate_batch(batch_a, {}, 2, false);
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected batches of different sizes to be rejected");
+  std::cout << "test_evaluate_batch: OK!\n";
+}
+
+void test_token_list() {
+  docling::TextManager tm("error");
+  std::vector<std::string> sentences_a{"Good muffins cost $3.88 in (New) York.", "Please buy two."};
+  std::vector<std::string> sentences_b{"Good muffins cost $4 in York.", "Buy two."};
+  docling::TokenList list_a = tm.tokenize_list(sentences_a);
+  docling::TokenList list_b = tm.tokenize_list(sentences_b);
+
+  docling::PairEvaluation evaluation = tm.evaluate_pair(sentences_a, sentences_b);
+  assert(list_a.tokens() == evaluation.tokens_a);
+  assert(list_b.tokens() == evaluation.tokens_b);
+  assert(list_a.ids() == tm.intern_tokens(evaluation.tokens_a));
+  assert(list_a.offsets().size() == list_a.size() + 1);
+  assert(list_a.offsets().back() == list_a.arena().size());
+  assert(tm.tokenize_list(sentences_a, true)[6] == "-LRB-");
+
+  assert(tm.edit_distance(list_a, list_b) == evaluation.edit_distance);
+  assert(tm.edit_distance(list_a, list_b, 0.1) == std::numeric_limits<double>::infinity());
+  docling::OverlapScores overlap = tm.overlap(list_a, list_b);
+  assert(overlap.precision == evaluation.precision && overlap.recall == evaluation.recall);
+  assert(overlap.f1 == evaluation.f1 && overlap.common == evaluation.common_tokens);
+  assert(!tm.overlap(list_a, tm.tokenize_list({})).precision);
+
+  docling::TextManager other("error");
+  bool thrown = false;
+  try {
+    tm.edit_distance(list_a, other.tokenize_list(sentences_b));
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected the token lists of another manager to be rejected");
+  std::cout << "test_token_list: OK!\n";
+}
+
+int main(int argc, char *argv[]) {
+  test_overlap_scores();
+  test_overlap_undefined();
+  test_evaluate_pair();
+  test_evaluate_empty_pair();
+  test_evaluate_batch();
+  test_token_list();
+
+  std::cout << "\nAll evaluate_pair tests passed!\n";
+  return 0;
+}
@@ -0,0 +1,212 @@
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <filesystem>
+#include <fstream>
+#include <iostream>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "meteor.h"
+#include "porter.h"
+#include "text_manager.h"
+
+static void assert_near(double actual, double expected, double tol, const char *label) {
+  if (std::fabs(actual - expected) > tol) {
+    std::cerr << "FAIL [" << label << "]: expected " << expected << ", got " << actual << "\n";
+    assert(false);
+  }
+}
+
+static void write_uint32(std::ofstream &out, const std::vector<uint32_t> &values) {
+  out.write(reinterpret_cast<const char *>(values.data()),
+            static_cast<std::streamsize>(values.size() * sizeof(uint32_t)));
+}
+
+// Write a table in the format of docling_metrics_text.meteor_table, on a little-endian host
+static std::string write_table(const std::map<std::string, std::vector<std::string>> &synonyms) {
+  std::map<std::string, uint32_t> ids;
+  for (const auto &[word, names] : synonyms) {
+    ids[word] = 0;
+    for (const auto &name : names) {
+      ids[name] = 0;
+    }
+  }
+  std::vector<uint32_t> word_offsets = {0};
+  std::vector<uint32_t> synonym_offsets = {0};
+  std::vector<uint32_t> synonym_ids;
+  std::string string_bytes;
+  uint32_t id = 0;
+  for (auto &[word, word_id] : ids) {
+    word_id = id++;
+    string_bytes += word;
+    word_offsets.push_back(static_cast<uint32_t>(string_bytes.size()));
+  }
+  for (const auto &[word, word_id] : ids) {
+    auto it = synonyms.find(word);
+    if (it != synonyms.end()) {
+      for (const auto &name : it->second) {
+        synonym_ids.push_back(ids[name]);
+      }
+    }
+    synonym_offsets.push_back(static_cast<uint32_t>(synonym_ids.size()));
+  }
+
+  // The Latin and Greek letters are cased, the apostrophe is case-ignorable
+  std::vector<uint32_t> lower_chars = {0x130, 0x3A3};
+  std::vector<uint32_t> lower_offsets = {0, 3, 5};
+  std::string lower_bytes = "i\xCC\x87"
+                            "\xCF\x83";
+  std::vector<uint32_t> case_ranges = {0x27, 0x27, docling::MeteorTable::kCaseIgnorable,
+                                       0x41, 0x5A, docling::MeteorTable::kCased,
+                                       0x61, 0x7A, docling::MeteorTable::kCased,
+                                       0x3A3, 0x3C9, docling::MeteorTable::kCased};
+
+  std::string path = (std::filesystem::temp_directory_path() / "test_meteor_table.bin").string();
+  std::ofstream out(path, std::ios::binary);
+  out.write("DMMETEOR", 8);
+  write_uint32(out, {docling::MeteorTable::kVersion, static_cast<uint32_t>(ids.size()),
+                     static_cast<uint32_t>(synonym_ids.size()),
+                     static_cast<uint32_t>(lower_chars.size()),
+                     static_cast<uint32_t>(case_ranges.size() / 3),
+                     static_cast<uint32_t>(string_bytes.size()),
+                     static_cast<uint32_t>(lower_bytes.size())});
+  write_uint32(out, word_offsets);
+  write_uint32(out, synonym_offsets);
+  write_uint32(out, synonym_ids);
+  write_uint32(out, lower_chars);
+  write_uint32(out, lower_offsets);
+  write_uint32(out, case_ranges);
+  out << string_bytes << lower_bytes;
+  return path;
+}
+
+void test_porter_stem() {
+  // Examples of NLTK's PorterStemmer
+  const std::vector<std::pair<std::string, std::string>> examples = {
+      {"caresses", "caress"}, {"ponies", "poni"}, {"ties", "tie"}, {"cats", "cat"},
+      {"agreed", "agre"}, {"plastered", "plaster"}, {"motoring", "motor"}, {"hopping", "hop"},
+      {"falling", "fall"}, {"filing", "file"}, {"happy", "happi"}, {"relational", "relat"},
+      {"generalizations", "gener"}, {"oscillators", "oscil"}, {"dying", "die"}, {"skies", "sky"},
+      {"analogi", "analog"}, {"is", "is"}, {"naïvement", "naïvement"}};
+  for (const auto &[word, stem] : examples) {
+    if (docling::porter_stem(word) != stem) {
+      std::cerr << "FAIL [porter_stem]: " << word << " -> " << docling::porter_stem(word)
+                << ", expected " << stem << "\n";
+      assert(false);
+    }
+  }
+  std::cout << "test_porter_stem: OK!\n";
+}
+
+void test_lower() {
+  docling::MeteorTable table(write_table({}));
+  assert(table.lower("MiXeD") == "mixed");
+  assert(table.lower("\xC4\xB0") == "i\xCC\x87");
+  // A capital sigma after a cased letter and at the end of a word is a final sigma
+  assert(table.lower("A\xCE\xA3") == "a\xCF\x82");
+  assert(table.lower("A'\xCE\xA3") == "a'\xCF\x82");
+  assert(table.lower("A\xCE\xA3" "B") == "a\xCF\x83" "b");
+  assert(table.lower("\xCE\xA3") == "\xCF\x83");
+  assert(table.lower("'\xCE\xA3") == "'\xCF\x83");
+  std::cout << "test_lower: OK!\n";
+}
+
+void test_synonyms() {
+  docling::MeteorTable table(write_table({{"sat", {"is", "sit"}}, {"big", {"larg"}}}));
+  assert(table.word_count() == 5);
+  std::vector<std::string_view> synonyms;
+  table.synonyms("sat", synonyms);
+  assert((synonyms == std::vector<std::string_view>{"is", "sit"}));
+  synonyms.clear();
+  table.synonyms("is", synonyms);
+  table.synonyms("missing", synonyms);
+  assert(synonyms.empty());
+  std::cout << "test_synonyms: OK!\n";
+}
+
+void test_meteor_score() {
+  docling::MeteorTable table(write_table({{"sat", {"is"}}}));
+  std::vector<std::string> reference = {"the", "cat", "is", "on", "the", "mat"};
+  std::vector<std::string> hypothesis = {"The", "cat", "sat", "on", "the", "mat"};
+
+  // All the words are aligned in a single chunk, "sat" by synonym
+  double score = docling::single_meteor_score(table, reference, hypothesis);
+  assert_near(score, 1.0 - 0.5 * std::pow(1.0 / 6.0, 3.0), 1e-12, "synonym");
+
+  // Without synonyms, 5 matches in 2 chunks, as NLTK's meteor_score
+  docling::MeteorTable no_synonyms(write_table({}));
+  score = docling::single_meteor_score(no_synonyms, reference, hypothesis);
+  assert_near(score, 0.8066666666666668, 1e-12, "exact");
+
+  // The stems are aligned: "cats" and "cat"
+  score = docling::single_meteor_score(no_synonyms, {"cats"}, {"cat"});
+  assert_near(score, 0.5, 1e-12, "stem");
+
+  assert(docling::single_meteor_score(no_synonyms, reference, {"dog"}) == 0.0);
+  assert(docling::single_meteor_score(no_synonyms, {}, hypothesis) == 0.0);
+  assert(docling::meteor_score(no_synonyms, {{"dog"}, reference}, hypothesis) ==
+         docling::single_meteor_score(no_synonyms, reference, hypothesis));
+
+  bool thrown = false;
+  try {
+    docling::meteor_score(no_synonyms, {}, hypothesis);
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected a hypothesis without references to be rejected");
+  std::cout << "test_meteor_score: OK!\n";
+}
+
+void test_meteor_batch() {
+  docling::TextManager tm("error");
+  bool thrown = false;
+  try {
+    tm.meteor({{"a"}}, {"a"});
+  } catch (const std::runtime_error &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected METEOR without a table to fail");
+
+  tm.load_meteor_table(write_table({{"sat", {"is"}}}));
+  std::vector<std::vector<std::string>> references = {{"the", "cat", "is", "on", "the", "mat"},
+                                                      {"a", "b"}, {}};
+  std::vector<std::vector<std::string>> hypotheses = {{"the", "cat", "sat", "on", "the", "mat"},
+                                                      {"b", "a"}, {"c"}};
+  std::vector<double> scores = tm.meteor_batch(references, hypotheses, 2);
+  assert(scores.size() == 3);
+  for (std::size_t i = 0; i < scores.size(); ++i) {
+    assert(scores[i] == tm.meteor({references[i]}, hypotheses[i]));
+  }
+  assert(scores[2] == 0.0);
+  std::cout << "test_meteor_batch: OK!\n";
+}
+
+void test_invalid_table() {
+  std::string path = (std::filesystem::temp_directory_path() / "test_meteor_invalid.bin").string();
+  for (const std::string &content : {std::string("DMMETEOR\x01"), std::string("not a table")}) {
+    std::ofstream(path, std::ios::binary) << content;
+    bool thrown = false;
+    try {
+      docling::MeteorTable table(path);
+    } catch (const std::runtime_error &) {
+      thrown = true;
+    }
+    assert(thrown && "Expected an invalid table to be rejected");
+  }
+  std::cout << "test_invalid_table: OK!\n";
+}
+
+int main(int argc, char *argv[]) {
+  test_porter_stem();
+  test_lower();
+  test_synonyms();
+  test_meteor_score();
+  test_meteor_batch();
+  test_invalid_table();
+
+  std::cout << "\nAll METEOR tests passed!\n";
+  return 0;
+}
@@ -1,9 +1,212 @@
 #include <cassert>
+#include <cctype>
+#include <filesystem>
+#include <fstream>
 #include <iostream>
+#include <memory>
+#include <random>
 #include <string>
+#include <string_view>
+#include <utility>
 #include <vector>
 
 #include "treebank.h"
+#include <re2/re2.h>
+
+namespace {
+
+using Rule = std::pair<std::unique_ptr<re2::RE2>, std::string>;
+
+// Python's \s on str patterns: the characters for which str.isspace() is true
+const std::string kWhitespace = "[\\t\\n\\x{0b}\\f\\r\\x{1c}-\\x{1f} \\x{85}\\x{a0}\\x{1680}"
+                                "\\x{2000}-\\x{200a}\\x{2028}\\x{2029}\\x{202f}\\x{205f}"
+                                "\\x{3000}]";
+
+// Python's \b before and after a word, as capturing groups
+const std::string kWordStart = R"((^|[^\p{L}\p{N}_]))";
+const std::string kWordEnd = R"(($|[^\p{L}\p{N}_]))";
+
+Rule rule(const std::string &pattern, const std::string &replacement) {
+  return {std::make_unique<re2::RE2>(pattern, re2::RE2::Quiet), replacement};
+}
+
+std::size_t utf8_length(unsigned char lead) {
+  return lead < 0x80 ? 1 : (lead >> 5) == 0x6 ? 2 : (lead >> 4) == 0xE ? 3 : 4;
+}
+
+/**
+ * The NLTKWordTokenizer regexes ported to RE2, one pass per rule, the reference of the
+ * single-scan TreeBankTokenizer.
+ */
+class RegexTokenizer {
+public:
+  RegexTokenizer() {
+    starting_quotes_.push_back(rule("([«“‘„]|`+)", R"( \1 )"));
+    starting_quotes_.push_back(rule(R"(^")", "``"));
+    starting_quotes_.push_back(rule(R"((``))", R"( \1 )"));
+    starting_quotes_.push_back(rule(R"(([ \(\[{<])("|\'{2}))", R"(\1 `` )"));
+
+    punctuation_.push_back(
+        rule(R"(([^\.])(\.)([\]\)}>"\'»”’ ]*))" + kWhitespace + "*$", R"(\1 \2 \3 )"));
+    punctuation_.push_back(rule(R"(([:,])([^\p{Nd}]))", R"( \1 \2)"));
+    punctuation_.push_back(rule(R"(([:,])$)", R"( \1 )"));
+    punctuation_.push_back(rule(R"(\.{2,})", R"( \0 )"));
+    punctuation_.push_back(rule(R"([;@#$%&])", R"( \0 )"));
+    punctuation_.push_back(rule(R"([\x{2012}-\x{2015}])", R"( \0 )"));
+    punctuation_.push_back(
+        rule(R"(([^\.])(\.)([\]\)}>"\']*))" + kWhitespace + "*$", R"(\1 \2\3 )"));
+    punctuation_.push_back(rule(R"([?!])", R"( \0 )"));
+    punctuation_.push_back(rule(R"(([^'])' )", R"(\1 ' )"));
+    punctuation_.push_back(rule(R"([*])", R"( \0 )"));
+
+    parens_brackets_ = rule(R"([\]\[\(\)\{\}\<\>])", R"( \0 )");
+    convert_parentheses_.push_back(rule(R"(\()", "-LRB-"));
+    convert_parentheses_.push_back(rule(R"(\))", "-RRB-"));
+    convert_parentheses_.push_back(rule(R"(\[)", "-LSB-"));
+    convert_parentheses_.push_back(rule(R"(\])", "-RSB-"));
+    convert_parentheses_.push_back(rule(R"(\{)", "-LCB-"));
+    convert_parentheses_.push_back(rule(R"(\})", "-RCB-"));
+    double_dashes_ = rule(R"(--)", R"( -- )");
+
+    ending_quotes_.push_back(rule("([»”’])", R"( \1 )"));
+    ending_quotes_.push_back(rule(R"('')", " '' "));
+    ending_quotes_.push_back(rule(R"(")", " '' "));
+    ending_quotes_.push_back(rule(kWhitespace + "+", " "));
+    ending_quotes_.push_back(rule(R"(([^' ])('[sSmMdD]?) )", R"(\1 \2 )"));
+    ending_quotes_.push_back(rule(R"(([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) )", R"(\1 \2 )"));
+
+    for (const char *contraction : {"(can)(not)", "(d)('ye)", "(gim)(me)", "(gon)(na)", "(got)(ta)",
+                                    "(lem)(me)", "(more)('n)"}) {
+      contractions_.push_back(rule("(?i)" + kWordStart + contraction + kWordEnd, R"(\1 \2 \3 \4)"));
+    }
+    contractions_.push_back(
+        rule("(?i)" + kWordStart + "(wan)(na)(" + kWhitespace + ")", R"(\1 \2 \3 \4)"));
+    contractions_.push_back(rule("(?i) ('t)(is)" + kWordEnd, R"( \1 \2 \3)"));
+    contractions_.push_back(rule("(?i) ('t)(was)" + kWordEnd, R"( \1 \2 \3)"));
+
+    word_char_ = std::make_unique<re2::RE2>(R"([\p{L}\p{N}_])", re2::RE2::Quiet);
+  }
+
+  std::vector<std::string> tokenize(const std::string &text, bool convert_parentheses) const {
+    std::string result = text;
+    for (const auto &[regex, replacement] : starting_quotes_) {
+      re2::RE2::GlobalReplace(&result, *regex, replacement);
+    }
+    split_starting_single_quotes(result);
+    for (const auto &[regex, replacement] : punctuation_) {
+      re2::RE2::GlobalReplace(&result, *regex, replacement);
+    }
+    re2::RE2::GlobalReplace(&result, *parens_brackets_.first, parens_brackets_.second);
+    if (convert_parentheses) {
+      for (const auto &[regex, replacement] : convert_parentheses_) {
+        re2::RE2::GlobalReplace(&result, *regex, replacement);
+      }
+    }
+    re2::RE2::GlobalReplace(&result, *double_dashes_.first, double_dashes_.second);
+    result = " " + result + " ";
+    for (const auto &[regex, replacement] : ending_quotes_) {
+      re2::RE2::GlobalReplace(&result, *regex, replacement);
+    }
+    for (const auto &[regex, replacement] : contractions_) {
+      while (re2::RE2::GlobalReplace(&result, *regex, replacement) > 0) {
+      }
+    }
+
+    std::vector<std::string> tokens;
+    std::size_t start = 0;
+    while (start < result.size()) {
+      std::size_t end = std::min(result.find(' ', start), result.size());
+      if (end > start) {
+        tokens.emplace_back(result, start, end - start);
+      }
+      start = end + 1;
+    }
+    return tokens;
+  }
+
+private:
+  // (?i)(?<!\w)(\')(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w) -> "\1 "
+  void split_starting_single_quotes(std::string &text) const {
+    auto is_word_char = [this, &text](std::size_t pos) {
+      unsigned char c = static_cast<unsigned char>(text[pos]);
+      if (c < 0x80) {
+        return std::isalnum(c) != 0 || c == '_';
+      }
+      std::string_view cp(text.data() + pos, std::min(utf8_length(c), text.size() - pos));
+      return re2::RE2::FullMatch(cp, *word_char_);
+    };
+    auto previous_is_word_char = [&](std::size_t pos) {
+      if (pos == 0) {
+        return false;
+      }
+      std::size_t start = pos - 1;
+      while (start > 0 && (static_cast<unsigned char>(text[start]) & 0xC0) == 0x80) {
+        --start;
+      }
+      return is_word_char(start);
+    };
+    auto starts_clitic = [&](std::size_t pos) {
+      for (std::string_view clitic : {"re", "ve", "ll", "m", "t", "s", "d", "n"}) {
+        std::size_t end = pos;
+        bool matches = true;
+        for (std::size_t k = 0; k < clitic.size() && matches; ++k) {
+          if (end < text.size() &&
+              std::tolower(static_cast<unsigned char>(text[end])) == clitic[k]) {
+            end += 1;
+          } else if (clitic[k] == 's' && text.compare(end, 2, "\xC5\xBF") == 0) {
+            end += 2;
+          } else {
+            matches = false;
+          }
+        }
+        if (matches && (end == text.size() || !is_word_char(end))) {
+          return true;
+        }
+      }
+      return false;
+    };
+
+    std::string result;
+    for (std::size_t i = 0; i < text.size(); ++i) {
+      result.push_back(text[i]);
+      if (text[i] == '\'' && i + 1 < text.size() && !previous_is_word_char(i) &&
+          is_word_char(i + 1) && !starts_clitic(i + 1)) {
+        result.push_back(' ');
+      }
+    }
+    text = std::move(result);
+  }
+
+  std::vector<Rule> starting_quotes_;
+  std::vector<Rule> punctuation_;
+  std::vector<Rule> ending_quotes_;
+  std::vector<Rule> convert_parentheses_;
+  std::vector<Rule> contractions_;
+  Rule parens_brackets_;
+  Rule double_dashes_;
+  std::unique_ptr<re2::RE2> word_char_;
+};
+
+void assert_same_tokens(const docling::TreeBankTokenizer &tokenizer,
+                        const RegexTokenizer &reference, const std::string &text,
+                        bool convert_parentheses) {
+  std::vector<std::string> tokens = tokenizer.tokenize(text, convert_parentheses);
+  std::vector<std::string> expected = reference.tokenize(text, convert_parentheses);
+  if (tokens != expected) {
+    std::cerr << "FAIL [tokens of \"" << text << "\"]:";
+    for (const auto &token : tokens) {
+      std::cerr << " [" << token << "]";
+    }
+    std::cerr << "\n  expected:";
+    for (const auto &token : expected) {
+      std::cerr << " [" << token << "]";
+    }
+    std::cerr << "\n";
+    assert(false);
+  }
+}
+
+} // namespace
 
 void test_tokenizer() {
   std::string text = "Good muffins cost $3.88 (roughly 3,36 euros)\nin New York.  Please buy "
@@ -51,8 +254,82 @@ void test_tokenizer() {
   std::cout << "OK!\n";
 }
 
+void test_token_spans() {
+  docling::TreeBankTokenizer tokenizer;
+  std::string text = "\"I cannot (\"go\").";
+  std::vector<docling::TokenSpan> spans;
+  tokenizer.tokenize_spans(text, true, spans);
+
+  std::vector<std::string_view> expected{"``", "I",  "can", "not",   "-LRB-",
+                                         "``", "go", "''",  "-RRB-", "."};
+  assert(spans.size() == expected.size());
+  for (std::size_t i = 0; i < spans.size(); ++i) {
+    assert(spans[i].view(text) == expected[i]);
+  }
+  // The spans point into the text, the replaced tokens cover the replaced bytes
+  assert(spans[2].start == 3 && spans[2].size == 3);
+  assert(spans[3].start == 6 && spans[3].size == 3);
+  assert(spans[4].replacement == docling::TokenReplacement::kLeftParenthesis);
+  assert(spans[7].start == 14 && spans[7].size == 1);
+
+  // The spans are appended
+  tokenizer.tokenize_spans("", false, spans);
+  tokenizer.tokenize_spans("go", false, spans);
+  assert(spans.size() == expected.size() + 1 && spans.back().start == 0);
+  std::cout << "test_token_spans: OK!\n";
+}
+
+void test_regex_reference_corpus() {
+  docling::TreeBankTokenizer tokenizer;
+  RegexTokenizer reference;
+  std::size_t lines = 0;
+  for (const auto &entry : std::filesystem::directory_iterator("tests/data/md")) {
+    std::ifstream in(entry.path());
+    std::string line;
+    while (std::getline(in, line)) {
+      assert_same_tokens(tokenizer, reference, line, false);
+      assert_same_tokens(tokenizer, reference, line, true);
+      ++lines;
+    }
+  }
+  assert(lines > 0);
+  std::cout << "test_regex_reference_corpus: " << lines << " lines OK!\n";
+}
+
+void test_regex_reference_random() {
+  // Random texts of the characters and words the rules are about, separated by |
+  const std::string alphabet =
+      "a|B|x|n|N|t|T|s|S|d|m|e|ll|LL|re|ve|ye|is|was|_|1|9|\xD9\xA3|\xC3\xA9|\xC5\xBF|"
+      "\xE2\x84\xAA|'|''|\"|`|``|.|..|,|:|;|?|!|*|-|--|@|#|$|%|&|(|)|[|]|{|}|<|>| | | |  |"
+      "\t|\n|\xC2\xA0|\xE3\x80\x80|\xC2\xAB|\xC2\xBB|\xE2\x80\x9C|\xE2\x80\x9D|"
+      "\xE2\x80\x98|\xE2\x80\x99|\xE2\x80\x9E|\xE2\x80\x93|\xE2\x80\x94|cannot|CanNot|"
+      "gimme|gonna|gotta|lemme|wanna|d'ye|more'n|'tis|'twas|n't|N'T|'s|'m|'D|'ll|'re|'VE|tis|twas";
+  std::vector<std::string> pieces;
+  for (std::size_t start = 0; start <= alphabet.size();) {
+    std::size_t end = std::min(alphabet.find('|', start), alphabet.size());
+    pieces.push_back(alphabet.substr(start, end - start));
+    start = end + 1;
+  }
+  docling::TreeBankTokenizer tokenizer;
+  RegexTokenizer reference;
+  std::mt19937 rng(42);
+  std::uniform_int_distribution<std::size_t> piece(0, pieces.size() - 1);
+  std::uniform_int_distribution<int> length(1, 10);
+  for (int i = 0; i < 20000; ++i) {
+    std::string text;
+    for (int k = length(rng); k > 0; --k) {
+      text += pieces[piece(rng)];
+    }
+    assert_same_tokens(tokenizer, reference, text, i % 2 == 0);
+  }
+  std::cout << "test_regex_reference_random: OK!\n";
+}
+
 int main(int argc, char *argv[]) {
   test_tokenizer();
+  test_token_spans();
+  test_regex_reference_corpus();
+  test_regex_reference_random();
 
   return 0;
 }
@@ -1,5 +1,10 @@
+#include <atomic>
 #include <cassert>
 #include <iostream>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <vector>
 
 #include "utils.h"
 
@@ -10,7 +15,88 @@ void test_system_memory_gt_1gb() {
   std::cout << "  OK!\n";
 }
 
+void test_resolve_num_threads() {
+  assert(docling::resolve_num_threads(4, 2) == 2);
+  assert(docling::resolve_num_threads(3, 100) == 3);
+  assert(docling::resolve_num_threads(0, 100) >= 1);
+  assert(docling::resolve_num_threads(8, 0) == 1);
+  bool thrown = false;
+  try {
+    docling::resolve_num_threads(-1, 10);
+  } catch (const std::invalid_argument &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected a negative number of threads to be rejected");
+  std::cout << "test_resolve_num_threads: OK!\n";
+}
+
+void test_parallel_for() {
+  std::vector<int> visits(1000, 0);
+  std::atomic<int> max_worker{0};
+  docling::parallel_for(visits.size(), 4, [&](std::size_t i, int worker) {
+    visits[i] += 1;
+    int current = max_worker.load();
+    while (worker > current && !max_worker.compare_exchange_weak(current, worker)) {
+    }
+  });
+  for (int count : visits) {
+    assert(count == 1);
+  }
+  assert(max_worker.load() < 4);
+
+  bool thrown = false;
+  try {
+    docling::parallel_for(100, 3, [](std::size_t i, int) {
+      if (i == 42) {
+        throw std::runtime_error("failed");
+      }
+    });
+  } catch (const std::runtime_error &) {
+    thrown = true;
+  }
+  assert(thrown && "Expected the exception of a worker to be rethrown");
+  std::cout << "test_parallel_for: OK!\n";
+}
+
+void test_decode_utf8() {
+  std::vector<int32_t> code_points;
+  // a, e acute, CJK, emoji and an invalid byte
+  docling::decode_utf8("a\xC3\xA9\xE4\xB8\xAD\xF0\x9F\x98\x80\xFF", code_points);
+  assert((code_points == std::vector<int32_t>{0x61, 0xE9, 0x4E2D, 0x1F600, 0xDCFF}));
+
+  // Truncated sequence: every byte is escaped like Python's surrogateescape
+  docling::decode_utf8("\xE4\xB8", code_points);
+  assert((code_points == std::vector<int32_t>{0xDCE4, 0xDCB8}));
+
+  // encode_utf8 is the inverse, also of the escaped bytes
+  const std::string text = "a\xC3\xA9\xE4\xB8\xAD\xF0\x9F\x98\x80\xFF";
+  docling::decode_utf8(text, code_points);
+  std::u32string wide(code_points.begin(), code_points.end());
+  std::string encoded = "prefix ";
+  docling::encode_utf8(wide.data(), wide.size(), encoded);
+  assert(encoded == "prefix " + text);
+  std::cout << "test_decode_utf8: OK!\n";
+}
+
+void test_split_whitespace() {
+  std::vector<std::string_view> words;
+  // Tab, no-break space, ideographic space and NEL are whitespace like in str.split()
+  docling::split_whitespace("  the\tquick\xC2\xA0"
+                           "brown\xE3\x80\x80"
+                           "fox\xC2\x85 ", words);
+  assert((words == std::vector<std::string_view>{"the", "quick", "brown", "fox"}));
+
+  docling::split_whitespace(" \n ", words);
+  assert(words.empty());
+  assert(docling::is_python_space(0x1C) && !docling::is_python_space(0x200B));
+  std::cout << "test_split_whitespace: OK!\n";
+}
+
 int main(int argc, char *argv[]) {
   test_system_memory_gt_1gb();
+  test_resolve_num_threads();
+  test_parallel_for();
+  test_decode_utf8();
+  test_split_whitespace();
   return 0;
 }
@@ -1,13 +1,21 @@
 from docling_metrics_text.docling_metrics_text import (
     TextDatasetEvaluation,
+    TextMetricKind,
     TextMetrics,
+    TextMetricsAccumulator,
+    TextPairCounts,
     TextPairEvaluation,
     TextPairSample,
+    TextScoreStatistics,
 )
 
 __all__ = [
     "TextDatasetEvaluation",
+    "TextMetricKind",
     "TextMetrics",
+    "TextMetricsAccumulator",
+    "TextPairCounts",
     "TextPairEvaluation",
     "TextPairSample",
+    "TextScoreStatistics",
 ]
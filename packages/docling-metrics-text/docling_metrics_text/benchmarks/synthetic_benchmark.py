@@ -0,0 +1,116 @@
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from docling_metrics_core.benchmark import (
+    BenchmarkConfig,
+    BenchmarkReport,
+    compare_reports,
+    run_benchmark,
+    synthetic_token_pairs,
+)
+
+from docling_metrics_text import TextMetrics
+from docling_metrics_text.docling_metrics_text import TextMetricsMode, TextPairSample
+
+_log = logging.getLogger(__name__)
+
+
+def make_samples(
+    count: int, num_tokens: int, error_rate: float, seed: int = 0
+) -> list[TextPairSample]:
+    r"""
+    Generate text pairs of `num_tokens` words, the second one with edits
+    """
+    return [
+        TextPairSample(
+            id=f"synthetic_{num_tokens}_{i}",
+            text_a=" ".join(tokens_a),
+            text_b=" ".join(tokens_b),
+        )
+        for i, (tokens_a, tokens_b) in enumerate(
+            synthetic_token_pairs(count, num_tokens, error_rate, seed=seed)
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Text Metrics benchmark on synthetic inputs"
+    )
+    parser.add_argument(
+        "-s",
+        "--save_root",
+        type=Path,
+        required=True,
+        help="Path to the directory to save the benchmark report",
+    )
+    parser.add_argument(
+        "-n", "--count", type=int, default=100, help="Text pairs per size"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Number of words of the generated texts",
+    )
+    parser.add_argument(
+        "-e", "--error_rate", type=float, default=0.1, help="Edit rate of the pairs"
+    )
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline report to compare with. Exit with 1 on regressions",
+    )
+    parser.add_argument("-t", "--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    # Configure logger
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    logging.basicConfig(level=logging.INFO, format=log_format)
+
+    config = BenchmarkConfig(warmup=args.warmup, repeats=args.repeats)
+    report = BenchmarkReport()
+    for mode in TextMetricsMode:
+        metric = TextMetrics(mode=mode)
+        for num_tokens in args.sizes:
+            samples = make_samples(args.count, num_tokens, args.error_rate)
+            result = run_benchmark(
+                f"text_{mode.name.lower()}_{num_tokens}", metric, samples, config
+            )
+            report.add(result)
+            _log.info(
+                "%s | p50: %.3fms | p95: %.3fms | p99: %.3fms | %.1f samples/s",
+                result.name,
+                result.latency.p50_ms,
+                result.latency.p95_ms,
+                result.latency.p99_ms,
+                result.throughput,
+            )
+
+    # Save report
+    args.save_root.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = args.save_root / f"synthetic_benchmark_report_{timestamp}.json"
+    report.save(report_path)
+    _log.info("Benchmark report saved to: %s", report_path)
+
+    if args.baseline is not None:
+        regressions = compare_reports(
+            report, BenchmarkReport.load(args.baseline), args.threshold
+        )
+        for regression in regressions:
+            _log.error("Regression: %s", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,65 @@
+import math
 from enum import Enum
-from typing import Iterable
-from uuid import uuid4
+from typing import Any, Hashable, Iterable, NamedTuple, Optional, Sequence
 
-import evaluate
-import nltk
 from docling_metrics_core.base_types import (
+    BaseAccumulator,
     BaseAggregateResult,
     BaseInputSample,
     BaseMetric,
     BaseSampleResult,
 )
-from nltk import edit_distance, word_tokenize
+from docling_metrics_core.cache import cached_batch_evaluation
+from docling_metrics_core.checkpoint import CheckpointStore
+from docling_metrics_core.evaluation import EvaluationConfig
+from docling_metrics_core.profiling import stage
+from nltk import edit_distance, sent_tokenize, word_tokenize
 from nltk.metrics import f_measure, precision, recall
 from nltk.translate import meteor_score
+from pydantic import BaseModel, Field
 
 from . import docling_metrics_text_cpp  # type: ignore
+from .meteor_table import default_meteor_table_path, ensure_meteor_table
+from .resources import load_bleu, require_nltk_resource
+
+# Bins of the histograms of the per-sample scores over [0, 1]
+_HISTOGRAM_BINS = 100
+# Samples per batch of evaluate_dataset, each batch runs on the native thread pool
+_DATASET_BATCH_SIZE = 256
+# N-gram order of the BLEU scores
+_BLEU_MAX_ORDER = 4
+
+
+def _levenshtein(a: Sequence[Hashable], b: Sequence[Hashable]) -> int:
+    r"""
+    Levenshtein distance with the bit-parallel algorithm of Myers, where the columns
+    of the DP are Python integers. Unlike nltk's edit_distance it scales to pages of
+    characters.
+    """
+    if not a:
+        return len(b)
+    peq: dict[Hashable, int] = {}
+    for i, item in enumerate(a):
+        peq[item] = peq.get(item, 0) | (1 << i)
+
+    mask = (1 << len(a)) - 1
+    high_bit = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    for item in b:
+        eq = peq.get(item, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
 
 
 class TextMetricsMode(str, Enum):
@@ -22,22 +67,337 @@ class TextMetricsMode(str, Enum):
     CPP = "C++"
 
 
+class TextMetricKind(str, Enum):
+    r"""The scores of TextPairEvaluation, the field of a kind is <value>_score"""
+
+    F1 = "f1"
+    PRECISION = "precision"
+    RECALL = "recall"
+    EDIT_DISTANCE = "edit_distance"
+    CER = "cer"
+    WER = "wer"
+    BLEU = "bleu"
+    METEOR = "meteor"
+
+
+# The scores of the token sets
+_OVERLAP_METRICS = {TextMetricKind.F1, TextMetricKind.PRECISION, TextMetricKind.RECALL}
+# The scores of the TreeBank tokens, which need the Punkt sentence splitting
+_TOKEN_METRICS = _OVERLAP_METRICS | {
+    TextMetricKind.EDIT_DISTANCE,
+    TextMetricKind.METEOR,
+}
+
+
+class _PairScores(NamedTuple):
+    r"""The tokens and the token scores of a pair, None where not computed"""
+
+    tokens_a: list[str]
+    tokens_b: list[str]
+    f1: Optional[float]
+    precision: Optional[float]
+    recall: Optional[float]
+    edit_distance: Optional[float]
+    overlap_counts: Optional[dict[str, int]]
+
+
+# The field of _PairScores holding each score
+_PAIR_SCORE_FIELDS = {
+    TextMetricKind.F1: "f1",
+    TextMetricKind.PRECISION: "precision",
+    TextMetricKind.RECALL: "recall",
+    TextMetricKind.EDIT_DISTANCE: "edit_distance",
+}
+
+
 class TextPairSample(BaseInputSample):
     text_a: str
     text_b: str
 
 
+class TextPairCounts(BaseModel):
+    r"""
+    Counts behind the scores of a pair, the corpus statistics of TextDatasetEvaluation
+    are computed from their sums. The counts of the metrics that are not selected are
+    None.
+    """
+
+    # Distinct tokens of text_a, of text_b and of both
+    token_set_a: Optional[int] = None
+    token_set_b: Optional[int] = None
+    common_tokens: Optional[int] = None
+    # Levenshtein distance of the token lists and the token count it is normalized by.
+    # Above max_edit_distance, the distance is counted as max_tokens
+    edit_operations: Optional[int] = None
+    max_tokens: Optional[int] = None
+    # Clipped n-gram matches and n-gram counts of the orders 1 to 4 of BLEU and the
+    # token counts of the prediction and of the reference. None when BLEU is not
+    # selected or could not be computed
+    bleu_matches_1: Optional[int] = None
+    bleu_matches_2: Optional[int] = None
+    bleu_matches_3: Optional[int] = None
+    bleu_matches_4: Optional[int] = None
+    bleu_possible_matches_1: Optional[int] = None
+    bleu_possible_matches_2: Optional[int] = None
+    bleu_possible_matches_3: Optional[int] = None
+    bleu_possible_matches_4: Optional[int] = None
+    bleu_translation_length: Optional[int] = None
+    bleu_reference_length: Optional[int] = None
+
+
 class TextPairEvaluation(BaseSampleResult):
-    f1_score: float
-    precision_score: float
-    recall_score: float
-    edit_distance_score: float
-    bleu_score: float
-    meteor_score: float
+    # The scores that are not selected in TextMetrics are None
+    f1_score: Optional[float] = None
+    precision_score: Optional[float] = None
+    recall_score: Optional[float] = None
+    edit_distance_score: Optional[float] = None
+    cer_score: Optional[float] = None
+    wer_score: Optional[float] = None
+    bleu_score: Optional[float] = None
+    meteor_score: Optional[float] = None
+    counts: Optional[TextPairCounts] = None
+
+
+class TextScoreStatistics(BaseModel):
+    r"""
+    Distribution of a per-sample score, without the error scores
+    """
+
+    count: int
+    error_count: int
+    mean: Optional[float] = None
+    # Estimated from the histogram, within a bin width
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    # Edges and counts of the histogram bins over [0, 1], the scores above 1 (error
+    # rates) are counted in the last bin
+    bins: list[float]
+    hist: list[int]
 
 
 class TextDatasetEvaluation(BaseAggregateResult):
-    pass
+    # Distributions of the per-sample scores, None if the metric is not selected
+    f1_score: Optional[TextScoreStatistics] = None
+    precision_score: Optional[TextScoreStatistics] = None
+    recall_score: Optional[TextScoreStatistics] = None
+    edit_distance_score: Optional[TextScoreStatistics] = None
+    cer_score: Optional[TextScoreStatistics] = None
+    wer_score: Optional[TextScoreStatistics] = None
+    bleu_score: Optional[TextScoreStatistics] = None
+    meteor_score: Optional[TextScoreStatistics] = None
+
+    # Corpus statistics of the summed counts of the pairs: The token set scores of the
+    # summed set sizes, the mean F1 of the samples, the total edit operations divided
+    # by the total token counts and the BLEU of the summed n-gram statistics
+    micro_precision: Optional[float] = None
+    micro_recall: Optional[float] = None
+    micro_f1: Optional[float] = None
+    macro_f1: Optional[float] = None
+    corpus_edit_distance: Optional[float] = None
+    corpus_bleu: Optional[float] = None
+
+
+class TextScoreAccumulator(BaseModel):
+    r"""
+    Running count, sum, extrema and histogram of a per-sample score
+    """
+
+    count: int = 0
+    error_count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    hist: list[int] = Field(default_factory=lambda: [0] * _HISTOGRAM_BINS)
+
+    def add(self, score: float) -> None:
+        r"""Fold a score"""
+        self.count += 1
+        self.total += score
+        self.minimum = score if self.minimum is None else min(self.minimum, score)
+        self.maximum = score if self.maximum is None else max(self.maximum, score)
+        self.hist[min(max(int(score * _HISTOGRAM_BINS), 0), _HISTOGRAM_BINS - 1)] += 1
+
+    def merge(self, other: "TextScoreAccumulator") -> None:
+        r"""Fold the state of another accumulator"""
+        self.count += other.count
+        self.error_count += other.error_count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = (
+                    value if self.minimum is None else min(self.minimum, value)
+                )
+                self.maximum = (
+                    value if self.maximum is None else max(self.maximum, value)
+                )
+        self.hist = [a + b for a, b in zip(self.hist, other.hist)]
+
+    def finalize(self) -> TextScoreStatistics:
+        r"""Compute the statistics of the folded scores"""
+        return TextScoreStatistics(
+            count=self.count,
+            error_count=self.error_count,
+            mean=self.total / self.count if self.count else None,
+            median=self._median(),
+            min=self.minimum,
+            max=self.maximum,
+            bins=[i / _HISTOGRAM_BINS for i in range(_HISTOGRAM_BINS + 1)],
+            hist=list(self.hist),
+        )
+
+    def _median(self) -> Optional[float]:
+        r"""The median, within a bin width of the exact one"""
+        if self.minimum is None or self.maximum is None:
+            return None
+        return (
+            self._order_statistic((self.count + 1) // 2, self.minimum, self.maximum)
+            + self._order_statistic(self.count // 2 + 1, self.minimum, self.maximum)
+        ) / 2
+
+    def _order_statistic(self, rank: int, minimum: float, maximum: float) -> float:
+        r"""
+        Estimate the rank-th smallest score, 1-based, as if the scores of its bin were
+        spread evenly over the bin
+        """
+        cumulative = 0
+        for i, bin_count in enumerate(self.hist):
+            if cumulative + bin_count >= rank:
+                low = i / _HISTOGRAM_BINS
+                high = (i + 1) / _HISTOGRAM_BINS
+                if i == _HISTOGRAM_BINS - 1:
+                    high = max(high, maximum)
+                value = low + (rank - cumulative - 0.5) / bin_count * (high - low)
+                return min(max(value, minimum), maximum)
+            cumulative += bin_count
+        return maximum
+
+
+class TextMetricsAccumulator(BaseAccumulator):
+    r"""
+    Running distributions of the per-sample scores and sums of the counts of the pairs,
+    whose size does not depend on the number of samples
+    """
+
+    # The scores equal to the error score are only counted
+    error_score: float = -1
+    # Keyed by the TextMetricKind values
+    scores: dict[str, TextScoreAccumulator] = Field(default_factory=dict)
+    overlap_count: int = 0
+    token_set_a: int = 0
+    token_set_b: int = 0
+    common_tokens: int = 0
+    edit_count: int = 0
+    edit_operations: int = 0
+    max_tokens: int = 0
+    bleu_count: int = 0
+    bleu_matches: list[int] = Field(default_factory=lambda: [0] * _BLEU_MAX_ORDER)
+    bleu_possible_matches: list[int] = Field(
+        default_factory=lambda: [0] * _BLEU_MAX_ORDER
+    )
+    bleu_translation_length: int = 0
+    bleu_reference_length: int = 0
+
+    def update(self, result: TextPairEvaluation) -> None:  # type: ignore[override]
+        r"""
+        Fold the scores and the counts of a pair
+        """
+        self.sample_count += 1
+        for kind in TextMetricKind:
+            score = getattr(result, f"{kind.value}_score")
+            if score is None:
+                continue
+            statistics = self.scores.setdefault(kind.value, TextScoreAccumulator())
+            if score == self.error_score:
+                statistics.error_count += 1
+            else:
+                statistics.add(score)
+
+        counts = result.counts
+        if counts is None:
+            return
+        if (
+            counts.token_set_a is not None
+            and counts.token_set_b is not None
+            and counts.common_tokens is not None
+        ):
+            self.overlap_count += 1
+            self.token_set_a += counts.token_set_a
+            self.token_set_b += counts.token_set_b
+            self.common_tokens += counts.common_tokens
+        if counts.edit_operations is not None and counts.max_tokens is not None:
+            self.edit_count += 1
+            self.edit_operations += counts.edit_operations
+            self.max_tokens += counts.max_tokens
+        if (
+            counts.bleu_translation_length is not None
+            and counts.bleu_reference_length is not None
+        ):
+            self.bleu_count += 1
+            for order in range(_BLEU_MAX_ORDER):
+                self.bleu_matches[order] += (
+                    getattr(counts, f"bleu_matches_{order + 1}") or 0
+                )
+                self.bleu_possible_matches[order] += (
+                    getattr(counts, f"bleu_possible_matches_{order + 1}") or 0
+                )
+            self.bleu_translation_length += counts.bleu_translation_length
+            self.bleu_reference_length += counts.bleu_reference_length
+
+    def merge(self, other: "TextMetricsAccumulator") -> None:  # type: ignore[override]
+        r"""
+        Fold the distributions and the sums of another accumulator
+        """
+        for name, statistics in other.scores.items():
+            self.scores.setdefault(name, TextScoreAccumulator()).merge(statistics)
+        for field_name in TextMetricsAccumulator.model_fields:
+            if field_name in ("error_score", "scores"):
+                continue
+            value = getattr(self, field_name)
+            other_value = getattr(other, field_name)
+            if isinstance(value, list):
+                setattr(self, field_name, [a + b for a, b in zip(value, other_value)])
+            else:
+                setattr(self, field_name, value + other_value)
+
+    def finalize(self) -> TextDatasetEvaluation:
+        r"""
+        Compute the distributions of the scores and the corpus statistics
+        """
+        values: dict[str, Any] = {"sample_count": self.sample_count}
+        for name, statistics in self.scores.items():
+            values[f"{name}_score"] = statistics.finalize()
+        if TextMetricKind.F1.value in self.scores:
+            values["macro_f1"] = values["f1_score"].mean
+
+        if self.overlap_count:
+            precision = (
+                self.common_tokens / self.token_set_b if self.token_set_b else None
+            )
+            recall = self.common_tokens / self.token_set_a if self.token_set_a else None
+            values["micro_precision"] = precision
+            values["micro_recall"] = recall
+            if precision is not None and recall is not None:
+                values["micro_f1"] = (
+                    0.0
+                    if precision == 0.0 or recall == 0.0
+                    else 1.0 / (0.5 / precision + 0.5 / recall)
+                )
+        if self.edit_count:
+            values["corpus_edit_distance"] = (
+                self.edit_operations / self.max_tokens if self.max_tokens else 0.0
+            )
+        if self.bleu_count:
+            bleu_statistics = docling_metrics_text_cpp.BleuStatistics(_BLEU_MAX_ORDER)
+            bleu_statistics.add_counts(
+                self.bleu_matches,
+                self.bleu_possible_matches,
+                self.bleu_translation_length,
+                self.bleu_reference_length,
+            )
+            bleu = bleu_statistics.score().bleu
+            values["corpus_bleu"] = None if math.isnan(bleu) else bleu
+        return TextDatasetEvaluation(**values)
 
 
 class TextMetrics(BaseMetric):
@@ -45,24 +405,58 @@ class TextMetrics(BaseMetric):
     Various text metrics
     """
 
+    sample_result_type = TextPairEvaluation
+
     def __init__(
-        self, mode: TextMetricsMode = TextMetricsMode.CPP, error_score: float = -1
+        self,
+        mode: TextMetricsMode = TextMetricsMode.CPP,
+        error_score: float = -1,
+        num_threads: int = 0,
+        max_edit_distance: Optional[float] = None,
+        offline: bool = False,
+        metrics: list[TextMetricKind] = list(TextMetricKind),
     ) -> None:
-        r""" """
+        r"""
+        num_threads: Native worker threads per batch in C++ mode, 0 for all cores
+        max_edit_distance: Threshold of the normalized edit distance. The pairs above
+            it get an edit distance of 1.0, and the C++ mode stops computing their
+            edit distance as soon as the threshold is exceeded
+        offline: Never download the NLTK data or the evaluate modules. A LookupError
+            is raised here if the NLTK data is not installed
+        metrics: The computed scores, the other fields of the results are None
+
+        The NLTK data and the evaluate modules are loaded on their first use, once
+        per process, and only if a selected metric needs them
+        """
+        if max_edit_distance is not None and max_edit_distance < 0:
+            raise ValueError("max_edit_distance must be non-negative")
+        if len(metrics) == 0:
+            raise ValueError("Cannot initialize TextMetrics without metrics")
+
         self._error_score = (
             error_score  # Returned value in case the score cannot be computed
         )
         self._mode = mode
-
-        # Download the NLTK data
-        nltk.download("popular", quiet=True)
-        nltk.download("punkt_tab", quiet=True)
-
-        self._bleu_eval = evaluate.load("bleu", experiment_id=str(uuid4()))
+        self._num_threads = num_threads
+        self._max_edit_distance = max_edit_distance
+        self._offline = offline
+        self._metrics = set(metrics)
+        # Whether the table of the native METEOR is loaded, None until its first use
+        self._meteor_table_loaded: Optional[bool] = None
 
         if self._mode == TextMetricsMode.CPP:
             self._text_manager = docling_metrics_text_cpp.TextManager()
 
+        if self._offline:
+            # Fail here rather than in the middle of an evaluation
+            if not self._metrics.isdisjoint(_TOKEN_METRICS):
+                require_nltk_resource("punkt_tab", offline=True)
+            if TextMetricKind.METEOR in self._metrics and not (
+                self._mode == TextMetricsMode.CPP
+                and default_meteor_table_path().exists()
+            ):
+                require_nltk_resource("wordnet", offline=True)
+
     def evaluate_sample(
         self,
         sample: TextPairSample,
@@ -70,39 +464,365 @@ class TextMetrics(BaseMetric):
         r"""
         Python implementation to compute text metrics for the input sample
         """
-        # Tokenize the inputs
-        tokens_a, tokens_b, tokens_a_set, tokens_b_set = self._tokenize_pair(
-            sample.text_a, sample.text_b
-        )
+        return self.evaluate_samples([sample])[0]
 
-        # Compute metrics
-        f1_score = self._compute_f1(tokens_a_set, tokens_b_set)
-        precision_score = self._compute_precision(tokens_a_set, tokens_b_set)
-        recall_score = self._compute_recall(tokens_a_set, tokens_b_set)
-        edit_distance_score = self._compute_edit_distance(tokens_a, tokens_b)
-        meteor_score_value = self._compute_meteor(tokens_a, tokens_b)
-        bleu_score = self._compute_bleu(sample.text_a, sample.text_b)
-
-        result = TextPairEvaluation(
-            id=sample.id,
-            f1_score=f1_score,
-            precision_score=precision_score,
-            recall_score=recall_score,
-            edit_distance_score=edit_distance_score,
-            meteor_score=meteor_score_value,
-            bleu_score=bleu_score,
-        )
-        return result
+    @cached_batch_evaluation
+    def evaluate_samples(  # type: ignore[override]
+        self,
+        samples: Sequence[TextPairSample],
+    ) -> list[TextPairEvaluation]:
+        r"""
+        Compute the text metrics for a batch of samples
 
-    def aggregate(self, results: Iterable[TextPairEvaluation]):
-        """Trivial implementation"""
-        return None
+        In C++ mode the tokenization, the token sets and the edit distance of a pair
+        are computed with a single native call
+        """
+        return [
+            TextPairEvaluation(**values)
+            for values in self.evaluate_samples_values(samples)
+        ]
+
+    def evaluate_sample_values(  # type: ignore[override]
+        self,
+        sample: TextPairSample,
+    ) -> dict[str, Any]:
+        r"""
+        Compute the text metrics for the input sample as plain values
+        """
+        return self.evaluate_samples_values([sample])[0]
 
-    def evaluate_dataset(
-        self, sample_pairs: Iterable[TextPairSample]
+    def evaluate_samples_values(  # type: ignore[override]
+        self,
+        samples: Sequence[TextPairSample],
+    ) -> list[dict[str, Any]]:
+        r"""
+        Compute the fields of TextPairEvaluation for a batch of samples, without
+        instantiating the pydantic models
+        """
+        selected = self._metrics
+        scores: dict[TextMetricKind, list[Optional[float]]] = {}
+        counts: list[dict[str, int]] = [{} for _ in samples]
+
+        if not selected.isdisjoint(_TOKEN_METRICS):
+            require_nltk_resource("punkt_tab", offline=self._offline)
+            overlap = not selected.isdisjoint(_OVERLAP_METRICS)
+            with_edit_distance = TextMetricKind.EDIT_DISTANCE in selected
+            if self._mode == TextMetricsMode.CPP:
+                # Tokenization, token sets and edit distance of the whole batch on the
+                # native thread pool
+                pair_scores = self._evaluate_pairs_cpp(
+                    samples, overlap, with_edit_distance
+                )
+            else:
+                pair_scores = self._evaluate_pairs_python(
+                    samples, overlap, with_edit_distance
+                )
+            for kind, field in _PAIR_SCORE_FIELDS.items():
+                scores[kind] = [getattr(pair, field) for pair in pair_scores]
+            for sample_counts, pair in zip(counts, pair_scores):
+                # The fallback of a failing batch computes all the scores of a pair
+                if overlap and pair.overlap_counts is not None:
+                    sample_counts.update(pair.overlap_counts)
+                if with_edit_distance and pair.edit_distance is not None:
+                    sample_counts.update(
+                        self._edit_counts(
+                            pair.tokens_a, pair.tokens_b, pair.edit_distance
+                        )
+                    )
+            if TextMetricKind.METEOR in selected:
+                scores[TextMetricKind.METEOR] = list(
+                    self._compute_meteor_batch(
+                        [pair.tokens_a for pair in pair_scores],
+                        [pair.tokens_b for pair in pair_scores],
+                    )
+                )
+
+        if TextMetricKind.CER in selected or TextMetricKind.WER in selected:
+            error_rates = self._compute_error_rates(
+                samples,
+                cer=TextMetricKind.CER in selected,
+                wer=TextMetricKind.WER in selected,
+            )
+            scores[TextMetricKind.CER] = [cer for cer, _ in error_rates]
+            scores[TextMetricKind.WER] = [wer for _, wer in error_rates]
+        if TextMetricKind.BLEU in selected:
+            bleu_scores = self._compute_bleu_batch(samples)
+            scores[TextMetricKind.BLEU] = [score for score, _ in bleu_scores]
+            for sample_counts, (_, bleu_counts) in zip(counts, bleu_scores):
+                if bleu_counts is not None:
+                    sample_counts.update(bleu_counts)
+
+        results: list[dict[str, Any]] = []
+        for i, sample in enumerate(samples):
+            values: dict[str, Any] = {"id": sample.id}
+            for kind in TextMetricKind:
+                values[f"{kind.value}_score"] = (
+                    scores[kind][i] if kind in selected else None
+                )
+            values["counts"] = counts[i] or None
+            results.append(values)
+        return results
+
+    def create_accumulator(self) -> TextMetricsAccumulator:
+        r"""
+        Create an empty accumulator of the score distributions and corpus statistics
+        """
+        return TextMetricsAccumulator(error_score=self._error_score)
+
+    def evaluate_dataset(  # type: ignore[override]
+        self,
+        samples: Iterable[TextPairSample],
+        config: Optional[EvaluationConfig] = None,
+        checkpoint: Optional[CheckpointStore] = None,
     ) -> TextDatasetEvaluation:
-        """Trivial implementation"""
-        return TextDatasetEvaluation(sample_count=0)
+        r"""
+        Evaluate a dataset into the distributions of the per-sample scores and the
+        corpus statistics
+
+        The samples are pulled from the iterable on demand and their results are
+        folded into a TextMetricsAccumulator, so the memory does not depend on the
+        number of samples. Unless `config` says otherwise, the samples are scored in
+        batches, each on the native thread pool in C++ mode.
+        """
+        if config is None:
+            config = EvaluationConfig(batch_size=_DATASET_BATCH_SIZE)
+        evaluation = super().evaluate_dataset(samples, config, checkpoint)
+        return evaluation  # type: ignore[return-value]
+
+    def metric_config(self) -> dict[str, Any]:
+        r"""
+        The error score is returned for the scores that cannot be computed, the
+        selected metrics determine which fields of the results are set
+        """
+        return {
+            "error_score": self._error_score,
+            "max_edit_distance": self._max_edit_distance,
+            "metrics": sorted(kind.value for kind in self._metrics),
+        }
+
+    def _evaluate_pairs_python(
+        self,
+        samples: Sequence[TextPairSample],
+        overlap: bool = True,
+        with_edit_distance: bool = True,
+    ) -> list[_PairScores]:
+        r"""
+        Tokenize the pairs and compute their token set and edit distance scores
+
+        Args:
+            samples: The pairs
+            overlap: Compute the token set scores, None otherwise
+            with_edit_distance: Compute the edit distance, None otherwise
+
+        Returns:
+            The tokens and the scores of each pair
+        """
+        with stage("text.tokenize", samples=len(samples)):
+            tokenized_pairs = [
+                self._tokenize_pair(sample.text_a, sample.text_b) for sample in samples
+            ]
+
+        edit_distance_scores: list[Optional[float]] = [None] * len(samples)
+        if with_edit_distance:
+            with stage("text.edit_distance", samples=len(samples)):
+                edit_distance_scores = list(
+                    self._compute_edit_distance_batch(
+                        [tokens_a for tokens_a, _, _, _ in tokenized_pairs],
+                        [tokens_b for _, tokens_b, _, _ in tokenized_pairs],
+                    )
+                )
+
+        pair_scores: list[_PairScores] = []
+        for tokenized_pair, edit_distance_score in zip(
+            tokenized_pairs, edit_distance_scores
+        ):
+            tokens_a, tokens_b, tokens_a_set, tokens_b_set = tokenized_pair
+            f1_score = precision_score = recall_score = None
+            overlap_counts = None
+            if overlap:
+                with stage("text.overlap"):
+                    f1_score = self._compute_f1(tokens_a_set, tokens_b_set)
+                    precision_score = self._compute_precision(
+                        tokens_a_set, tokens_b_set
+                    )
+                    recall_score = self._compute_recall(tokens_a_set, tokens_b_set)
+                    overlap_counts = self._overlap_counts(tokens_a_set, tokens_b_set)
+            pair_scores.append(
+                _PairScores(
+                    tokens_a,
+                    tokens_b,
+                    f1_score,
+                    precision_score,
+                    recall_score,
+                    edit_distance_score,
+                    overlap_counts,
+                )
+            )
+        return pair_scores
+
+    def _evaluate_pairs_cpp(
+        self,
+        samples: Sequence[TextPairSample],
+        overlap: bool = True,
+        with_edit_distance: bool = True,
+    ) -> list[_PairScores]:
+        r"""
+        Tokenize the pairs and compute their token set and edit distance scores with
+        a single native call, which releases the GIL while the worker threads run
+
+        Args:
+            samples: The pairs
+            overlap: Compute the token set scores, None otherwise
+            with_edit_distance: Compute the edit distance, None otherwise
+
+        Returns:
+            The tokens and the scores of each pair
+        """
+        with stage("text.sent_tokenize", samples=len(samples)):
+            sentences_a = [sent_tokenize(sample.text_a) for sample in samples]
+            sentences_b = [sent_tokenize(sample.text_b) for sample in samples]
+
+        try:
+            with stage("text.native_batch", samples=len(samples)):
+                batch = self._text_manager.evaluate_batch(
+                    sentences_a,
+                    sentences_b,
+                    num_threads=self._num_threads,
+                    return_tokens=True,
+                    max_distance=self._native_max_distance(),
+                    overlap=overlap,
+                    edit_distance=with_edit_distance,
+                )
+        except Exception:
+            return [
+                self._evaluate_pair_cpp(sample.text_a, sample.text_b)
+                for sample in samples
+            ]
+
+        pair_scores: list[_PairScores] = []
+        for i, (tokens_a, tokens_b) in enumerate(
+            zip(batch["tokens_a"], batch["tokens_b"])
+        ):
+            edit_distance_score: Optional[float] = None
+            if with_edit_distance:
+                edit_distance_score = float(batch["edit_distance"][i])
+                if math.isnan(edit_distance_score):
+                    # E.g. the edit distance refused to allocate
+                    edit_distance_score = self._compute_edit_distance(
+                        tokens_a, tokens_b
+                    )
+                else:
+                    edit_distance_score = self._bound_edit_distance(edit_distance_score)
+            f1_score = precision_score = recall_score = None
+            overlap_counts = None
+            if overlap:
+                f1_score = self._score_or_error(batch["f1"][i])
+                precision_score = self._score_or_error(batch["precision"][i])
+                recall_score = self._score_or_error(batch["recall"][i])
+                overlap_counts = {
+                    "token_set_a": int(batch["token_set_a"][i]),
+                    "token_set_b": int(batch["token_set_b"][i]),
+                    "common_tokens": int(batch["common_tokens"][i]),
+                }
+            pair_scores.append(
+                _PairScores(
+                    tokens_a,
+                    tokens_b,
+                    f1_score,
+                    precision_score,
+                    recall_score,
+                    edit_distance_score,
+                    overlap_counts,
+                )
+            )
+        return pair_scores
+
+    def _evaluate_pair_cpp(self, text_a: str, text_b: str) -> _PairScores:
+        r"""
+        Tokenize a pair and compute its token set and edit distance scores natively
+
+        The sentences are split with Punkt as in `word_tokenize`, the TreeBank
+        tokenization of the sentences and the scores are computed by the TextManager.
+        The results are identical to the Python mode.
+
+        Returns:
+            The tokens and the scores of the pair
+        """
+        try:
+            evaluation = self._text_manager.evaluate_pair(
+                sent_tokenize(text_a),
+                sent_tokenize(text_b),
+                max_distance=self._native_max_distance(),
+            )
+        except Exception:
+            # E.g. the edit distance refused to allocate: Isolate the failing scores
+            tokens_a, tokens_b, tokens_a_set, tokens_b_set = self._tokenize_pair(
+                text_a, text_b
+            )
+            return _PairScores(
+                tokens_a,
+                tokens_b,
+                self._compute_f1(tokens_a_set, tokens_b_set),
+                self._compute_precision(tokens_a_set, tokens_b_set),
+                self._compute_recall(tokens_a_set, tokens_b_set),
+                self._compute_edit_distance(tokens_a, tokens_b),
+                self._overlap_counts(tokens_a_set, tokens_b_set),
+            )
+
+        return _PairScores(
+            evaluation.tokens_a,
+            evaluation.tokens_b,
+            self._score_or_error(evaluation.f1),
+            self._score_or_error(evaluation.precision),
+            self._score_or_error(evaluation.recall),
+            self._bound_edit_distance(evaluation.edit_distance),
+            {
+                "token_set_a": evaluation.token_set_a,
+                "token_set_b": evaluation.token_set_b,
+                "common_tokens": evaluation.common_tokens,
+            },
+        )
+
+    def _overlap_counts(
+        self, tokens_a_set: set[str], tokens_b_set: set[str]
+    ) -> dict[str, int]:
+        r"""The sizes of the token sets and of their intersection"""
+        return {
+            "token_set_a": len(tokens_a_set),
+            "token_set_b": len(tokens_b_set),
+            "common_tokens": len(tokens_a_set & tokens_b_set),
+        }
+
+    def _edit_counts(
+        self, tokens_a: list[str], tokens_b: list[str], edit_distance_score: float
+    ) -> dict[str, int]:
+        r"""
+        The edit operations behind a normalized edit distance and the token count it
+        is normalized by, none if the edit distance failed
+        """
+        if not 0.0 <= edit_distance_score <= 1.0:
+            return {}
+        max_tokens = max(len(tokens_a), len(tokens_b))
+        return {
+            "edit_operations": round(edit_distance_score * max_tokens),
+            "max_tokens": max_tokens,
+        }
+
+    def _score_or_error(self, score: Optional[float]) -> float:
+        r"""Replace an undefined (None or NaN) score by the error score"""
+        if score is None or math.isnan(score):
+            return self._error_score
+        return float(score)
+
+    def _native_max_distance(self) -> float:
+        r"""The edit distance threshold of the TextManager, negative for none"""
+        return -1.0 if self._max_edit_distance is None else self._max_edit_distance
+
+    def _bound_edit_distance(self, distance: float) -> float:
+        r"""Report the edit distances above the threshold as 1.0, the maximum"""
+        if self._max_edit_distance is not None and distance > self._max_edit_distance:
+            return 1.0
+        return distance
 
     def _word_tokenize(self, text: str) -> list[str]:
         r"""Tokenize the input string using the TreeBank tokenizer"""
@@ -189,19 +909,166 @@ class TextMetrics(BaseMetric):
             tokens_b: Second list of tokens
 
         Returns:
-            Normalized edit distance score (0.0 = identical, 1.0 = completely different)
+            Normalized edit distance score (0.0 = identical, 1.0 = completely different),
+            1.0 above max_edit_distance
         """
         try:
             if self._mode == TextMetricsMode.CPP:
-                return self._text_manager.edit_distance(tokens_a, tokens_b)
-
-            levenshtein = edit_distance(tokens_a, tokens_b)
-            max_length = max(len(tokens_a), len(tokens_b))
-            distance = levenshtein / max_length if max_length > 0 else 0.0
-            return distance
+                distance = self._text_manager.edit_distance(
+                    tokens_a, tokens_b, max_distance=self._native_max_distance()
+                )
+            else:
+                levenshtein = edit_distance(tokens_a, tokens_b)
+                max_length = max(len(tokens_a), len(tokens_b))
+                distance = levenshtein / max_length if max_length > 0 else 0.0
+            return self._bound_edit_distance(distance)
         except Exception:
             return self._error_score
 
+    def _compute_edit_distance_batch(
+        self, batch_a: list[list[str]], batch_b: list[list[str]]
+    ) -> list[float]:
+        r"""
+        Compute the normalized edit distances of a batch of token list pairs.
+
+        Args:
+            batch_a: First token lists
+            batch_b: Second token lists
+
+        Returns:
+            Normalized edit distance score for each pair
+        """
+        if self._mode == TextMetricsMode.CPP:
+            try:
+                distances = self._text_manager.edit_distance_batch(
+                    batch_a, batch_b, max_distance=self._native_max_distance()
+                )
+                return [self._bound_edit_distance(d) for d in distances]
+            except Exception:
+                # Fall back to the pairs to isolate the failing ones
+                pass
+        return [
+            self._compute_edit_distance(tokens_a, tokens_b)
+            for tokens_a, tokens_b in zip(batch_a, batch_b)
+        ]
+
+    def _compute_error_rates(
+        self, samples: Sequence[TextPairSample], cer: bool = True, wer: bool = True
+    ) -> list[tuple[Optional[float], Optional[float]]]:
+        r"""
+        Compute the character and word error rates of a batch, with text_a as the
+        reference and text_b as the hypothesis.
+
+        In C++ mode the edit distances of the code points and of the whitespace
+        separated words are computed with the Myers bit-vector engine on the native
+        thread pool, which computes both rates.
+
+        Args:
+            samples: The pairs
+            cer: Compute the character error rates, None otherwise
+            wer: Compute the word error rates, None otherwise
+
+        Returns:
+            For each pair: (cer, wer), self._error_score if the reference is empty
+            but the hypothesis is not
+        """
+        with stage("text.error_rates", samples=len(samples)):
+            if self._mode == TextMetricsMode.CPP:
+                try:
+                    batch = self._text_manager.error_rates_batch(
+                        [sample.text_a for sample in samples],
+                        [sample.text_b for sample in samples],
+                        num_threads=self._num_threads,
+                    )
+                    return [
+                        (self._score_or_error(cer), self._score_or_error(wer))
+                        for cer, wer in zip(batch["cer"], batch["wer"])
+                    ]
+                except Exception:
+                    pass
+            return [
+                (
+                    self._compute_error_rate(list(sample.text_a), list(sample.text_b))
+                    if cer
+                    else None,
+                    self._compute_error_rate(
+                        sample.text_a.split(), sample.text_b.split()
+                    )
+                    if wer
+                    else None,
+                )
+                for sample in samples
+            ]
+
+    def _compute_error_rate(self, reference: list[str], hypothesis: list[str]) -> float:
+        r"""
+        Compute the error rate of a hypothesis: Its edit distance to the reference
+        divided by the length of the reference.
+
+        Args:
+            reference: Characters or words of the reference
+            hypothesis: Characters or words of the hypothesis
+
+        Returns:
+            Error rate, 0.0 if both are empty, or self._error_score if only the
+            reference is empty
+        """
+        if not reference:
+            return 0.0 if not hypothesis else self._error_score
+        return _levenshtein(reference, hypothesis) / len(reference)
+
+    def _has_native_meteor(self) -> bool:
+        r"""
+        Whether METEOR is computed natively, the METEOR table is loaded on the first
+        call and built from WordNet if it does not exist yet
+        """
+        if self._mode != TextMetricsMode.CPP:
+            return False
+        if self._meteor_table_loaded is None:
+            try:
+                table_path = default_meteor_table_path()
+                if not table_path.exists():
+                    require_nltk_resource("wordnet", offline=self._offline)
+                self._text_manager.load_meteor_table(
+                    str(ensure_meteor_table(table_path))
+                )
+                self._meteor_table_loaded = True
+            except Exception:
+                # METEOR falls back to NLTK
+                self._meteor_table_loaded = False
+        return self._meteor_table_loaded
+
+    def _compute_meteor_batch(
+        self, batch_a: list[list[str]], batch_b: list[list[str]]
+    ) -> list[float]:
+        r"""
+        Compute the METEOR scores of a batch of token list pairs.
+
+        In C++ mode the exact, stem and synonym alignments of the whole batch are
+        computed on the native thread pool, with the WordNet synonyms of the METEOR
+        table, with the same results as nltk's meteor_score.
+
+        Args:
+            batch_a: The reference token lists
+            batch_b: The hypothesis token lists
+
+        Returns:
+            METEOR score of each pair
+        """
+        with stage("text.meteor", samples=len(batch_a)):
+            if self._has_native_meteor():
+                try:
+                    scores = self._text_manager.meteor_batch(
+                        batch_a, batch_b, num_threads=self._num_threads
+                    )
+                    return [float(score) for score in scores]
+                except Exception:
+                    pass
+            return [
+                self._compute_meteor(tokens_a, tokens_b)
+                for tokens_a, tokens_b in zip(batch_a, batch_b)
+            ]
+
     def _compute_meteor(self, tokens_a: list[str], tokens_b: list[str]) -> float:
         r"""
         Compute METEOR score between two token lists.
@@ -214,10 +1081,66 @@ class TextMetrics(BaseMetric):
             METEOR score
         """
         try:
+            if self._has_native_meteor():
+                return self._text_manager.meteor([tokens_a], tokens_b)
+            require_nltk_resource("wordnet", offline=self._offline)
             return meteor_score.meteor_score([tokens_a], tokens_b)
         except Exception:
             return self._error_score
 
+    def _compute_bleu_batch(
+        self, samples: Sequence[TextPairSample]
+    ) -> list[tuple[float, Optional[dict[str, int]]]]:
+        r"""
+        Compute the BLEU scores of a batch, with text_a as the prediction and text_b
+        as the reference.
+
+        In C++ mode the 13a tokenization and the n-gram statistics of the whole batch
+        are computed on the native thread pool, with the same results as the "bleu"
+        module of evaluate.
+
+        Returns:
+            For each pair: The BLEU score, or self._error_score if it is undefined, and
+            the BLEU fields of TextPairCounts, None if the score is undefined
+        """
+        with stage("text.bleu", samples=len(samples)):
+            if self._mode == TextMetricsMode.CPP:
+                try:
+                    batch = self._text_manager.bleu_batch(
+                        [sample.text_a for sample in samples],
+                        [sample.text_b for sample in samples],
+                        num_threads=self._num_threads,
+                    )
+                    return [
+                        (
+                            self._score_or_error(score),
+                            None if math.isnan(score) else self._bleu_counts(batch, i),
+                        )
+                        for i, score in enumerate(batch["bleu"])
+                    ]
+                except Exception:
+                    pass
+            if self._mode == TextMetricsMode.PYTHON:
+                # Raise if the module is missing in offline mode
+                load_bleu(offline=self._offline)
+            return [
+                self._compute_bleu_with_counts(sample.text_a, sample.text_b)
+                for sample in samples
+            ]
+
+    def _bleu_counts(self, batch: dict[str, Any], i: int) -> dict[str, int]:
+        r"""The BLEU fields of TextPairCounts of pair i of a TextManager.bleu_batch"""
+        counts = {
+            "bleu_translation_length": int(batch["translation_length"][i]),
+            "bleu_reference_length": int(batch["reference_length"][i]),
+        }
+        for order in range(_BLEU_MAX_ORDER):
+            counts[f"bleu_matches_{order + 1}"] = int(batch["matches"][i][order])
+            counts[f"bleu_possible_matches_{order + 1}"] = int(
+                batch["possible_matches"][i][order]
+            )
+        return counts
+
     def _compute_bleu(self, text_a: str, text_b: str) -> float:
         r"""
         Compute BLEU score between two texts.
@@ -229,10 +1152,62 @@ class TextMetrics(BaseMetric):
         Returns:
             BLEU score, or self._error_score if computation fails
         """
+        return self._compute_bleu_with_counts(text_a, text_b)[0]
+
+    def _compute_bleu_with_counts(
+        self, text_a: str, text_b: str
+    ) -> tuple[float, Optional[dict[str, int]]]:
+        r"""
+        Compute the BLEU score between two texts and its n-gram statistics.
+
+        Args:
+            text_a: First text (prediction)
+            text_b: Second text (reference)
+
+        Returns:
+            The BLEU score, or self._error_score if computation fails, and the BLEU
+            fields of TextPairCounts, None if it fails
+        """
         try:
-            result = self._bleu_eval.compute(
+            if self._mode == TextMetricsMode.CPP:
+                score = self._text_manager.sentence_bleu(
+                    [self._text_manager.tokenize_13a(text_b)],
+                    self._text_manager.tokenize_13a(text_a),
+                )
+                if math.isnan(score.bleu):
+                    return self._error_score, None
+                return score.bleu, self._bleu_counts_of_score(
+                    score.precisions, score.translation_length, score.reference_length
+                )
+            result = load_bleu(offline=self._offline).compute(
                 predictions=[text_a], references=[[text_b]]
             )
-            return self._error_score if result is None else result["bleu"]
+            if result is None:
+                return self._error_score, None
+            return result["bleu"], self._bleu_counts_of_score(
+                result["precisions"],
+                result["translation_length"],
+                result["reference_length"],
+            )
         except Exception:
-            return self._error_score
+            return self._error_score, None
+
+    def _bleu_counts_of_score(
+        self, precisions: list[float], translation_length: int, reference_length: int
+    ) -> dict[str, int]:
+        r"""
+        The BLEU fields of TextPairCounts of a sentence pair from its score: The
+        prediction has translation_length - n n-grams of order n + 1, and the matches
+        are recovered exactly from the precisions
+        """
+        counts = {
+            "bleu_translation_length": translation_length,
+            "bleu_reference_length": reference_length,
+        }
+        for order, precision_value in enumerate(precisions):
+            possible_matches = max(translation_length - order, 0)
+            counts[f"bleu_matches_{order + 1}"] = round(
+                precision_value * possible_matches
+            )
+            counts[f"bleu_possible_matches_{order + 1}"] = possible_matches
+        return counts
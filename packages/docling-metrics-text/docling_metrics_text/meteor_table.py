@@ -0,0 +1,199 @@
+r"""
+Prebuilt lookup table of the native METEOR: the WordNet synonyms of the words and the
+lowercase mapping of Python's str.lower(), in the format read by the C++ MeteorTable.
+
+The table is built once from the NLTK WordNet data and memory-mapped by the TextManager,
+so the native METEOR needs no WordNet lookups.
+
+Usage: python -m docling_metrics_text.meteor_table [path]
+"""
+
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import nltk
+
+METEOR_TABLE_ENV = "DOCLING_METRICS_METEOR_TABLE"
+
+_MAGIC = b"DMMETEOR"
+_VERSION = 1
+_CASED = 1
+_CASE_IGNORABLE = 2
+_POS_LIST = ("n", "v", "a", "r", "s")
+
+
+def default_meteor_table_path() -> Path:
+    r"""
+    The path of the METEOR table: The DOCLING_METRICS_METEOR_TABLE environment variable if
+    set, otherwise a file of the user cache named after the NLTK version
+    """
+    path = os.environ.get(METEOR_TABLE_ENV)
+    if path:
+        return Path(path)
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_dir / "docling-metrics" / f"meteor-nltk-{nltk.__version__}.bin"
+
+
+def ensure_meteor_table(path: Optional[Path] = None, wordnet: Any = None) -> Path:
+    r"""
+    Return the path of the METEOR table, which is built first if it does not exist
+
+    Args:
+        path: Path of the table, default_meteor_table_path() if None
+        wordnet: The WordNet corpus reader, nltk.corpus.wordnet if None
+    """
+    path = default_meteor_table_path() if path is None else Path(path)
+    if not path.exists():
+        build_meteor_table(path, wordnet=wordnet)
+    return path
+
+
+def build_meteor_table(path: Path, wordnet: Any = None) -> Path:
+    r"""
+    Write the METEOR table of a WordNet corpus reader
+
+    The synonyms of a word are the lemma names without "_" of its synsets(), as in the
+    synonym matching of nltk.translate.meteor_score. The words are all the forms for which
+    synsets() finds a lemma: the lemma names, the exceptions and the inflected forms of the
+    morphological substitutions.
+
+    Args:
+        path: Path of the table, written atomically
+        wordnet: The WordNet corpus reader, nltk.corpus.wordnet if None
+
+    Returns:
+        The path of the table
+    """
+    if wordnet is None:
+        from nltk.corpus import wordnet as nltk_wordnet
+
+        wordnet = nltk_wordnet
+
+    synonyms: dict[str, set[str]] = {}
+    for word in _candidate_words(wordnet):
+        names = {
+            lemma.name()
+            for synset in wordnet.synsets(word)
+            for lemma in synset.lemmas()
+            if "_" not in lemma.name()
+        }
+        names.discard(word)
+        if names:
+            synonyms[word] = names
+
+    words = sorted(
+        set(synonyms).union(*synonyms.values()), key=lambda word: word.encode()
+    )
+    word_ids = {word: i for i, word in enumerate(words)}
+    word_offsets, string_bytes = _pack_strings(words)
+    synonym_offsets = array("I", [0])
+    synonym_ids = array("I")
+    for word in words:
+        synonym_ids.extend(sorted(word_ids[name] for name in synonyms.get(word, ())))
+        synonym_offsets.append(len(synonym_ids))
+
+    lower_chars = array("I")
+    lower_strings = []
+    for code_point in range(0x80, sys.maxunicode + 1):
+        lower = chr(code_point).lower()
+        if lower != chr(code_point):
+            lower_chars.append(code_point)
+            lower_strings.append(lower)
+    lower_offsets, lower_bytes = _pack_strings(lower_strings)
+
+    case_ranges = array("I")
+    for first, last, flags in _case_ranges():
+        case_ranges.extend((first, last, flags))
+
+    header = array(
+        "I",
+        [
+            _VERSION,
+            len(words),
+            len(synonym_ids),
+            len(lower_chars),
+            len(case_ranges) // 3,
+            len(string_bytes),
+            len(lower_bytes),
+        ],
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(_MAGIC)
+        for values in (
+            header,
+            word_offsets,
+            synonym_offsets,
+            synonym_ids,
+            lower_chars,
+            lower_offsets,
+            case_ranges,
+        ):
+            if sys.byteorder == "big":
+                values.byteswap()
+            f.write(values.tobytes())
+        f.write(string_bytes)
+        f.write(lower_bytes)
+    os.replace(temp_path, path)
+    return path
+
+
+def _candidate_words(wordnet: Any) -> set[str]:
+    r"""The lowercase forms for which the morphy of synsets() can find a lemma"""
+    lemma_map = wordnet._lemma_pos_offset_map
+    words: set[str] = set(lemma_map)
+    for pos in _POS_LIST:
+        words.update(wordnet._exception_map[pos])
+        substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS[pos]
+        for lemma, offsets in lemma_map.items():
+            if pos not in offsets:
+                continue
+            for old, new in substitutions:
+                if lemma.endswith(new):
+                    words.add(lemma[: len(lemma) - len(new)] + old)
+    return {word for word in words if word == word.lower()}
+
+
+def _pack_strings(strings: Iterable[str]) -> tuple[array, bytes]:
+    r"""The UTF-8 bytes of strings and their offsets"""
+    offsets = array("I", [0])
+    chunks = []
+    for string in strings:
+        data = string.encode("utf-8", "surrogateescape")
+        chunks.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return offsets, b"".join(chunks)
+
+
+def _case_ranges() -> list[tuple[int, int, int]]:
+    r"""
+    The ranges of code points with the same case flags for the final sigma rule of
+    str.lower(), probed with str.lower() itself
+    """
+    ranges: list[tuple[int, int, int]] = []
+    for code_point in range(sys.maxunicode + 1):
+        char = chr(code_point)
+        # A capital sigma becomes final after a cased letter, case-ignorables are skipped
+        after_cased = ("A" + char + "Σ").lower()[-1] == "ς"
+        cased = (char + "Σ").lower()[-1] == "ς"
+        if after_cased and not cased:
+            flags = _CASE_IGNORABLE
+        elif cased:
+            flags = _CASED
+        else:
+            continue
+        if ranges and ranges[-1][1] == code_point - 1 and ranges[-1][2] == flags:
+            ranges[-1] = (ranges[-1][0], code_point, flags)
+        else:
+            ranges.append((code_point, code_point, flags))
+    return ranges
+
+
+if __name__ == "__main__":
+    table_path = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(ensure_meteor_table(table_path))
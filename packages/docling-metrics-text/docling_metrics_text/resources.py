@@ -0,0 +1,94 @@
+r"""
+Lazy loading of the external resources of the text metrics: the NLTK data and the "bleu"
+module of HuggingFace evaluate.
+
+A resource is loaded when a metric first needs it, at most once per process. Installed NLTK
+data is never downloaded again, and in offline mode a missing resource raises a LookupError
+instead of being downloaded.
+"""
+
+import threading
+from typing import Any
+from uuid import uuid4
+
+import nltk
+
+# The NLTK packages of the metrics and the paths nltk.data.find() locates them at
+NLTK_RESOURCES = {
+    # Sentence splitting and word tokenization
+    "punkt_tab": "tokenizers/punkt_tab/english/",
+    # METEOR synonyms
+    "wordnet": "corpora/wordnet",
+}
+
+_lock = threading.Lock()
+_available_nltk_resources: set[str] = set()
+_bleu_module: Any = None
+
+
+def has_nltk_resource(name: str) -> bool:
+    r"""Whether an NLTK package of NLTK_RESOURCES is installed, without loading it"""
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+        return True
+    except LookupError:
+        return False
+
+
+def require_nltk_resource(name: str, offline: bool = False) -> None:
+    r"""
+    Make an NLTK package of NLTK_RESOURCES available, downloading it if needed
+
+    Args:
+        name: The NLTK package, e.g. "punkt_tab"
+        offline: Raise instead of downloading the package if it is not installed
+
+    Raises:
+        LookupError: If the package is not installed and cannot be downloaded
+    """
+    if name in _available_nltk_resources:
+        return
+    with _lock:
+        if name in _available_nltk_resources:
+            return
+        if not has_nltk_resource(name):
+            if offline:
+                raise LookupError(
+                    f"The NLTK resource '{name}' is not installed and downloads are "
+                    f"disabled. Install it with nltk.download('{name}')"
+                )
+            if not nltk.download(name, quiet=True):
+                raise LookupError(f"Cannot download the NLTK resource '{name}'")
+        _available_nltk_resources.add(name)
+
+
+def load_bleu(offline: bool = False) -> Any:
+    r"""
+    The "bleu" module of HuggingFace evaluate, loaded once per process
+
+    Args:
+        offline: Only load the module from the local cache of evaluate
+
+    Raises:
+        LookupError: If offline and the module is not in the local cache
+    """
+    global _bleu_module
+    with _lock:
+        if _bleu_module is None:
+            import evaluate
+            from datasets import DownloadConfig
+
+            try:
+                _bleu_module = evaluate.load(
+                    "bleu",
+                    experiment_id=str(uuid4()),
+                    download_config=DownloadConfig(local_files_only=offline),
+                )
+            except FileNotFoundError as e:
+                if not offline:
+                    raise
+                raise LookupError(
+                    "The 'bleu' module of evaluate is not cached and downloads are "
+                    "disabled"
+                ) from e
+        return _bleu_module
@@ -1,39 +1,45 @@
-# from docling_metrics_text import TextMetrics, TextPairSample, TextPairEvaluation
-
-# MD_FILE_DIR = "data/md"
-# TOKENS_DATA = "data/nltk_tokens.json"
-
-
-# def test_tokenizer():
-#     r""" """
-#     ed_metric = TextMetrics()
-
-#     # Load expected tokens from JSON
-#     test_dir = Path(__file__).parent
-#     tokens_file = test_dir / TOKENS_DATA
-#     md_dir = test_dir / MD_FILE_DIR
-
-#     with open(tokens_file, "r", encoding="utf-8") as f:
-#         expected_tokens_data = json.load(f)
-
-#     # Test each MD file
-#     for md_file in md_dir.glob("*.md"):
-#         md_filename = md_file.name
-
-#         # Read MD file content
-#         with open(md_file, "r", encoding="utf-8") as f:
-#             md_content = f.read()
-
-#         # Get expected NLTK tokens from JSON
-#         assert md_filename in expected_tokens_data, f"Missing tokens for {md_filename}"
-#         expected_tokens = expected_tokens_data[md_filename]["nltk_tokens"]
-
-#         # Tokenize using C++ implementation
-#         actual_tokens = ed_metric._treebank_tokenize(md_content)
-
-#         # Compare tokens
-#         assert actual_tokens == expected_tokens, (
-#             f"Token mismatch for {md_filename}:\n"
-#             f"Expected {len(expected_tokens)} tokens, got {len(actual_tokens)}\n"
-#             f"First difference at index {next((i for i, (e, a) in enumerate(zip(expected_tokens, actual_tokens)) if e != a), min(len(expected_tokens), len(actual_tokens)))}"
-#         )
+from pathlib import Path
+
+from docling_metrics_text import docling_metrics_text_cpp  # type: ignore
+from nltk import sent_tokenize, word_tokenize
+from nltk.tokenize.destructive import NLTKWordTokenizer
+
+MD_FILE_DIR = Path(__file__).parent / "data" / "md"
+
+EDGE_CASES = [
+    "'Tis the 'twas cannot CANNOT gimme wanna\tgo d'ye more'n lemme gotta gonna",
+    "He's 'quoted' and 'em 'n' \u201cx\u201d \u00aby\u00bb \u2018z\u2019 a\u2013b",
+    "...x.. *s* x:1,2 a: b,c ''hi'' \"yo\" l'\u00e9t\u00e9 \u017f's",
+    "non\u00a0breaking\u2003spaces\u2028and \u0663 digits.\n",
+]
+
+
+def test_tokenizer_sentences():
+    r"""Test that the C++ tokenizer matches NLTKWordTokenizer on single sentences."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    nltk_tokenizer = NLTKWordTokenizer()
+
+    lines = list(EDGE_CASES)
+    for md_file in MD_FILE_DIR.glob("*.md"):
+        lines.extend(md_file.read_text(encoding="utf-8").splitlines())
+
+    for line in lines:
+        assert text_manager.tokenize(line, False) == nltk_tokenizer.tokenize(line), (
+            f"Token mismatch for: {line!r}"
+        )
+
+
+def test_tokenizer():
+    r"""Test that the sentences tokenized in C++ match the word_tokenize output."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+
+    for md_file in MD_FILE_DIR.glob("*.md"):
+        md_content = md_file.read_text(encoding="utf-8")
+        actual_tokens = [
+            token
+            for sentence in sent_tokenize(md_content)
+            for token in text_manager.tokenize(sentence, False)
+        ]
+        assert actual_tokens == word_tokenize(md_content), (
+            f"Token mismatch for {md_file.name}"
+        )
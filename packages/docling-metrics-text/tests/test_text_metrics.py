@@ -1,12 +1,29 @@
 import json
+import math
+from itertools import pairwise
 from pathlib import Path
 
-from docling_metrics_text import TextMetrics
-from docling_metrics_text.docling_metrics_text import TextPairSample
+import nltk
+import numpy as np
+import pytest
+from docling_metrics_text import (  # type: ignore[attr-defined]
+    TextMetricKind,
+    TextMetrics,
+    TextPairCounts,
+    TextPairEvaluation,
+    docling_metrics_text_cpp,
+    resources,
+)
+from docling_metrics_text.docling_metrics_text import TextMetricsMode, TextPairSample
+from docling_metrics_text.meteor_table import build_meteor_table
 from docling_metrics_text.utils.data_loader import FileEntry, TextFileLoader
+from nltk import edit_distance, word_tokenize
+from nltk.stem.porter import PorterStemmer
+from nltk.translate import meteor_score
 
 MD_DIR = Path(__file__).parent / "data" / "md"
 METRICS = Path(__file__).parent / "data" / "metrics.json"
+NLTK_TOKENS = Path(__file__).parent / "data" / "nltk_tokens.json"
 RELATIVE_TOLERANCE = 1e-6
 
 
@@ -69,6 +86,8 @@ def test_extreme_cases():
     assert result.f1_score == -1.0
     assert result.precision_score == -1.0
     assert result.bleu_score == -1.0
+    assert result.cer_score == 1.0
+    assert result.wer_score == 1.0
 
     # Test Case 2: Custom error_score
     metrics_calculator_custom = TextMetrics(error_score=-2.0)
@@ -81,6 +100,624 @@ def test_extreme_cases():
     assert result.bleu_score == -2.0
 
 
+def test_evaluate_samples():
+    r"""Test that the batched evaluation matches the per-sample evaluation."""
+    loader = TextFileLoader(Path(MD_DIR))
+    samples = [
+        TextPairSample(
+            id=file_entry.id,
+            text_a=file_entry.pivot_content,
+            text_b=file_entry.target_content,
+        )
+        for file_entry in loader.load()
+        if file_entry.target_content
+    ]
+    samples.append(TextPairSample(id="empty", text_a="some text", text_b=""))
+
+    for mode in TextMetricsMode:
+        metrics_calculator = TextMetrics(mode=mode)
+        batch_results = metrics_calculator.evaluate_samples(samples)
+        assert batch_results == [
+            metrics_calculator.evaluate_sample(sample) for sample in samples
+        ]
+
+
+def test_cpp_python_parity():
+    r"""Test that the native pipeline of the C++ mode matches the Python mode."""
+    loader = TextFileLoader(Path(MD_DIR))
+    samples = [
+        TextPairSample(
+            id=file_entry.id,
+            text_a=file_entry.pivot_content,
+            text_b=file_entry.target_content,
+        )
+        for file_entry in loader.load()
+        if file_entry.target_content
+    ]
+    samples.append(TextPairSample(id="empty_b", text_a="some text", text_b=""))
+    samples.append(TextPairSample(id="empty_a", text_a="", text_b="some text"))
+    samples.append(TextPairSample(id="empty", text_a="", text_b=""))
+
+    python_results = TextMetrics(mode=TextMetricsMode.PYTHON).evaluate_samples(samples)
+    cpp_results = TextMetrics(mode=TextMetricsMode.CPP).evaluate_samples(samples)
+    for python_result, cpp_result in zip(python_results, cpp_results):
+        assert cpp_result == python_result
+
+
+def test_evaluate_batch():
+    r"""Test that the threaded batch API matches the evaluation of single pairs."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    md_lines = [
+        md_file.read_text(encoding="utf-8").splitlines()
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    batch_a = [lines_a for lines_a in md_lines for _ in md_lines] + [["some text"]]
+    batch_b = [lines_b for _ in md_lines for lines_b in md_lines] + [[]]
+
+    for num_threads in [1, 3]:
+        batch = text_manager.evaluate_batch(
+            batch_a, batch_b, num_threads=num_threads, return_tokens=True
+        )
+        assert batch["f1"].dtype == np.float64
+        assert len(batch["edit_distance"]) == len(batch_a)
+        for i, (sentences_a, sentences_b) in enumerate(zip(batch_a, batch_b)):
+            pair = text_manager.evaluate_pair(sentences_a, sentences_b)
+            assert batch["tokens_a"][i] == pair.tokens_a
+            assert batch["tokens_b"][i] == pair.tokens_b
+            for key in ["precision", "recall", "f1"]:
+                expected = getattr(pair, key)
+                if expected is None:
+                    assert np.isnan(batch[key][i])
+                else:
+                    assert batch[key][i] == expected
+            assert batch["edit_distance"][i] == pair.edit_distance
+
+    assert "tokens_a" not in text_manager.evaluate_batch(batch_a, batch_b)
+    with pytest.raises(ValueError):
+        text_manager.evaluate_batch(batch_a, batch_b[:-1])
+
+
+def test_edit_distance_threshold():
+    r"""Test that the bounded edit distance is exact up to the threshold."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    md_tokens = [
+        text_manager.tokenize(md_file.read_text(encoding="utf-8"), False)
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    for tokens_a in md_tokens:
+        for tokens_b in md_tokens:
+            exact = text_manager.edit_distance(tokens_a, tokens_b)
+            for max_distance in [0.0, 0.1, 0.5, exact]:
+                bounded = text_manager.edit_distance(tokens_a, tokens_b, max_distance)
+                if exact <= max_distance:
+                    assert bounded == exact
+                else:
+                    assert math.isinf(bounded)
+
+
+def test_edit_distance_ids():
+    r"""Test that the interned token ids give the edit distance of the tokens."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    md_tokens = [
+        text_manager.tokenize(md_file.read_text(encoding="utf-8"), False)
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    md_ids = [text_manager.intern_tokens(tokens) for tokens in md_tokens]
+    assert all(ids.dtype == np.int32 for ids in md_ids)
+
+    for tokens_a, ids_a in zip(md_tokens, md_ids):
+        for tokens_b, ids_b in zip(md_tokens, md_ids):
+            assert text_manager.edit_distance_ids(
+                ids_a, ids_b
+            ) == text_manager.edit_distance(tokens_a, tokens_b)
+
+    with pytest.raises(ValueError):
+        text_manager.edit_distance_ids(np.array([-1], dtype=np.int32), md_ids[0])
+
+
+def test_token_list():
+    r"""Test that the token lists of the TextManager give the metrics of their tokens."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    md_texts = [
+        md_file.read_text(encoding="utf-8")
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    md_lists = [text_manager.tokenize_list(text) for text in md_texts]
+
+    for text, token_list in zip(md_texts, md_lists):
+        tokens = text_manager.tokenize(text, False)
+        assert len(token_list) == len(tokens)
+        assert token_list.tolist() == tokens
+        assert token_list[-1] == tokens[-1]
+        assert np.array_equal(token_list.ids, text_manager.intern_tokens(tokens))
+        assert np.array_equal(np.asarray(token_list), token_list.ids)
+
+        offsets = token_list.offsets
+        arena = token_list.arena.tobytes()
+        assert offsets.dtype == np.uint32 and offsets[-1] == len(arena)
+        assert [
+            arena[start:end].decode("utf-8") for start, end in pairwise(offsets)
+        ] == tokens
+        with pytest.raises(ValueError):
+            token_list.ids[0] = 0
+
+    for list_a in md_lists:
+        for list_b in md_lists:
+            tokens_a, tokens_b = list_a.tolist(), list_b.tolist()
+            assert text_manager.edit_distance(
+                list_a, list_b
+            ) == text_manager.edit_distance(tokens_a, tokens_b)
+            overlap = text_manager.overlap(list_a, list_b)
+            assert overlap.common == len(set(tokens_a) & set(tokens_b))
+            assert overlap.reference_size == len(set(tokens_a))
+            assert overlap.test_size == len(set(tokens_b))
+
+    sentences = ["Good muffins cost $3.88 in New York.", "Please buy two."]
+    evaluation = text_manager.evaluate_pair(sentences, sentences[:1])
+    overlap = text_manager.overlap(
+        text_manager.tokenize_list(sentences), text_manager.tokenize_list(sentences[:1])
+    )
+    assert (overlap.precision, overlap.recall, overlap.f1) == (
+        evaluation.precision,
+        evaluation.recall,
+        evaluation.f1,
+    )
+
+    other_list = docling_metrics_text_cpp.TextManager("error").tokenize_list(
+        md_texts[0]
+    )
+    with pytest.raises(ValueError):
+        text_manager.edit_distance(md_lists[0], other_list)
+    with pytest.raises(ValueError):
+        text_manager.overlap(md_lists[0], other_list)
+
+
+def test_edit_distance_prepared_reference():
+    r"""Test that a prepared reference gives the edit distance of its tokens."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    md_tokens = [
+        text_manager.tokenize(md_file.read_text(encoding="utf-8"), False)
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    hypotheses = md_tokens + [[]]
+
+    for reference_tokens in md_tokens:
+        reference = text_manager.prepare_reference(reference_tokens)
+        assert len(reference) == len(reference_tokens)
+        assert reference.distinct_tokens == len(set(reference_tokens))
+        for max_distance in [-1.0, 0.1, 0.5]:
+            expected = [
+                text_manager.edit_distance(reference_tokens, tokens, max_distance)
+                for tokens in hypotheses
+            ]
+            distances = text_manager.edit_distance_batch(
+                reference, hypotheses, num_threads=2, max_distance=max_distance
+            )
+            assert distances.dtype == np.float64
+            assert distances.tolist() == expected
+            assert [
+                text_manager.edit_distance(reference, tokens, max_distance)
+                for tokens in hypotheses
+            ] == expected
+
+
+def test_short_edit_distance_batch():
+    r"""Test that every SIMD level gives the edit distance of the short pairs."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    SimdLevel = docling_metrics_text_cpp.SimdLevel
+    md_tokens = [
+        text_manager.tokenize(md_file.read_text(encoding="utf-8"), False)
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    # Windows of the documents, from a few tokens to more than a word, and a long pair
+    windows = [
+        tokens[start : start + size]
+        for tokens in md_tokens
+        for start, size in [(0, 5), (3, 40), (10, 64), (20, 90)]
+    ]
+    batch_a = windows + [[], md_tokens[0]]
+    batch_b = windows[1:] + windows[:1] + [["a"], md_tokens[-1]]
+
+    assert docling_metrics_text_cpp.simd_level() in list(SimdLevel.__members__.values())
+    for max_distance in [-1.0, 0.5]:
+        expected = [
+            text_manager.edit_distance(tokens_a, tokens_b, max_distance)
+            for tokens_a, tokens_b in zip(batch_a, batch_b)
+        ]
+        for level in [SimdLevel.PORTABLE, SimdLevel.SSE4, SimdLevel.AVX2]:
+            distances = text_manager.short_edit_distance_batch(
+                batch_a,
+                batch_b,
+                num_threads=2,
+                max_distance=max_distance,
+                max_level=level,
+            )
+            assert distances.dtype == np.float64
+            assert distances.tolist() == expected
+
+    with pytest.raises(ValueError):
+        text_manager.short_edit_distance_batch(batch_a, batch_b[1:])
+
+
+def test_align():
+    r"""Test that the alignment runs rebuild the second text from the first one."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    EditOp = docling_metrics_text_cpp.EditOp
+    md_tokens = [
+        text_manager.tokenize(md_file.read_text(encoding="utf-8"), False)
+        for md_file in sorted(Path(MD_DIR).glob("*.md"))
+    ]
+    for tokens_a in md_tokens:
+        for tokens_b in md_tokens:
+            alignment = text_manager.align(tokens_a, tokens_b)
+            assert alignment["ops"].dtype == np.uint8
+
+            rebuilt = []
+            for op, length, start_a, start_b in zip(
+                alignment["ops"],
+                alignment["lengths"],
+                alignment["starts_a"],
+                alignment["starts_b"],
+            ):
+                assert start_b == len(rebuilt)
+                if op == int(EditOp.MATCH):
+                    rebuilt.extend(tokens_a[start_a : start_a + length])
+                elif op != int(EditOp.DELETE):
+                    rebuilt.extend(tokens_b[start_b : start_b + length])
+            assert rebuilt == tokens_b
+
+            max_len = max(len(tokens_a), len(tokens_b))
+            assert alignment["distance"] == round(
+                text_manager.edit_distance(tokens_a, tokens_b) * max_len
+            )
+
+
+def test_error_rates():
+    r"""Test that the native CER and WER match the edit distance of NLTK."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    loader = TextFileLoader(Path(MD_DIR))
+    # NLTK rejects inputs longer than 2000 items
+    pairs = [
+        (file_entry.pivot_content[:1500], file_entry.target_content[:1500])
+        for file_entry in loader.load()
+        if file_entry.target_content
+    ]
+    pairs.append(("na\u00efve\u3000caf\u00e9 \U0001f600", "naive caf\u00e9"))
+    pairs.append(("", ""))
+
+    batch = text_manager.error_rates_batch(
+        [reference for reference, _ in pairs], [hypothesis for _, hypothesis in pairs]
+    )
+    assert batch["cer"].dtype == np.float64
+    assert batch["word_errors"].dtype == np.int32
+    for i, (reference, hypothesis) in enumerate(pairs):
+        chars = text_manager.character_errors(reference, hypothesis)
+        assert chars.errors == edit_distance(list(reference), list(hypothesis))
+        assert chars.reference_length == len(reference)
+        assert batch["char_errors"][i] == chars.errors
+
+        words = text_manager.word_errors(reference, hypothesis)
+        assert words.errors == edit_distance(reference.split(), hypothesis.split())
+        assert words.reference_length == len(reference.split())
+        assert batch["wer"][i] == words.rate
+
+    assert math.isnan(text_manager.character_errors("", "x").rate)
+
+
+def test_bleu():
+    r"""Test the native BLEU against the scores of the "bleu" module of evaluate."""
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    with open(METRICS, "r") as f:
+        expected_metrics = json.load(f)
+    loader = TextFileLoader(Path(MD_DIR))
+    file_entries = [
+        file_entry for file_entry in loader.load() if file_entry.target_content
+    ]
+
+    batch = text_manager.bleu_batch(
+        [file_entry.pivot_content for file_entry in file_entries],
+        [file_entry.target_content for file_entry in file_entries],
+    )
+    assert batch["matches"].shape == (len(file_entries), 4)
+    statistics = docling_metrics_text_cpp.BleuStatistics()
+    for i, file_entry in enumerate(file_entries):
+        if file_entry.id in expected_metrics:
+            assert batch["bleu"][i] == pytest.approx(
+                expected_metrics[file_entry.id]["bleu_score"], abs=RELATIVE_TOLERANCE
+            )
+        statistics.add(
+            [text_manager.tokenize_13a(file_entry.target_content)],
+            text_manager.tokenize_13a(file_entry.pivot_content),
+        )
+
+    # The corpus statistics are the sums of the statistics of the pairs
+    assert statistics.matches == batch["matches"].sum(axis=0).tolist()
+    assert statistics.reference_length == batch["reference_length"].sum()
+    assert 0.0 < statistics.score().bleu < 1.0
+
+    assert math.isnan(text_manager.bleu_batch(["some text"], [""])["bleu"][0])
+
+
+def test_porter_stem():
+    r"""Test the native Porter stemmer against the PorterStemmer of nltk."""
+    with open(NLTK_TOKENS, "r") as f:
+        nltk_tokens = json.load(f)
+    words = {
+        token.lower()
+        for entry in nltk_tokens.values()
+        for token in entry["nltk_tokens"]
+    }
+    words.update(["generalizations", "skies", "dying", "analogi", "naïvement"])
+
+    stemmer = PorterStemmer()
+    for word in sorted(words):
+        assert docling_metrics_text_cpp.porter_stem(word) == stemmer.stem(word), word
+
+
+def test_meteor(tmp_path):
+    r"""Test the native METEOR against the meteor_score of nltk."""
+    nltk.download("wordnet", quiet=True)
+    nltk.download("punkt_tab", quiet=True)
+    table_path = build_meteor_table(tmp_path / "meteor.bin")
+
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    with pytest.raises(RuntimeError):
+        text_manager.meteor([["a"]], ["a"])
+    text_manager.load_meteor_table(str(table_path))
+
+    with open(METRICS, "r") as f:
+        expected_metrics = json.load(f)
+    loader = TextFileLoader(Path(MD_DIR))
+    file_entries = [
+        file_entry for file_entry in loader.load() if file_entry.target_content
+    ]
+    batch_a = [word_tokenize(file_entry.pivot_content) for file_entry in file_entries]
+    batch_b = [word_tokenize(file_entry.target_content) for file_entry in file_entries]
+    # Swapped pairs align other words by stem and synonym
+    batch_a, batch_b = batch_a + batch_b, batch_b + batch_a
+
+    scores = text_manager.meteor_batch(batch_a, batch_b, num_threads=2)
+    assert scores.dtype == np.float64
+    for i, (tokens_a, tokens_b) in enumerate(zip(batch_a, batch_b)):
+        expected = meteor_score.meteor_score([tokens_a], tokens_b)
+        assert scores[i] == pytest.approx(expected, abs=1e-12)
+        assert text_manager.meteor([tokens_a], tokens_b) == scores[i]
+    for i, file_entry in enumerate(file_entries):
+        if file_entry.id in expected_metrics:
+            assert scores[i] == pytest.approx(
+                expected_metrics[file_entry.id]["meteor_score"], abs=RELATIVE_TOLERANCE
+            )
+
+    with pytest.raises(ValueError):
+        text_manager.meteor_batch(batch_a, batch_b[:-1])
+    (tmp_path / "invalid.bin").write_bytes(b"DMMETEOR")
+    with pytest.raises(RuntimeError):
+        text_manager.load_meteor_table(str(tmp_path / "invalid.bin"))
+
+
+def test_offline(monkeypatch):
+    r"""Test that the offline mode fails fast instead of downloading the NLTK data."""
+
+    def download(*args, **kwargs):
+        raise AssertionError("Nothing is downloaded in offline mode")
+
+    monkeypatch.setattr(resources, "_available_nltk_resources", set())
+    monkeypatch.setattr(resources, "has_nltk_resource", lambda name: False)
+    monkeypatch.setattr(nltk, "download", download)
+    for mode in [TextMetricsMode.CPP, TextMetricsMode.PYTHON]:
+        with pytest.raises(LookupError, match="punkt_tab"):
+            TextMetrics(mode=mode, offline=True)
+
+
+def test_max_edit_distance():
+    r"""Test that the pairs above max_edit_distance get the maximum edit distance."""
+    loader = TextFileLoader(Path(MD_DIR))
+    samples = [
+        TextPairSample(
+            id=file_entry.id,
+            text_a=file_entry.pivot_content,
+            text_b=file_entry.target_content,
+        )
+        for file_entry in loader.load()
+        if file_entry.target_content
+    ]
+
+    exact_results = TextMetrics().evaluate_samples(samples)
+    for mode in [TextMetricsMode.CPP, TextMetricsMode.PYTHON]:
+        bounded_metrics = TextMetrics(mode=mode, max_edit_distance=0.1)
+        for exact, bounded in zip(
+            exact_results, bounded_metrics.evaluate_samples(samples)
+        ):
+            if exact.edit_distance_score <= 0.1:
+                assert bounded.edit_distance_score == exact.edit_distance_score
+            else:
+                assert bounded.edit_distance_score == 1.0
+            assert bounded.f1_score == exact.f1_score
+
+    with pytest.raises(ValueError):
+        TextMetrics(max_edit_distance=-0.5)
+
+
+def test_metric_selection():
+    r"""Test that only the selected metrics are computed, the other scores are None."""
+    loader = TextFileLoader(Path(MD_DIR))
+    samples = [
+        TextPairSample(
+            id=file_entry.id,
+            text_a=file_entry.pivot_content,
+            text_b=file_entry.target_content,
+        )
+        for file_entry in loader.load()
+    ]
+
+    all_results = TextMetrics().evaluate_samples(samples)
+    for mode in [TextMetricsMode.CPP, TextMetricsMode.PYTHON]:
+        for metrics in [
+            [TextMetricKind.EDIT_DISTANCE],
+            [TextMetricKind.F1, TextMetricKind.RECALL],
+            [TextMetricKind.METEOR, TextMetricKind.CER],
+        ]:
+            selected_metrics = TextMetrics(mode=mode, metrics=metrics)
+            assert selected_metrics.metric_config()["metrics"] == sorted(
+                kind.value for kind in metrics
+            )
+            for expected, result in zip(
+                all_results, selected_metrics.evaluate_samples(samples)
+            ):
+                for kind in TextMetricKind:
+                    field = f"{kind.value}_score"
+                    if kind in metrics:
+                        assert getattr(result, field) == pytest.approx(
+                            getattr(expected, field), rel=RELATIVE_TOLERANCE
+                        )
+                    else:
+                        assert getattr(result, field) is None
+
+    with pytest.raises(ValueError):
+        TextMetrics(metrics=[])
+
+
+def test_metric_selection_offline(monkeypatch):
+    r"""Test that the metrics without tokens need no NLTK data."""
+
+    def download(*args, **kwargs):
+        raise AssertionError("Nothing is downloaded in offline mode")
+
+    monkeypatch.setattr(resources, "_available_nltk_resources", set())
+    monkeypatch.setattr(resources, "has_nltk_resource", lambda name: False)
+    monkeypatch.setattr(nltk, "download", download)
+    text_manager = docling_metrics_text_cpp.TextManager("error")
+    sample = TextPairSample(
+        id="s1",
+        text_a="The quick brown fox jumps over the lazy dog.",
+        text_b="The fast brown fox leaps over the lazy dog.",
+    )
+
+    metrics = TextMetrics(
+        offline=True,
+        metrics=[TextMetricKind.CER, TextMetricKind.WER, TextMetricKind.BLEU],
+    )
+    result = metrics.evaluate_sample(sample)
+    assert result.f1_score is None and result.edit_distance_score is None
+    assert result.meteor_score is None
+    assert (
+        result.cer_score
+        == text_manager.character_errors(sample.text_a, sample.text_b).rate
+    )
+    assert result.wer_score == pytest.approx(2 / 9)
+    assert result.bleu_score == pytest.approx(
+        text_manager.bleu_batch([sample.text_a], [sample.text_b])["bleu"][0]
+    )
+
+    python_metrics = TextMetrics(
+        mode=TextMetricsMode.PYTHON, offline=True, metrics=[TextMetricKind.WER]
+    )
+    assert python_metrics.evaluate_sample(sample).wer_score == result.wer_score
+
+
+def test_evaluate_dataset():
+    r"""Test the corpus statistics of a dataset against its per-sample results."""
+    loader = TextFileLoader(Path(MD_DIR))
+    samples = [
+        TextPairSample(
+            id=file_entry.id,
+            text_a=file_entry.pivot_content,
+            text_b=file_entry.target_content,
+        )
+        for file_entry in loader.load()
+    ]
+    samples.append(TextPairSample(id="empty_b", text_a="some text", text_b=""))
+
+    for mode in TextMetricsMode:
+        metrics = TextMetrics(mode=mode)
+        results = metrics.evaluate_samples(samples)
+        evaluation = metrics.evaluate_dataset(iter(samples))
+        assert evaluation.sample_count == len(samples)
+
+        f1_scores = [result.f1_score for result in results if result.f1_score != -1]
+        assert evaluation.f1_score is not None
+        assert evaluation.f1_score.error_count == len(samples) - len(f1_scores)
+        assert evaluation.macro_f1 == pytest.approx(np.mean(f1_scores))
+        assert evaluation.f1_score.median == pytest.approx(
+            np.median(f1_scores), abs=0.01
+        )
+        assert sum(evaluation.f1_score.hist) == len(f1_scores)
+
+        counts = [result.counts for result in results]
+        common_tokens = sum(count.common_tokens for count in counts)
+        assert evaluation.micro_recall == common_tokens / sum(
+            count.token_set_a for count in counts
+        )
+        assert evaluation.corpus_edit_distance == sum(
+            count.edit_operations for count in counts
+        ) / sum(count.max_tokens for count in counts)
+
+        # The corpus BLEU of the pairs whose sentence BLEU is defined
+        text_manager = docling_metrics_text_cpp.TextManager("error")
+        statistics = docling_metrics_text_cpp.BleuStatistics()
+        for sample, result in zip(samples, results):
+            if result.bleu_score != -1:
+                statistics.add(
+                    [text_manager.tokenize_13a(sample.text_b)],
+                    text_manager.tokenize_13a(sample.text_a),
+                )
+        assert evaluation.corpus_bleu == pytest.approx(statistics.score().bleu)
+
+
+def test_text_metrics_accumulator():
+    r"""Test the score distributions and the merge of the accumulator."""
+    results = [
+        TextPairEvaluation(
+            id=str(i),
+            f1_score=i / 10,
+            cer_score=2.0 if i == 9 else -1,
+            counts=TextPairCounts(
+                token_set_a=10, token_set_b=5, common_tokens=i % 5, edit_operations=i
+            ),
+        )
+        for i in range(10)
+    ]
+    accumulator = TextMetrics().create_accumulator().update_all(results[:4])
+    accumulator.merge(TextMetrics().create_accumulator().update_all(results[4:]))
+    evaluation = accumulator.finalize()
+
+    assert evaluation.sample_count == 10
+    assert evaluation.f1_score is not None and evaluation.f1_score.count == 10
+    assert evaluation.f1_score.mean == pytest.approx(0.45)
+    assert evaluation.f1_score.median == pytest.approx(0.45, abs=0.01)
+    assert (evaluation.f1_score.min, evaluation.f1_score.max) == (0.0, 0.9)
+    assert len(evaluation.f1_score.bins) == len(evaluation.f1_score.hist) + 1
+    assert evaluation.macro_f1 == evaluation.f1_score.mean
+
+    # The error scores are only counted, the error rates above 1 are in the last bin
+    assert evaluation.cer_score is not None
+    assert (evaluation.cer_score.count, evaluation.cer_score.error_count) == (1, 9)
+    assert evaluation.cer_score.median == 2.0
+    assert evaluation.cer_score.hist[-1] == 1
+    assert evaluation.wer_score is None
+
+    assert evaluation.micro_precision == pytest.approx(20 / 50)
+    assert evaluation.micro_recall == pytest.approx(20 / 100)
+    assert evaluation.micro_f1 == pytest.approx(2 * 0.4 * 0.2 / 0.6)
+    # Without max_tokens, the edit distance counts are incomplete
+    assert evaluation.corpus_edit_distance is None
+    assert evaluation.corpus_bleu is None
+
+    # The accumulator is serializable
+    restored = type(accumulator).model_validate_json(accumulator.model_dump_json())
+    assert restored.finalize() == evaluation
+
+
 if __name__ == "__main__":
     test_text_metrics()
     test_extreme_cases()
+    test_evaluate_samples()
+    test_cpp_python_parity()
+    test_evaluate_batch()
+    test_edit_distance_threshold()
+    test_edit_distance_ids()
+    test_align()
+    test_max_edit_distance()
+    test_metric_selection()
+    test_evaluate_dataset()
+    test_text_metrics_accumulator()